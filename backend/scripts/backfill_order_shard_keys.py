@@ -0,0 +1,61 @@
+"""
+Add the ShopOrdersShardIndex key (`shopShard`) to orders saved before that
+index existed, and move orders to their shard after SHOP_ORDER_SHARDS changes.
+Until an order has its current key, get_orders_by_shop (and so the shop
+stats backfill) and the shop's order history do not see it.
+
+Sets only `shopShard` on each order whose key is missing or stale, so status
+updates landing meanwhile are kept. Safe to re-run. DynamoDB only: the
+MongoDB and in-memory backends have no sharded index.
+
+Usage (from backend/):
+  python3 -m scripts.backfill_order_shard_keys
+  python3 -m scripts.backfill_order_shard_keys --dry-run
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from botocore.exceptions import ClientError  # noqa: E402
+
+from src.models.order import with_order_keys  # noqa: E402
+from src.services.dynamodb_service import DynamoDBService  # noqa: E402
+from src.utils.config import config  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dry-run", action="store_true", help="count orders needing keys only")
+    args = parser.parse_args()
+
+    db = DynamoDBService()
+    checked = 0
+    updated = 0
+    for order in db.scan_all(config.ORDERS_TABLE, ProjectionExpression="orderId, shopId, shopShard"):
+        checked += 1
+        shard = with_order_keys(order)["shopShard"]
+        if order.get("shopShard") == shard:
+            continue
+        updated += 1
+        if args.dry_run:
+            continue
+        try:
+            db.update_item(
+                config.ORDERS_TABLE, {"orderId": order["orderId"]}, "SET shopShard = :s", {":s": shard},
+                condition_expression="attribute_exists(orderId)",
+            )
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            updated -= 1  # deleted since the scan
+
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"{verb} {updated} of {checked} orders")
+
+
+if __name__ == "__main__":
+    main()
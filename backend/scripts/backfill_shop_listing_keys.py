@@ -0,0 +1,51 @@
+"""
+Add the PincodeStatusIndex keys (`pincodeStatus`, default `category`), the
+ShopGeoIndex keys (`geohash`, `geoStatus`; shops with lat/lng only) and the
+PincodeShardIndex key (`pincodeShard`) to shops saved before those indexes
+existed. Until a shop has them it is missing from shop discovery,
+/health/nearby and the agent's shop search (by pincode and by GPS
+respectively), and from get_shops_by_pincode.
+
+Re-saves each shop header that lacks a key or has a stale one. Safe to re-run;
+run it again after changing PINCODE_SHARDS, so shops move to their new shard.
+
+Usage (from backend/):
+  python3 -m scripts.backfill_shop_listing_keys
+  python3 -m scripts.backfill_shop_listing_keys --dry-run
+  IS_OFFLINE=true python3 -m scripts.backfill_shop_listing_keys   # local MongoDB
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.models.shop import with_listing_keys  # noqa: E402
+from src.services.database import db  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dry-run", action="store_true", help="count shops needing keys only")
+    args = parser.parse_args()
+
+    checked = 0
+    updated = 0
+    for shop_id in db.iter_shop_ids():
+        shop = db.get_shop(shop_id)
+        checked += 1
+        if not shop or with_listing_keys(shop) == shop:
+            continue
+        updated += 1
+        if not args.dry_run:
+            shop.pop("_id", None)
+            db.save_shop(shop)
+
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"{verb} {updated} of {checked} shops")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Rebuild the per-shop analytics rollups (SHOP_STATS table) from the orders table.
+
+New orders and status changes keep the rollups current incrementally; this
+script seeds them for orders placed before the rollups existed, or repairs a
+shop whose counters drifted. It overwrites rollup rows, so it is safe to re-run
+— but run it when no orders are being placed for the shops it touches.
+
+Usage (from backend/):
+  python3 -m scripts.backfill_shop_stats
+  python3 -m scripts.backfill_shop_stats --shop-id <shopId> --dry-run
+  IS_OFFLINE=true python3 -m scripts.backfill_shop_stats   # local MongoDB
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.services.database import db  # noqa: E402
+from src.utils.constants import ORDER_STATUS_PENDING, SHOP_STATS_ALL_TIME  # noqa: E402
+
+
+def rollup_rows(orders: list[dict]) -> list[dict]:
+    """Daily rows plus the all-time row for one shop's orders."""
+    days: dict = defaultdict(lambda: {"orderCount": 0, "revenue": 0.0})
+    all_time = {"statDate": SHOP_STATS_ALL_TIME, "orderCount": 0, "revenue": 0.0, "pendingOrders": 0}
+    for order in orders:
+        amount = order.get("totalAmount", 0)
+        day = days[order.get("createdAt", "")[:10]]
+        day["orderCount"] += 1
+        day["revenue"] += amount
+        all_time["orderCount"] += 1
+        all_time["revenue"] += amount
+        all_time["pendingOrders"] += order.get("status") == ORDER_STATUS_PENDING
+    rows = [dict(stats, statDate=day, revenue=round(stats["revenue"], 2))
+            for day, stats in sorted(days.items()) if day]
+    all_time["revenue"] = round(all_time["revenue"], 2)
+    return rows + [all_time]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--shop-id", help="rebuild one shop only")
+    parser.add_argument("--dry-run", action="store_true", help="compute but do not write")
+    args = parser.parse_args()
+
+    shop_ids = [args.shop_id] if args.shop_id else db.iter_shop_ids()
+    shops = 0
+    orders = 0
+    for shop_id in shop_ids:
+        shop_orders = db.get_orders_by_shop(shop_id, projection=["createdAt", "totalAmount", "status"])
+        if not args.dry_run:
+            db.save_shop_stats(shop_id, rollup_rows(shop_orders))
+        shops += 1
+        orders += len(shop_orders)
+
+    verb = "Would rebuild" if args.dry_run else "Rebuilt"
+    print(f"{verb} rollups for {shops} shops ({orders} orders)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark warm-call latency of the shared tuned AWS clients against the old setup.
+
+  default – boto3.resource("dynamodb") with botocore defaults and a fresh
+            resource.Table() per call, as DynamoDBService used to do
+  tuned   – src.services.aws_clients: tuned botocore Config and cached Table handles
+
+Both read the same --key with GetItem --calls times after one warm-up call and
+report the median and p95 per-call latency. Read-only.
+
+Usage (from backend/, AWS credentials for the target stage):
+  python3 -m scripts.benchmark_aws_clients --key shopId=shop-001
+  python3 -m scripts.benchmark_aws_clients --table gramsathi-dev-users --key userId=u-1 --calls 500
+  python3 -m scripts.benchmark_aws_clients --moto   # in-process mock, no AWS needed
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.utils.config import config  # noqa: E402
+
+
+def _seed_mock_table(table_name: str, key: dict) -> None:
+    import boto3
+
+    (name, value), = key.items()
+    client = boto3.client("dynamodb", region_name=config.AWS_REGION)
+    client.create_table(
+        TableName=table_name,
+        BillingMode="PAY_PER_REQUEST",
+        AttributeDefinitions=[{"AttributeName": name, "AttributeType": "S"}],
+        KeySchema=[{"AttributeName": name, "KeyType": "HASH"}],
+    )
+    client.put_item(TableName=table_name, Item={name: {"S": value}, "name": {"S": "Bench Shop"}})
+
+
+def _latencies_ms(get_table, key: dict, calls: int) -> list[float]:
+    get_table().get_item(Key=key)  # warm-up: connection + credential resolution
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        get_table().get_item(Key=key)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> float:
+    median = statistics.median(samples)
+    p95 = statistics.quantiles(samples, n=20)[-1]
+    print(f"  {label:8}: median {median:7.2f} ms   p95 {p95:7.2f} ms")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--table", default=config.SHOPS_TABLE)
+    parser.add_argument("--key", default="shopId=bench-shop", help="name=value of an existing item")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--moto", action="store_true", help="seed and use an in-process moto table")
+    args = parser.parse_args()
+
+    name, _, value = args.key.partition("=")
+    key = {name: value}
+
+    if args.moto:
+        from moto import mock_aws
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+        context = mock_aws()
+    else:
+        context = nullcontext()
+
+    with context:
+        if args.moto:
+            _seed_mock_table(args.table, key)
+
+        import boto3
+        from src.services import aws_clients
+
+        default_resource = boto3.resource("dynamodb", region_name=config.AWS_REGION)
+        default = _latencies_ms(lambda: default_resource.Table(args.table), key, args.calls)
+        tuned = _latencies_ms(lambda: aws_clients.table(args.table), key, args.calls)
+
+    print(f"{args.calls} warm GetItem calls on {args.table}")
+    default_ms = _report("default", default)
+    tuned_ms = _report("tuned", tuned)
+    print(f"  tuned is {default_ms / tuned_ms:.2f}x the speed of default (median)")
+
+
+if __name__ == "__main__":
+    main()
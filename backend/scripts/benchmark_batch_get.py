@@ -0,0 +1,91 @@
+"""
+Benchmark DynamoDBService.batch_get against a loop of get_item calls.
+
+Reads --count existing keys from the table (one keys-only scan page), then
+times fetching them sequentially with get_item and with batch_get (100-key
+BatchGetItem requests in parallel threads). Read-only.
+
+Usage (from backend/, AWS credentials for the target stage):
+  python3 -m scripts.benchmark_batch_get
+  python3 -m scripts.benchmark_batch_get --table gramsathi-dev-orders --count 500 --runs 5
+  python3 -m scripts.benchmark_batch_get --moto --count 300   # in-process mock, no AWS needed
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.utils.config import config  # noqa: E402
+
+
+def _seed_mock_table(table_name: str, count: int) -> None:
+    import boto3
+
+    boto3.client("dynamodb", region_name=config.AWS_REGION).create_table(
+        TableName=table_name,
+        BillingMode="PAY_PER_REQUEST",
+        AttributeDefinitions=[{"AttributeName": "shopId", "AttributeType": "S"}],
+        KeySchema=[{"AttributeName": "shopId", "KeyType": "HASH"}],
+    )
+    from src.services.dynamodb_service import DynamoDBService
+
+    DynamoDBService().batch_write(table_name, [
+        {"shopId": f"bench-{i:05d}", "name": f"Shop {i}", "pincode": "324001"} for i in range(count)
+    ])
+
+
+def _time_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--table", default=config.SHOPS_TABLE)
+    parser.add_argument("--count", type=int, default=200, help="number of keys to fetch")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--moto", action="store_true", help="seed and use an in-process moto table")
+    args = parser.parse_args()
+
+    if args.moto:
+        from moto import mock_aws
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+        context = mock_aws()
+    else:
+        context = nullcontext()
+
+    with context:
+        if args.moto:
+            _seed_mock_table(args.table, args.count)
+
+        from src.services import aws_clients
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+        key_names = [k["AttributeName"] for k in aws_clients.table(args.table).key_schema]
+        keys = []
+        for item in db.scan_all(args.table, ProjectionExpression=", ".join(key_names)):
+            keys.append({n: item[n] for n in key_names})
+            if len(keys) >= args.count:
+                break
+        if not keys:
+            sys.exit(f"{args.table} is empty — nothing to benchmark")
+
+        sequential = [_time_ms(lambda: [db.get_item(args.table, k) for k in keys]) for _ in range(args.runs)]
+        batched = [_time_ms(lambda: db.batch_get(args.table, keys)) for _ in range(args.runs)]
+
+    seq_ms, batch_ms = statistics.median(sequential), statistics.median(batched)
+    print(f"{len(keys)} keys from {args.table}, median of {args.runs} runs")
+    print(f"  get_item loop : {seq_ms:9.1f} ms")
+    print(f"  batch_get     : {batch_ms:9.1f} ms  ({seq_ms / batch_ms:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark the Decimal-free item codec against the boto3 resource-layer path.
+
+Builds one shop with a --items inventory (default 200) and times both ways of
+turning it into DynamoDB AttributeValues and back:
+
+  resource – to_decimal → TypeSerializer on write, TypeDeserializer → from_decimal
+             on read, as DynamoDBService did through boto3.resource
+  codec    – src.utils.dynamo_codec serialize_item / deserialize_item, one pass each
+
+With --moto the same item is also written and read back --runs times through
+an in-process table, once with a resource Table and once with DynamoDBService.
+
+Usage (from backend/):
+  python3 -m scripts.benchmark_item_codec
+  python3 -m scripts.benchmark_item_codec --items 500 --runs 2000
+  python3 -m scripts.benchmark_item_codec --moto --runs 200
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from decimal import Decimal
+from typing import Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer  # noqa: E402
+
+from src.utils.config import config  # noqa: E402
+from src.utils.dynamo_codec import deserialize_item, serialize_item  # noqa: E402
+
+
+def to_decimal(value: Any) -> Any:
+    """Recursively convert float → Decimal, as models did before each resource-layer write."""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: to_decimal(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [to_decimal(v) for v in value]
+    return value
+
+
+def from_decimal(value: Any) -> Any:
+    """Recursively convert Decimal → float, as models did after each resource-layer read."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, dict):
+        return {k: from_decimal(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [from_decimal(v) for v in value]
+    return value
+
+
+def _shop(items: int) -> dict:
+    return {
+        "shopId": "bench-shop", "ownerId": "bench-owner", "name": "Bench Kirana",
+        "pincode": "324001", "lat": 25.1802, "lng": 75.8331, "status": "approved",
+        "inventory": [
+            {"itemId": f"i{n}", "name": f"Item {n}", "nameHindi": "आटा", "price": 10.5 + n,
+             "unit": "kg", "stockQty": n % 50, "category": "grocery"}
+            for n in range(items)
+        ],
+    }
+
+
+def _resource_path(item: dict) -> dict:
+    serializer, deserializer = TypeSerializer(), TypeDeserializer()
+    wire = {k: serializer.serialize(v) for k, v in to_decimal(item).items()}
+    return from_decimal({k: deserializer.deserialize(v) for k, v in wire.items()})
+
+
+def _codec_path(item: dict) -> dict:
+    return deserialize_item(serialize_item(item))
+
+
+def _per_call_us(fn, runs: int) -> list[float]:
+    fn()  # warm-up
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> float:
+    median = statistics.median(samples)
+    print(f"  {label:8}: median {median:9.1f} µs   p95 {statistics.quantiles(samples, n=20)[-1]:9.1f} µs")
+    return median
+
+
+def _moto_round_trips(item: dict, runs: int) -> tuple[list[float], list[float]]:
+    import boto3
+    from moto import mock_aws
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        boto3.client("dynamodb", region_name=config.AWS_REGION).create_table(
+            TableName=config.SHOPS_TABLE,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[{"AttributeName": "shopId", "AttributeType": "S"}],
+            KeySchema=[{"AttributeName": "shopId", "KeyType": "HASH"}],
+        )
+        from src.services import aws_clients
+        from src.services.dynamodb_service import DynamoDBService
+
+        table, svc, key = aws_clients.table(config.SHOPS_TABLE), DynamoDBService(), {"shopId": item["shopId"]}
+
+        def via_resource():
+            table.put_item(Item=to_decimal(item))
+            return from_decimal(table.get_item(Key=key)["Item"])
+
+        def via_codec():
+            svc.put_item(config.SHOPS_TABLE, item)
+            return svc.get_item(config.SHOPS_TABLE, key)
+
+        return _per_call_us(via_resource, runs), _per_call_us(via_codec, runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=200, help="inventory size of the shop")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--moto", action="store_true", help="also time put/get through a moto table")
+    args = parser.parse_args()
+
+    item = _shop(args.items)
+    assert _resource_path(item) == _codec_path(item)
+
+    print(f"Serialize + deserialize one shop with {args.items} inventory items, {args.runs} runs")
+    resource_us = _report("resource", _per_call_us(lambda: _resource_path(item), args.runs))
+    codec_us = _report("codec", _per_call_us(lambda: _codec_path(item), args.runs))
+    print(f"  codec is {resource_us / codec_us:.2f}x the speed of resource (median)")
+
+    if args.moto:
+        print(f"\nPutItem + GetItem round trip on a moto table, {args.runs} runs")
+        resource_samples, codec_samples = _moto_round_trips(item, args.runs)
+        resource_us = _report("resource", resource_samples)
+        codec_us = _report("codec", codec_samples)
+        print(f"  codec is {resource_us / codec_us:.2f}x the speed of resource (median)")
+
+
+if __name__ == "__main__":
+    main()
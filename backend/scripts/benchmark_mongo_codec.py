@@ -0,0 +1,160 @@
+"""
+Benchmark MongoDBService's driver-level Decimal codec against the old Python walks.
+
+Builds one shop with a --items embedded inventory (default 500; legacy shop
+documents carried the whole list) and times both ways of reading and
+writing it. Stored prices are doubles, as MongoDBService writes them; with
+--decimal128 they are Decimal128, as other tools may write them (both paths
+then spend most of their time in Decimal128.to_decimal):
+
+  walk  – BSON decode, then a recursive Python pass turning Decimal128 into
+          float and a pop of `_id` (reads); a recursive Decimal → float pass,
+          then BSON encode (writes), as MongoDBService did before
+  codec – BSON decode / encode with mongodb_service.TYPE_REGISTRY, which
+          converts while the driver builds the document; `_id` never leaves
+          the server because reads project it away
+
+With --server the shop is also written to a scratch collection of the STAGE
+database of MONGODB_URI and read back --runs times with find_one, once by a
+plain client plus the walk and once through MongoDBService.get_shop.
+
+Usage (from backend/):
+  python3 -m scripts.benchmark_mongo_codec
+  python3 -m scripts.benchmark_mongo_codec --items 2000 --runs 500
+  python3 -m scripts.benchmark_mongo_codec --decimal128
+  python3 -m scripts.benchmark_mongo_codec --server
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import bson  # noqa: E402
+from bson import ObjectId  # noqa: E402
+from bson.codec_options import CodecOptions  # noqa: E402
+from bson.decimal128 import Decimal128  # noqa: E402
+
+from src.services.mongodb_service import TYPE_REGISTRY  # noqa: E402
+
+CODEC_OPTIONS = CodecOptions(type_registry=TYPE_REGISTRY)
+
+
+def _shop(items: int, number) -> dict:
+    return {
+        "shopId": "bench-shop", "ownerId": "bench-owner", "name": "Bench Kirana",
+        "pincode": "324001", "lat": 25.1802, "lng": 75.8331, "status": "approved",
+        "inventory": [
+            {"itemId": f"i{n}", "name": f"Item {n}", "nameHindi": "आटा", "price": number(f"{10.5 + n}"),
+             "unit": "kg", "stockQty": n % 50, "category": "grocery"}
+            for n in range(items)
+        ],
+    }
+
+
+def _convert(v, types, to_float):
+    if isinstance(v, types):
+        return to_float(v)
+    if isinstance(v, dict):
+        return {k: _convert(x, types, to_float) for k, x in v.items()}
+    if isinstance(v, list):
+        return [_convert(x, types, to_float) for x in v]
+    return v
+
+
+def _walk_read(raw: bytes) -> dict:
+    item = _convert(bson.decode(raw), (Decimal128, Decimal), lambda d: float(str(d)))
+    item.pop("_id", None)
+    return item
+
+
+def _codec_read(raw: bytes) -> dict:
+    return bson.decode(raw, codec_options=CODEC_OPTIONS)
+
+
+def _walk_write(item: dict) -> bytes:
+    return bson.encode(_convert(item, Decimal, float))
+
+
+def _codec_write(item: dict) -> bytes:
+    return bson.encode(item, codec_options=CODEC_OPTIONS)
+
+
+def _per_call_us(fn, runs: int) -> list[float]:
+    fn()  # warm-up
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> float:
+    median = statistics.median(samples)
+    print(f"  {label:6}: median {median:9.1f} µs   p95 {statistics.quantiles(samples, n=20)[-1]:9.1f} µs   "
+          f"{1e6 / median:8.0f} docs/s")
+    return median
+
+
+def _compare(title: str, walk, codec, runs: int) -> None:
+    print(title)
+    walk_us = _report("walk", _per_call_us(walk, runs))
+    codec_us = _report("codec", _per_call_us(codec, runs))
+    print(f"  codec is {walk_us / codec_us:.2f}x the speed of walk (median)\n")
+
+
+def _server_reads(shop: dict, runs: int) -> None:
+    from pymongo import MongoClient
+
+    from src.services.mongodb_service import MongoDBService, _collection_name
+    from src.utils.config import config
+
+    svc = MongoDBService()
+    svc.save_shop(shop)
+    plain = MongoClient(config.MONGODB_URI)[f"gramsathi_{config.STAGE}"]
+    shops = plain[_collection_name(config.SHOPS_TABLE)]
+    try:
+        def via_walk():
+            doc = shops.find_one({"shopId": shop["shopId"]})
+            doc = _convert(doc, (Decimal128, Decimal), lambda d: float(str(d)))
+            doc.pop("_id", None)
+            return doc
+
+        _compare(f"find_one of the shop, {runs} runs", via_walk, lambda: svc.get_shop(shop["shopId"]), runs)
+    finally:
+        shops.delete_one({"shopId": shop["shopId"]})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=500, help="embedded inventory size of the shop")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--decimal128", action="store_true", help="store prices as Decimal128")
+    parser.add_argument("--server", action="store_true", help="also time find_one against MONGODB_URI")
+    args = parser.parse_args()
+
+    stored = _shop(args.items, Decimal128 if args.decimal128 else float)
+    raw = bson.encode(dict(stored, _id=ObjectId()))
+    # the codec path never receives `_id`: reads project it away on the server
+    raw_without_id = bson.encode(stored)
+    incoming = _shop(args.items, Decimal)
+    assert _walk_read(raw) == _codec_read(raw_without_id)
+    assert _walk_write(incoming) == _codec_write(incoming)
+
+    print(f"One shop with {args.items} inventory items ({len(raw) / 1024:.0f} KiB of BSON)\n")
+    _compare(f"Decode (read), {args.runs} runs",
+             lambda: _walk_read(raw), lambda: _codec_read(raw_without_id), args.runs)
+    _compare(f"Encode (write), {args.runs} runs", lambda: _walk_write(incoming), lambda: _codec_write(incoming),
+             args.runs)
+    if args.server:
+        _server_reads(_shop(args.items, float), args.runs)
+
+
+if __name__ == "__main__":
+    main()
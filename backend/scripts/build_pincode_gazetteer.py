@@ -0,0 +1,80 @@
+"""
+Build the offline pincode gazetteer used for pincode ↔ lat/lon lookups.
+
+Input: the India Post "All India Pincode Directory" CSV (data.gov.in), or any
+CSV with `pincode`, `latitude` and `longitude` columns. Several post offices
+share a pincode; their coordinates are averaged into one centroid.
+
+Usage (from backend/):
+  python3 -m scripts.build_pincode_gazetteer pincodes.csv
+  python3 -m scripts.build_pincode_gazetteer pincodes.csv -o /tmp/pincodes.bin
+
+Output defaults to config.PINCODE_GAZETTEER_PATH (src/data/pincode_gazetteer.bin),
+which is packaged with the Lambda bundle.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.services.pincode_gazetteer import build_gazetteer  # noqa: E402
+from src.utils.config import config  # noqa: E402
+
+# Rough India bounding box — drops swapped/zeroed coordinates common in the source data
+_LAT_RANGE = (6.0, 37.5)
+_LON_RANGE = (68.0, 97.5)
+
+
+def _parse_float(value: str) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def load_centroids(csv_path: str) -> list[tuple[str, float, float]]:
+    sums: dict[str, list[float]] = defaultdict(lambda: [0.0, 0.0, 0])
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        columns = {c.lower(): c for c in reader.fieldnames or []}
+        try:
+            pin_col, lat_col, lon_col = columns["pincode"], columns["latitude"], columns["longitude"]
+        except KeyError:
+            raise SystemExit("CSV must have pincode, latitude and longitude columns")
+
+        for row in reader:
+            pincode = (row.get(pin_col) or "").strip()
+            lat = _parse_float(row.get(lat_col))
+            lon = _parse_float(row.get(lon_col))
+            if len(pincode) != 6 or not pincode.isdigit() or lat is None or lon is None:
+                continue
+            if not (_LAT_RANGE[0] <= lat <= _LAT_RANGE[1] and _LON_RANGE[0] <= lon <= _LON_RANGE[1]):
+                continue
+            acc = sums[pincode]
+            acc[0] += lat
+            acc[1] += lon
+            acc[2] += 1
+
+    return [(pin, lat / n, lon / n) for pin, (lat, lon, n) in sums.items()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("csv_path")
+    parser.add_argument("-o", "--output", default=config.PINCODE_GAZETTEER_PATH)
+    args = parser.parse_args()
+
+    centroids = load_centroids(args.csv_path)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    count = build_gazetteer(centroids, args.output)
+    size_kb = os.path.getsize(args.output) / 1024
+    print(f"Wrote {count} pincodes to {args.output} ({size_kb:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Check that MongoDB's newest-first reads are served by their compound indexes.
+
+Seeds --orders orders for one user and one shop and --conversations
+conversations for one user, then explains the queries MongoDBService runs for
+
+  get_orders_by_shop        {shopId} sort createdAt desc  (ShopOrdersByDateIndex)
+  get_orders_by_user        {userId} sort createdAt desc  (UserOrdersByDateIndex)
+  get_conversations_by_user {userId} sort createdAt desc  (UserConversationsByDateIndex)
+
+For each it prints the winning index, keys / documents examined and whether
+the plan has an in-memory SORT stage, and times --runs executions against
+the same query forced to a collection scan ($natural hint: scan + in-memory
+sort, the plan the old single-field indexes degraded to). Exits non-zero
+when any plan sorts in memory or uses the wrong index.
+Writes to the STAGE database of MONGODB_URI and removes its documents after.
+
+Usage (from backend/, MongoDB running locally):
+  python3 -m scripts.explain_mongo_queries
+  python3 -m scripts.explain_mongo_queries --orders 50000 --runs 50
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.services.mongodb_service import (  # noqa: E402
+    _CONVERSATION_LIST_FIELDS,
+    _NEWEST_FIRST,
+    _ORDER_FIELDS,
+    MongoDBService,
+)
+from src.utils.config import config  # noqa: E402
+
+USER_ID = "explain-user"
+SHOP_ID = "explain-shop"
+
+
+def _seed(db: MongoDBService, orders: int, conversations: int) -> None:
+    db._collection(config.ORDERS_TABLE).insert_many([{
+        "orderId": f"explain-order-{n}", "userId": USER_ID, "shopId": SHOP_ID,
+        "status": "delivered", "totalAmount": 10.0 + n % 90,
+        "items": [{"itemId": "i1", "name": "Atta 5kg", "qty": 1, "price": 10.0}],
+        "createdAt": f"2026-01-01T00:{n // 60 % 60:02d}:{n % 60:02d}.{n:07d}",
+    } for n in range(orders)])
+    db._collection(config.CONVERSATIONS_TABLE).insert_many([{
+        "conversationId": f"explain-conv-{n}", "userId": USER_ID, "language": "hi",
+        "createdAt": f"2026-01-01T00:00:00.{n:07d}", "updatedAt": f"2026-01-02T00:00:00.{n:07d}",
+    } for n in range(conversations)])
+
+
+def _cleanup(db: MongoDBService) -> None:
+    db._collection(config.ORDERS_TABLE).delete_many({"userId": USER_ID})
+    db._collection(config.CONVERSATIONS_TABLE).delete_many({"userId": USER_ID})
+
+
+def _stages(plan: dict):
+    """(stage, indexName) of every node of an explain() plan tree (classic or SBE)."""
+    plan = plan.get("queryPlan", plan)
+    yield plan.get("stage"), plan.get("indexName")
+    for child in [plan.get("inputStage"), *plan.get("inputStages", [])]:
+        if child:
+            yield from _stages(child)
+
+
+def _time(cursor_fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        list(cursor_fn())
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--conversations", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    db = MongoDBService()
+    queries = [
+        ("get_orders_by_shop", config.ORDERS_TABLE, {"shopId": SHOP_ID}, _ORDER_FIELDS, "ShopOrdersByDateIndex"),
+        ("get_orders_by_user", config.ORDERS_TABLE, {"userId": USER_ID}, _ORDER_FIELDS, "UserOrdersByDateIndex"),
+        ("get_conversations_by_user", config.CONVERSATIONS_TABLE, {"userId": USER_ID},
+         _CONVERSATION_LIST_FIELDS, "UserConversationsByDateIndex"),
+    ]
+    _cleanup(db)
+    _seed(db, args.orders, args.conversations)
+    failures = 0
+    try:
+        print(f"{args.orders} orders, {args.conversations} conversations; median of {args.runs} runs")
+        for name, table, query, fields, expected in queries:
+            collection = db._collection(table)
+            explain = collection.find(query, fields).sort(_NEWEST_FIRST).explain()
+            stages = list(_stages(explain["queryPlanner"]["winningPlan"]))
+            indexes = {index for _, index in stages if index}
+            in_memory_sort = any(stage == "SORT" for stage, _ in stages)
+            stats = explain.get("executionStats", {})
+            ok = expected in indexes and not in_memory_sort
+            failures += not ok
+            indexed = _time(lambda: collection.find(query, fields).sort(_NEWEST_FIRST), args.runs)
+            scanned = _time(
+                lambda: collection.find(query, fields).sort(_NEWEST_FIRST).hint([("$natural", 1)]), args.runs
+            )
+            print(f"  {name:26} {'ok  ' if ok else 'FAIL'} index {', '.join(sorted(indexes)) or '-':29} "
+                  f"sort {'memory' if in_memory_sort else 'index ':6}  "
+                  f"keys {stats.get('totalKeysExamined', '?'):>6}  docs {stats.get('totalDocsExamined', '?'):>6}  "
+                  f"returned {stats.get('nReturned', '?'):>6}   {indexed:7.2f} ms (scan + sort {scanned:7.2f} ms)")
+    finally:
+        _cleanup(db)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Harvest Google Places health facilities into the local facility mirror.
+
+Usage (from backend/):
+  python3 -m scripts.harvest_facilities 25.2138 75.8648 --radius-km 15
+  python3 -m scripts.harvest_facilities 25.2138 75.8648 --kinds clinic pharmacy
+
+The scheduled `harvestFacilities` Lambda does the same for FACILITY_HARVEST_AREAS.
+Costs one Nearby Search per (geohash cell, kind) — ~30 cells for a 15 km radius.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.services.facility_mirror import facility_mirror  # noqa: E402
+from src.utils.constants import HEALTH_FACILITY_CATEGORIES  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("lat", type=float)
+    parser.add_argument("lon", type=float)
+    parser.add_argument("--radius-km", type=float, default=15.0)
+    parser.add_argument("--kinds", nargs="+", default=sorted(HEALTH_FACILITY_CATEGORIES),
+                        choices=sorted(HEALTH_FACILITY_CATEGORIES))
+    args = parser.parse_args()
+
+    result = facility_mirror.harvest_area(args.lat, args.lon, args.radius_km, args.kinds)
+    print(f"Harvested {result['facilities']} facilities across {result['cells']} cells"
+          f" ({result['failedCells']} cells failed and {result['saturatedCells']} had more places"
+          f" than one search returns; neither was marked covered)")
+
+
+if __name__ == "__main__":
+    main()
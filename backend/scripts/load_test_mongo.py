@@ -0,0 +1,110 @@
+"""
+Load-test the MongoDB backend at a chosen concurrency.
+
+Seeds --shops approved shops (20 inventory items each) in one pincode, then
+issues --requests listing-page reads (get_approved_shops_by_pincode + one
+get_shop + attach_inventory), --concurrency at a time:
+
+  async – AsyncMongoDBService, one event loop, asyncio tasks
+  sync  – MongoDBService, a thread pool of the same size
+
+Reports throughput and median / p95 latency for each. Pool size and timeouts
+come from MONGODB_MAX_POOL_SIZE, MONGODB_SERVER_SELECTION_TIMEOUT_MS, etc.
+Writes to the STAGE database of MONGODB_URI — use a local server.
+
+Usage (from backend/, MongoDB running locally):
+  python3 -m scripts.load_test_mongo
+  python3 -m scripts.load_test_mongo --concurrency 200 --requests 5000
+  MONGODB_MAX_POOL_SIZE=50 python3 -m scripts.load_test_mongo --only async
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+PINCODE = "999001"
+
+
+def _shops(count: int) -> list[dict]:
+    return [{
+        "shopId": f"load-shop-{n}", "ownerId": "load-owner", "name": f"Load Shop {n}",
+        "ownerName": "Load", "phone": "9000000000", "pincode": PINCODE, "status": "approved",
+        "category": "grocery", "lat": 25.18, "lng": 75.83,
+    } for n in range(count)]
+
+
+def _report(label: str, latencies: list[float], elapsed: float) -> None:
+    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+    print(f"  {label:5}: {len(latencies) / elapsed:8.1f} req/s   "
+          f"median {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms")
+
+
+async def _run_async(requests: int, concurrency: int, shop_id: str) -> tuple[list[float], float]:
+    from src.services.mongodb_async_service import AsyncMongoDBService
+
+    db = AsyncMongoDBService()
+    await db.ensure_indexes()
+    gate = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one() -> None:
+        async with gate:
+            start = time.perf_counter()
+            await db.get_approved_shops_by_pincode(PINCODE)
+            await db.attach_inventory(await db.get_shop(shop_id))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await db.close()
+    return latencies, elapsed
+
+
+def _run_sync(db, requests: int, concurrency: int, shop_id: str) -> tuple[list[float], float]:
+    def one(_) -> float:
+        start = time.perf_counter()
+        db.get_approved_shops_by_pincode(PINCODE)
+        db.attach_inventory(db.get_shop(shop_id))
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(one, range(requests)))
+    return latencies, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--shops", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--only", choices=("async", "sync"))
+    args = parser.parse_args()
+
+    from src.services.mongodb_service import MongoDBService
+
+    sync_db = MongoDBService()
+    shops = _shops(args.shops)
+    for shop in shops:
+        sync_db.save_shop(shop)
+        sync_db.save_inventory_items(shop["shopId"], [
+            {"itemId": f"i{n}", "name": f"Item {n}", "price": 10.0 + n, "stockQty": 5} for n in range(20)
+        ])
+
+    print(f"{args.requests} listing reads, concurrency {args.concurrency}, {args.shops} shops in {PINCODE}")
+    if args.only != "sync":
+        _report("async", *asyncio.run(_run_async(args.requests, args.concurrency, shops[0]["shopId"])))
+    if args.only != "async":
+        _report("sync", *_run_sync(sync_db, args.requests, args.concurrency, shops[0]["shopId"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Move legacy conversations (full `messages` list embedded in the conversation
+item) into the turn-per-item CONVERSATION_TURNS layout.
+
+Conversations are also migrated lazily the first time they are loaded, so this
+script is only needed to finish the job in one pass (e.g. before items near
+DynamoDB's 400 KB limit). Safe to re-run.
+
+Usage (from backend/):
+  python3 -m scripts.migrate_conversation_turns
+  python3 -m scripts.migrate_conversation_turns --dry-run
+  IS_OFFLINE=true python3 -m scripts.migrate_conversation_turns   # local MongoDB
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.services.database import db  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dry-run", action="store_true", help="count legacy conversations only")
+    args = parser.parse_args()
+
+    conversations = 0
+    turns = 0
+    for item in db.iter_legacy_conversations():
+        conversations += 1
+        if args.dry_run:
+            turns += len(item.get("messages") or [])
+            continue
+        turns += db.migrate_conversation(item)
+
+    verb = "Found" if args.dry_run else "Migrated"
+    print(f"{verb} {conversations} conversations ({turns} turns)")
+
+
+if __name__ == "__main__":
+    main()
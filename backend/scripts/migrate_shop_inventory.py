@@ -0,0 +1,46 @@
+"""
+Move legacy shop inventories (full `inventory` list embedded in the shop
+header) into the item-per-row INVENTORY table.
+
+A shop is also migrated on its owner's next inventory write. Public reads
+never write: until then GET /shop/{id} and GET /shop/{id}/inventory serve the
+embedded list as-is. This script finishes the job in one pass. Safe to re-run.
+
+Usage (from backend/):
+  python3 -m scripts.migrate_shop_inventory
+  python3 -m scripts.migrate_shop_inventory --dry-run
+  IS_OFFLINE=true python3 -m scripts.migrate_shop_inventory   # local MongoDB
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.services.database import db  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dry-run", action="store_true", help="count legacy shops only")
+    args = parser.parse_args()
+
+    checked = 0
+    migrated = 0
+    for shop_id in db.iter_shop_ids():
+        shop = db.get_shop(shop_id)
+        checked += 1
+        if not shop or "inventory" not in shop:
+            continue
+        migrated += 1
+        if not args.dry_run:
+            db.migrate_shop_inventory(shop)
+
+    verb = "Would migrate" if args.dry_run else "Migrated"
+    print(f"{verb} {migrated} of {checked} shops")
+
+
+if __name__ == "__main__":
+    main()
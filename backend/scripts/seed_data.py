@@ -20,7 +20,6 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 try:
     from src.services.database import db
-    from src.utils.decimal_utils import to_decimal
 except ModuleNotFoundError as e:
     if "pymongo" in str(e):
         print("Error: pymongo is not installed. Install backend dependencies first:\n")
@@ -139,8 +138,10 @@ def seed() -> None:
     all_entries = CLINICS + PHARMACIES + HOSPITALS + SHOPS
 
     for item in all_entries:
-        payload = to_decimal(item)
+        payload = dict(item)
+        inventory = payload.pop("inventory", [])
         db.save_shop(payload)
+        db.save_inventory_items(payload["shopId"], inventory)
         print(f"  [{item['pincode']}] {item['name']} ({item.get('category', 'shop')})")
 
     pincodes_str = ", ".join(NEARBY_PINCODES)
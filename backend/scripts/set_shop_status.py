@@ -0,0 +1,38 @@
+"""
+Approve, suspend or re-open a shop. Always change shop status through this
+script (or db.set_shop_status) rather than editing the item by hand: the
+derived `pincodeStatus` key must change with it, or the shop is listed under
+its old status.
+
+Usage (from backend/):
+  python3 -m scripts.set_shop_status <shopId> approved
+  python3 -m scripts.set_shop_status <shopId> suspended
+  IS_OFFLINE=true python3 -m scripts.set_shop_status <shopId> approved   # local MongoDB
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.models.shop import ShopStatus  # noqa: E402
+from src.services.database import db  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("shop_id")
+    parser.add_argument("status", choices=[s.value for s in ShopStatus])
+    args = parser.parse_args()
+
+    shop = db.set_shop_status(args.shop_id, args.status, datetime.now(timezone.utc).isoformat())
+    if not shop:
+        sys.exit(f"Shop {args.shop_id} not found")
+    print(f"{shop['name']} ({args.shop_id}) → {shop['status']}")
+
+
+if __name__ == "__main__":
+    main()
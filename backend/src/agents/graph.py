@@ -33,11 +33,14 @@ from langgraph.graph import END, START, StateGraph
 from src.prompts import CLASSIFIER_SYSTEM, HEALTH_ADVISOR_EXTRA, HEALTH_AND_NEARBY_EXTRA
 from src.services.bedrock_service import bedrock, detect_red_flags_fast
 from src.services.database import db
-from src.services.google_places_service import google_places
+from src.services.facility_mirror import facility_mirror
+from src.services.google_places_service import FIELD_TIER_FULL, google_places
+from src.services.location_resolver import location_resolver
+from src.services.pincode_gazetteer import pincode_gazetteer
+from src.utils.config import config
 from src.utils.constants import (
     MAX_NEARBY_FACILITIES,
     MSG_EMERGENCY_RESPONSE_BY_LANG,
-    SHOP_STATUS_APPROVED,
 )
 from src.utils.logger import logger
 
@@ -56,6 +59,7 @@ class QueryState(TypedDict):
     system_extra: str
     use_cache: bool
     low_bandwidth: bool
+    field_tier: str           # Places field-mask tier: 'minimal' | 'standard' | 'full'
     # Outputs populated by the graph nodes
     intent: str               # 'health_advice' | 'nearby_facilities' | 'shops'
     nearby_kind: str          # 'clinic' | 'pharmacy' | 'hospital' | 'facilities' | ''
@@ -256,7 +260,8 @@ def nearby_facilities_node(state: QueryState) -> dict:
     pincode            = state.get("pincode") or None
     extracted_location = state.get("extracted_location")
 
-    results = _fetch_facilities(kind, extracted_location, lat, lon, pincode)
+    results = _fetch_facilities(kind, extracted_location, lat, lon, pincode,
+                                field_tier=state.get("field_tier") or FIELD_TIER_FULL)
     if results is None:
         msg = _no_location_reply(lang)
         return {"reply": msg, "tts_text": msg, "facilities": []}
@@ -307,7 +312,8 @@ def health_and_nearby_node(state: QueryState) -> dict:
             logger.error("health_and_nearby_bedrock_failed", error=str(exc))
             health_reply = _err_reply(lang)
     # ── Agent 2: Nearby facilities via Google Places ──────────────────────────
-    results = _fetch_facilities(kind, extracted_location, lat, lon, pincode)
+    results = _fetch_facilities(kind, extracted_location, lat, lon, pincode,
+                                field_tier=state.get("field_tier") or FIELD_TIER_FULL)
     if results is None:
         results = []   # no location — health advice still shown; no cards
 
@@ -321,6 +327,7 @@ def shops_node(state: QueryState) -> dict:
     lon                = state.get("lon")
     pincode            = state.get("pincode") or None
     extracted_location = state.get("extracted_location")
+    field_tier         = state.get("field_tier") or FIELD_TIER_FULL
 
     shops: list = []
 
@@ -328,25 +335,31 @@ def shops_node(state: QueryState) -> dict:
         # LLM confirmed a specific location → skip DynamoDB, query Google directly
         clean_query = f"shops and stores in {extracted_location}, India"
         logger.info("shops_named_location_search", location=extracted_location)
-        shops = google_places.search_facilities(
-            query=clean_query,
-            kind="shops",
-            lat=None, lon=None,
-            max_results=MAX_NEARBY_FACILITIES,
-            force_text_search=True,
-        )
+        shops = _search_named_location(clean_query, "shops", extracted_location, field_tier)
     else:
         # No named location — need GPS or pincode
         if lat is None and lon is None and not pincode:
             return {"reply": _no_location_reply(lang), "facilities": []}
 
-        # 1. Registered GramSathi shops from DynamoDB (highest priority)
-        if pincode:
-            all_db = db.get_shops_by_pincode(pincode)
-            shops  = [s for s in all_db if s.get("status") == SHOP_STATUS_APPROVED][:MAX_NEARBY_FACILITIES]
+        # GPS-only users: map to the nearest pincode, so shops registered
+        # without lat/lng are found too
+        if not pincode and lat is not None and lon is not None:
+            pincode = pincode_gazetteer.nearest_pincode(lat, lon)
+            if pincode:
+                logger.info("shops_pincode_from_gps", pincode=pincode)
+
+        # 1. Registered GramSathi shops (highest priority), by pincode and near GPS
+        by_pincode = db.get_shop_cards_by_pincode(pincode) if pincode else []
+        near: list = []
+        if lat is not None and lon is not None:
+            near = db.get_shops_near(lat, lon, config.SHOPS_NEAR_RADIUS_KM)
+            if near:
+                logger.info("shops_near_gps", count=len(near))
+        shops = _merge_shop_cards(by_pincode, near)
 
         # 2. Fall back to Google Places (GPS nearby or pincode-anchored text search)
         if not shops:
+            lat, lon = _coordinates_for(lat, lon, pincode)
             shops = google_places.search_facilities(
                 query="shops and stores, India",
                 kind="shops",
@@ -355,6 +368,7 @@ def shops_node(state: QueryState) -> dict:
                 max_results=MAX_NEARBY_FACILITIES,
                 force_text_search=False,
                 pincode=pincode,
+                field_tier=field_tier,
             )
 
     logger.info("shops_searched", location=extracted_location, count=len(shops))
@@ -362,30 +376,45 @@ def shops_node(state: QueryState) -> dict:
     return {"reply": "", "tts_text": tts, "facilities": shops}
 
 
+def _merge_shop_cards(by_pincode: list, near: list) -> list:
+    """
+    Registered shops in the user's pincode first (nearest first where the
+    shop is also in GPS range, then the rest), then other shops in range by
+    distance; each shop once, at most MAX_NEARBY_FACILITIES.
+    """
+    distance = {shop["shopId"]: shop["distanceKm"] for shop in near}
+    in_pincode = [
+        dict(shop, distanceKm=distance[shop["shopId"]]) if shop.get("shopId") in distance else shop
+        for shop in by_pincode
+    ]
+    in_pincode.sort(key=lambda shop: shop.get("distanceKm", float("inf")))
+    listed = {shop.get("shopId") for shop in in_pincode}
+    return (in_pincode + [shop for shop in near if shop["shopId"] not in listed])[:MAX_NEARBY_FACILITIES]
+
+
 def _fetch_facilities(
     kind: str,
     extracted_location: Optional[str],
     lat: Optional[float],
     lon: Optional[float],
     pincode: Optional[str],
+    field_tier: str = FIELD_TIER_FULL,
 ) -> Optional[list]:
     """
     Shared facility-fetching logic used by both nearby_facilities_node and
     health_and_nearby_node. Returns a list of place dicts, or None when no
-    location data is available at all.
+    location data is available at all. `field_tier` picks the Places field mask.
     """
     if extracted_location:
         kind_term   = _KIND_SEARCH_TERM.get(kind, kind)
         clean_query = f"{kind_term} in {extracted_location}, India"
         logger.info("fetch_facilities_named_location", location=extracted_location, kind=kind)
-        return google_places.search_facilities(
-            query=clean_query,
-            kind=kind,
-            lat=None, lon=None,
-            max_results=MAX_NEARBY_FACILITIES,
-            force_text_search=True,
-        )
+        return _search_named_location(clean_query, kind, extracted_location, field_tier)
     if lat is not None or lon is not None or pincode:
+        lat, lon = _coordinates_for(lat, lon, pincode)
+        mirrored = facility_mirror.nearby(lat, lon, kind, MAX_NEARBY_FACILITIES)
+        if mirrored:
+            return mirrored
         return google_places.search_facilities(
             query=f"{_KIND_SEARCH_TERM.get(kind, kind)}, India",
             kind=kind,
@@ -394,10 +423,61 @@ def _fetch_facilities(
             max_results=MAX_NEARBY_FACILITIES,
             force_text_search=False,
             pincode=pincode,
+            field_tier=field_tier,
         )
     return None   # caller decides how to handle the no-location case
 
 
+def _search_named_location(
+    query: str, kind: str, location: str, field_tier: str = FIELD_TIER_FULL
+) -> list:
+    """
+    Search around a named place. Once the place's coordinates are known (GEO_CACHE)
+    a Nearby Search is used; the first time, a Text Search runs and its first
+    result's coordinates are cached for next time.
+    """
+    coords = location_resolver.resolve(location)
+    if coords:
+        lat, lon = coords
+        mirrored = facility_mirror.nearby(lat, lon, kind, MAX_NEARBY_FACILITIES)
+        if mirrored:
+            return mirrored
+        return google_places.search_facilities(
+            query=query,
+            kind=kind,
+            lat=lat, lon=lon,
+            max_results=MAX_NEARBY_FACILITIES,
+            force_text_search=False,
+            field_tier=field_tier,
+        )
+
+    results = google_places.search_facilities(
+        query=query,
+        kind=kind,
+        lat=None, lon=None,
+        max_results=MAX_NEARBY_FACILITIES,
+        force_text_search=True,
+        field_tier=field_tier,
+    )
+    location_resolver.remember(location, results)
+    return results
+
+
+def _coordinates_for(
+    lat: Optional[float], lon: Optional[float], pincode: Optional[str]
+) -> tuple[Optional[float], Optional[float]]:
+    """
+    Use the offline gazetteer centroid when only a pincode is known, so Places
+    can run a precise Nearby Search instead of a "… near 324008, India" text search.
+    """
+    if lat is None and lon is None and pincode:
+        centroid = pincode_gazetteer.centroid(pincode)
+        if centroid:
+            logger.info("pincode_centroid_resolved", pincode=pincode)
+            return centroid
+    return lat, lon
+
+
 def _route(state: QueryState) -> Literal["health_advice", "nearby_facilities", "shops", "health_and_nearby"]:
     intent = state.get("intent", "health_advice")
     if intent in ("nearby_facilities", "shops", "health_and_nearby"):
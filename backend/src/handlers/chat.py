@@ -28,10 +28,12 @@ from src.utils.constants import (
     ERR_UNSUPPORTED_CONTENT_TYPE,
     ERR_UPLOAD_URL_FAILED,
 )
+from src.utils.deferred import defer, post_response
 from src.utils.logger import logger
 from src.utils.response import error, ok, parse_body
 
 
+@post_response
 def handler(event: dict, context) -> dict:
     user_id, auth_err = require_auth(event)
     if auth_err:
@@ -59,7 +61,7 @@ def handler(event: dict, context) -> dict:
     # Step 2: Load or create conversation (US-18)
     conversation: Conversation
     if conversation_id:
-        existing = db.get_conversation(conversation_id)
+        existing = db.load_conversation(conversation_id, config.CONVERSATION_HISTORY_MESSAGES)
         conversation = Conversation.from_dynamo(existing) if existing else _new_conversation(user_id, language)
     else:
         conversation = _new_conversation(user_id, language)
@@ -94,14 +96,15 @@ def handler(event: dict, context) -> dict:
         logger.warning("polly_synthesis_failed", user_id=user_id, language=language, error=str(exc))
         audio_url = None
 
-    # Step 6: Persist conversation
+    # Step 6: Persist conversation (after the response is sent)
     now = datetime.now(timezone.utc).isoformat()
-    conversation.messages.append(Message(role=MessageRole.USER, content=text_input, timestamp=now))
-    conversation.messages.append(
-        Message(role=MessageRole.ASSISTANT, content=ai_reply, audioUrl=audio_url, timestamp=now)
-    )
+    new_turns = [
+        Message(role=MessageRole.USER, content=text_input, timestamp=now),
+        Message(role=MessageRole.ASSISTANT, content=ai_reply, audioUrl=audio_url, timestamp=now),
+    ]
     conversation.updatedAt = now
-    db.save_conversation(conversation.to_dynamo())
+    defer("append_conversation_turns", db.append_conversation_turns,
+          conversation.to_header(), [m.to_dict() for m in new_turns])
 
     logger.info("chat_response", user_id=user_id, intent=conversation.intent.value,
                 conversation_id=conversation.conversationId, has_audio=bool(audio_url))
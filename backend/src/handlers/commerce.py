@@ -30,14 +30,15 @@ from src.utils.constants import (
     ERR_TOO_MANY_ITEMS,
     MSG_ORDER_CONFIRMED,
     ORDER_ID_DISPLAY_LEN,
-    SHOP_STATUS_APPROVED,
 )
+from src.utils.deferred import defer, post_response
 from src.utils.logger import logger
 from src.utils.response import error, ok, parse_body
 
 _PINCODE_RE = re.compile(r"^\d{6}$")
 
 
+@post_response
 def handler(event: dict, context) -> dict:
     method = event.get("httpMethod", "GET")
     path = event.get("path", "")
@@ -58,16 +59,18 @@ def _discover_shops(event: dict) -> dict:
     body = parse_body(event)
     pincode: str = body.get("pincode", "").strip()
     category: str = body.get("category", "")
+    cards_only: bool = body.get("view") == "card"
 
     if not pincode:
         return error(ERR_PINCODE_REQUIRED, 400)
     if not _PINCODE_RE.match(pincode):
         return error(ERR_PINCODE_FORMAT, 400)
 
-    shops = db.get_shops_by_pincode(pincode)
-    shops = [s for s in shops if s.get("status") == SHOP_STATUS_APPROVED]
-    if category:
-        shops = [s for s in shops if s.get("category") == category]
+    # view=card skips inventories; the default keeps them for the shop browser's previews
+    if cards_only:
+        shops = db.get_shop_cards_by_pincode(pincode, category or None)
+    else:
+        shops = db.attach_inventories(db.get_approved_shops_by_pincode(pincode, category or None))
 
     return ok({"pincode": pincode, "shops": shops})
 
@@ -134,6 +137,7 @@ def _place_order(event: dict) -> dict:
     db.save_order(order.to_dynamo())
     logger.info("order_placed", user_id=user_id, shop_id=shop_id,
                 order_id=order.orderId, total=order.totalAmount)
+    defer("record_order_placed", db.record_order_placed, shop_id, now[:10], order.totalAmount, order.orderId)
 
     try:
         if shop.get("phone"):
@@ -0,0 +1,37 @@
+"""
+Facility harvest handler (scheduled, no HTTP route)
+
+Refreshes the local facility mirror from Google Places for every area in
+FACILITY_HARVEST_AREAS ("lat,lon,radius_km;..."). Runs weekly — well inside the
+mirror's TTL, so covered cells never expire between runs.
+"""
+
+from src.services.facility_mirror import facility_mirror
+from src.utils.config import config
+from src.utils.logger import logger
+
+
+def parse_areas(spec: str) -> list[tuple[float, float, float]]:
+    areas = []
+    for chunk in spec.split(";"):
+        parts = [p.strip() for p in chunk.split(",")]
+        if len(parts) != 3:
+            continue
+        try:
+            areas.append((float(parts[0]), float(parts[1]), float(parts[2])))
+        except ValueError:
+            logger.warning("facility_harvest_bad_area", area=chunk)
+    return areas
+
+
+def handler(event: dict, context) -> dict:
+    totals = {"areas": 0, "cells": 0, "facilities": 0, "failedCells": 0, "saturatedCells": 0}
+    for lat, lon, radius_km in parse_areas(config.FACILITY_HARVEST_AREAS):
+        result = facility_mirror.harvest_area(lat, lon, radius_km)
+        totals["areas"] += 1
+        totals["cells"] += result["cells"]
+        totals["facilities"] += result["facilities"]
+        totals["failedCells"] += result["failedCells"]
+        totals["saturatedCells"] += result["saturatedCells"]
+    logger.info("facility_harvest_complete", **totals)
+    return totals
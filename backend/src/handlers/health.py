@@ -4,6 +4,12 @@ Health handler (US-05 → US-09)
 POST /health/query  – all user queries routed through the LangGraph agent graph:
                       health advice, nearby clinics/pharmacies/hospitals, or shops
 POST /health/nearby – legacy pincode-based lookup (kept for backward compat)
+GET  /health/place/{placeId} – expanded facility card (Places details)
+
+/health/query options:
+  lowBandwidth    – OGG audio and the "minimal" Places field tier (names + coordinates)
+  facilityFields  – explicit tier: "minimal" | "standard" | "full" (default "full")
+  facilityFormat  – "compact" returns facilities as {"fields": [...], "rows": [[...]]}
 """
 import re
 import uuid
@@ -14,6 +20,12 @@ from src.agents.graph import agent_graph
 from src.models.conversation import Conversation, Intent, Message, MessageRole
 from src.services.bedrock_service import bedrock
 from src.services.database import db
+from src.services.google_places_service import (
+    FIELD_TIER_FULL,
+    FIELD_TIER_MINIMAL,
+    FIELD_TIERS,
+    google_places,
+)
 from src.services.polly_service import polly
 from src.services.transcribe_service import transcribe
 from src.utils.auth import require_auth
@@ -21,15 +33,20 @@ from src.utils.config import config
 from src.utils.constants import (
     ERR_PINCODE_FORMAT,
     ERR_PINCODE_REQUIRED,
+    ERR_PLACE_ID_REQUIRED,
+    ERR_PLACE_NOT_FOUND,
     ERR_TEXT_OR_AUDIO_REQUIRED,
     ERR_TRANSCRIPTION_FAILED,
     HEALTH_FACILITY_CATEGORIES,
     MAX_NEARBY_FACILITIES,
 )
+from src.utils.deferred import defer, post_response
+from src.utils.facility_cards import COMPACT_FORMAT, compact_cards
 from src.utils.logger import logger
 from src.utils.response import error, ok, parse_body
 
 _PINCODE_RE = re.compile(r"^\d{6}$")
+_PLACE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,512}$")
 
 _HEALTH_DISCLAIMER = {
     "hi": "यह सामान्य जानकारी है। डॉक्टर से परामर्श अवश्य लें।",
@@ -53,10 +70,13 @@ def _health_system_extra(language: str) -> str:
     )
 
 
+@post_response
 def handler(event: dict, context) -> dict:
     path = event.get("path", "")
     if path.endswith("/nearby"):
         return _handle_nearby(event)
+    if "/place/" in path:
+        return _handle_place(event)
     return _handle_query(event)
 
 
@@ -80,6 +100,12 @@ def _handle_query_impl(event: dict, user_id: str) -> dict:
     conversation_id: str = body.get("conversationId", "")
     generate_summary: bool = body.get("generateSummary", False)
     low_bandwidth: bool = body.get("lowBandwidth", False)
+    field_tier: str = body.get("facilityFields") or (
+        FIELD_TIER_MINIMAL if low_bandwidth else FIELD_TIER_FULL
+    )
+    if field_tier not in FIELD_TIERS:
+        field_tier = FIELD_TIER_FULL
+    facility_format: str = body.get("facilityFormat", "")
 
     body_lat: Optional[float] = None
     body_lon: Optional[float] = None
@@ -119,7 +145,7 @@ def _handle_query_impl(event: dict, user_id: str) -> dict:
 
     # Load conversation history for multi-turn health advice
     if conversation_id:
-        existing = db.get_conversation(conversation_id)
+        existing = db.load_conversation(conversation_id, config.CONVERSATION_HISTORY_MESSAGES)
         conversation = (
             Conversation.from_dynamo(existing) if existing
             else _new_conv(user_id, language)
@@ -144,6 +170,7 @@ def _handle_query_impl(event: dict, user_id: str) -> dict:
         "system_extra": _health_system_extra(language),
         "use_cache": not bool(history),
         "low_bandwidth": low_bandwidth,
+        "field_tier": field_tier,
         # outputs (graph will populate these)
         "intent":             "",
         "nearby_kind":        "",
@@ -179,13 +206,14 @@ def _handle_query_impl(event: dict, user_id: str) -> dict:
 
     # Only persist health advice turns to conversation history, not search results
     if not is_search:
-        conversation.messages.extend([
+        new_turns = [
             Message(role=MessageRole.USER, content=text, timestamp=now),
             Message(role=MessageRole.ASSISTANT, content=reply_text,
                     audioUrl=audio_url, timestamp=now),
-        ])
+        ]
         conversation.updatedAt = now
-        db.save_conversation(conversation.to_dynamo())
+        defer("append_conversation_turns", db.append_conversation_turns,
+              conversation.to_header(), [m.to_dict() for m in new_turns])
 
     response_body: dict = {
         "conversationId": conversation.conversationId,
@@ -197,6 +225,9 @@ def _handle_query_impl(event: dict, user_id: str) -> dict:
         "facilities": facilities,
         "nearbyKind": nearby_kind,
     }
+    if facility_format == COMPACT_FORMAT:
+        response_body["facilities"] = compact_cards(facilities)
+        response_body["facilityFormat"] = COMPACT_FORMAT
 
     if generate_summary and not is_search:
         try:
@@ -222,14 +253,30 @@ def _handle_nearby(event: dict) -> dict:
     if not _PINCODE_RE.match(pincode):
         return error(ERR_PINCODE_FORMAT, 400)
 
-    all_shops = db.get_shops_by_pincode(pincode)
+    # One read of the pincode's approved listing cards (category order), filtered here
     facilities = [
-        s for s in all_shops
-        if s.get("category") in HEALTH_FACILITY_CATEGORIES
+        card for card in db.get_shop_cards_by_pincode(pincode)
+        if card.get("category") in HEALTH_FACILITY_CATEGORIES
     ]
     return ok({"pincode": pincode, "facilities": facilities[:MAX_NEARBY_FACILITIES]})
 
 
+def _handle_place(event: dict) -> dict:
+    """Expanded facility card — Places details for one place id."""
+    _, auth_err = require_auth(event)
+    if auth_err:
+        return auth_err
+
+    place_id: str = ((event.get("pathParameters") or {}).get("placeId") or "").strip()
+    if not place_id or not _PLACE_ID_RE.match(place_id):
+        return error(ERR_PLACE_ID_REQUIRED, 400)
+
+    details = google_places.get_place_details(place_id)
+    if not details:
+        return error(ERR_PLACE_NOT_FOUND, 404)
+    return ok({"place": details})
+
+
 def _new_conv(user_id: str, language: str) -> Conversation:
     return Conversation(
         conversationId=str(uuid.uuid4()),
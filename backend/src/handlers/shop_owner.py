@@ -4,48 +4,80 @@ Shop owner handler (US-13, US-14, US-15, US-16)
 POST /shop                         – register a new shop (auth required)
 GET  /shop/{shopId}                – get shop profile (public)
 POST /shop/{shopId}/inventory      – upload / update inventory (auth + owner only)
-GET  /shop/{shopId}/orders         – list incoming orders (auth + owner only)
-GET  /shop/{shopId}/analytics      – basic daily analytics (auth + owner only)
+GET  /shop/{shopId}/inventory      – inventory items in itemId order, paginated (public)
+                                     ?limit=1..100 (default 50) &cursor=<nextCursor>
+PATCH /shop/{shopId}/inventory/{itemId} – update price and/or stockQty of one item (auth + owner only)
+GET  /shop/{shopId}/orders         – incoming orders, newest first, paginated (auth + owner only)
+                                     ?limit=1..100 (default 50) &cursor=<nextCursor> &status=<status>
+PATCH /shop/{shopId}/orders/{orderId} – change an order's status (auth + owner only)
+GET  /shop/{shopId}/analytics      – today, all-time and last-N-days analytics (auth + owner only)
+                                     ?days=1..30 (default 7)
 """
 import uuid
-from datetime import datetime, date, timezone
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
+from src.models.order import OrderStatus
 from src.models.shop import InventoryItem, Shop, ShopStatus
 from src.services.database import db
 from src.utils.auth import require_auth
 from src.utils.constants import (
+    ANALYTICS_DEFAULT_DAYS,
+    ANALYTICS_MAX_DAYS,
     DEFAULT_INVENTORY_UNIT,
     ERR_FORBIDDEN,
     ERR_FORBIDDEN_NOT_YOUR_SHOP,
+    ERR_INVALID_CURSOR,
+    ERR_INVALID_DAYS,
     ERR_INVALID_ITEM_DATA,
+    ERR_INVALID_ORDER_STATUS,
+    ERR_ITEM_NOT_FOUND,
     ERR_ITEM_PRICE_NEGATIVE,
+    ERR_ITEM_UPDATE_FIELDS,
     ERR_ITEMS_LIST_REQUIRED,
     ERR_MISSING_FIELDS,
+    ERR_ORDER_NOT_FOUND,
+    ERR_ORDER_STATUS_CONFLICT,
+    ERR_ORDER_STATUS_TRANSITION,
     ERR_ROUTE_NOT_FOUND,
     ERR_SHOP_ID_REQUIRED,
     ERR_SHOP_NOT_FOUND,
     ERR_STOCK_QTY_NEGATIVE,
     MSG_SHOP_REGISTERED,
-    ORDER_STATUS_PENDING,
+    ORDER_STATUS_TRANSITIONS,
     PRIVATE_SHOP_FIELDS,
+    SHOP_CATEGORY_GENERAL,
+    SHOP_STATS_ALL_TIME,
 )
+from src.utils.deferred import defer, post_response
+from src.utils.logger import logger
+from src.utils.pagination import clamp_page_size, decode_cursor, encode_cursor
 from src.utils.response import error, ok, parse_body
 
 
+@post_response
 def handler(event: dict, context) -> dict:
     method = event.get("httpMethod", "GET")
     path = event.get("path", "")
     params = event.get("pathParameters") or {}
     shop_id = params.get("shopId", "")
+    item_id = params.get("itemId", "")
+    order_id = params.get("orderId", "")
 
     if method == "POST" and path.endswith("/shop"):
         return _register_shop(event)
     if method == "GET" and shop_id and not path.endswith(("/orders", "/analytics", "/inventory")):
         return _get_shop(shop_id)  # public
+    if method == "GET" and path.endswith("/inventory"):
+        return _get_inventory(event, shop_id)  # public
     if method == "POST" and path.endswith("/inventory"):
         return _update_inventory(event, shop_id)
+    if method == "PATCH" and item_id:
+        return _update_inventory_item(event, shop_id, item_id)
     if method == "GET" and path.endswith("/orders"):
         return _get_orders(event, shop_id)
+    if method == "PATCH" and order_id:
+        return _update_order_status(event, shop_id, order_id)
     if method == "GET" and path.endswith("/analytics"):
         return _get_analytics(event, shop_id)
 
@@ -74,6 +106,7 @@ def _register_shop(event: dict) -> dict:
         address=body.get("address"),
         lat=body.get("lat"),
         lng=body.get("lng"),
+        category=body.get("category") or SHOP_CATEGORY_GENERAL,
         status=ShopStatus.PENDING,
     )
     db.save_shop(shop.to_dynamo())
@@ -91,7 +124,47 @@ def _get_shop(shop_id: str) -> dict:
     if not shop:
         return error(ERR_SHOP_NOT_FOUND, 404)
     public_shop = {k: v for k, v in shop.items() if k not in PRIVATE_SHOP_FIELDS}
-    return ok(public_shop)
+    return ok(db.attach_inventory(public_shop))
+
+
+def _legacy_inventory_page(shop: dict, limit: int, cursor: Optional[str]) -> tuple:
+    """
+    A page of a legacy embedded `inventory` list, in the same order and cursor
+    format as db.get_inventory_page. The list moves to the inventory table on
+    the owner's next inventory write, or with scripts/migrate_shop_inventory.py.
+    Raises ValueError for a malformed or foreign cursor.
+    """
+    start = decode_cursor(cursor)
+    items = sorted((dict(i, shopId=shop["shopId"]) for i in shop["inventory"]), key=lambda i: str(i["itemId"]))
+    if start:
+        if set(start) != {"shopId", "itemId"} or start["shopId"] != shop["shopId"]:
+            raise ValueError("invalid cursor")
+        items = [i for i in items if str(i["itemId"]) > str(start["itemId"])]
+    page = items[:limit]
+    last_key = {"shopId": shop["shopId"], "itemId": page[-1]["itemId"]} if len(items) > limit else None
+    return page, encode_cursor(last_key)
+
+
+def _get_inventory(event: dict, shop_id: str) -> dict:
+    """Public and read-only — one page of a shop's inventory items."""
+    if not shop_id:
+        return error(ERR_SHOP_ID_REQUIRED, 400)
+
+    shop_data = db.get_shop(shop_id)
+    if not shop_data:
+        return error(ERR_SHOP_NOT_FOUND, 404)
+
+    query = event.get("queryStringParameters") or {}
+    limit = clamp_page_size(query.get("limit"))
+    cursor = query.get("cursor") or None
+    try:
+        if "inventory" in shop_data:
+            items, next_cursor = _legacy_inventory_page(shop_data, limit, cursor)
+        else:
+            items, next_cursor = db.get_inventory_page(shop_id, limit=limit, cursor=cursor)
+    except ValueError:
+        return error(ERR_INVALID_CURSOR, 400)
+    return ok({"shopId": shop_id, "items": items, "nextCursor": next_cursor})
 
 
 def _update_inventory(event: dict, shop_id: str) -> dict:
@@ -138,23 +211,57 @@ def _update_inventory(event: dict, shop_id: str) -> dict:
     if any(item.stockQty < 0 for item in new_items):
         return error(ERR_STOCK_QTY_NEGATIVE, 400)
 
-    shop = Shop.from_dynamo(shop_data)
+    db.migrate_shop_inventory(shop_data)
+    items = {item.itemId: item.to_dict() for item in new_items}
+    existing_ids = {i["itemId"] for i in db.get_inventory(shop_id, projection=["itemId"])}
     if replace:
-        shop.inventory = new_items
+        db.delete_inventory_items(shop_id, sorted(existing_ids - items.keys()))
+        item_count = len(items)
     else:
-        existing_map = {item.itemId: item for item in shop.inventory}
-        for item in new_items:
-            existing_map[item.itemId] = item
-        shop.inventory = list(existing_map.values())
+        item_count = len(existing_ids | items.keys())
+    db.save_inventory_items(shop_id, list(items.values()))
 
-    shop.updatedAt = datetime.now(timezone.utc).isoformat()
-    db.save_shop(shop.to_dynamo())
+    return ok({"shopId": shop_id, "itemCount": item_count})
 
-    return ok({"shopId": shop_id, "itemCount": len(shop.inventory)})
+
+def _update_inventory_item(event: dict, shop_id: str, item_id: str) -> dict:
+    """Change price and/or stock of one item without rewriting the shop or its inventory."""
+    user_id, auth_err = require_auth(event)
+    if auth_err:
+        return auth_err
+
+    shop_data = db.get_shop(shop_id)
+    if not shop_data:
+        return error(ERR_SHOP_NOT_FOUND, 404)
+    if shop_data.get("ownerId") != user_id:
+        return error(ERR_FORBIDDEN_NOT_YOUR_SHOP, 403)
+
+    body = parse_body(event)
+    fields: dict = {}
+    try:
+        if body.get("price") is not None:
+            fields["price"] = float(body["price"])
+        if body.get("stockQty") is not None:
+            fields["stockQty"] = int(body["stockQty"])
+    except (TypeError, ValueError) as exc:
+        return error(ERR_INVALID_ITEM_DATA.format(str(exc)), 400)
+
+    if not fields:
+        return error(ERR_ITEM_UPDATE_FIELDS, 400)
+    if fields.get("price", 0) < 0:
+        return error(ERR_ITEM_PRICE_NEGATIVE, 400)
+    if fields.get("stockQty", 0) < 0:
+        return error(ERR_STOCK_QTY_NEGATIVE, 400)
+
+    db.migrate_shop_inventory(shop_data)
+    item = db.update_inventory_item(shop_id, item_id, fields)
+    if not item:
+        return error(ERR_ITEM_NOT_FOUND, 404)
+    return ok(item)
 
 
 def _get_orders(event: dict, shop_id: str) -> dict:
-    """Return all orders for this shop. Only the owner can view (US-15)."""
+    """One page of this shop's orders, newest first. Only the owner can view (US-15)."""
     user_id, auth_err = require_auth(event)
     if auth_err:
         return auth_err
@@ -168,12 +275,58 @@ def _get_orders(event: dict, shop_id: str) -> dict:
     if shop_data.get("ownerId") != user_id:
         return error(ERR_FORBIDDEN, 403)
 
-    orders = db.get_orders_by_shop(shop_id)
-    return ok({"shopId": shop_id, "orders": orders})
+    query = event.get("queryStringParameters") or {}
+    try:
+        orders, next_cursor = db.get_orders_page(
+            shop_id,
+            limit=clamp_page_size(query.get("limit")),
+            cursor=query.get("cursor") or None,
+            status=query.get("status") or None,
+        )
+    except ValueError:
+        return error(ERR_INVALID_CURSOR, 400)
+    return ok({"shopId": shop_id, "orders": orders, "nextCursor": next_cursor})
+
+
+def _update_order_status(event: dict, shop_id: str, order_id: str) -> dict:
+    """Owner moves an order along (pending → confirmed → ready → delivered / cancelled)."""
+    user_id, auth_err = require_auth(event)
+    if auth_err:
+        return auth_err
+
+    shop_data = db.get_shop(shop_id)
+    if not shop_data:
+        return error(ERR_SHOP_NOT_FOUND, 404)
+    if shop_data.get("ownerId") != user_id:
+        return error(ERR_FORBIDDEN, 403)
+
+    new_status: str = parse_body(event).get("status", "")
+    if new_status not in {s.value for s in OrderStatus}:
+        return error(ERR_INVALID_ORDER_STATUS.format(new_status), 400)
+
+    order = db.get_order(order_id)
+    if not order or order.get("shopId") != shop_id:
+        return error(ERR_ORDER_NOT_FOUND, 404)
+    old_status = order.get("status")
+    if old_status == new_status:
+        return ok(order)
+    if new_status not in ORDER_STATUS_TRANSITIONS.get(old_status, ()):
+        return error(ERR_ORDER_STATUS_TRANSITION.format(old_status, new_status), 409)
+
+    updated = db.update_order_status(
+        order_id, old_status, new_status, datetime.now(timezone.utc).isoformat()
+    )
+    if updated is None:
+        return error(ERR_ORDER_STATUS_CONFLICT, 409)
+    defer("record_order_status_change", db.record_order_status_change, shop_id, old_status, new_status)
+    return ok(updated)
 
 
 def _get_analytics(event: dict, shop_id: str) -> dict:
-    """Daily analytics — owner only (US-16)."""
+    """
+    Analytics from the per-day rollups kept by record_order_placed — one query
+    of at most ANALYTICS_MAX_DAYS + 1 rows, however many orders the shop has (US-16).
+    """
     user_id, auth_err = require_auth(event)
     if auth_err:
         return auth_err
@@ -187,20 +340,43 @@ def _get_analytics(event: dict, shop_id: str) -> dict:
     if shop_data.get("ownerId") != user_id:
         return error(ERR_FORBIDDEN, 403)
 
-    orders = db.get_orders_by_shop(shop_id)
-    today = date.today().isoformat()
-    today_orders = [o for o in orders if o.get("createdAt", "").startswith(today)]
-    total_revenue = sum(o.get("totalAmount", 0) for o in today_orders)
-    pending_count = sum(1 for o in orders if o.get("status") == ORDER_STATUS_PENDING)
+    query = event.get("queryStringParameters") or {}
+    try:
+        days = int(query.get("days") or ANALYTICS_DEFAULT_DAYS)
+    except ValueError:
+        days = 0
+    if not 1 <= days <= ANALYTICS_MAX_DAYS:
+        return error(ERR_INVALID_DAYS.format(ANALYTICS_MAX_DAYS), 400)
+
+    today = datetime.now(timezone.utc).date()
+    start = today - timedelta(days=days - 1)
+    rows = {r["statDate"]: r for r in db.get_shop_stats(shop_id, start.isoformat())}
+    all_time = rows.pop(SHOP_STATS_ALL_TIME, {})
+
+    daily = []
+    for offset in range(days):
+        day = (start + timedelta(days=offset)).isoformat()
+        row = rows.get(day, {})
+        daily.append({
+            "date": day,
+            "orderCount": int(row.get("orderCount", 0)),
+            "revenue": round(row.get("revenue", 0), 2),
+        })
 
     return ok({
         "shopId": shop_id,
         "today": {
-            "orderCount": len(today_orders),
-            "revenue": round(total_revenue, 2),
+            "orderCount": daily[-1]["orderCount"],
+            "revenue": daily[-1]["revenue"],
         },
         "allTime": {
-            "orderCount": len(orders),
-            "pendingOrders": pending_count,
+            "orderCount": int(all_time.get("orderCount", 0)),
+            "pendingOrders": int(all_time.get("pendingOrders", 0)),
+        },
+        "range": {
+            "days": days,
+            "orderCount": sum(d["orderCount"] for d in daily),
+            "revenue": round(sum(d["revenue"] for d in daily), 2),
+            "daily": daily,
         },
     })
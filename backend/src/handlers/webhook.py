@@ -23,6 +23,7 @@ from src.utils.constants import (
     USER_ID_WHATSAPP_PREFIX,
     WHATSAPP_MAX_CHARS,
 )
+from src.utils.deferred import defer, post_response
 from src.utils.logger import logger
 from src.utils.response import ok, error, parse_body
 
@@ -39,6 +40,7 @@ def verify(event: dict, context) -> dict:
     return error(ERR_VERIFICATION_FAILED, 403)
 
 
+@post_response
 def incoming(event: dict, context) -> dict:
     """Handle incoming WhatsApp messages and reply using the AI pipeline."""
     # Verify the payload came from Meta using X-Hub-Signature-256
@@ -81,9 +83,8 @@ def incoming(event: dict, context) -> dict:
         user_id = f"{USER_ID_WHATSAPP_PREFIX}{from_number}"
         logger.info("whatsapp_message", user_id=user_id, msg_type=msg_type)
 
-        conversations = db.get_conversations_by_user(user_id)
-        if conversations:
-            latest = max(conversations, key=lambda c: c.get("updatedAt", ""))
+        latest = db.get_latest_conversation(user_id, config.CONVERSATION_HISTORY_MESSAGES)
+        if latest:
             conversation = Conversation.from_dynamo(latest)
         else:
             conversation = Conversation(
@@ -96,12 +97,13 @@ def incoming(event: dict, context) -> dict:
         ai_reply = bedrock.chat(user_text, conversation_history=history)
 
         now = datetime.now(timezone.utc).isoformat()
-        conversation.messages.extend([
+        new_turns = [
             Message(role=MessageRole.USER, content=user_text, timestamp=now),
             Message(role=MessageRole.ASSISTANT, content=ai_reply, timestamp=now),
-        ])
+        ]
         conversation.updatedAt = now
-        db.save_conversation(conversation.to_dynamo())
+        defer("append_conversation_turns", db.append_conversation_turns,
+              conversation.to_header(), [m.to_dict() for m in new_turns])
 
         _send_whatsapp_message(from_number, ai_reply[:WHATSAPP_MAX_CHARS])
 
@@ -42,6 +42,7 @@ class Conversation:
     language: str = "hi"
     messages: List[Message] = field(default_factory=list)
     symptoms: List[str] = field(default_factory=list)
+    turnCount: int = 0  # messages stored in CONVERSATION_TURNS (messages holds only the loaded tail)
     createdAt: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     updatedAt: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
@@ -57,6 +58,12 @@ class Conversation:
             "updatedAt": self.updatedAt,
         }
 
+    def to_header(self) -> dict:
+        """Header item without messages — turns are stored separately."""
+        header = self.to_dynamo()
+        del header["messages"]
+        return header
+
     @classmethod
     def from_dynamo(cls, item: dict) -> "Conversation":
         messages = [
@@ -75,6 +82,7 @@ class Conversation:
             language=item.get("language", "hi"),
             messages=messages,
             symptoms=item.get("symptoms", []),
+            turnCount=int(item.get("turnCount", len(messages))),
             createdAt=item.get("createdAt", datetime.now(timezone.utc).isoformat()),
             updatedAt=item.get("updatedAt", datetime.now(timezone.utc).isoformat()),
         )
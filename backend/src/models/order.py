@@ -5,7 +5,51 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import List, Optional
 
-from src.utils.decimal_utils import from_decimal, to_decimal
+from src.utils.config import config
+from src.utils.pagination import decode_cursor, encode_cursor
+from src.utils.sharding import shard_key
+
+
+_PAGE_CURSOR_FIELDS = frozenset({"shopId", "createdAt", "orderId"})
+
+
+def with_order_keys(order: dict) -> dict:
+    """
+    Order item plus `shopShard` (shopId#n, the ShopOrdersShardIndex partition
+    key, sorted by createdAt; n < the shop's SHOP_ORDER_SHARDS count, see
+    src/utils/sharding.py).
+    """
+    return dict(order, shopShard=shard_key(order["shopId"], order["orderId"], config.SHOP_ORDER_SHARDS))
+
+
+def order_page_start(shop_id: str, cursor: Optional[str]) -> Optional[tuple]:
+    """
+    The (createdAt, orderId) position a get_orders_page cursor continues
+    after, or None for the first page. Raises ValueError for a malformed
+    cursor or one issued for another shop.
+    """
+    start = decode_cursor(cursor)
+    if not start:
+        return None
+    if set(start) != _PAGE_CURSOR_FIELDS or start["shopId"] != shop_id:
+        raise ValueError("invalid cursor")
+    return start["createdAt"], start["orderId"]
+
+
+def merge_order_pages(shop_id: str, pages: List[list], limit: int) -> tuple:
+    """
+    One newest-first page from per-shard pages (each newest first, at most
+    `limit` orders past the cursor) and the cursor for the next page, or None
+    when every shard is exhausted.
+    """
+    orders = sorted((o for page in pages for o in page),
+                    key=lambda o: (o["createdAt"], o["orderId"]), reverse=True)
+    more = len(orders) > limit or any(len(page) >= limit for page in pages)
+    orders = orders[:limit]
+    if not (more and orders):
+        return orders, None
+    last = orders[-1]
+    return orders, encode_cursor({"shopId": shop_id, "createdAt": last["createdAt"], "orderId": last["orderId"]})
 
 
 class OrderStatus(str, Enum):
@@ -58,11 +102,10 @@ class Order:
             "createdAt": self.createdAt,
             "updatedAt": self.updatedAt,
         }
-        return to_decimal(data)
+        return data
 
     @classmethod
     def from_dynamo(cls, item: dict) -> "Order":
-        item = from_decimal(item)
         items = [
             OrderItem(
                 itemId=i["itemId"],
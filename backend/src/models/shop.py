@@ -5,7 +5,89 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import List, Optional
 
-from src.utils.decimal_utils import from_decimal, to_decimal
+from src.utils import geohash
+from src.utils.config import config
+from src.utils.constants import (
+    SHOP_CATEGORY_GENERAL,
+    SHOP_GEO_CELL_PRECISION,
+    SHOP_GEOHASH_PRECISION,
+    SHOP_STATUS_PENDING,
+)
+from src.utils.sharding import shard_index, shard_key, shard_keys
+
+
+def _float(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def listing_key(pincode: str, status: str, shop_id: str) -> str:
+    """
+    PincodeStatusIndex partition key of a shop, e.g. "324008#approved". In a
+    pincode with a PINCODE_SHARDS count, shard n >= 1 adds "#<n>"; shard 0
+    keeps the bare key, so other pincodes' shops never change key.
+    """
+    shard = shard_index(pincode, shop_id, config.PINCODE_SHARDS)
+    return f"{pincode}#{status}#{shard}" if shard else f"{pincode}#{status}"
+
+
+def listing_keys(pincode: str, status: str) -> list[str]:
+    """Every PincodeStatusIndex partition key of `status` shops in a pincode."""
+    count = len(shard_keys(pincode, config.PINCODE_SHARDS))
+    return [f"{pincode}#{status}"] + [f"{pincode}#{status}#{n}" for n in range(1, count)]
+
+
+def geo_key(cell: str, status: str) -> str:
+    """ShopGeoIndex partition key: SHOP_GEO_CELL_PRECISION cell and status, e.g. "tsq4e#approved"."""
+    return f"{cell}#{status}"
+
+
+def shop_geohash(lat, lng) -> Optional[str]:
+    """SHOP_GEOHASH_PRECISION geohash of a shop's coordinates; None if missing or out of range."""
+    if lat is None or lng is None:
+        return None
+    lat, lng = float(lat), float(lng)
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return geohash.encode(lat, lng, SHOP_GEOHASH_PRECISION)
+
+
+def with_listing_keys(shop: dict) -> dict:
+    """
+    Shop item plus its index keys, derived from other fields, so they must be
+    rewritten whenever those change:
+      PincodeShardIndex  – `pincodeShard` (pincode#n, n < the pincode's
+                           PINCODE_SHARDS count; see src/utils/sharding.py)
+      PincodeStatusIndex – `pincodeStatus` (pincode#status, plus #n in shard
+                           n >= 1 of a hot pincode) and `category` (sort key;
+                           defaults to "general")
+      ShopGeoIndex       – `geohash` (sort key) and `geoStatus` (cell#status),
+                           only for shops with valid lat/lng: the index is sparse
+    """
+    status = shop.get("status") or SHOP_STATUS_PENDING
+    keyed = {k: v for k, v in shop.items() if k not in ("geohash", "geoStatus")}
+    keyed["category"] = shop.get("category") or SHOP_CATEGORY_GENERAL
+    keyed["pincodeShard"] = shard_key(shop["pincode"], shop["shopId"], config.PINCODE_SHARDS)
+    keyed["pincodeStatus"] = listing_key(shop["pincode"], status, shop["shopId"])
+    code = shop_geohash(shop.get("lat"), shop.get("lng"))
+    if code:
+        keyed["geohash"] = code
+        keyed["geoStatus"] = geo_key(code[:SHOP_GEO_CELL_PRECISION], status)
+    return keyed
+
+
+def status_keys(shop: dict, status: str) -> dict:
+    """The fields a status change sets: `status` and the index keys derived from it."""
+    keyed = with_listing_keys({**shop, "status": status})
+    return {k: keyed[k] for k in ("status", "pincodeStatus", "geohash", "geoStatus") if k in keyed}
+
+
+def nearest_cards(lat: float, lon: float, radius_km: float, cards, limit: int) -> list:
+    """Shop cards within `radius_km` of (lat, lon), nearest first, each with its `distanceKm`."""
+    ranked = sorted(
+        ((geohash.haversine_km(lat, lon, c["lat"], c["lng"]), c) for c in cards if c.get("lat") is not None),
+        key=lambda pair: pair[0],
+    )
+    return [dict(c, distanceKm=round(d, 2)) for d, c in ranked if d <= radius_km][:limit]
 
 
 class ShopStatus(str, Enum):
@@ -35,6 +117,18 @@ class InventoryItem:
             "category": self.category,
         }
 
+    @classmethod
+    def from_dict(cls, item: dict) -> "InventoryItem":
+        return cls(
+            itemId=item["itemId"],
+            name=item["name"],
+            price=float(item.get("price", 0)),
+            nameHindi=item.get("nameHindi"),
+            unit=item.get("unit", "piece"),
+            stockQty=int(item.get("stockQty", 0)),
+            category=item.get("category"),
+        )
+
 
 @dataclass
 class Shop:
@@ -47,12 +141,14 @@ class Shop:
     address: Optional[str] = None
     lat: Optional[float] = None
     lng: Optional[float] = None
+    category: str = SHOP_CATEGORY_GENERAL
     status: ShopStatus = ShopStatus.PENDING
     inventory: List[InventoryItem] = field(default_factory=list)
     createdAt: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     updatedAt: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
     def to_dynamo(self) -> dict:
+        """Shop header only — inventory lines live in INVENTORY_TABLE, one item each."""
         data = {
             "shopId": self.shopId,
             "ownerId": self.ownerId,
@@ -63,28 +159,19 @@ class Shop:
             "address": self.address,
             "lat": self.lat,
             "lng": self.lng,
+            "category": self.category,
             "status": self.status.value if isinstance(self.status, Enum) else self.status,
-            "inventory": [i.to_dict() for i in self.inventory],
             "createdAt": self.createdAt,
             "updatedAt": self.updatedAt,
         }
-        return to_decimal(data)
+        code = shop_geohash(self.lat, self.lng)
+        if code:  # ShopGeoIndex sort key — absent (not NULL) without coordinates
+            data["geohash"] = code
+        return data
 
     @classmethod
     def from_dynamo(cls, item: dict) -> "Shop":
-        item = from_decimal(item)
-        inventory = [
-            InventoryItem(
-                itemId=i["itemId"],
-                name=i["name"],
-                price=float(i.get("price", 0)),
-                nameHindi=i.get("nameHindi"),
-                unit=i.get("unit", "piece"),
-                stockQty=int(i.get("stockQty", 0)),
-                category=i.get("category"),
-            )
-            for i in item.get("inventory", [])
-        ]
+        inventory = [InventoryItem.from_dict(i) for i in item.get("inventory", [])]
         return cls(
             shopId=item["shopId"],
             ownerId=item["ownerId"],
@@ -93,8 +180,9 @@ class Shop:
             phone=item["phone"],
             pincode=item["pincode"],
             address=item.get("address"),
-            lat=item.get("lat"),
-            lng=item.get("lng"),
+            lat=_float(item.get("lat")),
+            lng=_float(item.get("lng")),
+            category=item.get("category") or SHOP_CATEGORY_GENERAL,
             status=ShopStatus(item.get("status", "pending")),
             inventory=inventory,
             createdAt=item.get("createdAt", datetime.now(timezone.utc).isoformat()),
@@ -0,0 +1,112 @@
+"""
+Shared, tuned boto3 clients for every AWS service wrapper.
+
+Each wrapper used to build its own client at import time with botocore
+defaults: a 10-connection pool, no TCP keepalive, 60 s timeouts and the legacy
+retry mode. Clients are now created here on first use (a function that never
+calls Polly never pays for a Polly client), reused for the life of the warm
+container, and configured with:
+
+  max_pool_connections  AWS_MAX_POOL_CONNECTIONS — room for the parallel
+                        batch_get / facility-mirror threads
+  tcp_keepalive         idle connections survive between invocations
+  connect/read timeout  per service, below the 29 s API Gateway limit
+  retries               adaptive mode (client-side rate limiting on throttles);
+                        DynamoDB gets a single attempt because DynamoDBService
+                        retries with its own jittered, budgeted backoff
+
+DynamoDB Table handles are cached per table name instead of being rebuilt by
+`resource.Table()` on every call. `scripts/benchmark_aws_clients.py` compares
+warm-call latency against the previous default setup.
+"""
+import threading
+from typing import Any, Dict, Tuple
+
+import boto3
+from botocore.config import Config as BotoConfig
+
+from src.utils.config import config
+
+# (connect_timeout, read_timeout) in seconds
+_TIMEOUTS: Dict[str, Tuple[float, float]] = {
+    "dynamodb": (1, 5),
+    "bedrock-runtime": (2, 25),  # long generations stream back slowly
+    "polly": (2, 10),
+    "transcribe": (2, 10),
+    "s3": (2, 10),
+    "sns": (2, 5),
+}
+_DEFAULT_TIMEOUT = (2, 10)
+
+# Client constructor arguments that differ per service
+_CLIENT_KWARGS: Dict[str, Dict[str, Any]] = {
+    "s3": {"endpoint_url": f"https://s3.{config.AWS_REGION}.amazonaws.com"},
+}
+_CONFIG_OVERRIDES: Dict[str, Dict[str, Any]] = {
+    "s3": {"signature_version": "s3v4"},
+    # DynamoDBService retries itself (jittered, budgeted, per-table metrics)
+    "dynamodb": {"retries": {"mode": "adaptive", "max_attempts": 1}},
+}
+
+_lock = threading.Lock()
+_clients: Dict[str, Any] = {}
+_resources: Dict[str, Any] = {}
+_tables: Dict[str, Any] = {}
+
+
+def client_config(service: str) -> BotoConfig:
+    connect_timeout, read_timeout = _TIMEOUTS.get(service, _DEFAULT_TIMEOUT)
+    settings: Dict[str, Any] = {
+        "region_name": config.AWS_REGION,
+        "max_pool_connections": config.AWS_MAX_POOL_CONNECTIONS,
+        "tcp_keepalive": True,
+        "connect_timeout": connect_timeout,
+        "read_timeout": read_timeout,
+        "retries": {"mode": "adaptive", "max_attempts": config.AWS_MAX_ATTEMPTS},
+    }
+    settings.update(_CONFIG_OVERRIDES.get(service, {}))
+    return BotoConfig(**settings)
+
+
+def client(service: str):
+    """The shared low-level client for `service`, created on first use."""
+    existing = _clients.get(service)
+    if existing is not None:
+        return existing
+    with _lock:
+        if service not in _clients:
+            _clients[service] = boto3.client(
+                service, config=client_config(service), **_CLIENT_KWARGS.get(service, {})
+            )
+        return _clients[service]
+
+
+def resource(service: str):
+    """The shared boto3 resource for `service`, created on first use."""
+    existing = _resources.get(service)
+    if existing is not None:
+        return existing
+    with _lock:
+        if service not in _resources:
+            _resources[service] = boto3.resource(
+                service, config=client_config(service), **_CLIENT_KWARGS.get(service, {})
+            )
+        return _resources[service]
+
+
+def table(table_name: str):
+    """Cached DynamoDB Table handle on the shared resource."""
+    existing = _tables.get(table_name)
+    if existing is not None:
+        return existing
+    handle = resource("dynamodb").Table(table_name)
+    with _lock:
+        return _tables.setdefault(table_name, handle)
+
+
+def reset() -> None:
+    """Forget every client, resource and Table handle (tests / credential changes)."""
+    with _lock:
+        _clients.clear()
+        _resources.clear()
+        _tables.clear()
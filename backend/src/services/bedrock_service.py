@@ -2,9 +2,9 @@ import hashlib
 import json
 import re
 import time
-import boto3
 from typing import List, Optional
 
+from src.services import aws_clients
 from src.services.database import db
 from src.utils.config import config
 
@@ -100,8 +100,9 @@ def _cache_key(text: str, language: str) -> str:
 
 
 class BedrockService:
-    def __init__(self):
-        self._client = boto3.client("bedrock-runtime", region_name=config.AWS_REGION)
+    @property
+    def _client(self):
+        return aws_clients.client("bedrock-runtime")
 
     def chat(
         self,
@@ -1,16 +1,26 @@
 """
-Database abstraction: DynamoDB (AWS) when deployed, MongoDB when running locally.
-Import `db` from here — handlers use the same interface either way.
+Database abstraction: DynamoDB (AWS) when deployed, MongoDB when running locally,
+or the in-process InMemoryDBService when DB_BACKEND=memory (fast, deterministic
+tests and handler benchmarks). Import `db` from here — handlers use the same
+interface either way. Users, shops and pincode listings are served through the
+read-through entity cache.
 """
 import os
 
+from src.services.entity_cache import cached
+
 _IS_OFFLINE = os.environ.get("IS_OFFLINE", "").lower() in ("true", "1")
+_DB_BACKEND = os.environ.get("DB_BACKEND", "").lower()
+
+if _DB_BACKEND == "memory":
+    from src.services.memory_service import InMemoryDBService
 
-if _IS_OFFLINE:
+    db = cached(InMemoryDBService())
+elif _IS_OFFLINE:
     from src.services.mongodb_service import MongoDBService
 
-    db = MongoDBService()
+    db = cached(MongoDBService())
 else:
     from src.services.dynamodb_service import dynamo
 
-    db = dynamo
+    db = cached(dynamo)
@@ -1,10 +1,30 @@
+import random
+import threading
 import time
-import boto3
-from boto3.dynamodb.conditions import Key
-from botocore.exceptions import ClientError
-from typing import Any, Callable, Optional, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from boto3.dynamodb.conditions import Attr, ConditionExpressionBuilder, Key
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+from src.models.order import merge_order_pages, order_page_start, with_order_keys
+from src.models.shop import geo_key, listing_keys, nearest_cards, status_keys, with_listing_keys
+from src.services import aws_clients
+from src.utils import geohash
 from src.utils.config import config
+from src.utils.constants import (
+    COVERAGE_MARKER_KEY,
+    MAX_NEARBY_FACILITIES,
+    ORDER_STATUS_PENDING,
+    SHOP_CARD_FIELDS,
+    SHOP_GEO_CELL_PRECISION,
+    SHOP_STATS_ALL_TIME,
+    SHOP_STATUS_APPROVED,
+)
+from src.utils.dynamo_codec import deserialize_item, serialize_item
 from src.utils.logger import logger
+from src.utils.metrics import Counters, emf_fields
+from src.utils.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from src.utils.sharding import shard_keys
 
 _T = TypeVar("_T")
 
@@ -13,41 +33,203 @@ _THROTTLE_CODES = frozenset({
     "RequestLimitExceeded",
     "ThrottlingException",
 })
+_TRANSIENT_CODES = frozenset({"InternalServerError", "ServiceUnavailable"})
 _MAX_RETRIES = 3
-_RETRY_BASE_SLEEP = 0.1  # seconds; doubles each attempt (0.1 → 0.2 → 0.4)
-
-
-def _with_retry(fn: Callable[[], _T]) -> _T:
-    """Retry DynamoDB calls on throttling errors with exponential backoff."""
+_RETRY_BASE_SLEEP = 0.1  # seconds; backoff ceiling doubles each attempt (0.1 → 0.2 → 0.4 …)
+_RETRY_MAX_SLEEP = 2.0
+# Per-container retry budget (token bucket, as in the AWS SDK "standard" mode):
+# each retry spends tokens, each successful call refunds some. Once empty,
+# errors are raised immediately instead of piling retries onto a struggling table.
+_RETRY_BUDGET_CAPACITY = 500
+_THROTTLE_RETRY_COST = 5
+_TRANSIENT_RETRY_COST = 10
+_SUCCESS_REFUND = 1
+_BATCH_WRITE_SIZE = 25  # BatchWriteItem limit per request
+_BATCH_GET_SIZE = 100  # BatchGetItem limit per request
+_MAX_PARALLEL_BATCHES = 8
+# Shared by every parallel read: threads start on first use and stay warm with
+# the container. Tasks run on it must not submit to it themselves.
+_read_pool = ThreadPoolExecutor(max_workers=_MAX_PARALLEL_BATCHES, thread_name_prefix="dynamodb-read")
+_MAX_UNPROCESSED_RETRIES = 5
+# LastEvaluatedKey attributes of each paginated query (table + index keys, as in
+# serverless.yml): a page cursor must carry exactly these
+_PAGE_KEY_ATTRIBUTES = {
+    (config.INVENTORY_TABLE, None): frozenset({"shopId", "itemId"}),
+}
+
+
+class _RetryBudget:
+    """Token bucket shared by every DynamoDB call in this container."""
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._tokens = capacity
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: int) -> bool:
+        with self._lock:
+            if self._tokens < cost:
+                return False
+            self._tokens -= cost
+            return True
+
+    def refund(self, amount: int) -> None:
+        with self._lock:
+            self._tokens = min(self._capacity, self._tokens + amount)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tokens = self._capacity
+
+
+retry_budget = _RetryBudget(_RETRY_BUDGET_CAPACITY)
+retry_metrics = Counters()  # per table: DynamoDBThrottles, DynamoDBRetries, DynamoDBRetryBudgetExhausted
+
+
+def _backoff(attempt: int) -> float:
+    """Full jitter: uniform in [0, min(cap, base * 2^attempt)] so containers don't retry in lockstep."""
+    return random.uniform(0, min(_RETRY_MAX_SLEEP, _RETRY_BASE_SLEEP * (2 ** attempt)))
+
+
+def _retry_cost(exc: Exception) -> Optional[int]:
+    """Budget cost of retrying `exc`, or None if it is not retryable."""
+    if isinstance(exc, ClientError):
+        code = exc.response["Error"]["Code"]
+        if code in _THROTTLE_CODES:
+            return _THROTTLE_RETRY_COST
+        if code in _TRANSIENT_CODES:
+            return _TRANSIENT_RETRY_COST
+        return None
+    return _TRANSIENT_RETRY_COST  # connection reset / timeout
+
+
+def _record(table_name: str, event: str, metrics: Dict[str, int], **fields) -> None:
+    """Count `metrics` for the table and log them as CloudWatch metrics."""
+    for metric in metrics:
+        retry_metrics.add(table_name, metric)
+    logger.warning(event, **fields, **emf_fields(metrics, table=table_name))
+
+
+def _with_retry(fn: Callable[[], _T], table_name: str) -> _T:
+    """
+    Retry DynamoDB calls on throttling and transient errors (5xx, connection
+    resets, timeouts) with full-jitter exponential backoff, while the
+    container's retry budget lasts. Every throttle (including one on the last
+    attempt), retry and budget exhaustion is counted per table and published
+    as a CloudWatch metric. A success refunds the cost of its last retry, or
+    _SUCCESS_REFUND if it needed none.
+    """
+    last_cost = 0
     for attempt in range(_MAX_RETRIES):
         try:
-            return fn()
-        except ClientError as exc:
-            code = exc.response["Error"]["Code"]
-            if code in _THROTTLE_CODES and attempt < _MAX_RETRIES - 1:
-                sleep = _RETRY_BASE_SLEEP * (2 ** attempt)
-                logger.warning("dynamodb_throttled", attempt=attempt + 1, sleep_s=sleep, code=code)
-                time.sleep(sleep)
-                continue
-            raise
+            result = fn()
+        except (ClientError, BotoConnectionError, HTTPClientError) as exc:
+            cost = _retry_cost(exc)
+            if cost is None:
+                raise
+            code = exc.response["Error"]["Code"] if isinstance(exc, ClientError) else type(exc).__name__
+            throttles = {"DynamoDBThrottles": 1} if cost == _THROTTLE_RETRY_COST else {}
+            if attempt == _MAX_RETRIES - 1:
+                if throttles:
+                    _record(table_name, "dynamodb_throttled", throttles, attempt=attempt + 1, code=code)
+                raise
+            if not retry_budget.acquire(cost):
+                _record(table_name, "dynamodb_retry_budget_exhausted",
+                        {**throttles, "DynamoDBRetryBudgetExhausted": 1}, code=code)
+                raise
+            last_cost = cost
+            sleep = _backoff(attempt)
+            _record(table_name, "dynamodb_retry", {**throttles, "DynamoDBRetries": 1},
+                    attempt=attempt + 1, sleep_s=round(sleep, 3), code=code)
+            time.sleep(sleep)
+            continue
+        retry_budget.refund(last_cost or _SUCCESS_REFUND)
+        return result
     raise RuntimeError("Unreachable")  # pragma: no cover
 
 
+def _gather(read: Callable[[Any], _T], values: list) -> list[_T]:
+    """read(value) for each value (shard keys, cells, batches), in parallel on _read_pool (one inline)."""
+    if len(values) == 1:
+        return [read(values[0])]
+    return list(_read_pool.map(read, values))
+
+
+def _query_kwargs(
+    index_name: Optional[str],
+    key_name: str,
+    key_value: Any,
+    scan_forward: bool,
+    filters: Optional[dict],
+    projection: Optional[list[str]],
+) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {
+        "KeyConditionExpression": Key(key_name).eq(key_value),
+        "ScanIndexForward": scan_forward,
+    }
+    if index_name:
+        kwargs["IndexName"] = index_name
+    if filters:
+        kwargs["FilterExpression"] = reduce(
+            lambda acc, cond: acc & cond, [Attr(k).eq(v) for k, v in filters.items()]
+        )
+    if projection:
+        names = {f"#p{i}": field for i, field in enumerate(projection)}
+        kwargs["ProjectionExpression"] = ", ".join(names)
+        kwargs["ExpressionAttributeNames"] = names
+    return kwargs
+
+
+def _build_expressions(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """
+    Low-level request kwargs: Key / Attr condition objects in
+    KeyConditionExpression and FilterExpression become expression strings
+    with #n / :v placeholders, and their values AttributeValues.
+    """
+    built = dict(kwargs)
+    builder = ConditionExpressionBuilder()
+    names = dict(built.get("ExpressionAttributeNames") or {})
+    values: dict[str, Any] = {}
+    for field, is_key in (("KeyConditionExpression", True), ("FilterExpression", False)):
+        condition = built.get(field)
+        if condition is None or isinstance(condition, str):
+            continue
+        expression = builder.build_expression(condition, is_key_condition=is_key)
+        built[field] = expression.condition_expression
+        names.update(expression.attribute_name_placeholders)
+        values.update(expression.attribute_value_placeholders)
+    if names:
+        built["ExpressionAttributeNames"] = names
+    if values:
+        built["ExpressionAttributeValues"] = serialize_item(values)
+    return built
+
+
 class DynamoDBService:
-    def __init__(self):
-        self._resource = boto3.resource("dynamodb", region_name=config.AWS_REGION)
+    """
+    Items go in and come out as plain Python values (numbers as int / float):
+    every call uses the low-level client with the one-pass codec in
+    src/utils/dynamo_codec.py instead of the Decimal-based resource layer.
+    """
 
-    def _table(self, table_name: str):
-        return self._resource.Table(table_name)
+    @property
+    def _client(self):
+        return aws_clients.client("dynamodb")
+
+    def _call(self, table_name: str, operation: str, **kwargs: Any) -> dict:
+        """One low-level call on `table_name` with retries."""
+        method = getattr(self._client, operation)
+        return _with_retry(lambda: method(TableName=table_name, **kwargs), table_name)
 
     # --- Generic CRUD ---
 
     def put_item(self, table_name: str, item: dict) -> None:
-        _with_retry(lambda: self._table(table_name).put_item(Item=item))
+        self._call(table_name, "put_item", Item=serialize_item(item))
 
     def get_item(self, table_name: str, key: dict) -> Optional[dict]:
-        response = _with_retry(lambda: self._table(table_name).get_item(Key=key))
-        return response.get("Item")
+        response = self._call(table_name, "get_item", Key=serialize_item(key))
+        item = response.get("Item")
+        return deserialize_item(item) if item is not None else None
 
     def update_item(
         self,
@@ -56,20 +238,108 @@ class DynamoDBService:
         update_expression: str,
         expression_values: dict,
         expression_names: Optional[dict] = None,
+        condition_expression: Optional[str] = None,
     ) -> dict:
         kwargs: dict[str, Any] = {
-            "Key": key,
+            "Key": serialize_item(key),
             "UpdateExpression": update_expression,
-            "ExpressionAttributeValues": expression_values,
             "ReturnValues": "ALL_NEW",
         }
+        if expression_values:
+            kwargs["ExpressionAttributeValues"] = serialize_item(expression_values)
         if expression_names:
             kwargs["ExpressionAttributeNames"] = expression_names
-        response = _with_retry(lambda: self._table(table_name).update_item(**kwargs))
-        return response.get("Attributes", {})
+        if condition_expression:
+            kwargs["ConditionExpression"] = condition_expression
+        response = self._call(table_name, "update_item", **kwargs)
+        return deserialize_item(response.get("Attributes", {}))
 
     def delete_item(self, table_name: str, key: dict) -> None:
-        _with_retry(lambda: self._table(table_name).delete_item(Key=key))
+        self._call(table_name, "delete_item", Key=serialize_item(key))
+
+    def batch_write(
+        self,
+        table_name: str,
+        put_items: list[dict] = (),
+        delete_keys: list[dict] = (),
+    ) -> None:
+        """
+        BatchWriteItem in chunks of 25. DynamoDB may accept only part of a batch
+        under load; UnprocessedItems are re-sent with exponential backoff.
+        """
+        requests = [{"PutRequest": {"Item": serialize_item(item)}} for item in put_items]
+        requests += [{"DeleteRequest": {"Key": serialize_item(key)}} for key in delete_keys]
+        for start in range(0, len(requests), _BATCH_WRITE_SIZE):
+            pending = {table_name: requests[start:start + _BATCH_WRITE_SIZE]}
+            for attempt in range(_MAX_UNPROCESSED_RETRIES + 1):
+                response = _with_retry(
+                    lambda batch=pending: self._client.batch_write_item(RequestItems=batch), table_name
+                )
+                pending = response.get("UnprocessedItems") or {}
+                if not pending:
+                    break
+                if attempt == _MAX_UNPROCESSED_RETRIES:
+                    raise RuntimeError(
+                        f"{len(pending[table_name])} items still unprocessed writing {table_name}"
+                    )
+                sleep = _backoff(attempt)
+                _record(table_name, "dynamodb_unprocessed_items", {"DynamoDBRetries": 1},
+                        count=len(pending[table_name]), sleep_s=round(sleep, 3))
+                time.sleep(sleep)
+
+    def batch_get(
+        self,
+        table_name: str,
+        keys: list[dict],
+        projection: Optional[list[str]] = None,
+    ) -> list[Optional[dict]]:
+        """
+        Fetch many items by primary key. Returns one entry per key, in input
+        order, with None where no item exists. Keys are de-duplicated, split
+        into BatchGetItem requests of 100 and fetched in parallel; any
+        UnprocessedKeys are re-requested with exponential backoff.
+        """
+        if not keys:
+            return []
+        key_names = list(keys[0])
+        unique = list({tuple(k[n] for n in key_names): k for k in keys}.values())
+        request: dict[str, Any] = {}
+        if projection:
+            fields = list(dict.fromkeys([*key_names, *projection]))
+            names = {f"#p{i}": field for i, field in enumerate(fields)}
+            request["ProjectionExpression"] = ", ".join(names)
+            request["ExpressionAttributeNames"] = names
+
+        chunks = [
+            [serialize_item(k) for k in unique[i:i + _BATCH_GET_SIZE]]
+            for i in range(0, len(unique), _BATCH_GET_SIZE)
+        ]
+        per_chunk = _gather(lambda chunk: self._batch_get_chunk(table_name, chunk, request), chunks)
+
+        found = {
+            tuple(item[n] for n in key_names): item
+            for items in per_chunk for item in items
+        }
+        return [found.get(tuple(k[n] for n in key_names)) for k in keys]
+
+    def _batch_get_chunk(self, table_name: str, keys: list[dict], request: dict) -> list[dict]:
+        items: list[dict] = []
+        pending = {table_name: {"Keys": keys, **request}}
+        for attempt in range(_MAX_UNPROCESSED_RETRIES + 1):
+            response = _with_retry(
+                lambda batch=pending: self._client.batch_get_item(RequestItems=batch), table_name
+            )
+            items.extend(deserialize_item(i) for i in response.get("Responses", {}).get(table_name, []))
+            pending = response.get("UnprocessedKeys") or {}
+            if not pending:
+                return items
+            if attempt == _MAX_UNPROCESSED_RETRIES:
+                break
+            sleep = _backoff(attempt)
+            _record(table_name, "dynamodb_unprocessed_keys", {"DynamoDBRetries": 1},
+                    count=len(pending[table_name]["Keys"]), sleep_s=round(sleep, 3))
+            time.sleep(sleep)
+        raise RuntimeError(f"{len(pending[table_name]['Keys'])} keys still unprocessed reading {table_name}")
 
     def query_by_index(
         self,
@@ -77,27 +347,125 @@ class DynamoDBService:
         index_name: str,
         key_name: str,
         key_value: str,
+        *,
+        limit: Optional[int] = None,
+        scan_forward: bool = True,
+        filters: Optional[dict] = None,
+        projection: Optional[list[str]] = None,
     ) -> list[dict]:
         """
         Query a GSI and automatically paginate through all result pages.
         DynamoDB returns at most 1 MB per call; without pagination, items beyond
-        that limit are silently dropped.
+        that limit are silently dropped. `limit` stops reading once that many
+        items are collected; `filters` are attribute equality checks.
         """
-        table = self._table(table_name)
-        query_kwargs: dict[str, Any] = {
-            "IndexName": index_name,
-            "KeyConditionExpression": Key(key_name).eq(key_value),
-        }
+        query_kwargs = _query_kwargs(index_name, key_name, key_value, scan_forward, filters, projection)
+        return self._query_all(table_name, query_kwargs, limit)
+
+    def query_sharded_index(
+        self,
+        table_name: str,
+        index_name: str,
+        key_name: str,
+        key_values: list[str],
+        *,
+        projection: Optional[list[str]] = None,
+    ) -> list[dict]:
+        """
+        Every item of a write-sharded GSI key (src/utils/sharding.py): one
+        paginated query per shard value, run in parallel, results concatenated
+        in shard order. A single shard is a plain query_by_index.
+        """
+        def shard(value: str) -> list[dict]:
+            return self.query_by_index(table_name, index_name, key_name, value, projection=projection)
+
+        return [item for items in _gather(shard, key_values) for item in items]
+
+    def query_page(
+        self,
+        table_name: str,
+        index_name: Optional[str],
+        key_name: str,
+        key_value: str,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        scan_forward: bool = True,
+        filters: Optional[dict] = None,
+        projection: Optional[list[str]] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        One page of up to `limit` items and an opaque cursor for the next page
+        (None when there is none). Raises ValueError for a malformed cursor, or
+        one that is not a position in this partition of this index (edited, or
+        issued for another shop or index) — DynamoDB rejects those as a
+        ValidationException. DynamoDB applies Limit before FilterExpression,
+        so filtered pages keep reading until full or the index is exhausted.
+        """
+        query_kwargs = _build_expressions(
+            _query_kwargs(index_name, key_name, key_value, scan_forward, filters, projection)
+        )
+        start_key = decode_cursor(cursor)
+        if start_key:
+            expected = _PAGE_KEY_ATTRIBUTES.get((table_name, index_name))
+            if start_key.get(key_name) != key_value or (expected and set(start_key) != expected):
+                raise ValueError("invalid cursor")
+            query_kwargs["ExclusiveStartKey"] = serialize_item(start_key)
         items: list[dict] = []
         while True:
-            response = _with_retry(lambda: table.query(**query_kwargs))
-            items.extend(response.get("Items", []))
+            query_kwargs["Limit"] = limit - len(items)
+            try:
+                response = self._call(table_name, "query", **query_kwargs)
+            except ClientError as exc:
+                if start_key and exc.response["Error"]["Code"] == "ValidationException":
+                    raise ValueError("invalid cursor") from exc
+                raise
+            items.extend(deserialize_item(i) for i in response.get("Items", []))
             last_key = response.get("LastEvaluatedKey")
-            if not last_key:
+            if not last_key or len(items) >= limit:
+                break
+            query_kwargs["ExclusiveStartKey"] = last_key
+        return items, encode_cursor(deserialize_item(last_key) if last_key else None)
+
+    def query_by_key(
+        self,
+        table_name: str,
+        key_name: str,
+        key_value: str,
+        projection: Optional[list[str]] = None,
+    ) -> list[dict]:
+        """Query every item sharing a partition key on the base table (all pages)."""
+        return self._query_all(
+            table_name, _query_kwargs(None, key_name, key_value, True, None, projection)
+        )
+
+    def _query_all(
+        self, table_name: str, query_kwargs: dict[str, Any], limit: Optional[int] = None
+    ) -> list[dict]:
+        query_kwargs = _build_expressions(query_kwargs)
+        items: list[dict] = []
+        while True:
+            if limit is not None:
+                query_kwargs["Limit"] = limit - len(items)
+            response = self._call(table_name, "query", **query_kwargs)
+            items.extend(deserialize_item(i) for i in response.get("Items", []))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key or (limit is not None and len(items) >= limit):
                 break
             query_kwargs["ExclusiveStartKey"] = last_key
         return items
 
+    def scan_all(self, table_name: str, **scan_kwargs: Any) -> Iterator[dict]:
+        """Yield every item of a full-table scan (all pages). Maintenance scripts only."""
+        scan_kwargs = _build_expressions(scan_kwargs)
+        while True:
+            response = self._call(table_name, "scan", **scan_kwargs)
+            yield from (deserialize_item(i) for i in response.get("Items", []))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            scan_kwargs["ExclusiveStartKey"] = last_key
+
     # --- Domain helpers ---
 
     def get_user(self, user_id: str) -> Optional[dict]:
@@ -106,10 +474,14 @@ class DynamoDBService:
     def save_user(self, user: dict) -> None:
         self.put_item(config.USERS_TABLE, user)
 
+    # --- Conversations: header item + one CONVERSATION_TURNS item per message ---
+
     def get_conversation(self, conversation_id: str) -> Optional[dict]:
+        """Header item only (no messages)."""
         return self.get_item(config.CONVERSATIONS_TABLE, {"conversationId": conversation_id})
 
     def save_conversation(self, conversation: dict) -> None:
+        """Legacy whole-document write — new code appends turns instead."""
         self.put_item(config.CONVERSATIONS_TABLE, conversation)
 
     def get_conversations_by_user(self, user_id: str) -> list[dict]:
@@ -117,19 +489,258 @@ class DynamoDBService:
             config.CONVERSATIONS_TABLE, "UserConversationsIndex", "userId", user_id
         )
 
+    def get_latest_conversation(self, user_id: str, max_messages: int) -> Optional[dict]:
+        """
+        The user's most recently updated conversation (loaded like load_conversation).
+        One Limit=1 descending query on UserRecentConversationsIndex (userId, updatedAt).
+        """
+        items = self._query_all(config.CONVERSATIONS_TABLE, {
+            "IndexName": "UserRecentConversationsIndex",
+            "KeyConditionExpression": Key("userId").eq(user_id),
+            "ScanIndexForward": False,
+        }, limit=1)
+        if not items:
+            return None
+        return self.load_conversation(items[0]["conversationId"], max_messages)
+
+    def load_conversation(self, conversation_id: str, max_messages: int) -> Optional[dict]:
+        """
+        Header plus its last `max_messages` messages (oldest first) under "messages".
+        Legacy items that still embed the full message list are migrated on first read.
+        """
+        header = self.get_conversation(conversation_id)
+        if not header:
+            return None
+        if "messages" in header:
+            messages = header.pop("messages") or []
+            header["turnCount"] = self.migrate_conversation({**header, "messages": messages})
+            header["messages"] = messages[-max_messages:] if max_messages else []
+            return header
+        header["messages"] = self._latest_turns(conversation_id, max_messages)
+        return header
+
+    def _latest_turns(self, conversation_id: str, max_messages: int) -> list[dict]:
+        if max_messages <= 0:
+            return []
+        turns = self._query_all(config.CONVERSATION_TURNS_TABLE, {
+            "KeyConditionExpression": Key("conversationId").eq(conversation_id),
+            "ScanIndexForward": False,
+        }, limit=max_messages)
+        turns.reverse()
+        return [
+            {k: v for k, v in turn.items() if k not in ("conversationId", "turnSeq")}
+            for turn in turns
+        ]
+
+    def append_conversation_turns(self, header: dict, messages: list[dict]) -> None:
+        """
+        Upsert the header and append `messages` as new turns. Sequence numbers
+        come from an atomic ADD on the header's turnCount, so concurrent appends
+        never collide.
+        """
+        if not messages:
+            return
+        fields = {k: v for k, v in header.items()
+                  if k not in ("conversationId", "messages", "turnCount", "createdAt")}
+        names = {f"#{k}": k for k in fields}
+        names["#createdAt"] = "createdAt"
+        values = {f":{k}": v for k, v in fields.items()}
+        values[":createdAt"] = header.get("createdAt")
+        values[":n"] = len(messages)
+        assignments = [f"#{k} = :{k}" for k in fields]
+        assignments.append("#createdAt = if_not_exists(#createdAt, :createdAt)")
+
+        updated = self.update_item(
+            config.CONVERSATIONS_TABLE,
+            {"conversationId": header["conversationId"]},
+            f"SET {', '.join(assignments)} ADD turnCount :n",
+            values,
+            names,
+        )
+        first_seq = int(updated["turnCount"]) - len(messages) + 1
+        self._put_turns(header["conversationId"], first_seq, messages)
+
+    def _put_turns(self, conversation_id: str, first_seq: int, messages: list[dict]) -> None:
+        turns = []
+        for offset, message in enumerate(messages):
+            item = {k: v for k, v in message.items() if v is not None}
+            item.update(conversationId=conversation_id, turnSeq=first_seq + offset)
+            turns.append(item)
+        self.batch_write(config.CONVERSATION_TURNS_TABLE, turns)
+
+    def migrate_conversation(self, item: dict) -> int:
+        """
+        Move a legacy item's embedded `messages` into CONVERSATION_TURNS (turns
+        1..n) and strip them from the header. Idempotent. Returns the turn count.
+        """
+        messages = item.get("messages") or []
+        self._put_turns(item["conversationId"], 1, messages)
+        try:
+            self.update_item(
+                config.CONVERSATIONS_TABLE,
+                {"conversationId": item["conversationId"]},
+                "REMOVE messages SET turnCount = :n",
+                {":n": len(messages)},
+                condition_expression="attribute_exists(messages)",
+            )
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+        logger.info("conversation_migrated", conversation_id=item["conversationId"], turns=len(messages))
+        return len(messages)
+
+    def iter_legacy_conversations(self) -> Iterator[dict]:
+        """Conversations that still embed their message list (pre turn-per-item layout)."""
+        return self.scan_all(config.CONVERSATIONS_TABLE, FilterExpression=Attr("messages").exists())
+
     def get_shop(self, shop_id: str) -> Optional[dict]:
         return self.get_item(config.SHOPS_TABLE, {"shopId": shop_id})
 
     def save_shop(self, shop: dict) -> None:
-        self.put_item(config.SHOPS_TABLE, shop)
+        self.put_item(config.SHOPS_TABLE, with_listing_keys(shop))
+
+    def set_shop_status(self, shop_id: str, status: str, updated_at: str) -> Optional[dict]:
+        """Change a shop's status and its index keys together; None if no such shop."""
+        shop = self.get_shop(shop_id)
+        if not shop:
+            return None
+        changes = dict(status_keys(shop, status), updatedAt=updated_at)
+        names = {f"#f{i}": field for i, field in enumerate(changes)}
+        return self.update_item(
+            config.SHOPS_TABLE,
+            {"shopId": shop_id},
+            "SET " + ", ".join(f"{name} = :f{i}" for i, name in enumerate(names)),
+            {f":f{i}": value for i, value in enumerate(changes.values())},
+            names,
+        )
 
     def get_shops_by_pincode(self, pincode: str) -> list[dict]:
-        return self.query_by_index(
-            config.SHOPS_TABLE, "PincodeIndex", "pincode", pincode
+        """Every shop in a pincode, whatever its status (admin / maintenance use)."""
+        return self.query_sharded_index(
+            config.SHOPS_TABLE, "PincodeShardIndex", "pincodeShard",
+            shard_keys(pincode, config.PINCODE_SHARDS),
         )
 
+    def get_shop_cards_by_pincode(
+        self, pincode: str, category: Optional[str] = None, status: str = SHOP_STATUS_APPROVED
+    ) -> list[dict]:
+        """
+        Listing cards (SHOP_CARD_FIELDS) of `status` shops in a pincode, optionally
+        of one category, in category order. PincodeStatusIndex is keyed
+        pincode#status (write-sharded in hot pincodes) + category and projects
+        only card fields, so other statuses, other categories and inventory
+        lists are never read.
+        """
+        def shard(value: str) -> list[dict]:
+            kwargs = _query_kwargs("PincodeStatusIndex", "pincodeStatus", value,
+                                   True, None, list(SHOP_CARD_FIELDS))
+            if category:
+                kwargs["KeyConditionExpression"] &= Key("category").eq(category)
+            return self._query_all(config.SHOPS_TABLE, kwargs)
+
+        shards = _gather(shard, listing_keys(pincode, status))
+        if len(shards) == 1:
+            return shards[0]
+        return sorted((card for cards in shards for card in cards), key=lambda card: card.get("category", ""))
+
+    def get_approved_shops_by_pincode(self, pincode: str, category: Optional[str] = None) -> list[dict]:
+        """Full approved shop items: cards from PincodeStatusIndex, then one batch_get."""
+        cards = self.get_shop_cards_by_pincode(pincode, category)
+        shops = self.batch_get(config.SHOPS_TABLE, [{"shopId": c["shopId"]} for c in cards])
+        return [shop for shop in shops if shop]
+
+    def get_shops_near(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        category: Optional[str] = None,
+        limit: int = MAX_NEARBY_FACILITIES,
+    ) -> list[dict]:
+        """
+        Approved shop cards within `radius_km`, nearest first, each with its
+        `distanceKm`. ShopGeoIndex is keyed cell#status, so every cell
+        overlapping the search circle is one query for approved card
+        projections only; the cells are read in parallel and the union is
+        refined by exact distance.
+        """
+        cells = geohash.cells_covering(lat, lon, radius_km, SHOP_GEO_CELL_PRECISION)
+        filters = {"category": category} if category else None
+
+        def cell_cards(cell: str) -> list[dict]:
+            return self._query_all(config.SHOPS_TABLE, _query_kwargs(
+                "ShopGeoIndex", "geoStatus", geo_key(cell, SHOP_STATUS_APPROVED),
+                True, filters, list(SHOP_CARD_FIELDS),
+            ))
+
+        cards = [card for per_cell in _gather(cell_cards, cells) for card in per_cell]
+        return nearest_cards(lat, lon, radius_km, cards, limit)
+
+    # --- Inventory (one item per shopId + itemId) ---
+
+    def get_inventory(self, shop_id: str, projection: Optional[list[str]] = None) -> list[dict]:
+        return self.query_by_key(config.INVENTORY_TABLE, "shopId", shop_id, projection)
+
+    def get_inventory_page(
+        self, shop_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> tuple[list[dict], Optional[str]]:
+        """One page of a shop's inventory in itemId order."""
+        return self.query_page(
+            config.INVENTORY_TABLE, None, "shopId", shop_id, limit=limit, cursor=cursor
+        )
+
+    def save_inventory_items(self, shop_id: str, items: list[dict]) -> None:
+        self.batch_write(config.INVENTORY_TABLE, [dict(i, shopId=shop_id) for i in items])
+
+    def delete_inventory_items(self, shop_id: str, item_ids: list[str]) -> None:
+        self.batch_write(
+            config.INVENTORY_TABLE,
+            delete_keys=[{"shopId": shop_id, "itemId": item_id} for item_id in item_ids],
+        )
+
+    def update_inventory_item(self, shop_id: str, item_id: str, fields: dict) -> Optional[dict]:
+        """SET only `fields` on one existing item; returns None if it does not exist."""
+        names = {f"#f{i}": name for i, name in enumerate(fields)}
+        values = {f":v{i}": value for i, value in enumerate(fields.values())}
+        try:
+            return self.update_item(
+                config.INVENTORY_TABLE,
+                {"shopId": shop_id, "itemId": item_id},
+                "SET " + ", ".join(f"{n} = {v}" for n, v in zip(names, values)),
+                values,
+                names,
+                condition_expression="attribute_exists(itemId)",
+            )
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return None
+            raise
+
+    def attach_inventory(self, shop: dict) -> dict:
+        """Shop header plus its `inventory` list; legacy embedded lists are used as-is."""
+        if "inventory" in shop:
+            return shop
+        items = self.get_inventory(shop["shopId"])
+        return dict(shop, inventory=[{k: v for k, v in i.items() if k != "shopId"} for i in items])
+
+    def attach_inventories(self, shops: list[dict]) -> list[dict]:
+        """attach_inventory for many shops: the inventory queries run in parallel."""
+        pending = [s for s in shops if "inventory" not in s]
+        if len(pending) <= 1:
+            return [self.attach_inventory(s) for s in shops]
+        attached = dict(zip((s["shopId"] for s in pending), _gather(self.attach_inventory, pending)))
+        return [attached.get(s["shopId"], s) for s in shops]
+
+    def migrate_shop_inventory(self, shop: dict) -> None:
+        """Move a legacy embedded `inventory` list out of the shop header. Idempotent."""
+        if "inventory" not in shop:
+            return
+        self.save_inventory_items(shop["shopId"], shop["inventory"])
+        self.update_item(config.SHOPS_TABLE, {"shopId": shop["shopId"]}, "REMOVE inventory", {})
+        logger.info("shop_inventory_migrated", shop_id=shop["shopId"], items=len(shop["inventory"]))
+
     def save_order(self, order: dict) -> None:
-        self.put_item(config.ORDERS_TABLE, order)
+        self.put_item(config.ORDERS_TABLE, with_order_keys(order))
 
     def get_order(self, order_id: str) -> Optional[dict]:
         return self.get_item(config.ORDERS_TABLE, {"orderId": order_id})
@@ -139,11 +750,108 @@ class DynamoDBService:
             config.ORDERS_TABLE, "UserOrdersIndex", "userId", user_id
         )
 
-    def get_orders_by_shop(self, shop_id: str) -> list[dict]:
-        return self.query_by_index(
-            config.ORDERS_TABLE, "ShopOrdersIndex", "shopId", shop_id
+    def get_orders_by_shop(self, shop_id: str, projection: Optional[list[str]] = None) -> list[dict]:
+        return self.query_sharded_index(
+            config.ORDERS_TABLE, "ShopOrdersShardIndex", "shopShard",
+            shard_keys(shop_id, config.SHOP_ORDER_SHARDS), projection=projection,
         )
 
+    def get_orders_page(
+        self,
+        shop_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        Newest-first page of a shop's orders. ShopOrdersShardIndex is keyed
+        shopShard + createdAt, so each shard is read newest first, in parallel,
+        up to `limit` orders past the cursor, and the shard pages are merged.
+        Raises ValueError for a malformed cursor or another shop's.
+        """
+        start = order_page_start(shop_id, cursor)
+
+        def shard(value: str) -> list[dict]:
+            kwargs = _query_kwargs("ShopOrdersShardIndex", "shopShard", value, False,
+                                   {"status": status} if status else None, None)
+            if start:
+                created_at, order_id = start
+                kwargs["KeyConditionExpression"] &= Key("createdAt").lte(created_at)
+                after = Attr("createdAt").lt(created_at) | Attr("orderId").lt(order_id)
+                kwargs["FilterExpression"] = after & kwargs["FilterExpression"] if status else after
+            return self._query_all(config.ORDERS_TABLE, kwargs, limit)
+
+        pages = _gather(shard, shard_keys(shop_id, config.SHOP_ORDER_SHARDS))
+        return merge_order_pages(shop_id, pages, limit)
+
+    def update_order_status(
+        self, order_id: str, old_status: str, new_status: str, updated_at: str
+    ) -> Optional[dict]:
+        """Move an order from `old_status` to `new_status`; None if its status changed meanwhile."""
+        try:
+            return self.update_item(
+                config.ORDERS_TABLE,
+                {"orderId": order_id},
+                "SET #s = :new, updatedAt = :at",
+                {":new": new_status, ":old": old_status, ":at": updated_at},
+                {"#s": "status"},
+                condition_expression="#s = :old",
+            )
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return None
+            raise
+
+    def iter_shop_ids(self) -> Iterator[str]:
+        for item in self.scan_all(config.SHOPS_TABLE, ProjectionExpression="shopId"):
+            yield item["shopId"]
+
+    # --- Shop analytics rollups (statDate = "YYYY-MM-DD" per day, "ALL" all-time) ---
+
+    def record_order_placed(self, shop_id: str, day: str, amount: float, order_id: str) -> None:
+        """
+        ADD onto the day's and the all-time rollup rows in one transaction, so
+        either both rows count the order or neither does. The order ID is the
+        idempotency token: a retried call within ten minutes is not applied twice.
+        """
+        values = serialize_item({":one": 1, ":amount": amount})
+        updates = (
+            ({"shopId": shop_id, "statDate": day}, "ADD orderCount :one, revenue :amount"),
+            ({"shopId": shop_id, "statDate": SHOP_STATS_ALL_TIME},
+             "ADD orderCount :one, revenue :amount, pendingOrders :one"),
+        )
+        items = [
+            {"Update": {
+                "TableName": config.SHOP_STATS_TABLE,
+                "Key": serialize_item(key),
+                "UpdateExpression": expression,
+                "ExpressionAttributeValues": values,
+            }}
+            for key, expression in updates
+        ]
+        _with_retry(
+            lambda: self._client.transact_write_items(TransactItems=items, ClientRequestToken=order_id),
+            config.SHOP_STATS_TABLE,
+        )
+
+    def record_order_status_change(self, shop_id: str, old_status: str, new_status: str) -> None:
+        delta = int(new_status == ORDER_STATUS_PENDING) - int(old_status == ORDER_STATUS_PENDING)
+        if delta:
+            self.update_item(
+                config.SHOP_STATS_TABLE, {"shopId": shop_id, "statDate": SHOP_STATS_ALL_TIME},
+                "ADD pendingOrders :delta", {":delta": delta},
+            )
+
+    def get_shop_stats(self, shop_id: str, since_day: str) -> list[dict]:
+        """Daily rows from `since_day` onwards plus the all-time row, in one query."""
+        return self._query_all(config.SHOP_STATS_TABLE, {
+            "KeyConditionExpression": Key("shopId").eq(shop_id) & Key("statDate").gte(since_day),
+        })
+
+    def save_shop_stats(self, shop_id: str, rows: list[dict]) -> None:
+        """Overwrite rollup rows (backfill); each row carries its own statDate."""
+        self.batch_write(config.SHOP_STATS_TABLE, [dict(r, shopId=shop_id) for r in rows])
+
     # --- Response cache (health query deduplication) ---
 
     def get_response_cache(self, cache_key: str) -> Optional[str]:
@@ -177,5 +885,27 @@ class DynamoDBService:
             {"locationKey": location_key, "lat": str(lat), "lon": str(lon)},
         )
 
+    # --- Facility mirror (harvested Places results, keyed by geohash cell) ---
+
+    def get_facilities_in_cell(self, cell: str, kind: Optional[str] = None) -> list[dict]:
+        """
+        Mirrored facilities plus coverage markers of one cell: only the
+        "<kind>#" sort-key range when `kind` is given, the whole cell otherwise.
+        """
+        condition = Key("geohash").eq(cell)
+        if kind:
+            condition &= Key("facilityKey").begins_with(f"{kind}#")
+        return self._query_all(config.FACILITIES_TABLE, {"KeyConditionExpression": condition})
+
+    def save_facilities(self, facilities: list[dict]) -> None:
+        # One BatchWriteItem may not name the same key twice; the last copy wins
+        unique = {(f["geohash"], f["facilityKey"]): f for f in facilities}
+        self.batch_write(config.FACILITIES_TABLE, list(unique.values()))
+
+    def mark_cell_harvested(self, cell: str, kinds: list[str], harvested_at: str, ttl: int) -> None:
+        self.batch_write(config.FACILITIES_TABLE, [
+            {"geohash": cell, "facilityKey": f"{kind}#{COVERAGE_MARKER_KEY}", "harvestedAt": harvested_at, "ttl": ttl}
+            for kind in kinds
+        ])
 
 dynamo = DynamoDBService()
@@ -0,0 +1,251 @@
+"""
+Read-through cache for rarely changing entities in front of the `db` interface.
+
+`db.get_user` runs on every /health/query, `db.get_shop` on every order and
+inventory call, and the pincode listing query on every shop search — yet users,
+shops and shop listings change a few times a day at most. CachedDatabase wraps
+DynamoDBService / MongoDBService and serves:
+
+    user:<userId>       get_user                               ENTITY_CACHE_USER_TTL_SECONDS
+    shop:<shopId>       get_shop, get_approved_shops_by_pincode ENTITY_CACHE_SHOP_TTL_SECONDS
+    pincode:<pincode>   get_shop_cards_by_pincode              ENTITY_CACHE_PINCODE_TTL_SECONDS
+
+Writes go to the database first and then invalidate (never update) the cached
+entries they affect: save_user drops the user; save_shop and set_shop_status
+drop the shop and the listings of its old and new pincode; migrate_shop_inventory
+drops the shop, and only when it had an embedded inventory to move. Missing entities are never cached, so a freshly registered user or shop
+is visible immediately. Every other method is passed straight through.
+
+Tiers:
+  local  – per-kind bounded LRU with TTL (default); invalidations only reach
+           this container, so other warm containers may serve a stale entry
+           for at most one TTL
+  shared – any Redis-compatible server at ENTITY_CACHE_REDIS_URL; every
+           container reads and invalidates the same keys. Falls back to the
+           local tier when the `redis` package is missing or the URL is unset.
+"""
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from src.utils.config import config
+from src.utils.constants import SHOP_STATUS_APPROVED
+from src.utils.logger import logger
+
+_USER = "user"
+_SHOP = "shop"
+_PINCODE = "pincode"
+
+
+# ── Stores ────────────────────────────────────────────────────────────────────
+
+class _LocalStore:
+    """Bounded LRU of key → (expires_at, value). Values are copied in and out."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self._ttl = ttl_seconds
+        self._max = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry[1])
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class _SharedStore:
+    """
+    One entity kind in a Redis-compatible server. Values are plain JSON — every
+    backend returns numbers as int / float, never Decimal. Errors are logged
+    and treated as misses — the database is always the fallback.
+    """
+
+    def __init__(self, client, namespace: str, ttl_seconds: int):
+        self._client = client
+        self._prefix = f"{config.TABLE_PREFIX}:entity:{namespace}:"
+        self._ttl = ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self._client.get(self._prefix + key)
+        except Exception as exc:
+            logger.warning("entity_cache_read_failed", key=key, error=str(exc))
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            self._client.set(self._prefix + key, json.dumps(value, separators=(",", ":")), ex=self._ttl)
+        except Exception as exc:
+            logger.warning("entity_cache_write_failed", key=key, error=str(exc))
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            self._client.delete(*(self._prefix + key for key in keys))
+        except Exception as exc:
+            logger.warning("entity_cache_invalidate_failed", keys=list(keys), error=str(exc))
+
+    def clear(self) -> None:
+        """Shared entries expire on their own; only the local tier is ever cleared."""
+
+
+def _shared_client():
+    """Redis client for ENTITY_CACHE_REDIS_URL, or None to use the local tier."""
+    if not config.ENTITY_CACHE_REDIS_URL:
+        return None
+    try:
+        import redis
+    except ImportError:
+        logger.warning("entity_cache_shared_unavailable", reason="redis_not_installed")
+        return None
+    return redis.Redis.from_url(
+        config.ENTITY_CACHE_REDIS_URL,
+        socket_timeout=config.ENTITY_CACHE_REDIS_TIMEOUT_SECONDS,
+        socket_connect_timeout=config.ENTITY_CACHE_REDIS_TIMEOUT_SECONDS,
+    )
+
+
+def _build_stores(client=None) -> dict:
+    ttls = {
+        _USER: config.ENTITY_CACHE_USER_TTL_SECONDS,
+        _SHOP: config.ENTITY_CACHE_SHOP_TTL_SECONDS,
+        _PINCODE: config.ENTITY_CACHE_PINCODE_TTL_SECONDS,
+    }
+    if client is not None:
+        return {kind: _SharedStore(client, kind, ttl) for kind, ttl in ttls.items()}
+    return {kind: _LocalStore(ttl, config.ENTITY_CACHE_MAX_ENTRIES) for kind, ttl in ttls.items()}
+
+
+# ── Cached interface ──────────────────────────────────────────────────────────
+
+class CachedDatabase:
+    """Read-through, write-invalidate wrapper; unknown attributes go to `inner`."""
+
+    def __init__(self, inner, client=None):
+        self._inner = inner
+        self._stores = _build_stores(client)
+
+    def __getattr__(self, name: str):
+        return getattr(self._inner, name)
+
+    def clear_cache(self) -> None:
+        """Drop every local entry (tests / forced refresh)."""
+        for store in self._stores.values():
+            store.clear()
+
+    def _read_through(self, kind: str, key: str, load: Callable[[], Optional[Any]]) -> Optional[Any]:
+        store = self._stores[kind]
+        value = store.get(key)
+        if value is not None:
+            return value
+        value = load()
+        if value is not None:
+            store.set(key, value)
+        return value
+
+    # --- Users ---
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        return self._read_through(_USER, user_id, lambda: self._inner.get_user(user_id))
+
+    def save_user(self, user: dict) -> None:
+        self._inner.save_user(user)
+        self._stores[_USER].delete(user["userId"])
+
+    # --- Shops ---
+
+    def get_shop(self, shop_id: str) -> Optional[dict]:
+        return self._read_through(_SHOP, shop_id, lambda: self._inner.get_shop(shop_id))
+
+    def save_shop(self, shop: dict) -> None:
+        previous = self.get_shop(shop["shopId"])
+        self._inner.save_shop(shop)
+        self._invalidate_shop(shop["shopId"], shop.get("pincode"), previous)
+
+    def set_shop_status(self, shop_id: str, status: str, updated_at: str) -> Optional[dict]:
+        updated = self._inner.set_shop_status(shop_id, status, updated_at)
+        if updated:
+            self._invalidate_shop(shop_id, updated.get("pincode"), None)
+        return updated
+
+    def migrate_shop_inventory(self, shop: dict) -> None:
+        # Already migrated (every write after the first): nothing changes, nothing to drop.
+        # Listing cards carry no inventory, so a migration leaves the pincode entry valid.
+        if "inventory" not in shop:
+            return
+        self._inner.migrate_shop_inventory(shop)
+        self._stores[_SHOP].delete(shop["shopId"])
+
+    def _invalidate_shop(self, shop_id: str, pincode: Optional[str], previous: Optional[dict]) -> None:
+        self._stores[_SHOP].delete(shop_id)
+        pincodes = {pincode, (previous or {}).get("pincode")} - {None}
+        self._stores[_PINCODE].delete(*pincodes)
+
+    # --- Pincode listings ---
+
+    def get_shop_cards_by_pincode(
+        self, pincode: str, category: Optional[str] = None, status: str = SHOP_STATUS_APPROVED
+    ) -> list:
+        """
+        All listing variants of one pincode share a single entry (variant →
+        cards), so a shop write invalidates them together with one delete.
+        """
+        store = self._stores[_PINCODE]
+        variant = f"{status}#{category or ''}"
+        listings = store.get(pincode) or {}
+        if variant in listings:
+            return listings[variant]
+        cards = self._inner.get_shop_cards_by_pincode(pincode, category, status)
+        listings[variant] = cards
+        store.set(pincode, listings)
+        return cards
+
+    def get_approved_shops_by_pincode(self, pincode: str, category: Optional[str] = None) -> list:
+        """Cached cards, then cached shops; only the uncached shops are batch-read."""
+        cards = self.get_shop_cards_by_pincode(pincode, category)
+        store = self._stores[_SHOP]
+        shops = [store.get(card["shopId"]) for card in cards]
+        missing = [card["shopId"] for card, shop in zip(cards, shops) if shop is None]
+        if missing:
+            loaded = iter(self._inner.batch_get(config.SHOPS_TABLE, [{"shopId": s} for s in missing]))
+            for i, shop in enumerate(shops):
+                if shop is None:
+                    shops[i] = next(loaded)
+                    if shops[i]:
+                        store.set(shops[i]["shopId"], shops[i])
+        return [shop for shop in shops if shop]
+
+
+def cached(inner) -> Any:
+    """Wrap `inner` when ENTITY_CACHE_ENABLED, using the shared tier if configured."""
+    if not config.ENTITY_CACHE_ENABLED:
+        return inner
+    return CachedDatabase(inner, _shared_client())
@@ -0,0 +1,207 @@
+"""
+Local spatial mirror of health facilities, keyed by geohash cell.
+
+Clinics, pharmacies and hospitals barely change week to week, yet every health
+query used to hit Places Nearby Search. A scheduled harvest (see
+src/handlers/harvest.py) copies Places results into the FACILITIES table:
+
+    PK geohash (precision 5, ≈ 4.9 km)   SK facilityKey = "<kind>#<placeId>"
+
+Places is searched one cell at a time, nearest places first, and each kind
+whose search of a cell succeeded without filling a whole page gets a
+"<kind>##coverage" marker row in that cell. A lookup queries only the cells
+that overlap the search circle, and only the `<kind>#` range of each (marker
+and facilities in one query), refines by exact distance and returns the
+nearest results — but only when every one of those cells is marked for the
+kind, so a partially mirrored area still falls back to live Places.
+
+Rows carry a `ttl` (FACILITY_MIRROR_TTL_DAYS) so mirrored Places content never
+outlives the caching window allowed by the Places terms of service.
+"""
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+from src.services.database import db
+from src.services.google_places_service import MAX_RESULTS_PER_REQUEST, google_places
+from src.utils import geohash
+from src.utils.config import config
+from src.utils.constants import COVERAGE_MARKER_KEY, HEALTH_FACILITY_CATEGORIES
+from src.utils.logger import logger
+
+_MAX_PARALLEL_READS = 8  # a 10 km circle overlaps ~25 cells: about 3 rounds of queries
+# Shared across lookups: threads start on first use and stay warm with the container
+_read_pool = ThreadPoolExecutor(max_workers=_MAX_PARALLEL_READS, thread_name_prefix="facility-mirror")
+_FACILITY_FIELDS = ("placeId", "name", "address", "phone", "lat", "lon", "category", "rating")
+
+
+def _kinds_for(kind: str) -> frozenset:
+    if kind == "facilities":
+        return HEALTH_FACILITY_CATEGORIES
+    if kind in HEALTH_FACILITY_CATEGORIES:
+        return frozenset({kind})
+    return frozenset()
+
+
+class FacilityMirror:
+
+    def __init__(self, precision: Optional[int] = None, radius_km: Optional[float] = None):
+        self._precision = precision or config.FACILITY_MIRROR_PRECISION
+        self._radius_km = radius_km or config.FACILITY_MIRROR_RADIUS_KM
+
+    # ── Read path ──────────────────────────────────────────────────────────────
+
+    def nearby(self, lat: float, lon: float, kind: str, max_results: int) -> Optional[List[dict]]:
+        """
+        Nearest mirrored facilities of `kind` within FACILITY_MIRROR_RADIUS_KM,
+        or None when the mirror cannot answer (disabled, unharvested cell,
+        nothing in range, or a read error) and live Places should be used.
+        """
+        kinds = _kinds_for(kind)
+        if not config.FACILITY_MIRROR_ENABLED or not kinds or lat is None or lon is None:
+            return None
+
+        cells = geohash.cells_covering(lat, lon, self._radius_km, self._precision)
+        # One kind: only its "<kind>#" range of each cell; all health kinds: the whole cell
+        read_kind = next(iter(kinds)) if len(kinds) == 1 else None
+        try:
+            per_cell = list(_read_pool.map(lambda cell: db.get_facilities_in_cell(cell, read_kind), cells))
+        except Exception as exc:
+            logger.warning("facility_mirror_read_failed", error=str(exc))
+            return None
+
+        now = int(time.time())
+        items = []
+        missing = []
+        for cell, rows in zip(cells, per_cell):
+            covered = set()
+            for item in rows:
+                if int(item.get("ttl", now + 1)) <= now:  # DynamoDB TTL deletes lazily
+                    continue
+                kind_of_row, _, rest = item["facilityKey"].partition("#")
+                if rest == COVERAGE_MARKER_KEY:
+                    covered.add(kind_of_row)
+                else:
+                    items.append(item)
+            if not kinds <= covered:
+                missing.append(cell)
+        if missing:
+            logger.info("facility_mirror_miss", reason="cell_not_harvested", cell=missing[0], missing=len(missing))
+            return None
+
+        ranked = []
+        for item in items:
+            if item.get("kind") not in kinds:
+                continue
+            distance = geohash.haversine_km(lat, lon, item["lat"], item["lon"])
+            if distance <= self._radius_km:
+                ranked.append((distance, item))
+
+        if not ranked:
+            logger.info("facility_mirror_miss", reason="no_results_in_radius", kind=kind)
+            return None
+
+        ranked.sort(key=lambda pair: pair[0])
+        results: List[dict] = []
+        seen: set = set()
+        for _, item in ranked:
+            if item["placeId"] in seen:
+                continue
+            seen.add(item["placeId"])
+            facility = {field: item.get(field) for field in _FACILITY_FIELDS}
+            facility["source"] = "google"
+            results.append(facility)
+            if len(results) >= max_results:
+                break
+        logger.info("facility_mirror_hit", kind=kind, cells=len(cells), results=len(results))
+        return results
+
+    # ── Harvest ────────────────────────────────────────────────────────────────
+
+    def harvest_area(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        kinds: Iterable[str] = tuple(sorted(HEALTH_FACILITY_CATEGORIES)),
+    ) -> dict:
+        """
+        Copy Places results for every cell covering the circle into the mirror.
+        One Nearby Search per (cell, kind), centred on the cell and sized to its
+        circumscribed circle. A cell is marked covered for a kind only if that
+        search succeeded; after a failure it keeps its previous marker (or
+        none), so lookups fall back to live Places rather than trust an empty
+        cell. A search that fills a whole page may have missed places, so it
+        leaves its kind unmarked too (its rows are still saved).
+        Returns {"cells": n, "facilities": n, "failedCells": n, "saturatedCells": n},
+        counting as "cells" those marked for every kind.
+        """
+        if not config.GOOGLE_PLACES_API_KEY:
+            logger.warning("facility_harvest_skipped", reason="no_api_key")
+            return {"cells": 0, "facilities": 0, "failedCells": 0, "saturatedCells": 0}
+
+        kinds = list(kinds)
+        harvested_at = datetime.now(timezone.utc).isoformat()
+        ttl = int(time.time()) + config.FACILITY_MIRROR_TTL_DAYS * 86400
+        cell_count = 0
+        facility_count = 0
+        failed_cells = 0
+        saturated_cells = 0
+
+        for cell in geohash.cells_covering(lat, lon, radius_km, self._precision):
+            lat_min, lat_max, lon_min, lon_max = geohash.bounds(cell)
+            c_lat, c_lon = (lat_min + lat_max) / 2, (lon_min + lon_max) / 2
+            half_diag_km = geohash.haversine_km(lat_min, lon_min, lat_max, lon_max) / 2
+            radius_m = int(math.ceil(half_diag_km * 1000))
+
+            rows = {}
+            covered = []
+            failed = False
+            saturated = False
+            for kind in kinds:
+                places = google_places.harvest_page(c_lat, c_lon, kind, radius_m)
+                if places is None:
+                    failed = True
+                    continue
+                if len(places) >= MAX_RESULTS_PER_REQUEST:
+                    saturated = True
+                else:
+                    covered.append(kind)
+                for place in places:
+                    if not place.get("placeId") or place.get("lat") is None or place.get("lon") is None:
+                        continue
+                    row = {field: place.get(field) for field in _FACILITY_FIELDS}
+                    row.update(
+                        geohash=geohash.encode(place["lat"], place["lon"], self._precision),
+                        facilityKey=f"{kind}#{place['placeId']}",
+                        kind=kind,
+                        harvestedAt=harvested_at,
+                        ttl=ttl,
+                    )
+                    if row["rating"] is None:
+                        del row["rating"]
+                    rows[(row["geohash"], row["facilityKey"])] = row
+
+            db.save_facilities(list(rows.values()))
+            facility_count += len(rows)
+            if covered:
+                db.mark_cell_harvested(cell, covered, harvested_at, ttl)
+            if failed:
+                failed_cells += 1
+                logger.warning("facility_harvest_cell_failed", cell=cell)
+                continue
+            if saturated:
+                saturated_cells += 1
+                logger.info("facility_harvest_cell_saturated", cell=cell)
+                continue
+            cell_count += 1
+
+        logger.info("facility_harvest_done", cells=cell_count, facilities=facility_count,
+                    failed_cells=failed_cells, saturated_cells=saturated_cells)
+        return {"cells": cell_count, "facilities": facility_count,
+                "failedCells": failed_cells, "saturatedCells": saturated_cells}
+
+
+facility_mirror = FacilityMirror()
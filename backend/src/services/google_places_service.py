@@ -6,10 +6,21 @@ location geocoding and facility/shop discovery in one API call.
 
 Text Search  → used when user mentions a city  ("clinics in Kota")
 Nearby Search → used when GPS coordinates are available from the app
+
+Failed or empty lookups are negatively cached for a short TTL, and a circuit
+breaker stops calling the API while it is failing (outage / quota exhausted)
+so requests fail fast instead of each waiting out the HTTP timeout. Only
+endpoint failures (5xx, 429, timeouts, network errors) count toward the
+breaker; a request the API rejects (e.g. 404 for an unknown place ID) does not.
 """
+import hashlib
 import json
+import threading
+import time
 import urllib.error
+import urllib.parse
 import urllib.request
+from collections import OrderedDict
 from typing import List, Optional
 
 from src.utils.config import config
@@ -18,15 +29,31 @@ from src.utils.logger import logger
 _TEXT_SEARCH_URL = "https://places.googleapis.com/v1/places:searchText"
 _NEARBY_SEARCH_URL = "https://places.googleapis.com/v1/places:searchNearby"
 
-# Fields we request — only pay for what we need
-_FIELD_MASK = (
-    "places.displayName,"
-    "places.formattedAddress,"
-    "places.nationalPhoneNumber,"
-    "places.location,"
-    "places.primaryTypeDisplayName,"
-    "places.rating"
-)
+# Field-mask tiers — Places bills per SKU of the most expensive field requested,
+# so low-bandwidth clients that only show names skip address/phone/rating.
+FIELD_TIER_MINIMAL = "minimal"    # id, name, coordinates
+FIELD_TIER_STANDARD = "standard"  # + address, type
+FIELD_TIER_FULL = "full"          # + phone, rating
+FIELD_TIERS = (FIELD_TIER_MINIMAL, FIELD_TIER_STANDARD, FIELD_TIER_FULL)
+
+_TIER_FIELDS: dict = {
+    FIELD_TIER_MINIMAL:  ("id", "displayName", "location"),
+    FIELD_TIER_STANDARD: ("id", "displayName", "location", "formattedAddress", "primaryTypeDisplayName"),
+    FIELD_TIER_FULL:     ("id", "displayName", "location", "formattedAddress", "primaryTypeDisplayName",
+                          "nationalPhoneNumber", "rating"),
+}
+_FIELD_MASKS: dict = {
+    tier: ",".join(f"places.{field}" for field in fields)
+    for tier, fields in _TIER_FIELDS.items()
+}
+
+# Place Details (expanded card) — fields are not prefixed with "places."
+_DETAILS_URL = "https://places.googleapis.com/v1/places/{place_id}"
+_DETAILS_FIELD_MASK = ",".join(_TIER_FIELDS[FIELD_TIER_FULL] + (
+    "currentOpeningHours.openNow",
+    "currentOpeningHours.weekdayDescriptions",
+    "googleMapsUri",
+))
 
 # Google Places API (New) valid types for includedTypes in searchNearby.
 # Only types from Table A are accepted — "clinic" is NOT a valid standalone
@@ -39,6 +66,9 @@ _INCLUDED_TYPES: dict = {
     "shops":      ["grocery_store", "supermarket", "convenience_store"],
 }
 
+# Text and Nearby Search return at most this many places per request
+MAX_RESULTS_PER_REQUEST = 20
+
 # Radius ladder for auto-expansion when no results are found at a tighter radius
 _NEARBY_RADIUS_LADDER = [10_000, 20_000, 50_000]  # 10 km → 20 km → 50 km
 
@@ -52,7 +82,161 @@ _KIND_SEARCH_TERM: dict = {
 }
 
 
+# ── Resilience ────────────────────────────────────────────────────────────────
+
+class _RequestRejected(Exception):
+    """The API answered with a 4xx other than 429: the request, not the endpoint, is at fault."""
+
+
+class _NegativeCache:
+    """Bounded TTL set of request keys that recently failed or returned nothing."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self._ttl = ttl_seconds
+        self._max = max_entries
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False
+            return True
+
+    def add(self, key: str) -> None:
+        with self._lock:
+            self._entries[key] = time.monotonic() + self._ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class _CircuitBreaker:
+    """
+    Classic closed → open → half-open breaker around the Places endpoint.
+
+    closed    – calls flow; consecutive failures are counted
+    open      – calls are rejected until reset_seconds have passed
+    half-open – exactly one probe call is let through; success closes the
+                breaker, failure re-opens it for another reset window
+
+    allow() returns a ticket (None when the call is rejected) that the caller
+    hands back with its result. Every state change starts a new generation,
+    so a late result from a call admitted before it (a slow call finishing
+    after the breaker opened, or while a probe is out) is ignored and cannot
+    close the breaker or release the probe.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: int):
+        self._threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _enter(self, state: str) -> None:
+        """Switch state under the lock; results of calls admitted before become stale."""
+        self._state = state
+        self._generation += 1
+        self._probe_in_flight = False
+
+    def allow(self) -> Optional[int]:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return self._generation
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self._reset_seconds:
+                    return None
+                self._enter(self.HALF_OPEN)
+            # HALF_OPEN: only one probe at a time
+            if self._probe_in_flight:
+                return None
+            self._probe_in_flight = True
+            return self._generation
+
+    def record_success(self, ticket: int) -> None:
+        with self._lock:
+            if ticket != self._generation:
+                return
+            if self._state != self.CLOSED:
+                logger.info("google_places_breaker_closed")
+                self._enter(self.CLOSED)
+            self._failures = 0
+
+    def record_failure(self, ticket: int) -> None:
+        with self._lock:
+            if ticket != self._generation:
+                return
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self._threshold:
+                logger.warning("google_places_breaker_opened", failures=self._failures)
+                self._enter(self.OPEN)
+                self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._enter(self.CLOSED)
+            self._failures = 0
+
+
+def _nearby_payload(
+    lat: float, lon: float, kind: str, radius_m: int, max_results: int, rank_preference: Optional[str] = None
+) -> dict:
+    payload = {
+        "includedTypes": _INCLUDED_TYPES.get(kind, _INCLUDED_TYPES["facilities"]),
+        "maxResultCount": min(max_results, MAX_RESULTS_PER_REQUEST),
+        "locationRestriction": {
+            "circle": {
+                "center": {"latitude": lat, "longitude": lon},
+                "radius": float(radius_m),
+            }
+        },
+    }
+    if rank_preference:
+        payload["rankPreference"] = rank_preference
+    return payload
+
+
+def _request_key(url: str, payload: dict) -> str:
+    raw = f"{url}|{json.dumps(payload, sort_keys=True)}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
 class GooglePlacesService:
+    def __init__(self):
+        self._negative_cache = _NegativeCache(
+            config.PLACES_NEGATIVE_CACHE_TTL_SECONDS,
+            config.PLACES_NEGATIVE_CACHE_MAX_ENTRIES,
+        )
+        self._breaker = _CircuitBreaker(
+            config.PLACES_BREAKER_FAILURE_THRESHOLD,
+            config.PLACES_BREAKER_RESET_SECONDS,
+        )
+
+    def reset_resilience_state(self) -> None:
+        """Forget negative-cache entries and close the breaker (tests / warm reuse)."""
+        self._negative_cache.clear()
+        self._breaker.reset()
+
     def search_facilities(
         self,
         query: str,
@@ -62,9 +246,11 @@ class GooglePlacesService:
         max_results: int = 5,
         force_text_search: bool = False,
         pincode: Optional[str] = None,
+        field_tier: str = FIELD_TIER_FULL,
     ) -> List[dict]:
         """
-        Return up to max_results places matching `kind`.
+        Return up to max_results places matching `kind`, with the fields of
+        `field_tier` (minimal / standard / full).
 
         Routing decision (in priority order):
           1. GPS + no named-location override  → Nearby Search (10 km, auto-expands to 20/50 km)
@@ -78,19 +264,26 @@ class GooglePlacesService:
 
         if lat is not None and lon is not None and not force_text_search:
             # Case 1: precise GPS-based search
-            places = self._nearby_search(lat, lon, kind, max_results)
+            places = self._nearby_search(lat, lon, kind, max_results, field_tier=field_tier)
         elif force_text_search:
             # Case 2: user named a specific city — use their query verbatim
-            places = self._text_search(query, kind, max_results, pincode=None)
+            places = self._text_search(query, kind, max_results, pincode=None, field_tier=field_tier)
         else:
             # Cases 3 & 4: no GPS — anchor to pincode if we have one
-            places = self._text_search(query, kind, max_results, pincode=pincode)
+            places = self._text_search(query, kind, max_results, pincode=pincode, field_tier=field_tier)
 
         return places[:max_results]
 
     # ── Text Search ────────────────────────────────────────────────────────────
 
-    def _text_search(self, query: str, kind: str, max_results: int, pincode: Optional[str] = None) -> List[dict]:
+    def _text_search(
+        self,
+        query: str,
+        kind: str,
+        max_results: int,
+        pincode: Optional[str] = None,
+        field_tier: str = FIELD_TIER_FULL,
+    ) -> List[dict]:
         if pincode:
             # Build a precise, pincode-anchored query instead of the vague raw text.
             # e.g. "nearby clinics" + pincode "324008"  →  "clinics and doctors near 324008, India"
@@ -102,54 +295,151 @@ class GooglePlacesService:
         types = _INCLUDED_TYPES.get(kind, _INCLUDED_TYPES["facilities"])
         payload: dict = {
             "textQuery": search_query,
-            "maxResultCount": min(max_results, 20),
+            "maxResultCount": min(max_results, MAX_RESULTS_PER_REQUEST),
             "languageCode": "en",
         }
         # Use the first type as a primary filter to narrow results
         if types:
             payload["includedType"] = types[0]
 
-        logger.info("google_places_text_search", query=search_query, kind=kind)
-        return self._call(_TEXT_SEARCH_URL, payload)
+        logger.info("google_places_text_search", query=search_query, kind=kind, field_tier=field_tier)
+        return self._call(_TEXT_SEARCH_URL, payload, field_mask=_FIELD_MASKS[field_tier])
 
     # ── Nearby Search ──────────────────────────────────────────────────────────
 
-    def _nearby_search(self, lat: float, lon: float, kind: str, max_results: int) -> List[dict]:
-        types = _INCLUDED_TYPES.get(kind, _INCLUDED_TYPES["facilities"])
+    def _nearby_search(
+        self, lat: float, lon: float, kind: str, max_results: int, field_tier: str = FIELD_TIER_FULL
+    ) -> List[dict]:
         for radius in _NEARBY_RADIUS_LADDER:
-            payload: dict = {
-                "includedTypes": types,
-                "maxResultCount": min(max_results, 20),
-                "locationRestriction": {
-                    "circle": {
-                        "center": {"latitude": lat, "longitude": lon},
-                        "radius": float(radius),
-                    }
-                },
-            }
-            logger.info("google_places_nearby_search", lat=lat, lon=lon, kind=kind, radius_km=radius // 1000)
-            results = self._call(_NEARBY_SEARCH_URL, payload)
+            results = self.nearby_page(lat, lon, kind, radius, max_results, field_tier=field_tier)
             if results:
                 return results
             logger.info("google_places_no_results_expanding", radius_km=radius // 1000)
         return []
 
+    def nearby_page(
+        self,
+        lat: float,
+        lon: float,
+        kind: str,
+        radius_m: int,
+        max_results: int = 20,
+        field_tier: str = FIELD_TIER_FULL,
+    ) -> List[dict]:
+        """Single Nearby Search at a fixed radius (no ladder)."""
+        logger.info("google_places_nearby_search", lat=lat, lon=lon, kind=kind,
+                    radius_km=radius_m // 1000, field_tier=field_tier)
+        return self._call(_NEARBY_SEARCH_URL, _nearby_payload(lat, lon, kind, radius_m, max_results),
+                          field_mask=_FIELD_MASKS[field_tier])
+
+    def harvest_page(self, lat: float, lon: float, kind: str, radius_m: int) -> Optional[List[dict]]:
+        """
+        Nearby Search for the facility harvest: None on failure, so an outage is
+        not mistaken for an empty area. Bypasses the breaker and negative cache,
+        which answer [] for both. Ranked by distance, so a full page of
+        MAX_RESULTS_PER_REQUEST results is the nearest places rather than the most
+        popular ones, and may not be all of them.
+        """
+        logger.info("google_places_harvest_search", lat=lat, lon=lon, kind=kind, radius_km=radius_m // 1000)
+        payload = _nearby_payload(lat, lon, kind, radius_m, MAX_RESULTS_PER_REQUEST, rank_preference="DISTANCE")
+        try:
+            return self._fetch(_NEARBY_SEARCH_URL, payload, _FIELD_MASKS[FIELD_TIER_FULL])
+        except _RequestRejected:
+            return None
+
+    # ── Place Details ──────────────────────────────────────────────────────────
+
+    def get_place_details(self, place_id: str) -> Optional[dict]:
+        """
+        Full details for one place (expanded facility card): the search fields
+        plus opening hours and a Maps link. Returns None when unavailable; an
+        unknown place ID is not counted as a breaker failure.
+        """
+        if not config.GOOGLE_PLACES_API_KEY:
+            logger.warning("google_places_key_missing")
+            return None
+        ticket = self._breaker.allow()
+        if ticket is None:
+            logger.warning("google_places_breaker_open_skip", state=self._breaker.state)
+            return None
+
+        logger.info("google_places_details", place_id=place_id)
+        try:
+            body = self._request(_DETAILS_URL.format(place_id=urllib.parse.quote(place_id, safe="")), None, _DETAILS_FIELD_MASK)
+        except _RequestRejected:
+            self._breaker.record_success(ticket)
+            return None
+        if body is None:
+            self._breaker.record_failure(ticket)
+            return None
+        self._breaker.record_success(ticket)
+
+        parsed = self._parse([body])
+        if not parsed:
+            return None
+        details = parsed[0]
+        hours = body.get("currentOpeningHours") or {}
+        details["openNow"] = hours.get("openNow")
+        details["openingHours"] = hours.get("weekdayDescriptions", [])
+        details["mapsUrl"] = body.get("googleMapsUri", "")
+        return details
+
     # ── HTTP ───────────────────────────────────────────────────────────────────
 
-    def _call(self, url: str, payload: dict) -> List[dict]:
-        data = json.dumps(payload).encode()
-        req = urllib.request.Request(
-            url,
-            data=data,
-            headers={
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": config.GOOGLE_PLACES_API_KEY,
-                "X-Goog-FieldMask": _FIELD_MASK,
-            },
-        )
+    def _call(self, url: str, payload: dict, field_mask: str = _FIELD_MASKS[FIELD_TIER_FULL]) -> List[dict]:
+        key = _request_key(url, payload)
+        if key in self._negative_cache:
+            logger.info("google_places_negative_cache_hit")
+            return []
+        ticket = self._breaker.allow()
+        if ticket is None:
+            logger.warning("google_places_breaker_open_skip", state=self._breaker.state)
+            return []
+
+        try:
+            places = self._fetch(url, payload, field_mask)
+        except _RequestRejected:
+            places = []
+        if places is None:
+            self._breaker.record_failure(ticket)
+            self._negative_cache.add(key)
+            return []
+
+        self._breaker.record_success(ticket)
+        if not places:
+            self._negative_cache.add(key)
+        return places
+
+    def _fetch(self, url: str, payload: dict, field_mask: str) -> Optional[List[dict]]:
+        """
+        POST a search to the Places API. Returns parsed places, or None if the
+        endpoint failed; raises _RequestRejected if it rejected the request.
+        """
+        body = self._request(url, payload, field_mask)
+        if body is None:
+            return None
+        places = body.get("places", [])
+        logger.info("google_places_response", count=len(places))
+        return self._parse(places)
+
+    def _request(self, url: str, payload: Optional[dict], field_mask: str) -> Optional[dict]:
+        """
+        POST `payload` (GET when None) and return the decoded JSON body, or
+        None if the endpoint failed (5xx, 429, timeout, network error). A 4xx
+        other than 429 raises _RequestRejected.
+        """
+        headers = {
+            "X-Goog-Api-Key": config.GOOGLE_PLACES_API_KEY,
+            "X-Goog-FieldMask": field_mask,
+        }
+        data = None
+        if payload is not None:
+            data = json.dumps(payload).encode()
+            headers["Content-Type"] = "application/json"
+        req = urllib.request.Request(url, data=data, headers=headers)
         try:
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                body = json.loads(resp.read())
+            with urllib.request.urlopen(req, timeout=config.GOOGLE_PLACES_TIMEOUT_SECONDS) as resp:
+                return json.loads(resp.read())
         except urllib.error.HTTPError as exc:
             try:
                 err_body = exc.read().decode("utf-8", errors="replace")
@@ -157,14 +447,12 @@ class GooglePlacesService:
                 err_body = ""
             logger.warning("google_places_request_failed",
                            status=exc.code, error=str(exc), body=err_body)
-            return []
+            if 400 <= exc.code < 500 and exc.code != 429:
+                raise _RequestRejected(exc.code) from exc
+            return None
         except Exception as exc:
             logger.warning("google_places_request_failed", error=str(exc))
-            return []
-
-        places = body.get("places", [])
-        logger.info("google_places_response", count=len(places))
-        return self._parse(places)
+            return None
 
     # ── Parser ─────────────────────────────────────────────────────────────────
 
@@ -182,6 +470,7 @@ class GooglePlacesService:
                 (place.get("primaryTypeDisplayName") or {}).get("text", "")
             )
             results.append({
+                "placeId": place.get("id", ""),
                 "name": name,
                 "address": place.get("formattedAddress", ""),
                 "phone": place.get("nationalPhoneNumber", ""),
@@ -0,0 +1,97 @@
+"""
+Named-place → lat/lon resolver backed by the GEO_CACHE table.
+
+The first time the LLM extracts a place ("Kota", "Aklera") we still have to run
+a Places Text Search; the first result's coordinates are then cached so every
+later query for the same place can use Nearby Search (and its result caches)
+instead of another searchText call.
+
+Tiers:
+  1. in-process LRU  – free, survives warm Lambda invocations
+  2. GEO_CACHE table – permanent, shared by all containers (coordinates are stable)
+"""
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.services.database import db
+from src.utils.logger import logger
+
+_MEMORY_MAX_ENTRIES = 1024
+_KEY_PREFIX = "place:"
+
+Coordinates = Tuple[float, float]
+
+
+def _location_key(place: str) -> str:
+    normalized = re.sub(r"\s+", " ", place.lower().strip().strip(".,!?\"'"))
+    return f"{_KEY_PREFIX}{normalized}"
+
+
+class LocationResolver:
+    def __init__(self, max_entries: int = _MEMORY_MAX_ENTRIES):
+        self._max = max_entries
+        self._memory: "OrderedDict[str, Coordinates]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, place: str) -> Optional[Coordinates]:
+        """Return cached (lat, lon) for a named place, or None if never seen."""
+        if not place:
+            return None
+        key = _location_key(place)
+
+        with self._lock:
+            coords = self._memory.get(key)
+            if coords:
+                self._memory.move_to_end(key)
+                return coords
+
+        try:
+            item = db.get_geo_cache(key)
+        except Exception as exc:
+            logger.warning("geo_cache_read_failed", key=key, error=str(exc))
+            return None
+        if not item:
+            return None
+
+        try:
+            coords = (float(item["lat"]), float(item["lon"]))
+        except (KeyError, TypeError, ValueError):
+            return None
+        self._remember_in_memory(key, coords)
+        logger.info("geo_cache_hit", key=key)
+        return coords
+
+    def remember(self, place: str, places: List[dict]) -> None:
+        """Cache the first Places result's coordinates for `place`."""
+        if not place or not places:
+            return
+        first = places[0]
+        lat, lon = first.get("lat"), first.get("lon")
+        if lat is None or lon is None:
+            return
+        key = _location_key(place)
+        coords = (float(lat), float(lon))
+        self._remember_in_memory(key, coords)
+        try:
+            db.set_geo_cache(key, coords[0], coords[1])
+        except Exception as exc:
+            logger.warning("geo_cache_write_failed", key=key, error=str(exc))
+            return
+        logger.info("geo_cache_stored", key=key)
+
+    def clear(self) -> None:
+        """Drop the in-process tier (tests / forced refresh)."""
+        with self._lock:
+            self._memory.clear()
+
+    def _remember_in_memory(self, key: str, coords: Coordinates) -> None:
+        with self._lock:
+            self._memory[key] = coords
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max:
+                self._memory.popitem(last=False)
+
+
+location_resolver = LocationResolver()
@@ -0,0 +1,663 @@
+"""
+In-process backend for tests and benchmarks (DB_BACKEND=memory).
+Same interface as DynamoDBService, with every table held in Python dicts.
+
+Each table is declared below with the key schema and GSIs from serverless.yml.
+Every index — the base table's partition key included — is a hash index
+(partition value → primary keys) maintained on write, so a query reads only
+its own partition, as on DynamoDB:
+
+  - indexes are sparse: an item missing an index key attribute is not indexed
+  - KEYS_ONLY / INCLUDE projections are applied to index reads
+  - partitions come back in range-key order (ties by primary key), so results
+    and page cursors are deterministic
+  - TTL tables hide items whose `ttl` epoch has passed and drop them on access
+  - MEMORY_DB_LATENCY_MS adds a fixed delay to every table round trip, so
+    handler benchmarks can model the network without moto's overhead
+
+Items are deep-copied on the way in and out; nothing is persisted, and
+`clear()` empties every table.
+"""
+import copy
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+from src.models.order import merge_order_pages, order_page_start, with_order_keys
+from src.models.shop import geo_key, listing_keys, nearest_cards, status_keys, with_listing_keys
+from src.utils import geohash
+from src.utils.config import config
+from src.utils.constants import (
+    COVERAGE_MARKER_KEY,
+    MAX_NEARBY_FACILITIES,
+    ORDER_STATUS_PENDING,
+    SHOP_CARD_FIELDS,
+    SHOP_GEO_CELL_PRECISION,
+    SHOP_STATS_ALL_TIME,
+    SHOP_STATUS_APPROVED,
+)
+from src.utils.logger import logger
+from src.utils.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from src.utils.sharding import shard_keys
+
+
+@dataclass(frozen=True)
+class _Index:
+    hash_key: str
+    range_key: Optional[str] = None
+    # Non-key attributes an index read returns; None means ALL
+    projection: Optional[tuple] = None
+
+
+@dataclass(frozen=True)
+class _Schema:
+    hash_key: str
+    range_key: Optional[str] = None
+    indexes: Dict[str, _Index] = field(default_factory=dict)
+    ttl_attribute: Optional[str] = None
+
+
+_KEYS_ONLY: tuple = ()
+
+_SCHEMAS: Dict[str, _Schema] = {
+    config.USERS_TABLE: _Schema("userId"),
+    config.CONVERSATIONS_TABLE: _Schema("conversationId", indexes={
+        "UserConversationsIndex": _Index("userId"),
+        "UserRecentConversationsIndex": _Index("userId", "updatedAt", _KEYS_ONLY),
+    }),
+    config.CONVERSATION_TURNS_TABLE: _Schema("conversationId", "turnSeq"),
+    config.SHOPS_TABLE: _Schema("shopId", indexes={
+        "PincodeShardIndex": _Index("pincodeShard"),
+        "PincodeStatusIndex": _Index("pincodeStatus", "category", SHOP_CARD_FIELDS),
+        "ShopGeoIndex": _Index("geoStatus", "geohash", SHOP_CARD_FIELDS),
+    }),
+    config.INVENTORY_TABLE: _Schema("shopId", "itemId"),
+    config.ORDERS_TABLE: _Schema("orderId", indexes={
+        "UserOrdersIndex": _Index("userId"),
+        "ShopOrdersShardIndex": _Index("shopShard", "createdAt"),
+    }),
+    config.SHOP_STATS_TABLE: _Schema("shopId", "statDate"),
+    config.RESPONSE_CACHE_TABLE: _Schema("cacheKey", ttl_attribute="ttl"),
+    config.GEO_CACHE_TABLE: _Schema("locationKey"),
+    config.FACILITIES_TABLE: _Schema("geohash", "facilityKey", ttl_attribute="ttl"),
+}
+
+
+class _Table:
+    """Items by primary key plus one hash index per GSI (index None = base table)."""
+
+    def __init__(self, name: str, schema: _Schema):
+        self.name = name
+        self.schema = schema
+        self.key_names = tuple(k for k in (schema.hash_key, schema.range_key) if k)
+        self.index_defs: Dict[Optional[str], _Index] = {
+            None: _Index(schema.hash_key, schema.range_key), **schema.indexes
+        }
+        self.items: Dict[tuple, dict] = {}
+        self.partitions: Dict[Optional[str], Dict[Any, set]] = {
+            name: defaultdict(set) for name in self.index_defs
+        }
+
+    def key_of(self, item: dict) -> tuple:
+        try:
+            return tuple(item[k] for k in self.key_names)
+        except KeyError as exc:
+            raise ValueError(f"{self.name}: missing key attribute {exc}") from None
+
+    def _index_keys(self, item: dict):
+        for name, index in self.index_defs.items():
+            if index.hash_key in item and (index.range_key is None or index.range_key in item):
+                yield name, item[index.hash_key]
+
+    def put(self, item: dict) -> None:
+        key = self.key_of(item)
+        self.delete(key)
+        self.items[key] = item
+        for name, hash_value in self._index_keys(item):
+            self.partitions[name][hash_value].add(key)
+
+    def delete(self, key: tuple) -> Optional[dict]:
+        old = self.items.pop(key, None)
+        if old is not None:
+            for name, hash_value in self._index_keys(old):
+                bucket = self.partitions[name][hash_value]
+                bucket.discard(key)
+                if not bucket:
+                    del self.partitions[name][hash_value]
+        return old
+
+    def _expired(self, item: dict, now: float) -> bool:
+        ttl = self.schema.ttl_attribute
+        return ttl is not None and ttl in item and int(item[ttl]) < now
+
+    def get(self, key: tuple) -> Optional[dict]:
+        item = self.items.get(key)
+        if item is not None and self._expired(item, time.time()):
+            self.delete(key)
+            return None
+        return item
+
+    def sort_key(self, index_name: Optional[str], item: dict) -> tuple:
+        range_key = self.index_defs[index_name].range_key
+        return (item[range_key] if range_key else None, self.key_of(item))
+
+    def partition(self, index_name: Optional[str], hash_value: Any) -> list[dict]:
+        """Live items of one index partition in (range key, primary key) order."""
+        if index_name not in self.index_defs:
+            raise ValueError(f"{self.name}: no index {index_name}")
+        now = time.time()
+        items = []
+        for key in list(self.partitions[index_name].get(hash_value, ())):
+            item = self.items[key]
+            if self._expired(item, now):
+                self.delete(key)
+            else:
+                items.append(item)
+        items.sort(key=lambda i: self.sort_key(index_name, i))
+        return items
+
+    def scan(self) -> list[dict]:
+        now = time.time()
+        for key, item in list(self.items.items()):
+            if self._expired(item, now):
+                self.delete(key)
+        return list(self.items.values())
+
+    def project(self, index_name: Optional[str], item: dict, projection: Optional[list]) -> dict:
+        index = self.index_defs[index_name]
+        if index.projection is not None:
+            kept = {*self.key_names, index.hash_key, index.range_key, *index.projection}
+            item = {k: v for k, v in item.items() if k in kept}
+        if projection:
+            item = {k: v for k, v in item.items() if k in projection}
+        return copy.deepcopy(item)
+
+
+class InMemoryDBService:
+    """Dict-backed implementation of the DynamoDBService interface."""
+
+    def __init__(self, latency_ms: Optional[float] = None):
+        self._latency_s = (config.MEMORY_DB_LATENCY_MS if latency_ms is None else latency_ms) / 1000
+        self._lock = threading.RLock()
+        self._tables = {name: _Table(name, schema) for name, schema in _SCHEMAS.items()}
+
+    def clear(self) -> None:
+        """Empty every table."""
+        with self._lock:
+            self._tables = {name: _Table(name, schema) for name, schema in _SCHEMAS.items()}
+
+    def _table(self, table_name: str) -> _Table:
+        """One simulated round trip to `table_name`."""
+        if self._latency_s:
+            time.sleep(self._latency_s)
+        try:
+            return self._tables[table_name]
+        except KeyError:
+            raise ValueError(f"Unknown table: {table_name}") from None
+
+    # --- Generic CRUD (same interface as DynamoDBService) ---
+
+    def put_item(self, table_name: str, item: dict) -> None:
+        table = self._table(table_name)
+        with self._lock:
+            table.put(copy.deepcopy(item))
+
+    def get_item(self, table_name: str, key: dict) -> Optional[dict]:
+        table = self._table(table_name)
+        with self._lock:
+            return copy.deepcopy(table.get(table.key_of(key)))
+
+    def delete_item(self, table_name: str, key: dict) -> None:
+        table = self._table(table_name)
+        with self._lock:
+            table.delete(table.key_of(key))
+
+    def batch_write(self, table_name: str, put_items: list = (), delete_keys: list = ()) -> None:
+        table = self._table(table_name)
+        with self._lock:
+            for item in put_items:
+                table.put(copy.deepcopy(item))
+            for key in delete_keys:
+                table.delete(table.key_of(key))
+
+    def batch_get(self, table_name: str, keys: list, projection: Optional[list] = None) -> list:
+        if not keys:
+            return []
+        table = self._table(table_name)
+        fields = [*table.key_names, *projection] if projection else None
+        with self._lock:
+            found = [table.get(table.key_of(k)) for k in keys]
+            return [table.project(None, item, fields) if item is not None else None for item in found]
+
+    def query_by_index(
+        self,
+        table_name: str,
+        index_name: str,
+        key_name: str,
+        key_value: str,
+        *,
+        limit: Optional[int] = None,
+        scan_forward: bool = True,
+        filters: Optional[dict] = None,
+        projection: Optional[list] = None,
+    ) -> list:
+        items, _ = self._query(table_name, index_name, key_name, key_value, limit=limit,
+                               scan_forward=scan_forward, filters=filters, projection=projection)
+        return items
+
+    def query_sharded_index(
+        self,
+        table_name: str,
+        index_name: str,
+        key_name: str,
+        key_values: list,
+        *,
+        projection: Optional[list] = None,
+    ) -> list:
+        """Same contract as DynamoDBService.query_sharded_index; shards are read one after another."""
+        return [
+            item for value in key_values
+            for item in self.query_by_index(table_name, index_name, key_name, value, projection=projection)
+        ]
+
+    def query_page(
+        self,
+        table_name: str,
+        index_name: Optional[str],
+        key_name: str,
+        key_value: str,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        scan_forward: bool = True,
+        filters: Optional[dict] = None,
+        projection: Optional[list] = None,
+    ) -> tuple:
+        """
+        Same contract as DynamoDBService.query_page. The cursor holds the last
+        item's table and index keys, like DynamoDB's LastEvaluatedKey.
+        """
+        return self._query(table_name, index_name, key_name, key_value, limit=limit,
+                           start=decode_cursor(cursor), scan_forward=scan_forward,
+                           filters=filters, projection=projection)
+
+    def query_by_key(
+        self, table_name: str, key_name: str, key_value: str, projection: Optional[list] = None
+    ) -> list:
+        return self.query_by_index(table_name, None, key_name, key_value, projection=projection)
+
+    def _query(
+        self,
+        table_name: str,
+        index_name: Optional[str],
+        key_name: str,
+        key_value: Any,
+        *,
+        limit: Optional[int] = None,
+        start: Optional[dict] = None,
+        scan_forward: bool = True,
+        filters: Optional[dict] = None,
+        projection: Optional[list] = None,
+    ) -> tuple:
+        table = self._table(table_name)
+        index = table.index_defs.get(index_name)
+        if index is None or index.hash_key != key_name:
+            raise ValueError(f"{table_name}: {key_name} is not the partition key of {index_name}")
+        with self._lock:
+            items = table.partition(index_name, key_value)
+            if not scan_forward:
+                items.reverse()
+            if start:
+                if start.get(key_name) != key_value:
+                    raise ValueError("invalid cursor")
+                try:
+                    position = table.sort_key(index_name, start)
+                except (KeyError, ValueError) as exc:
+                    raise ValueError("invalid cursor") from exc
+                if scan_forward:
+                    items = [i for i in items if table.sort_key(index_name, i) > position]
+                else:
+                    items = [i for i in items if table.sort_key(index_name, i) < position]
+            if filters:
+                items = [i for i in items if all(i.get(k) == v for k, v in filters.items())]
+            next_cursor = None
+            if limit is not None and len(items) > limit:
+                items = items[:limit]
+                last = items[-1]
+                next_cursor = encode_cursor({
+                    k: last[k] for k in {*table.key_names, index.hash_key, index.range_key} if k
+                })
+            return [table.project(index_name, i, projection) for i in items], next_cursor
+
+    def scan_all(self, table_name: str, ProjectionExpression: Optional[str] = None) -> Iterator[dict]:
+        """Every item of the table; only ProjectionExpression (plain names) is supported."""
+        table = self._table(table_name)
+        fields = [f.strip() for f in ProjectionExpression.split(",")] if ProjectionExpression else None
+        with self._lock:
+            items = [table.project(None, i, fields) for i in table.scan()]
+        yield from items
+
+    # --- Domain helpers (same interface as DynamoDBService) ---
+
+    def get_user(self, user_id: str) -> Optional[dict]:
+        return self.get_item(config.USERS_TABLE, {"userId": user_id})
+
+    def save_user(self, user: dict) -> None:
+        self.put_item(config.USERS_TABLE, user)
+
+    # --- Conversations: header item + one CONVERSATION_TURNS item per message ---
+
+    def get_conversation(self, conversation_id: str) -> Optional[dict]:
+        """Header item only (no messages)."""
+        return self.get_item(config.CONVERSATIONS_TABLE, {"conversationId": conversation_id})
+
+    def save_conversation(self, conversation: dict) -> None:
+        """Legacy whole-document write — new code appends turns instead."""
+        self.put_item(config.CONVERSATIONS_TABLE, conversation)
+
+    def get_conversations_by_user(self, user_id: str) -> list:
+        return self.query_by_index(
+            config.CONVERSATIONS_TABLE, "UserConversationsIndex", "userId", user_id
+        )
+
+    def get_latest_conversation(self, user_id: str, max_messages: int) -> Optional[dict]:
+        items = self.query_by_index(
+            config.CONVERSATIONS_TABLE, "UserRecentConversationsIndex", "userId", user_id,
+            limit=1, scan_forward=False,
+        )
+        if not items:
+            return None
+        return self.load_conversation(items[0]["conversationId"], max_messages)
+
+    def load_conversation(self, conversation_id: str, max_messages: int) -> Optional[dict]:
+        header = self.get_conversation(conversation_id)
+        if not header:
+            return None
+        if "messages" in header:
+            messages = header.pop("messages") or []
+            header["turnCount"] = self.migrate_conversation({**header, "messages": messages})
+            header["messages"] = messages[-max_messages:] if max_messages else []
+            return header
+        if max_messages <= 0:
+            header["messages"] = []
+            return header
+        turns = self.query_by_index(
+            config.CONVERSATION_TURNS_TABLE, None, "conversationId", conversation_id,
+            limit=max_messages, scan_forward=False,
+        )
+        turns.reverse()
+        header["messages"] = [
+            {k: v for k, v in turn.items() if k not in ("conversationId", "turnSeq")}
+            for turn in turns
+        ]
+        return header
+
+    def append_conversation_turns(self, header: dict, messages: list) -> None:
+        """Upsert the header and append `messages`; turn numbers are allocated under the lock."""
+        if not messages:
+            return
+        fields = {k: v for k, v in header.items()
+                  if k not in ("conversationId", "messages", "turnCount", "createdAt")}
+        table = self._table(config.CONVERSATIONS_TABLE)
+        with self._lock:
+            key = table.key_of(header)
+            item = table.get(key) or {"conversationId": header["conversationId"]}
+            item = dict(item, **copy.deepcopy(fields))
+            item.setdefault("createdAt", header.get("createdAt"))
+            item["turnCount"] = int(item.get("turnCount", 0)) + len(messages)
+            table.put(item)
+            first_seq = item["turnCount"] - len(messages) + 1
+        self._put_turns(header["conversationId"], first_seq, messages)
+
+    def _put_turns(self, conversation_id: str, first_seq: int, messages: list) -> None:
+        turns = []
+        for offset, message in enumerate(messages):
+            item = {k: v for k, v in message.items() if v is not None}
+            item.update(conversationId=conversation_id, turnSeq=first_seq + offset)
+            turns.append(item)
+        self.batch_write(config.CONVERSATION_TURNS_TABLE, turns)
+
+    def migrate_conversation(self, item: dict) -> int:
+        messages = item.get("messages") or []
+        self._put_turns(item["conversationId"], 1, messages)
+        table = self._table(config.CONVERSATIONS_TABLE)
+        with self._lock:
+            header = table.get(table.key_of(item))
+            if header is not None and "messages" in header:
+                header = {k: v for k, v in header.items() if k != "messages"}
+                header["turnCount"] = len(messages)
+                table.put(header)
+        logger.info("conversation_migrated", conversation_id=item["conversationId"], turns=len(messages))
+        return len(messages)
+
+    def iter_legacy_conversations(self) -> Iterator[dict]:
+        for item in self.scan_all(config.CONVERSATIONS_TABLE):
+            if "messages" in item:
+                yield item
+
+    def get_shop(self, shop_id: str) -> Optional[dict]:
+        return self.get_item(config.SHOPS_TABLE, {"shopId": shop_id})
+
+    def save_shop(self, shop: dict) -> None:
+        self.put_item(config.SHOPS_TABLE, with_listing_keys(shop))
+
+    def set_shop_status(self, shop_id: str, status: str, updated_at: str) -> Optional[dict]:
+        return self._update(config.SHOPS_TABLE, {"shopId": shop_id},
+                            lambda shop: dict(status_keys(shop, status), updatedAt=updated_at))
+
+    def get_shops_by_pincode(self, pincode: str) -> list:
+        return self.query_sharded_index(
+            config.SHOPS_TABLE, "PincodeShardIndex", "pincodeShard", shard_keys(pincode, config.PINCODE_SHARDS)
+        )
+
+    def get_shop_cards_by_pincode(
+        self, pincode: str, category: Optional[str] = None, status: str = SHOP_STATUS_APPROVED
+    ) -> list:
+        cards = self.query_sharded_index(
+            config.SHOPS_TABLE, "PincodeStatusIndex", "pincodeStatus", listing_keys(pincode, status),
+            projection=list(SHOP_CARD_FIELDS),
+        )
+        if category:
+            cards = [c for c in cards if c.get("category") == category]
+        return sorted(cards, key=lambda card: card.get("category", ""))
+
+    def get_approved_shops_by_pincode(self, pincode: str, category: Optional[str] = None) -> list:
+        cards = self.get_shop_cards_by_pincode(pincode, category)
+        shops = self.batch_get(config.SHOPS_TABLE, [{"shopId": c["shopId"]} for c in cards])
+        return [shop for shop in shops if shop]
+
+    def get_shops_near(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        category: Optional[str] = None,
+        limit: int = MAX_NEARBY_FACILITIES,
+    ) -> list:
+        """Approved shop cards within `radius_km`, nearest first: one ShopGeoIndex read per covering cell."""
+        cards = [
+            card
+            for cell in geohash.cells_covering(lat, lon, radius_km, SHOP_GEO_CELL_PRECISION)
+            for card in self.query_by_index(
+                config.SHOPS_TABLE, "ShopGeoIndex", "geoStatus", geo_key(cell, SHOP_STATUS_APPROVED),
+                filters={"category": category} if category else None, projection=list(SHOP_CARD_FIELDS),
+            )
+        ]
+        return nearest_cards(lat, lon, radius_km, cards, limit)
+
+    def _update(self, table_name: str, key: dict, changes) -> Optional[dict]:
+        """Apply `changes(item)` (a dict of fields to SET) to an existing item; None if absent."""
+        table = self._table(table_name)
+        with self._lock:
+            item = table.get(table.key_of(key))
+            if item is None:
+                return None
+            item = dict(item, **copy.deepcopy(changes(item)))
+            table.put(item)
+            return copy.deepcopy(item)
+
+    # --- Inventory (one item per shopId + itemId) ---
+
+    def get_inventory(self, shop_id: str, projection: Optional[list] = None) -> list:
+        return self.query_by_key(config.INVENTORY_TABLE, "shopId", shop_id, projection)
+
+    def get_inventory_page(
+        self, shop_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> tuple:
+        return self.query_page(config.INVENTORY_TABLE, None, "shopId", shop_id, limit=limit, cursor=cursor)
+
+    def save_inventory_items(self, shop_id: str, items: list) -> None:
+        self.batch_write(config.INVENTORY_TABLE, [dict(i, shopId=shop_id) for i in items])
+
+    def delete_inventory_items(self, shop_id: str, item_ids: list) -> None:
+        self.batch_write(
+            config.INVENTORY_TABLE,
+            delete_keys=[{"shopId": shop_id, "itemId": item_id} for item_id in item_ids],
+        )
+
+    def update_inventory_item(self, shop_id: str, item_id: str, fields: dict) -> Optional[dict]:
+        return self._update(config.INVENTORY_TABLE, {"shopId": shop_id, "itemId": item_id},
+                            lambda item: fields)
+
+    def attach_inventory(self, shop: dict) -> dict:
+        """Shop header plus its `inventory` list; legacy embedded lists are used as-is."""
+        if "inventory" in shop:
+            return shop
+        items = self.get_inventory(shop["shopId"])
+        return dict(shop, inventory=[{k: v for k, v in i.items() if k != "shopId"} for i in items])
+
+    def attach_inventories(self, shops: list) -> list:
+        return [self.attach_inventory(shop) for shop in shops]
+
+    def migrate_shop_inventory(self, shop: dict) -> None:
+        if "inventory" not in shop:
+            return
+        self.save_inventory_items(shop["shopId"], shop["inventory"])
+        table = self._table(config.SHOPS_TABLE)
+        with self._lock:
+            stored = table.get(table.key_of(shop))
+            if stored is not None:
+                table.put({k: v for k, v in stored.items() if k != "inventory"})
+        logger.info("shop_inventory_migrated", shop_id=shop["shopId"], items=len(shop["inventory"]))
+
+    def save_order(self, order: dict) -> None:
+        self.put_item(config.ORDERS_TABLE, with_order_keys(order))
+
+    def get_order(self, order_id: str) -> Optional[dict]:
+        return self.get_item(config.ORDERS_TABLE, {"orderId": order_id})
+
+    def get_orders_by_user(self, user_id: str) -> list:
+        return self.query_by_index(config.ORDERS_TABLE, "UserOrdersIndex", "userId", user_id)
+
+    def get_orders_by_shop(self, shop_id: str, projection: Optional[list] = None) -> list:
+        return self.query_sharded_index(
+            config.ORDERS_TABLE, "ShopOrdersShardIndex", "shopShard",
+            shard_keys(shop_id, config.SHOP_ORDER_SHARDS), projection=projection,
+        )
+
+    def get_orders_page(
+        self,
+        shop_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> tuple:
+        """Same contract as DynamoDBService.get_orders_page."""
+        start = order_page_start(shop_id, cursor)
+        pages = []
+        for value in shard_keys(shop_id, config.SHOP_ORDER_SHARDS):
+            orders = self.query_by_index(config.ORDERS_TABLE, "ShopOrdersShardIndex", "shopShard", value,
+                                         scan_forward=False, filters={"status": status} if status else None)
+            if start:
+                orders = [o for o in orders if (o["createdAt"], o["orderId"]) < start]
+            pages.append(orders[:limit])
+        return merge_order_pages(shop_id, pages, limit)
+
+    def update_order_status(
+        self, order_id: str, old_status: str, new_status: str, updated_at: str
+    ) -> Optional[dict]:
+        """Move an order from `old_status` to `new_status`; None if its status changed meanwhile."""
+        table = self._table(config.ORDERS_TABLE)
+        with self._lock:
+            order = table.get((order_id,))
+            if order is None or order.get("status") != old_status:
+                return None
+            order = dict(order, status=new_status, updatedAt=updated_at)
+            table.put(order)
+            return copy.deepcopy(order)
+
+    def iter_shop_ids(self) -> Iterator[str]:
+        for item in self.scan_all(config.SHOPS_TABLE, ProjectionExpression="shopId"):
+            yield item["shopId"]
+
+    # --- Shop analytics rollups (statDate = "YYYY-MM-DD" per day, "ALL" all-time) ---
+
+    def _add(self, table_name: str, key: dict, deltas: dict) -> None:
+        """Atomic ADD of `deltas` onto an item, creating it if needed."""
+        table = self._table(table_name)
+        with self._lock:
+            item = dict(table.get(table.key_of(key)) or key)
+            for name, delta in deltas.items():
+                item[name] = item.get(name, 0) + delta
+            table.put(item)
+
+    def record_order_placed(self, shop_id: str, day: str, amount: float, order_id: str) -> None:
+        with self._lock:
+            self._add(config.SHOP_STATS_TABLE, {"shopId": shop_id, "statDate": day},
+                      {"orderCount": 1, "revenue": amount})
+            self._add(config.SHOP_STATS_TABLE, {"shopId": shop_id, "statDate": SHOP_STATS_ALL_TIME},
+                      {"orderCount": 1, "revenue": amount, "pendingOrders": 1})
+
+    def record_order_status_change(self, shop_id: str, old_status: str, new_status: str) -> None:
+        delta = int(new_status == ORDER_STATUS_PENDING) - int(old_status == ORDER_STATUS_PENDING)
+        if delta:
+            self._add(config.SHOP_STATS_TABLE, {"shopId": shop_id, "statDate": SHOP_STATS_ALL_TIME},
+                      {"pendingOrders": delta})
+
+    def get_shop_stats(self, shop_id: str, since_day: str) -> list:
+        rows = self.query_by_key(config.SHOP_STATS_TABLE, "shopId", shop_id)
+        return [r for r in rows if r["statDate"] >= since_day]
+
+    def save_shop_stats(self, shop_id: str, rows: list) -> None:
+        self.batch_write(config.SHOP_STATS_TABLE, [dict(r, shopId=shop_id) for r in rows])
+
+    # --- Response cache (health query deduplication) ---
+
+    def get_response_cache(self, cache_key: str) -> Optional[str]:
+        item = self.get_item(config.RESPONSE_CACHE_TABLE, {"cacheKey": cache_key})
+        return item.get("response") if item else None
+
+    def set_response_cache(self, cache_key: str, response: str, language: str) -> None:
+        ttl = int(time.time()) + config.RESPONSE_CACHE_TTL_SECONDS
+        self.put_item(
+            config.RESPONSE_CACHE_TABLE,
+            {"cacheKey": cache_key, "response": response, "language": language, "ttl": ttl},
+        )
+
+    # --- Geo cache (Nominatim city → lat/lon, permanent) ---
+
+    def get_geo_cache(self, location_key: str) -> Optional[dict]:
+        return self.get_item(config.GEO_CACHE_TABLE, {"locationKey": location_key})
+
+    def set_geo_cache(self, location_key: str, lat: float, lon: float) -> None:
+        self.put_item(
+            config.GEO_CACHE_TABLE,
+            {"locationKey": location_key, "lat": str(lat), "lon": str(lon)},
+        )
+
+    # --- Facility mirror (harvested Places results, keyed by geohash cell) ---
+
+    def get_facilities_in_cell(self, cell: str, kind: Optional[str] = None) -> list:
+        rows = self.query_by_key(config.FACILITIES_TABLE, "geohash", cell)
+        return [r for r in rows if r["facilityKey"].startswith(f"{kind}#")] if kind else rows
+
+    def save_facilities(self, facilities: list) -> None:
+        self.batch_write(config.FACILITIES_TABLE, facilities)
+
+    def mark_cell_harvested(self, cell: str, kinds: list, harvested_at: str, ttl: int) -> None:
+        self.batch_write(config.FACILITIES_TABLE, [
+            {"geohash": cell, "facilityKey": f"{kind}#{COVERAGE_MARKER_KEY}", "harvestedAt": harvested_at, "ttl": ttl}
+            for kind in kinds
+        ])
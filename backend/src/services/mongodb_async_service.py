@@ -0,0 +1,471 @@
+"""
+Async MongoDB backend (PyMongo's native AsyncMongoClient) for asyncio callers:
+local load tests, async scripts. Same interface and documents as
+MongoDBService, with every method a coroutine.
+
+Pool size and timeouts come from client_options() (MONGODB_MAX_POOL_SIZE,
+MONGODB_SERVER_SELECTION_TIMEOUT_MS, …). Indexes are ensured lazily by the
+first query, once per process and under a lock, so hundreds of concurrent
+first calls wait for a single check instead of each issuing create_index.
+`scripts/load_test_mongo.py` drives it at a chosen concurrency.
+"""
+import asyncio
+import time
+from typing import AsyncIterator, Optional
+
+from pymongo import AsyncMongoClient, DESCENDING, ReplaceOne, ReturnDocument
+from pymongo.errors import PyMongoError
+
+from src.models.shop import status_keys, with_listing_keys
+from src.services import mongodb_service
+from src.services.mongodb_service import (
+    BACKFILLS,
+    INDEXES,
+    INDEX_MARKER_ID,
+    INDEX_VERSION,
+    SCHEMA_COLLECTION,
+    _CACHED_RESPONSE_FIELDS,
+    _CARD_FIELDS,
+    _CONVERSATION_LIST_FIELDS,
+    _EXPIRING_FIELDS,
+    _INVENTORY_ORDER,
+    _NEWEST_FIRST,
+    _NO_ID,
+    _ORDER_FIELDS,
+    _SHOP_FIELDS,
+    _align,
+    _batch_get_query,
+    _coverage_markers,
+    _collection_name,
+    _facility_query,
+    _find_args,
+    _inventories_query,
+    _near_query,
+    _order_fields,
+    _order_placed_ops,
+    _page_query,
+    _page_result,
+    _with_distance,
+    _with_expiry,
+    _with_inventories,
+    _with_location,
+    client_options,
+    missing_indexes,
+    retired_indexes,
+)
+from src.utils.config import config
+from src.utils.constants import (
+    MAX_NEARBY_FACILITIES,
+    ORDER_STATUS_PENDING,
+    SHOP_STATS_ALL_TIME,
+    SHOP_STATUS_APPROVED,
+)
+from src.utils.logger import logger
+from src.utils.pagination import DEFAULT_PAGE_SIZE
+
+
+class AsyncMongoDBService:
+    """Coroutine twin of MongoDBService."""
+
+    def __init__(self, client: Optional[AsyncMongoClient] = None):
+        self._client = client or AsyncMongoClient(config.MONGODB_URI, **client_options())
+        self._db = self._client[f"gramsathi_{config.STAGE}"]
+        self._index_lock = asyncio.Lock()
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    async def _collection(self, table_name: str):
+        await self.ensure_indexes()
+        return self._db[_collection_name(table_name)]
+
+    async def ensure_indexes(self) -> None:
+        """Same once-per-process, marker-versioned check as MongoDBService._ensure_indexes."""
+        if self._db.name in mongodb_service._indexes_ready:
+            return
+        async with self._index_lock:
+            if self._db.name in mongodb_service._indexes_ready:
+                return
+            try:
+                schema = self._db[SCHEMA_COLLECTION]
+                marker = await schema.find_one({"_id": INDEX_MARKER_ID})
+                if not marker or marker.get("version") != INDEX_VERSION:
+                    for table_name, query, pipeline in BACKFILLS:
+                        await self._db[_collection_name(table_name)].update_many(query, pipeline)
+                    for table_name in INDEXES:
+                        collection = self._db[_collection_name(table_name)]
+                        existing = [i["name"] for i in await (await collection.list_indexes()).to_list(None)]
+                        missing = missing_indexes(table_name, existing)
+                        if missing:
+                            await collection.create_indexes(missing)
+                        for name in retired_indexes(table_name, existing):
+                            await collection.drop_index(name)
+                    await schema.replace_one({"_id": INDEX_MARKER_ID},
+                                             {"_id": INDEX_MARKER_ID, "version": INDEX_VERSION}, upsert=True)
+                    logger.info("mongodb_indexes_ensured", database=self._db.name, version=INDEX_VERSION)
+                mongodb_service._indexes_ready.add(self._db.name)
+            except PyMongoError as e:
+                logger.warning("mongodb_index_create", error=str(e))
+
+    # --- Generic queries (same interface as DynamoDBService) ---
+
+    async def batch_get(self, table_name: str, keys: list, projection: Optional[list] = None) -> list:
+        if not keys:
+            return []
+        query, fields = _batch_get_query(keys, projection)
+        collection = await self._collection(table_name)
+        return _align(keys, await collection.find(query, fields).to_list(None))
+
+    async def query_by_index(
+        self,
+        table_name: str,
+        index_name: str,
+        key_name: str,
+        key_value: str,
+        *,
+        limit: Optional[int] = None,
+        scan_forward: bool = True,
+        filters: Optional[dict] = None,
+        projection: Optional[list] = None,
+    ) -> list:
+        fields, sort = _find_args(index_name, scan_forward, projection)
+        collection = await self._collection(table_name)
+        cursor = collection.find({key_name: key_value, **(filters or {})}, fields).sort(sort)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return await cursor.to_list(None)
+
+    async def query_page(
+        self,
+        table_name: str,
+        index_name: str,
+        key_name: str,
+        key_value: str,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        scan_forward: bool = True,
+        filters: Optional[dict] = None,
+        projection: Optional[list] = None,
+    ) -> tuple:
+        query = _page_query(index_name, key_name, key_value, filters, cursor, scan_forward)
+        fields, sort = _find_args(index_name, scan_forward, projection, keep_sort_fields=True)
+        collection = await self._collection(table_name)
+        docs = await collection.find(query, fields).sort(sort).limit(limit + 1).to_list(None)
+        return _page_result(docs, limit, index_name, projection)
+
+    async def _find_one(self, table_name: str, query: dict, fields: dict = _NO_ID) -> Optional[dict]:
+        collection = await self._collection(table_name)
+        return await collection.find_one(query, fields)
+
+    async def _find(self, table_name: str, query: dict, fields: dict = _NO_ID, sort=None) -> list:
+        collection = await self._collection(table_name)
+        cursor = collection.find(query, fields)
+        if sort:
+            cursor = cursor.sort(sort)
+        return await cursor.to_list(None)
+
+    async def _replace(self, table_name: str, query: dict, doc: dict) -> None:
+        collection = await self._collection(table_name)
+        await collection.replace_one(query, doc, upsert=True)
+
+    async def _bulk_replace(self, table_name: str, key_names: tuple, docs: list) -> None:
+        if not docs:
+            return
+        ops = [ReplaceOne({k: d[k] for k in key_names}, d, upsert=True) for d in docs]
+        collection = await self._collection(table_name)
+        await collection.bulk_write(ops, ordered=False)
+
+    async def _find_and_set(
+        self, table_name: str, query: dict, changes: dict, hidden: Optional[dict] = None
+    ) -> Optional[dict]:
+        collection = await self._collection(table_name)
+        return await collection.find_one_and_update(
+            query, {"$set": changes},
+            projection={**_NO_ID, **(hidden or {})}, return_document=ReturnDocument.AFTER,
+        )
+
+    # --- Domain helpers (same interface as DynamoDBService) ---
+
+    async def get_user(self, user_id: str) -> Optional[dict]:
+        return await self._find_one(config.USERS_TABLE, {"userId": user_id})
+
+    async def save_user(self, user: dict) -> None:
+        await self._replace(config.USERS_TABLE, {"userId": user["userId"]}, user)
+
+    # --- Conversations: header document + one CONVERSATION_TURNS document per message ---
+
+    async def get_conversation(self, conversation_id: str) -> Optional[dict]:
+        """Header document only (no messages)."""
+        return await self._find_one(config.CONVERSATIONS_TABLE, {"conversationId": conversation_id})
+
+    async def save_conversation(self, conversation: dict) -> None:
+        """Legacy whole-document write — new code appends turns instead."""
+        await self._replace(config.CONVERSATIONS_TABLE,
+                            {"conversationId": conversation["conversationId"]}, conversation)
+
+    async def get_conversations_by_user(self, user_id: str) -> list:
+        return await self._find(
+            config.CONVERSATIONS_TABLE, {"userId": user_id}, _CONVERSATION_LIST_FIELDS, sort=_NEWEST_FIRST
+        )
+
+    async def get_latest_conversation(self, user_id: str, max_messages: int) -> Optional[dict]:
+        collection = await self._collection(config.CONVERSATIONS_TABLE)
+        doc = await collection.find_one(
+            {"userId": user_id}, {"_id": 0, "conversationId": 1}, sort=[("updatedAt", DESCENDING)],
+        )
+        if not doc:
+            return None
+        return await self.load_conversation(doc["conversationId"], max_messages)
+
+    async def load_conversation(self, conversation_id: str, max_messages: int) -> Optional[dict]:
+        header = await self.get_conversation(conversation_id)
+        if not header:
+            return None
+        if "messages" in header:
+            messages = header.pop("messages") or []
+            header["turnCount"] = await self.migrate_conversation({**header, "messages": messages})
+            header["messages"] = messages[-max_messages:] if max_messages else []
+            return header
+        if max_messages <= 0:
+            header["messages"] = []
+            return header
+        collection = await self._collection(config.CONVERSATION_TURNS_TABLE)
+        cursor = (
+            collection
+            .find({"conversationId": conversation_id}, {"_id": 0, "conversationId": 0, "turnSeq": 0})
+            .sort("turnSeq", DESCENDING)
+            .limit(max_messages)
+        )
+        turns = await cursor.to_list(None)
+        turns.reverse()
+        header["messages"] = turns
+        return header
+
+    async def append_conversation_turns(self, header: dict, messages: list) -> None:
+        if not messages:
+            return
+        fields = {k: v for k, v in header.items()
+                  if k not in ("conversationId", "messages", "turnCount", "createdAt")}
+        collection = await self._collection(config.CONVERSATIONS_TABLE)
+        updated = await collection.find_one_and_update(
+            {"conversationId": header["conversationId"]},
+            {
+                "$set": fields,
+                "$setOnInsert": {"createdAt": header.get("createdAt")},
+                "$inc": {"turnCount": len(messages)},
+            },
+            projection={"turnCount": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        first_seq = int(updated["turnCount"]) - len(messages) + 1
+        await self._put_turns(header["conversationId"], first_seq, messages)
+
+    async def _put_turns(self, conversation_id: str, first_seq: int, messages: list) -> None:
+        turns = []
+        for offset, message in enumerate(messages):
+            doc = {k: v for k, v in message.items() if v is not None}
+            doc.update(conversationId=conversation_id, turnSeq=first_seq + offset)
+            turns.append(doc)
+        await self._bulk_replace(config.CONVERSATION_TURNS_TABLE, ("conversationId", "turnSeq"), turns)
+
+    async def migrate_conversation(self, item: dict) -> int:
+        messages = item.get("messages") or []
+        await self._put_turns(item["conversationId"], 1, messages)
+        collection = await self._collection(config.CONVERSATIONS_TABLE)
+        await collection.update_one(
+            {"conversationId": item["conversationId"], "messages": {"$exists": True}},
+            {"$unset": {"messages": ""}, "$set": {"turnCount": len(messages)}},
+        )
+        logger.info("conversation_migrated", conversation_id=item["conversationId"], turns=len(messages))
+        return len(messages)
+
+    async def iter_legacy_conversations(self) -> AsyncIterator[dict]:
+        collection = await self._collection(config.CONVERSATIONS_TABLE)
+        async for doc in collection.find({"messages": {"$exists": True}}, _NO_ID):
+            yield doc
+
+    async def get_shop(self, shop_id: str) -> Optional[dict]:
+        return await self._find_one(config.SHOPS_TABLE, {"shopId": shop_id}, _SHOP_FIELDS)
+
+    async def save_shop(self, shop: dict) -> None:
+        await self._replace(config.SHOPS_TABLE, {"shopId": shop["shopId"]},
+                            _with_location(with_listing_keys(shop)))
+
+    async def set_shop_status(self, shop_id: str, status: str, updated_at: str) -> Optional[dict]:
+        shop = await self.get_shop(shop_id)
+        if not shop:
+            return None
+        return await self._find_and_set(config.SHOPS_TABLE, {"shopId": shop_id},
+                                        dict(status_keys(shop, status), updatedAt=updated_at), _SHOP_FIELDS)
+
+    async def get_shops_by_pincode(self, pincode: str) -> list:
+        return await self._find(config.SHOPS_TABLE, {"pincode": pincode}, _SHOP_FIELDS)
+
+    async def _listed_shops(self, pincode: str, category: Optional[str], status: str, fields: dict) -> list:
+        query = {"pincode": pincode, "status": status}
+        if category:
+            query["category"] = category
+        return await self._find(config.SHOPS_TABLE, query, fields)
+
+    async def get_shop_cards_by_pincode(
+        self, pincode: str, category: Optional[str] = None, status: str = SHOP_STATUS_APPROVED
+    ) -> list:
+        return await self._listed_shops(pincode, category, status, _CARD_FIELDS)
+
+    async def get_approved_shops_by_pincode(self, pincode: str, category: Optional[str] = None) -> list:
+        return await self._listed_shops(pincode, category, SHOP_STATUS_APPROVED, _SHOP_FIELDS)
+
+    async def get_shops_near(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        category: Optional[str] = None,
+        limit: int = MAX_NEARBY_FACILITIES,
+    ) -> list:
+        collection = await self._collection(config.SHOPS_TABLE)
+        cursor = collection.find(_near_query(lat, lon, radius_km, category), _CARD_FIELDS).limit(limit)
+        docs = await cursor.to_list(None)
+        return _with_distance(lat, lon, docs)
+
+    # --- Inventory: one document per (shopId, itemId) ---
+
+    async def get_inventory(self, shop_id: str, projection: Optional[list] = None) -> list:
+        return await self.query_by_index(config.INVENTORY_TABLE, "InventoryItemsIndex", "shopId", shop_id,
+                                         projection=projection)
+
+    async def get_inventory_page(
+        self, shop_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> tuple:
+        return await self.query_page(config.INVENTORY_TABLE, "InventoryItemsIndex", "shopId", shop_id,
+                                     limit=limit, cursor=cursor)
+
+    async def save_inventory_items(self, shop_id: str, items: list) -> None:
+        await self._bulk_replace(config.INVENTORY_TABLE, ("shopId", "itemId"),
+                                 [dict(i, shopId=shop_id) for i in items])
+
+    async def delete_inventory_items(self, shop_id: str, item_ids: list) -> None:
+        if item_ids:
+            collection = await self._collection(config.INVENTORY_TABLE)
+            await collection.delete_many({"shopId": shop_id, "itemId": {"$in": list(item_ids)}})
+
+    async def update_inventory_item(self, shop_id: str, item_id: str, fields: dict) -> Optional[dict]:
+        return await self._find_and_set(config.INVENTORY_TABLE, {"shopId": shop_id, "itemId": item_id}, fields)
+
+    async def attach_inventory(self, shop: dict) -> dict:
+        """Shop header plus its `inventory` list; legacy embedded lists are used as-is."""
+        if "inventory" in shop:
+            return shop
+        items = await self.get_inventory(shop["shopId"])
+        return dict(shop, inventory=[{k: v for k, v in i.items() if k != "shopId"} for i in items])
+
+    async def attach_inventories(self, shops: list) -> list:
+        """attach_inventory for many shops with one query."""
+        query = _inventories_query(shops)
+        if query is None:
+            return shops
+        return _with_inventories(shops, await self._find(config.INVENTORY_TABLE, query, sort=_INVENTORY_ORDER))
+
+    async def migrate_shop_inventory(self, shop: dict) -> None:
+        if "inventory" not in shop:
+            return
+        await self.save_inventory_items(shop["shopId"], shop["inventory"])
+        collection = await self._collection(config.SHOPS_TABLE)
+        await collection.update_one({"shopId": shop["shopId"]}, {"$unset": {"inventory": ""}})
+        logger.info("shop_inventory_migrated", shop_id=shop["shopId"], items=len(shop["inventory"]))
+
+    async def save_order(self, order: dict) -> None:
+        await self._replace(config.ORDERS_TABLE, {"orderId": order["orderId"]}, order)
+
+    async def get_order(self, order_id: str) -> Optional[dict]:
+        return await self._find_one(config.ORDERS_TABLE, {"orderId": order_id})
+
+    async def get_orders_by_user(self, user_id: str) -> list:
+        return await self._find(config.ORDERS_TABLE, {"userId": user_id}, _ORDER_FIELDS, sort=_NEWEST_FIRST)
+
+    async def get_orders_by_shop(self, shop_id: str, projection: Optional[list] = None) -> list:
+        return await self._find(
+            config.ORDERS_TABLE, {"shopId": shop_id}, _order_fields(projection), sort=_NEWEST_FIRST
+        )
+
+    async def get_orders_page(
+        self,
+        shop_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> tuple:
+        return await self.query_page(
+            config.ORDERS_TABLE, "ShopOrdersByDateIndex", "shopId", shop_id,
+            limit=limit, cursor=cursor, scan_forward=False,
+            filters={"status": status} if status else None,
+        )
+
+    async def update_order_status(
+        self, order_id: str, old_status: str, new_status: str, updated_at: str
+    ) -> Optional[dict]:
+        return await self._find_and_set(config.ORDERS_TABLE, {"orderId": order_id, "status": old_status},
+                                        {"status": new_status, "updatedAt": updated_at})
+
+    async def iter_shop_ids(self) -> AsyncIterator[str]:
+        collection = await self._collection(config.SHOPS_TABLE)
+        async for doc in collection.find({}, {"shopId": 1, "_id": 0}):
+            yield doc["shopId"]
+
+    # --- Shop analytics rollups (statDate = "YYYY-MM-DD" per day, "ALL" all-time) ---
+
+    async def record_order_placed(self, shop_id: str, day: str, amount: float, order_id: str) -> None:
+        stats = await self._collection(config.SHOP_STATS_TABLE)
+        await stats.bulk_write(_order_placed_ops(shop_id, day, amount))
+
+    async def record_order_status_change(self, shop_id: str, old_status: str, new_status: str) -> None:
+        delta = int(new_status == ORDER_STATUS_PENDING) - int(old_status == ORDER_STATUS_PENDING)
+        if delta:
+            stats = await self._collection(config.SHOP_STATS_TABLE)
+            await stats.update_one({"shopId": shop_id, "statDate": SHOP_STATS_ALL_TIME},
+                                   {"$inc": {"pendingOrders": delta}}, upsert=True)
+
+    async def get_shop_stats(self, shop_id: str, since_day: str) -> list:
+        return await self._find(config.SHOP_STATS_TABLE,
+                                {"shopId": shop_id, "statDate": {"$gte": since_day}})
+
+    async def save_shop_stats(self, shop_id: str, rows: list) -> None:
+        await self._bulk_replace(config.SHOP_STATS_TABLE, ("shopId", "statDate"),
+                                 [dict(r, shopId=shop_id) for r in rows])
+
+    async def get_response_cache(self, cache_key: str) -> Optional[str]:
+        doc = await self._find_one(config.RESPONSE_CACHE_TABLE, {"cacheKey": cache_key}, _CACHED_RESPONSE_FIELDS)
+        if not doc:
+            return None
+        if int(doc.get("ttl", 0)) < int(time.time()):
+            return None
+        return doc.get("response")
+
+    async def set_response_cache(self, cache_key: str, response: str, language: str) -> None:
+        ttl = int(time.time()) + config.RESPONSE_CACHE_TTL_SECONDS
+        await self._replace(config.RESPONSE_CACHE_TABLE, {"cacheKey": cache_key},
+                            _with_expiry({"cacheKey": cache_key, "response": response,
+                                          "language": language, "ttl": ttl}))
+
+    # --- Geo cache (Nominatim city → lat/lon, permanent) ---
+
+    async def get_geo_cache(self, location_key: str) -> Optional[dict]:
+        return await self._find_one(config.GEO_CACHE_TABLE, {"locationKey": location_key})
+
+    async def set_geo_cache(self, location_key: str, lat: float, lon: float) -> None:
+        await self._replace(config.GEO_CACHE_TABLE, {"locationKey": location_key},
+                            {"locationKey": location_key, "lat": str(lat), "lon": str(lon)})
+
+    # --- Facility mirror (harvested Places results, keyed by geohash cell) ---
+
+    async def get_facilities_in_cell(self, cell: str, kind: Optional[str] = None) -> list:
+        return await self._find(config.FACILITIES_TABLE, _facility_query(cell, kind), _EXPIRING_FIELDS)
+
+    async def save_facilities(self, facilities: list) -> None:
+        await self._bulk_replace(config.FACILITIES_TABLE, ("geohash", "facilityKey"),
+                                 [_with_expiry(f) for f in facilities])
+
+    async def mark_cell_harvested(self, cell: str, kinds: list, harvested_at: str, ttl: int) -> None:
+        await self.save_facilities(_coverage_markers(cell, kinds, harvested_at, ttl))
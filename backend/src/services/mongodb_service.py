@@ -2,14 +2,43 @@
 MongoDB backend for local development (IS_OFFLINE).
 Same interface as DynamoDBService so handlers can use either.
 """
+import hashlib
+import json
+import re
 import time
-from typing import Optional
-
-from pymongo import MongoClient, ASCENDING
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Iterator, Optional
+
+from bson import ObjectId
+from bson.codec_options import TypeCodec, TypeRegistry
+from bson.decimal128 import Decimal128
+from bson.errors import InvalidId
+from pymongo import MongoClient, ASCENDING, DESCENDING, GEOSPHERE, IndexModel, ReplaceOne, ReturnDocument, UpdateOne
 from pymongo.errors import PyMongoError
 
+from src.models.shop import status_keys, with_listing_keys
 from src.utils.config import config
+from src.utils.constants import (
+    COVERAGE_MARKER_KEY,
+    MAX_NEARBY_FACILITIES,
+    ORDER_STATUS_PENDING,
+    SHOP_CARD_FIELDS,
+    SHOP_STATS_ALL_TIME,
+    SHOP_STATUS_APPROVED,
+)
+from src.utils.geohash import haversine_km
 from src.utils.logger import logger
+from src.utils.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+
+
+# Range key of each DynamoDB index — the sort order Mongo queries reproduce
+_INDEX_SORT_KEYS = {
+    "ShopOrdersByDateIndex": "createdAt",
+    "UserRecentConversationsIndex": "updatedAt",
+    "InventoryItemsIndex": "itemId",
+}
 
 
 def _collection_name(table_name: str) -> str:
@@ -17,11 +46,322 @@ def _collection_name(table_name: str) -> str:
     return table_name.replace("-", "_")
 
 
+# Indexes per table for the query patterns (equivalent to the DynamoDB key schemas and GSIs)
+INDEXES: dict = {
+    config.CONVERSATIONS_TABLE: [
+        # a user's conversations, newest first (equality then sort key: no in-memory sort)
+        IndexModel([("userId", ASCENDING), ("createdAt", DESCENDING)], name="UserConversationsByDateIndex"),
+        # latest by user (WhatsApp)
+        IndexModel([("userId", ASCENDING), ("updatedAt", DESCENDING)], name="UserRecentConversationsIndex"),
+    ],
+    config.CONVERSATION_TURNS_TABLE: [
+        # (conversationId, turnSeq) is the primary key
+        IndexModel([("conversationId", ASCENDING), ("turnSeq", ASCENDING)],
+                   name="ConversationTurnsIndex", unique=True),
+    ],
+    config.SHOPS_TABLE: [
+        IndexModel([("pincode", ASCENDING)], name="PincodeIndex"),
+        # listed (approved) shops of a pincode, optionally one category
+        IndexModel([("pincode", ASCENDING), ("status", ASCENDING), ("category", ASCENDING)],
+                   name="PincodeStatusIndex"),
+        # GeoJSON point of lat/lng for get_shops_near
+        IndexModel([("location", GEOSPHERE)], name="ShopLocationIndex"),
+    ],
+    config.INVENTORY_TABLE: [
+        # (shopId, itemId) is the primary key
+        IndexModel([("shopId", ASCENDING), ("itemId", ASCENDING)], name="InventoryItemsIndex", unique=True),
+    ],
+    config.ORDERS_TABLE: [
+        IndexModel([("userId", ASCENDING), ("createdAt", DESCENDING)], name="UserOrdersByDateIndex"),
+        # get_orders_by_shop and the get_orders_page seek both read this one
+        IndexModel([("shopId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)],
+                   name="ShopOrdersByDateIndex"),
+    ],
+    config.SHOP_STATS_TABLE: [
+        # (shopId, statDate) is the primary key
+        IndexModel([("shopId", ASCENDING), ("statDate", ASCENDING)], name="ShopStatsIndex", unique=True),
+    ],
+    config.FACILITIES_TABLE: [
+        # (geohash, facilityKey) is the primary key
+        IndexModel([("geohash", ASCENDING), ("facilityKey", ASCENDING)], name="FacilityCellIndex", unique=True),
+        IndexModel([("expiresAt", ASCENDING)], name="FacilityExpiryIndex", expireAfterSeconds=0),
+    ],
+    config.RESPONSE_CACHE_TABLE: [
+        # the server deletes documents once `expiresAt` (the `ttl` epoch as a date) has passed
+        IndexModel([("expiresAt", ASCENDING)], name="ResponseCacheExpiryIndex", expireAfterSeconds=0),
+    ],
+}
+
+# Single-field indexes superseded by the compound ones above (their key is the
+# compound index's prefix); dropped when the index version changes.
+RETIRED_INDEXES: dict = {
+    config.CONVERSATIONS_TABLE: ["UserConversationsIndex"],
+    config.ORDERS_TABLE: ["UserOrdersIndex", "ShopOrdersIndex"],
+}
+
+# One-off updates run with a new index version: fill the indexed fields of
+# documents written before those fields existed. (table, filter, update pipeline)
+BACKFILLS: list = [
+    (config.SHOPS_TABLE,
+     {"location": {"$exists": False},
+      "lat": {"$type": "number", "$gte": -90, "$lte": 90},
+      "lng": {"$type": "number", "$gte": -180, "$lte": 180}},
+     [{"$set": {"location": {"type": "Point", "coordinates": ["$lng", "$lat"]}}}]),
+    *[
+        (table, {"expiresAt": {"$exists": False}, "ttl": {"$type": "number"}},
+         [{"$set": {"expiresAt": {"$toDate": {"$multiply": ["$ttl", 1000]}}}}])
+        for table in (config.RESPONSE_CACHE_TABLE, config.FACILITIES_TABLE)
+    ],
+]
+
+# A marker document records which version of INDEXES a database already has,
+# so a cold start with nothing to change costs one find_one instead of a
+# list/create round trip per collection.
+SCHEMA_COLLECTION = "_schema"
+INDEX_MARKER_ID = "indexes"
+INDEX_VERSION = hashlib.sha1(json.dumps(
+    {table: [model.document for model in models] for table, models in INDEXES.items()},
+    sort_keys=True, default=str,
+).encode()).hexdigest()[:12]
+
+# Databases whose indexes were checked by this process (sync and async clients)
+_indexes_ready: set = set()
+
+
+def client_options() -> dict:
+    """Connection-pool, timeout and type-codec settings shared by the sync and async clients."""
+    return {
+        "type_registry": TYPE_REGISTRY,
+        "maxPoolSize": config.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": config.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": config.MONGODB_MAX_IDLE_TIME_MS,
+        "serverSelectionTimeoutMS": config.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": config.MONGODB_CONNECT_TIMEOUT_MS,
+    }
+
+
+def missing_indexes(table_name: str, existing_names) -> list:
+    return [m for m in INDEXES[table_name] if m.document["name"] not in set(existing_names)]
+
+
+def retired_indexes(table_name: str, existing_names) -> list:
+    return [n for n in RETIRED_INDEXES.get(table_name, ()) if n in set(existing_names)]
+
+
+def _expires_at(ttl: int) -> datetime:
+    """`ttl` epoch seconds as the BSON date TTL indexes expire on."""
+    return datetime.fromtimestamp(int(ttl), tz=timezone.utc)
+
+
+def _with_expiry(doc: dict) -> dict:
+    """Document plus `expiresAt` when it carries a `ttl`."""
+    return {**doc, "expiresAt": _expires_at(doc["ttl"])} if doc.get("ttl") is not None else doc
+
+
+def _with_location(shop: dict) -> dict:
+    """Shop document with a GeoJSON `location` point when it has valid lat/lng."""
+    shop = {k: v for k, v in shop.items() if k != "location"}
+    lat, lng = shop.get("lat"), shop.get("lng")
+    if lat is None or lng is None or not (-90 <= float(lat) <= 90 and -180 <= float(lng) <= 180):
+        return shop
+    return {**shop, "location": {"type": "Point", "coordinates": [float(lng), float(lat)]}}
+
+
+def _near_query(lat: float, lon: float, radius_km: float, category: Optional[str]) -> dict:
+    """Approved shops within `radius_km`, which $nearSphere returns nearest first."""
+    query = {
+        "location": {"$nearSphere": {
+            "$geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "$maxDistance": radius_km * 1000,
+        }},
+        "status": SHOP_STATUS_APPROVED,
+    }
+    if category:
+        query["category"] = category
+    return query
+
+
+def _with_distance(lat: float, lon: float, cards: list) -> list:
+    return [dict(c, distanceKm=round(haversine_km(lat, lon, c["lat"], c["lng"]), 2)) for c in cards]
+
+
+# Shop listing cards (get_shop_cards_by_pincode, get_shops_near)
+_CARD_FIELDS = {**{f: 1 for f in SHOP_CARD_FIELDS}, "_id": 0}
+# Fields that exist only for Mongo indexes, hidden from callers
+_SHOP_FIELDS = {"_id": 0, "location": 0}
+_EXPIRING_FIELDS = {"_id": 0, "expiresAt": 0}
+_NO_ID = {"_id": 0}
+_CACHED_RESPONSE_FIELDS = {"_id": 0, "response": 1, "ttl": 1}
+# Conversation headers only: legacy documents may still embed every message
+_CONVERSATION_LIST_FIELDS = {"_id": 0, "messages": 0}
+_ORDER_FIELDS = {"_id": 0}
+# Served by the (key, createdAt desc) indexes
+_NEWEST_FIRST = [("createdAt", DESCENDING)]
+
+
+def _order_fields(projection: Optional[list]) -> dict:
+    return {**{f: 1 for f in projection}, "_id": 0} if projection else _ORDER_FIELDS
+
+
+class _DecimalCodec(TypeCodec):
+    """
+    Numbers as handlers expect them, converted by the driver while it encodes
+    and decodes BSON: Decimal is written as a double and Decimal128 (e.g.
+    values written by other tools) is read back as float.
+    """
+    python_type = Decimal
+    bson_type = Decimal128
+
+    def transform_python(self, value: Decimal) -> float:
+        return float(value)
+
+    def transform_bson(self, value: Decimal128) -> float:
+        return float(value.to_decimal())
+
+
+TYPE_REGISTRY = TypeRegistry([_DecimalCodec()])
+
+
+def _strip_id(doc: dict) -> dict:
+    """Page results keep `_id` for the cursor; callers never see it."""
+    doc.pop("_id", None)
+    return doc
+
+
+def _batch_get_query(keys: list, projection: Optional[list]) -> tuple:
+    """(filter, fields) for one `$in` (or `$or` for composite keys) lookup of `keys`."""
+    key_names = list(keys[0])
+    if len(key_names) == 1:
+        query = {key_names[0]: {"$in": list({k[key_names[0]] for k in keys})}}
+    else:
+        query = {"$or": [dict(k) for k in keys]}
+    fields = {"_id": 0}
+    if projection:
+        fields.update({f: 1 for f in [*key_names, *projection]})
+    return query, fields
+
+
+def _align(keys: list, docs) -> list:
+    """Results in the order of `keys`, None where no document matched."""
+    key_names = list(keys[0])
+    found = {tuple(doc[n] for n in key_names): doc for doc in docs}
+    return [found.get(tuple(k[n] for n in key_names)) for k in keys]
+
+
+def _order_placed_ops(shop_id: str, day: str, amount: float) -> list:
+    """The two `$inc` upserts of record_order_placed, for one bulk_write."""
+    amount = float(amount)
+    return [
+        UpdateOne({"shopId": shop_id, "statDate": day},
+                  {"$inc": {"orderCount": 1, "revenue": amount}}, upsert=True),
+        UpdateOne({"shopId": shop_id, "statDate": SHOP_STATS_ALL_TIME},
+                  {"$inc": {"orderCount": 1, "revenue": amount, "pendingOrders": 1}}, upsert=True),
+    ]
+
+
+def _facility_query(cell: str, kind: Optional[str]) -> dict:
+    """One mirror cell; with `kind`, only its "<kind>#" keys (a prefix range on FacilityCellIndex)."""
+    query: dict = {"geohash": cell}
+    if kind:
+        query["facilityKey"] = {"$regex": f"^{re.escape(kind)}#"}
+    return query
+
+
+def _coverage_markers(cell: str, kinds: list, harvested_at: str, ttl: int) -> list:
+    return [
+        {"geohash": cell, "facilityKey": f"{kind}#{COVERAGE_MARKER_KEY}", "harvestedAt": harvested_at, "ttl": ttl}
+        for kind in kinds
+    ]
+
+
+# Every listed shop's inventory in one query, walking InventoryItemsIndex
+_INVENTORY_ORDER = [("shopId", ASCENDING), ("itemId", ASCENDING)]
+
+
+def _inventories_query(shops: list) -> Optional[dict]:
+    """`$in` filter for the shops without an embedded (legacy) inventory; None if there are none."""
+    shop_ids = [s["shopId"] for s in shops if "inventory" not in s]
+    return {"shopId": {"$in": shop_ids}} if shop_ids else None
+
+
+def _with_inventories(shops: list, items) -> list:
+    by_shop = defaultdict(list)
+    for item in items:
+        by_shop[item.pop("shopId")].append(item)
+    return [s if "inventory" in s else dict(s, inventory=by_shop[s["shopId"]]) for s in shops]
+
+
+def _find_args(
+    index_name: Optional[str], scan_forward: bool, projection: Optional[list], keep_sort_fields: bool = False
+) -> tuple:
+    """
+    (fields, sort) reproducing the DynamoDB index order for a query. `_id` is
+    projected away unless keep_sort_fields (page queries build their cursor
+    from the last document's sort key and `_id`).
+    """
+    direction = ASCENDING if scan_forward else DESCENDING
+    sort_key = _INDEX_SORT_KEYS.get(index_name)
+    sort = [(sort_key, direction), ("_id", direction)] if sort_key else [("_id", direction)]
+    if not keep_sort_fields:
+        return {**{f: 1 for f in projection or ()}, "_id": 0}, sort
+    fields = None
+    if projection:
+        fields = {f: 1 for f in projection}
+        if sort_key:
+            fields[sort_key] = 1
+    return fields, sort
+
+
+def _page_query(
+    index_name: Optional[str], key_name: str, key_value: str,
+    filters: Optional[dict], cursor: Optional[str], scan_forward: bool,
+) -> dict:
+    """
+    Range-based pagination: the cursor holds the last item's (sort key, _id),
+    so each page is an index seek rather than a growing skip().
+    """
+    query = {key_name: key_value, **(filters or {})}
+    sort_key = _INDEX_SORT_KEYS.get(index_name)
+    start = decode_cursor(cursor)
+    if start:
+        try:
+            last_id = ObjectId(start["_id"])
+        except (KeyError, InvalidId) as exc:
+            raise ValueError("invalid cursor") from exc
+        op = "$gt" if scan_forward else "$lt"
+        if sort_key:
+            last_sort = start.get(sort_key)
+            query["$or"] = [
+                {sort_key: {op: last_sort}},
+                {sort_key: last_sort, "_id": {op: last_id}},
+            ]
+        else:
+            query["_id"] = {op: last_id}
+    return query
+
+
+def _page_result(docs: list, limit: int, index_name: Optional[str], projection: Optional[list]) -> tuple:
+    """Items and next cursor from up to limit + 1 documents read by a page query."""
+    sort_key = _INDEX_SORT_KEYS.get(index_name)
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        position = {"_id": str(last["_id"])}
+        if sort_key:
+            position[sort_key] = last.get(sort_key)
+        next_cursor = encode_cursor(position)
+    items = [_strip_id(d) for d in docs]
+    if projection:
+        items = [{k: v for k, v in item.items() if k in projection} for item in items]
+    return items, next_cursor
+
+
 class MongoDBService:
     """MongoDB implementation matching DynamoDBService interface for local dev."""
 
     def __init__(self):
-        self._client = MongoClient(config.MONGODB_URI)
+        self._client = MongoClient(config.MONGODB_URI, **client_options())
         self._db = self._client[f"gramsathi_{config.STAGE}"]
         self._ensure_indexes()
 
@@ -29,140 +369,399 @@ class MongoDBService:
         return self._db[_collection_name(table_name)]
 
     def _ensure_indexes(self) -> None:
-        """Create indexes for query patterns (equivalent to DynamoDB GSIs)."""
+        """
+        Create missing indexes, once per process. When the marker document
+        already holds INDEX_VERSION nothing else is read; otherwise BACKFILLS
+        run, only the indexes absent from list_indexes() are created, any
+        RETIRED_INDEXES still present are dropped, and the marker is set.
+        """
+        if self._db.name in _indexes_ready:
+            return
         try:
-            # conversations: query by userId
-            self._collection(config.CONVERSATIONS_TABLE).create_index(
-                [("userId", ASCENDING)],
-                name="UserConversationsIndex",
-            )
-            # shops: query by pincode
-            self._collection(config.SHOPS_TABLE).create_index(
-                [("pincode", ASCENDING)],
-                name="PincodeIndex",
-            )
-            # orders: query by userId and shopId
-            self._collection(config.ORDERS_TABLE).create_index(
-                [("userId", ASCENDING)],
-                name="UserOrdersIndex",
-            )
-            self._collection(config.ORDERS_TABLE).create_index(
-                [("shopId", ASCENDING)],
-                name="ShopOrdersIndex",
-            )
+            schema = self._db[SCHEMA_COLLECTION]
+            marker = schema.find_one({"_id": INDEX_MARKER_ID})
+            if not marker or marker.get("version") != INDEX_VERSION:
+                for table_name, query, pipeline in BACKFILLS:
+                    self._collection(table_name).update_many(query, pipeline)
+                for table_name in INDEXES:
+                    collection = self._collection(table_name)
+                    existing = [i["name"] for i in collection.list_indexes()]
+                    missing = missing_indexes(table_name, existing)
+                    if missing:
+                        collection.create_indexes(missing)
+                    for name in retired_indexes(table_name, existing):
+                        collection.drop_index(name)
+                schema.replace_one({"_id": INDEX_MARKER_ID},
+                                   {"_id": INDEX_MARKER_ID, "version": INDEX_VERSION}, upsert=True)
+                logger.info("mongodb_indexes_ensured", database=self._db.name, version=INDEX_VERSION)
+            _indexes_ready.add(self._db.name)
         except PyMongoError as e:
             logger.warning("mongodb_index_create", error=str(e))
 
-    def _doc_from_item(self, item: dict) -> dict:
-        """Prepare item for MongoDB (convert Decimal to float if needed)."""
-        from decimal import Decimal
-
-        def convert(v):
-            if isinstance(v, Decimal):
-                return float(v)
-            if isinstance(v, dict):
-                return {k: convert(x) for k, x in v.items()}
-            if isinstance(v, list):
-                return [convert(x) for x in v]
-            return v
-
-        return convert(item)
-
-    def _doc_to_item(self, doc: Optional[dict]) -> Optional[dict]:
-        """Convert MongoDB doc to format handlers expect (Decimal128 → float)."""
-        if doc is None:
-            return None
-        try:
-            from bson.decimal128 import Decimal128
-        except ImportError:
-            return doc
-
-        def convert(v):
-            if isinstance(v, (Decimal128,)):
-                return float(v)
-            from decimal import Decimal
-
-            if isinstance(v, Decimal):
-                return float(v)
-            if isinstance(v, dict):
-                return {k: convert(x) for k, x in v.items()}
-            if isinstance(v, list):
-                return [convert(x) for x in v]
-            return v
-
-        return convert(doc)
+    # --- Generic queries (same interface as DynamoDBService) ---
+
+    def batch_get(self, table_name: str, keys: list, projection: Optional[list] = None) -> list:
+        """One `$in` (or `$or` for composite keys) query; results aligned to `keys`, None if missing."""
+        if not keys:
+            return []
+        query, fields = _batch_get_query(keys, projection)
+        return _align(keys, self._collection(table_name).find(query, fields))
+
+    def query_by_index(
+        self,
+        table_name: str,
+        index_name: str,
+        key_name: str,
+        key_value: str,
+        *,
+        limit: Optional[int] = None,
+        scan_forward: bool = True,
+        filters: Optional[dict] = None,
+        projection: Optional[list] = None,
+    ) -> list:
+        fields, sort = _find_args(index_name, scan_forward, projection)
+        cursor = self._collection(table_name).find({key_name: key_value, **(filters or {})}, fields).sort(sort)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return list(cursor)
+
+    def query_page(
+        self,
+        table_name: str,
+        index_name: str,
+        key_name: str,
+        key_value: str,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        scan_forward: bool = True,
+        filters: Optional[dict] = None,
+        projection: Optional[list] = None,
+    ) -> tuple:
+        query = _page_query(index_name, key_name, key_value, filters, cursor, scan_forward)
+        fields, sort = _find_args(index_name, scan_forward, projection, keep_sort_fields=True)
+        docs = list(self._collection(table_name).find(query, fields).sort(sort).limit(limit + 1))
+        return _page_result(docs, limit, index_name, projection)
 
     # --- Domain helpers (same interface as DynamoDBService) ---
 
     def get_user(self, user_id: str) -> Optional[dict]:
-        return self._doc_to_item(
-            self._collection(config.USERS_TABLE).find_one({"userId": user_id})
-        )
+        return self._collection(config.USERS_TABLE).find_one({"userId": user_id}, _NO_ID)
 
     def save_user(self, user: dict) -> None:
         self._collection(config.USERS_TABLE).replace_one(
-            {"userId": user["userId"]}, self._doc_from_item(user), upsert=True
+            {"userId": user["userId"]}, user, upsert=True
         )
 
+    # --- Conversations: header document + one CONVERSATION_TURNS document per message ---
+
     def get_conversation(self, conversation_id: str) -> Optional[dict]:
-        return self._doc_to_item(
-            self._collection(config.CONVERSATIONS_TABLE).find_one(
-                {"conversationId": conversation_id}
-            )
+        """Header document only (no messages)."""
+        return self._collection(config.CONVERSATIONS_TABLE).find_one(
+            {"conversationId": conversation_id}, _NO_ID
         )
 
     def save_conversation(self, conversation: dict) -> None:
+        """Legacy whole-document write — new code appends turns instead."""
         self._collection(config.CONVERSATIONS_TABLE).replace_one(
             {"conversationId": conversation["conversationId"]},
-            self._doc_from_item(conversation),
+            conversation,
             upsert=True,
         )
 
     def get_conversations_by_user(self, user_id: str) -> list:
+        """Conversation headers, newest first; load_conversation reads the messages."""
         cursor = self._collection(config.CONVERSATIONS_TABLE).find(
-            {"userId": user_id}
-        ).sort("createdAt", -1)
-        return [self._doc_to_item(d) for d in cursor]
+            {"userId": user_id}, _CONVERSATION_LIST_FIELDS
+        ).sort(_NEWEST_FIRST)
+        return list(cursor)
+
+    def get_latest_conversation(self, user_id: str, max_messages: int) -> Optional[dict]:
+        doc = self._collection(config.CONVERSATIONS_TABLE).find_one(
+            {"userId": user_id},
+            {"_id": 0, "conversationId": 1},
+            sort=[("updatedAt", DESCENDING)],
+        )
+        if not doc:
+            return None
+        return self.load_conversation(doc["conversationId"], max_messages)
 
-    def get_shop(self, shop_id: str) -> Optional[dict]:
-        return self._doc_to_item(
-            self._collection(config.SHOPS_TABLE).find_one({"shopId": shop_id})
+    def load_conversation(self, conversation_id: str, max_messages: int) -> Optional[dict]:
+        header = self.get_conversation(conversation_id)
+        if not header:
+            return None
+        if "messages" in header:
+            messages = header.pop("messages") or []
+            header["turnCount"] = self.migrate_conversation({**header, "messages": messages})
+            header["messages"] = messages[-max_messages:] if max_messages else []
+            return header
+        if max_messages <= 0:
+            header["messages"] = []
+            return header
+        cursor = (
+            self._collection(config.CONVERSATION_TURNS_TABLE)
+            .find({"conversationId": conversation_id}, {"_id": 0, "conversationId": 0, "turnSeq": 0})
+            .sort("turnSeq", DESCENDING)
+            .limit(max_messages)
+        )
+        turns = list(cursor)
+        turns.reverse()
+        header["messages"] = turns
+        return header
+
+    def append_conversation_turns(self, header: dict, messages: list) -> None:
+        if not messages:
+            return
+        fields = {k: v for k, v in header.items()
+                  if k not in ("conversationId", "messages", "turnCount", "createdAt")}
+        updated = self._collection(config.CONVERSATIONS_TABLE).find_one_and_update(
+            {"conversationId": header["conversationId"]},
+            {
+                "$set": fields,
+                "$setOnInsert": {"createdAt": header.get("createdAt")},
+                "$inc": {"turnCount": len(messages)},
+            },
+            projection={"turnCount": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        first_seq = int(updated["turnCount"]) - len(messages) + 1
+        self._put_turns(header["conversationId"], first_seq, messages)
+
+    def _put_turns(self, conversation_id: str, first_seq: int, messages: list) -> None:
+        if not messages:
+            return
+        ops = []
+        for offset, message in enumerate(messages):
+            doc = {k: v for k, v in message.items() if v is not None}
+            doc.update(conversationId=conversation_id, turnSeq=first_seq + offset)
+            ops.append(ReplaceOne(
+                {"conversationId": conversation_id, "turnSeq": doc["turnSeq"]},
+                doc,
+                upsert=True,
+            ))
+        self._collection(config.CONVERSATION_TURNS_TABLE).bulk_write(ops, ordered=False)
+
+    def migrate_conversation(self, item: dict) -> int:
+        messages = item.get("messages") or []
+        self._put_turns(item["conversationId"], 1, messages)
+        self._collection(config.CONVERSATIONS_TABLE).update_one(
+            {"conversationId": item["conversationId"], "messages": {"$exists": True}},
+            {"$unset": {"messages": ""}, "$set": {"turnCount": len(messages)}},
         )
+        logger.info("conversation_migrated", conversation_id=item["conversationId"], turns=len(messages))
+        return len(messages)
+
+    def iter_legacy_conversations(self) -> Iterator[dict]:
+        cursor = self._collection(config.CONVERSATIONS_TABLE).find(
+            {"messages": {"$exists": True}}, _NO_ID
+        )
+        for doc in cursor:
+            yield doc
+
+    def get_shop(self, shop_id: str) -> Optional[dict]:
+        return self._collection(config.SHOPS_TABLE).find_one({"shopId": shop_id}, _SHOP_FIELDS)
 
     def save_shop(self, shop: dict) -> None:
         self._collection(config.SHOPS_TABLE).replace_one(
-            {"shopId": shop["shopId"]}, self._doc_from_item(shop), upsert=True
+            {"shopId": shop["shopId"]}, _with_location(with_listing_keys(shop)), upsert=True
         )
 
+    def set_shop_status(self, shop_id: str, status: str, updated_at: str) -> Optional[dict]:
+        shop = self.get_shop(shop_id)
+        if not shop:
+            return None
+        doc = self._collection(config.SHOPS_TABLE).find_one_and_update(
+            {"shopId": shop_id},
+            {"$set": dict(status_keys(shop, status), updatedAt=updated_at)},
+            projection=_SHOP_FIELDS,
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc
+
     def get_shops_by_pincode(self, pincode: str) -> list:
-        cursor = self._collection(config.SHOPS_TABLE).find({"pincode": pincode})
-        return [self._doc_to_item(d) for d in cursor]
+        cursor = self._collection(config.SHOPS_TABLE).find({"pincode": pincode}, _SHOP_FIELDS)
+        return list(cursor)
+
+    def _listed_shops(self, pincode: str, category: Optional[str], status: str, fields: dict):
+        query = {"pincode": pincode, "status": status}
+        if category:
+            query["category"] = category
+        return list(self._collection(config.SHOPS_TABLE).find(query, fields))
+
+    def get_shop_cards_by_pincode(
+        self, pincode: str, category: Optional[str] = None, status: str = SHOP_STATUS_APPROVED
+    ) -> list:
+        return self._listed_shops(pincode, category, status, _CARD_FIELDS)
+
+    def get_approved_shops_by_pincode(self, pincode: str, category: Optional[str] = None) -> list:
+        return self._listed_shops(pincode, category, SHOP_STATUS_APPROVED, _SHOP_FIELDS)
+
+    def get_shops_near(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        category: Optional[str] = None,
+        limit: int = MAX_NEARBY_FACILITIES,
+    ) -> list:
+        """
+        Listing cards of approved shops within `radius_km` of a GPS fix, nearest
+        first, each with `distanceKm`. One $nearSphere query on ShopLocationIndex.
+        """
+        cursor = self._collection(config.SHOPS_TABLE).find(
+            _near_query(lat, lon, radius_km, category), _CARD_FIELDS
+        ).limit(limit)
+        return _with_distance(lat, lon, list(cursor))
+
+    # --- Inventory: one document per (shopId, itemId) ---
+
+    def get_inventory(self, shop_id: str, projection: Optional[list] = None) -> list:
+        return self.query_by_index(config.INVENTORY_TABLE, "InventoryItemsIndex", "shopId", shop_id,
+                                   projection=projection)
+
+    def get_inventory_page(
+        self, shop_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> tuple:
+        return self.query_page(config.INVENTORY_TABLE, "InventoryItemsIndex", "shopId", shop_id,
+                               limit=limit, cursor=cursor)
+
+    def save_inventory_items(self, shop_id: str, items: list) -> None:
+        if not items:
+            return
+        ops = [
+            ReplaceOne(
+                {"shopId": shop_id, "itemId": item["itemId"]},
+                dict(item, shopId=shop_id),
+                upsert=True,
+            )
+            for item in items
+        ]
+        self._collection(config.INVENTORY_TABLE).bulk_write(ops, ordered=False)
+
+    def delete_inventory_items(self, shop_id: str, item_ids: list) -> None:
+        if item_ids:
+            self._collection(config.INVENTORY_TABLE).delete_many(
+                {"shopId": shop_id, "itemId": {"$in": list(item_ids)}}
+            )
+
+    def update_inventory_item(self, shop_id: str, item_id: str, fields: dict) -> Optional[dict]:
+        doc = self._collection(config.INVENTORY_TABLE).find_one_and_update(
+            {"shopId": shop_id, "itemId": item_id},
+            {"$set": fields},
+            projection=_NO_ID,
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc
+
+    def attach_inventory(self, shop: dict) -> dict:
+        """Shop header plus its `inventory` list; legacy embedded lists are used as-is."""
+        if "inventory" in shop:
+            return shop
+        items = self.get_inventory(shop["shopId"])
+        return dict(shop, inventory=[{k: v for k, v in i.items() if k != "shopId"} for i in items])
+
+    def attach_inventories(self, shops: list) -> list:
+        """attach_inventory for many shops with one query."""
+        query = _inventories_query(shops)
+        if query is None:
+            return shops
+        items = self._collection(config.INVENTORY_TABLE).find(query, _NO_ID).sort(_INVENTORY_ORDER)
+        return _with_inventories(shops, items)
+
+    def migrate_shop_inventory(self, shop: dict) -> None:
+        if "inventory" not in shop:
+            return
+        self.save_inventory_items(shop["shopId"], shop["inventory"])
+        self._collection(config.SHOPS_TABLE).update_one(
+            {"shopId": shop["shopId"]}, {"$unset": {"inventory": ""}}
+        )
+        logger.info("shop_inventory_migrated", shop_id=shop["shopId"], items=len(shop["inventory"]))
 
     def save_order(self, order: dict) -> None:
         self._collection(config.ORDERS_TABLE).replace_one(
-            {"orderId": order["orderId"]}, self._doc_from_item(order), upsert=True
+            {"orderId": order["orderId"]}, order, upsert=True
         )
 
     def get_order(self, order_id: str) -> Optional[dict]:
-        return self._doc_to_item(
-            self._collection(config.ORDERS_TABLE).find_one({"orderId": order_id})
-        )
+        return self._collection(config.ORDERS_TABLE).find_one({"orderId": order_id}, _NO_ID)
 
     def get_orders_by_user(self, user_id: str) -> list:
         cursor = self._collection(config.ORDERS_TABLE).find(
-            {"userId": user_id}
-        ).sort("createdAt", -1)
-        return [self._doc_to_item(d) for d in cursor]
+            {"userId": user_id}, _ORDER_FIELDS
+        ).sort(_NEWEST_FIRST)
+        return list(cursor)
 
-    def get_orders_by_shop(self, shop_id: str) -> list:
+    def get_orders_by_shop(self, shop_id: str, projection: Optional[list] = None) -> list:
         cursor = self._collection(config.ORDERS_TABLE).find(
-            {"shopId": shop_id}
-        ).sort("createdAt", -1)
-        return [self._doc_to_item(d) for d in cursor]
+            {"shopId": shop_id}, _order_fields(projection)
+        ).sort(_NEWEST_FIRST)
+        return list(cursor)
+
+    def get_orders_page(
+        self,
+        shop_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> tuple:
+        return self.query_page(
+            config.ORDERS_TABLE, "ShopOrdersByDateIndex", "shopId", shop_id,
+            limit=limit, cursor=cursor, scan_forward=False,
+            filters={"status": status} if status else None,
+        )
+
+    def update_order_status(
+        self, order_id: str, old_status: str, new_status: str, updated_at: str
+    ) -> Optional[dict]:
+        doc = self._collection(config.ORDERS_TABLE).find_one_and_update(
+            {"orderId": order_id, "status": old_status},
+            {"$set": {"status": new_status, "updatedAt": updated_at}},
+            projection=_NO_ID,
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc
+
+    def iter_shop_ids(self) -> Iterator[str]:
+        for doc in self._collection(config.SHOPS_TABLE).find({}, {"shopId": 1, "_id": 0}):
+            yield doc["shopId"]
+
+    # --- Shop analytics rollups (statDate = "YYYY-MM-DD" per day, "ALL" all-time) ---
+
+    def record_order_placed(self, shop_id: str, day: str, amount: float, order_id: str) -> None:
+        """
+        Both rollup rows in one bulk_write round trip. The order ID is unused:
+        DynamoDB uses it as the transaction's idempotency token.
+        """
+        self._collection(config.SHOP_STATS_TABLE).bulk_write(_order_placed_ops(shop_id, day, amount))
+
+    def record_order_status_change(self, shop_id: str, old_status: str, new_status: str) -> None:
+        delta = int(new_status == ORDER_STATUS_PENDING) - int(old_status == ORDER_STATUS_PENDING)
+        if delta:
+            self._collection(config.SHOP_STATS_TABLE).update_one(
+                {"shopId": shop_id, "statDate": SHOP_STATS_ALL_TIME},
+                {"$inc": {"pendingOrders": delta}}, upsert=True,
+            )
+
+    def get_shop_stats(self, shop_id: str, since_day: str) -> list:
+        cursor = self._collection(config.SHOP_STATS_TABLE).find(
+            {"shopId": shop_id, "statDate": {"$gte": since_day}}, _NO_ID
+        )
+        return list(cursor)
+
+    def save_shop_stats(self, shop_id: str, rows: list) -> None:
+        if not rows:
+            return
+        ops = [
+            ReplaceOne({"shopId": shop_id, "statDate": r["statDate"]},
+                       dict(r, shopId=shop_id), upsert=True)
+            for r in rows
+        ]
+        self._collection(config.SHOP_STATS_TABLE).bulk_write(ops, ordered=False)
 
     def get_response_cache(self, cache_key: str) -> Optional[str]:
         doc = self._collection(config.RESPONSE_CACHE_TABLE).find_one(
-            {"cacheKey": cache_key}
+            {"cacheKey": cache_key}, _CACHED_RESPONSE_FIELDS
         )
         if not doc:
             return None
@@ -176,16 +775,15 @@ class MongoDBService:
         ttl = int(time.time()) + config.RESPONSE_CACHE_TTL_SECONDS
         self._collection(config.RESPONSE_CACHE_TABLE).replace_one(
             {"cacheKey": cache_key},
-            {"cacheKey": cache_key, "response": response, "language": language, "ttl": ttl},
+            {"cacheKey": cache_key, "response": response, "language": language,
+             "ttl": ttl, "expiresAt": _expires_at(ttl)},
             upsert=True,
         )
 
     # --- Geo cache (Nominatim city → lat/lon, permanent) ---
 
     def get_geo_cache(self, location_key: str) -> Optional[dict]:
-        return self._doc_to_item(
-            self._collection(config.GEO_CACHE_TABLE).find_one({"locationKey": location_key})
-        )
+        return self._collection(config.GEO_CACHE_TABLE).find_one({"locationKey": location_key}, _NO_ID)
 
     def set_geo_cache(self, location_key: str, lat: float, lon: float) -> None:
         self._collection(config.GEO_CACHE_TABLE).replace_one(
@@ -193,3 +791,25 @@ class MongoDBService:
             {"locationKey": location_key, "lat": str(lat), "lon": str(lon)},
             upsert=True,
         )
+
+    # --- Facility mirror (harvested Places results, keyed by geohash cell) ---
+
+    def get_facilities_in_cell(self, cell: str, kind: Optional[str] = None) -> list:
+        cursor = self._collection(config.FACILITIES_TABLE).find(_facility_query(cell, kind), _EXPIRING_FIELDS)
+        return list(cursor)
+
+    def save_facilities(self, facilities: list) -> None:
+        if not facilities:
+            return
+        ops = [
+            ReplaceOne(
+                {"geohash": f["geohash"], "facilityKey": f["facilityKey"]},
+                _with_expiry(f),
+                upsert=True,
+            )
+            for f in facilities
+        ]
+        self._collection(config.FACILITIES_TABLE).bulk_write(ops, ordered=False)
+
+    def mark_cell_harvested(self, cell: str, kinds: list, harvested_at: str, ttl: int) -> None:
+        self.save_facilities(_coverage_markers(cell, kinds, harvested_at, ttl))
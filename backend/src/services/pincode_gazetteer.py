@@ -0,0 +1,185 @@
+"""
+Offline India pincode gazetteer (pincode ↔ lat/lon).
+
+Pincode-only users get a real centroid for Google Places Nearby Search instead
+of a vague "clinics near 324008, India" text search, and GPS-only users get a
+nearest pincode so registered shops can be looked up by pincode.
+
+File layout (little-endian, memory-mapped — nothing is parsed at cold start):
+
+    header   b"GSPG" | version u16 | reserved u16 | count u32
+    kd       count × (lat f32, lon f32, pincode u32)   implicit balanced KD-tree
+    index    count × (pincode u32, kd_slot u32)        sorted by pincode
+
+The KD section is laid out so that the median of every sub-range [lo, hi) sits
+at (lo + hi) // 2, splitting on latitude at even depths and longitude at odd
+depths. That makes the tree implicit in the array — no node objects, no build
+step on load.
+
+Build the file with `python -m scripts.build_pincode_gazetteer <csv>`.
+"""
+import math
+import mmap
+import os
+import struct
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+from src.utils.config import config
+from src.utils.logger import logger
+
+_MAGIC = b"GSPG"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+_KD_RECORD = struct.Struct("<ffI")
+_INDEX_RECORD = struct.Struct("<II")
+
+_KM_PER_DEGREE = 111.195
+
+
+def _split_axis(depth: int) -> int:
+    return depth & 1  # 0 = latitude, 1 = longitude
+
+
+def build_gazetteer(points: Iterable[Tuple[str, float, float]], path: str) -> int:
+    """
+    Write a gazetteer file from (pincode, lat, lon) centroids.
+    Duplicate pincodes keep the last value. Returns the number of records written.
+    """
+    by_pincode = {int(p): (float(lat), float(lon)) for p, lat, lon in points}
+    records = [(lat, lon, pin) for pin, (lat, lon) in by_pincode.items()]
+    kd: List[Optional[tuple]] = [None] * len(records)
+
+    # Iterative median split — avoids recursion limits on ~20k pincodes
+    stack = [(0, len(records), 0, records)]
+    while stack:
+        lo, hi, depth, chunk = stack.pop()
+        if lo >= hi:
+            continue
+        axis = _split_axis(depth)
+        chunk = sorted(chunk, key=lambda r: r[axis])
+        mid = (lo + hi) // 2
+        kd[mid] = chunk[mid - lo]
+        stack.append((lo, mid, depth + 1, chunk[: mid - lo]))
+        stack.append((mid + 1, hi, depth + 1, chunk[mid - lo + 1:]))
+
+    index = sorted((rec[2], slot) for slot, rec in enumerate(kd))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, 0, len(kd)))
+        for lat, lon, pin in kd:
+            f.write(_KD_RECORD.pack(lat, lon, pin))
+        for pin, slot in index:
+            f.write(_INDEX_RECORD.pack(pin, slot))
+    os.replace(tmp_path, path)
+    return len(kd)
+
+
+class PincodeGazetteer:
+    """Read-only, lazily memory-mapped view over a gazetteer file."""
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path or config.PINCODE_GAZETTEER_PATH
+        self._buf: Optional[mmap.mmap] = None
+        self._count = 0
+        self._index_offset = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                with open(self._path, "rb") as f:
+                    buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError) as exc:
+                logger.warning("pincode_gazetteer_unavailable", path=self._path, error=str(exc))
+                return
+            magic, version, _, count = _HEADER.unpack_from(buf, 0)
+            if magic != _MAGIC or version != _VERSION:
+                logger.warning("pincode_gazetteer_bad_header", path=self._path)
+                buf.close()
+                return
+            self._buf = buf
+            self._count = count
+            self._index_offset = _HEADER.size + count * _KD_RECORD.size
+            logger.info("pincode_gazetteer_loaded", count=count)
+
+    @property
+    def available(self) -> bool:
+        self._load()
+        return self._buf is not None and self._count > 0
+
+    def _kd(self, slot: int) -> Tuple[float, float, int]:
+        return _KD_RECORD.unpack_from(self._buf, _HEADER.size + slot * _KD_RECORD.size)
+
+    # ── pincode → centroid ─────────────────────────────────────────────────────
+
+    def centroid(self, pincode: str) -> Optional[Tuple[float, float]]:
+        """Return (lat, lon) for a 6-digit pincode, or None if unknown."""
+        if not self.available or not pincode or not pincode.isdigit():
+            return None
+        target = int(pincode)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pin, slot = _INDEX_RECORD.unpack_from(
+                self._buf, self._index_offset + mid * _INDEX_RECORD.size
+            )
+            if pin < target:
+                lo = mid + 1
+            elif pin > target:
+                hi = mid
+            else:
+                lat, lon, _ = self._kd(slot)
+                return round(lat, 5), round(lon, 5)
+        return None
+
+    # ── lat/lon → nearest pincode ──────────────────────────────────────────────
+
+    def nearest_pincode(
+        self, lat: float, lon: float, max_km: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Return the pincode whose centroid is closest to (lat, lon), or None when
+        the gazetteer is missing or the nearest centroid is beyond max_km.
+        """
+        if not self.available:
+            return None
+        max_km = config.PINCODE_NEAREST_MAX_KM if max_km is None else max_km
+        # Equirectangular projection — accurate to well under 1 % at India's latitudes
+        lon_scale = math.cos(math.radians(lat))
+        best_pin = 0
+        best_d2 = float("inf")
+
+        stack = [(0, self._count, 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            n_lat, n_lon, n_pin = self._kd(mid)
+            d_lat = lat - n_lat
+            d_lon = (lon - n_lon) * lon_scale
+            d2 = d_lat * d_lat + d_lon * d_lon
+            if d2 < best_d2:
+                best_d2, best_pin = d2, n_pin
+
+            diff = d_lat if _split_axis(depth) == 0 else d_lon
+            near, far = ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+            # Push far side first so the near side is explored first (LIFO)
+            if diff * diff < best_d2:
+                stack.append((far[0], far[1], depth + 1))
+            stack.append((near[0], near[1], depth + 1))
+
+        if math.sqrt(best_d2) * _KM_PER_DEGREE > max_km:
+            return None
+        return f"{best_pin:06d}"
+
+
+pincode_gazetteer = PincodeGazetteer()
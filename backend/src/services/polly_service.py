@@ -1,6 +1,6 @@
-import boto3
 import uuid
 from src.utils.config import config
+from src.services import aws_clients
 from src.services.s3_service import s3
 
 
@@ -42,8 +42,9 @@ NORMAL_SAMPLE_RATE = "22050"
 
 
 class PollyService:
-    def __init__(self):
-        self._client = boto3.client("polly", region_name=config.AWS_REGION)
+    @property
+    def _client(self):
+        return aws_clients.client("polly")
 
     def synthesize(self, text: str, language_code: str = "hi", low_bandwidth: bool = False) -> str:
         """
@@ -1,16 +1,11 @@
-import boto3
-from botocore.config import Config as BotoConfig
+from src.services import aws_clients
 from src.utils.config import config
 
 
 class S3Service:
-    def __init__(self):
-        self._client = boto3.client(
-            "s3",
-            region_name=config.AWS_REGION,
-            endpoint_url=f"https://s3.{config.AWS_REGION}.amazonaws.com",
-            config=BotoConfig(signature_version="s3v4"),
-        )
+    @property
+    def _client(self):
+        return aws_clients.client("s3")
 
     def generate_presigned_upload_url(self, object_key: str, content_type: str = "audio/webm") -> str:
         """Generate a presigned PUT URL so the Flutter app can upload audio directly to S3."""
@@ -1,11 +1,13 @@
-import boto3
 import json
+
+from src.services import aws_clients
 from src.utils.config import config
 
 
 class SNSService:
-    def __init__(self):
-        self._client = boto3.client("sns", region_name=config.AWS_REGION)
+    @property
+    def _client(self):
+        return aws_clients.client("sns")
 
     def notify_shop_new_order(self, shop_phone: str, order: dict) -> None:
         """Send an SMS/push notification to the shop owner when a new order arrives (US-15)."""
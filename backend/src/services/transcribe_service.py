@@ -1,8 +1,8 @@
-import boto3
 import json
 import time
 import urllib.request
 import uuid
+from src.services import aws_clients
 from src.utils.config import config
 
 
@@ -20,8 +20,9 @@ LANGUAGE_MAP = {
 
 
 class TranscribeService:
-    def __init__(self):
-        self._client = boto3.client("transcribe", region_name=config.AWS_REGION)
+    @property
+    def _client(self):
+        return aws_clients.client("transcribe")
 
     def transcribe_audio(self, audio_s3_key: str, language_code: str = "hi") -> str:
         """
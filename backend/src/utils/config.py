@@ -1,5 +1,19 @@
 import os
 
+from src.utils.sharding import parse_shard_counts
+
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _shard_spec(name: str) -> str:
+    """A "key=count,key=count" env var, rejected at cold start if malformed (not on every save)."""
+    spec = os.environ.get(name, "")
+    try:
+        parse_shard_counts(spec)
+    except ValueError as exc:
+        raise ValueError(f"{name}: {exc}") from exc
+    return spec
+
 
 class Config:
     STAGE: str = os.environ.get("STAGE", "dev")
@@ -8,10 +22,20 @@ class Config:
     TABLE_PREFIX: str = os.environ.get("TABLE_PREFIX", f"gramsathi-{STAGE}")
     USERS_TABLE: str = f"{TABLE_PREFIX}-users"
     CONVERSATIONS_TABLE: str = f"{TABLE_PREFIX}-conversations"
+    CONVERSATION_TURNS_TABLE: str = f"{TABLE_PREFIX}-conversation-turns"
     SHOPS_TABLE: str = f"{TABLE_PREFIX}-shops"
+    INVENTORY_TABLE: str = f"{TABLE_PREFIX}-inventory"
     ORDERS_TABLE: str = f"{TABLE_PREFIX}-orders"
+    SHOP_STATS_TABLE: str = f"{TABLE_PREFIX}-shop-stats"
     RESPONSE_CACHE_TABLE: str = f"{TABLE_PREFIX}-response-cache"
     GEO_CACHE_TABLE: str = os.environ.get("GEO_CACHE_TABLE", f"{TABLE_PREFIX}-geo-cache")
+    FACILITIES_TABLE: str = os.environ.get("FACILITIES_TABLE", f"{TABLE_PREFIX}-facilities")
+
+    # Shared boto3 clients (src/services/aws_clients.py)
+    AWS_MAX_POOL_CONNECTIONS: int = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "25"))
+    AWS_MAX_ATTEMPTS: int = int(os.environ.get("AWS_MAX_ATTEMPTS", "3"))
+    # CloudWatch namespace for Embedded Metric Format counters (src/utils/metrics.py)
+    METRICS_NAMESPACE: str = os.environ.get("METRICS_NAMESPACE", "GramSathi")
 
     S3_AUDIO_BUCKET: str = os.environ.get("S3_AUDIO_BUCKET", f"gramsathi-audio-{STAGE}")
     AUDIO_EXPIRY_SECONDS: int = 3600
@@ -28,8 +52,58 @@ class Config:
     )
     BEDROCK_MAX_TOKENS: int = int(os.environ.get("BEDROCK_MAX_TOKENS", "512"))
     BEDROCK_HISTORY_TURNS: int = 4
+    # Messages loaded per request — exactly what the prompt uses (user + assistant per turn)
+    CONVERSATION_HISTORY_MESSAGES: int = BEDROCK_HISTORY_TURNS * 2
     RESPONSE_CACHE_TTL_SECONDS: int = 86400
     GOOGLE_PLACES_API_KEY: str = os.environ.get("GOOGLE_PLACES_API_KEY", "")
+    GOOGLE_PLACES_TIMEOUT_SECONDS: int = 10
+
+    # Places resilience — skip repeat lookups that just failed or came back empty,
+    # and stop calling the API altogether while it is failing (outage / quota).
+    PLACES_NEGATIVE_CACHE_TTL_SECONDS: int = int(os.environ.get("PLACES_NEGATIVE_CACHE_TTL_SECONDS", "120"))
+    PLACES_NEGATIVE_CACHE_MAX_ENTRIES: int = 512
+    PLACES_BREAKER_FAILURE_THRESHOLD: int = int(os.environ.get("PLACES_BREAKER_FAILURE_THRESHOLD", "5"))
+    PLACES_BREAKER_RESET_SECONDS: int = int(os.environ.get("PLACES_BREAKER_RESET_SECONDS", "30"))
+
+    # Offline pincode ↔ lat/lon gazetteer (built by scripts/build_pincode_gazetteer.py)
+    PINCODE_GAZETTEER_PATH: str = os.environ.get(
+        "PINCODE_GAZETTEER_PATH", os.path.join(_SRC_DIR, "data", "pincode_gazetteer.bin")
+    )
+    PINCODE_NEAREST_MAX_KM: float = 25.0  # GPS further than this from any centroid → no pincode
+
+    # Local facility mirror — harvested Places results served before live Places calls
+    FACILITY_MIRROR_ENABLED: bool = os.environ.get("FACILITY_MIRROR_ENABLED", "true").lower() in ("true", "1")
+    FACILITY_MIRROR_RADIUS_KM: float = 10.0      # matches the first Places radius rung
+    FACILITY_MIRROR_PRECISION: int = 5           # table partition / harvest cell ≈ 4.9 km × 4.9 km
+    FACILITY_MIRROR_TTL_DAYS: int = 30           # Places content may not be cached longer
+
+    # Registered shops shown to GPS users (get_shops_near). Every geohash cell the
+    # circle overlaps is one query, so keep this to a few cells (≈ 4.9 km each).
+    SHOPS_NEAR_RADIUS_KM: float = float(os.environ.get("SHOPS_NEAR_RADIUS_KM", "5"))
+
+    # Write-sharded hot partition keys (src/utils/sharding.py): "key=count,key=count".
+    # PincodeShardIndex and PincodeStatusIndex by pincode, ShopOrdersShardIndex by
+    # shopId; unlisted keys get one shard.
+    PINCODE_SHARDS: str = _shard_spec("PINCODE_SHARDS")
+    SHOP_ORDER_SHARDS: str = _shard_spec("SHOP_ORDER_SHARDS")
+
+    # Areas the scheduled harvest covers: "lat,lon,radius_km;lat,lon,radius_km"
+    FACILITY_HARVEST_AREAS: str = os.environ.get("FACILITY_HARVEST_AREAS", "25.2138,75.8648,15")
+
+    # Read-through entity cache in front of `db` (see src/services/entity_cache.py)
+    ENTITY_CACHE_ENABLED: bool = os.environ.get("ENTITY_CACHE_ENABLED", "true").lower() in ("true", "1")
+    ENTITY_CACHE_USER_TTL_SECONDS: int = int(os.environ.get("ENTITY_CACHE_USER_TTL_SECONDS", "300"))
+    ENTITY_CACHE_SHOP_TTL_SECONDS: int = int(os.environ.get("ENTITY_CACHE_SHOP_TTL_SECONDS", "120"))
+    ENTITY_CACHE_PINCODE_TTL_SECONDS: int = int(os.environ.get("ENTITY_CACHE_PINCODE_TTL_SECONDS", "60"))
+    ENTITY_CACHE_MAX_ENTRIES: int = 2048  # per entity kind, local tier only
+    # Shared tier so invalidations reach every container, e.g. redis://localhost:6379/0
+    ENTITY_CACHE_REDIS_URL: str = os.environ.get("ENTITY_CACHE_REDIS_URL", "")
+    ENTITY_CACHE_REDIS_TIMEOUT_SECONDS: float = 0.2
+
+    # Run deferred bookkeeping writes after the response via a Lambda internal extension
+    POST_RESPONSE_EXTENSION_ENABLED: bool = (
+        os.environ.get("POST_RESPONSE_EXTENSION_ENABLED", "true").lower() in ("true", "1")
+    )
 
     # Input validation limits — prevents token abuse and DynamoDB oversized items
     MAX_TEXT_LENGTH: int = 1000       # characters per user message
@@ -50,6 +124,14 @@ class Config:
 
     # MongoDB for local dev (when IS_OFFLINE) — no AWS DynamoDB needed
     MONGODB_URI: str = os.environ.get("MONGODB_URI", "mongodb://localhost:27017")
+    # Connection pool shared by each (sync or async) client; fail fast when no server answers
+    MONGODB_MAX_POOL_SIZE: int = int(os.environ.get("MONGODB_MAX_POOL_SIZE", "100"))
+    MONGODB_MIN_POOL_SIZE: int = int(os.environ.get("MONGODB_MIN_POOL_SIZE", "0"))
+    MONGODB_MAX_IDLE_TIME_MS: int = int(os.environ.get("MONGODB_MAX_IDLE_TIME_MS", "60000"))
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = int(os.environ.get("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    MONGODB_CONNECT_TIMEOUT_MS: int = int(os.environ.get("MONGODB_CONNECT_TIMEOUT_MS", "5000"))
+    # In-process backend (DB_BACKEND=memory): simulated delay per table round trip
+    MEMORY_DB_LATENCY_MS: float = float(os.environ.get("MEMORY_DB_LATENCY_MS", "0"))
 
 
 config = Config()
@@ -22,19 +22,30 @@ ERR_UNSUPPORTED_CONTENT_TYPE = "Unsupported content type: {}"
 ERR_SHOP_ID_REQUIRED = "shopId is required"
 ERR_SHOP_ID_AND_ITEMS_REQUIRED = "shopId and items are required"
 ERR_ORDER_ID_REQUIRED = "orderId is required"
+ERR_PLACE_ID_REQUIRED = "placeId is required"
+ERR_INVALID_CURSOR = "Invalid or expired cursor"
 ERR_ITEMS_LIST_REQUIRED = "items list is required"
 ERR_MISSING_FIELDS = "Missing fields: {}"
 ERR_INVALID_ITEM_DATA = "Invalid item data: {}"
 ERR_ITEM_QTY_POSITIVE = "Item quantities must be greater than zero"
 ERR_ITEM_PRICE_NEGATIVE = "Item prices cannot be negative"
 ERR_STOCK_QTY_NEGATIVE = "Stock quantities cannot be negative"
+ERR_ITEM_UPDATE_FIELDS = "price or stockQty is required"
+ERR_INVALID_ORDER_STATUS = "Invalid order status: {}"
+ERR_INVALID_DAYS = "days must be between 1 and {}"
 ERR_TOO_MANY_ITEMS = "Too many items (max {})"
 
 # ── Resource not-found ───────────────────────────────────────────────────────
 ERR_SHOP_NOT_FOUND = "Shop not found"
 ERR_ORDER_NOT_FOUND = "Order not found"
+ERR_ITEM_NOT_FOUND = "Item not found"
+ERR_PLACE_NOT_FOUND = "Place not found"
 ERR_USER_NOT_FOUND = "User not found"
 
+# ── Conflict ─────────────────────────────────────────────────────────────────
+ERR_ORDER_STATUS_CONFLICT = "Order status changed meanwhile — reload and retry"
+ERR_ORDER_STATUS_TRANSITION = "An order cannot move from {} to {}"
+
 # ── Service error prefixes  (callers append ': <exception>') ─────────────────
 ERR_TRANSCRIPTION_FAILED = "Transcription failed"
 ERR_AI_SERVICE = "AI service error"
@@ -44,11 +55,21 @@ ERR_UPLOAD_URL_FAILED = "Could not generate upload URL"
 # ── Shop / order status values ───────────────────────────────────────────────
 SHOP_STATUS_APPROVED = "approved"
 SHOP_STATUS_PENDING = "pending"
+SHOP_CATEGORY_GENERAL = "general"  # registered shops that sell general goods (kirana etc.)
 ORDER_STATUS_PENDING = "pending"
 ORDER_STATUS_CONFIRMED = "confirmed"
 ORDER_STATUS_READY = "ready"
 ORDER_STATUS_DELIVERED = "delivered"
 ORDER_STATUS_CANCELLED = "cancelled"
+# Status moves an owner may make. Delivered and cancelled orders are final, and
+# nothing returns to pending, so each order leaves the pendingOrders rollup once.
+ORDER_STATUS_TRANSITIONS: dict = {
+    ORDER_STATUS_PENDING: frozenset({ORDER_STATUS_CONFIRMED, ORDER_STATUS_CANCELLED}),
+    ORDER_STATUS_CONFIRMED: frozenset({ORDER_STATUS_READY, ORDER_STATUS_CANCELLED}),
+    ORDER_STATUS_READY: frozenset({ORDER_STATUS_DELIVERED, ORDER_STATUS_CANCELLED}),
+    ORDER_STATUS_DELIVERED: frozenset(),
+    ORDER_STATUS_CANCELLED: frozenset(),
+}
 
 # ── User-ID prefixes ─────────────────────────────────────────────────────────
 USER_ID_PHONE_PREFIX = "ph-"
@@ -57,6 +78,9 @@ USER_ID_WHATSAPP_PREFIX = "wa-"
 # ── Health ───────────────────────────────────────────────────────────────────
 HEALTH_FACILITY_CATEGORIES: frozenset = frozenset({"clinic", "pharmacy", "hospital"})
 MAX_NEARBY_FACILITIES = 5
+# Facility mirror: sort-key suffix of the "this cell has been harvested for this
+# kind" markers, one per (cell, kind) in the cell ("<kind>##coverage")
+COVERAGE_MARKER_KEY = "#coverage"
 # Fallback pincode when user asks "nearby" without providing one (Kota 324008 — matches seed data)
 DEFAULT_NEARBY_PINCODE = "324008"
 
@@ -83,6 +107,15 @@ MSG_ORDER_CONFIRMED = "ऑर्डर #{} कन्फर्म हो गय
 # ── Shop owner ───────────────────────────────────────────────────────────────
 MSG_SHOP_REGISTERED = "Shop registered. Awaiting admin approval."
 PRIVATE_SHOP_FIELDS: frozenset = frozenset({"ownerId", "phone"})
+SHOP_STATS_ALL_TIME = "ALL"  # statDate of the all-time rollup row; sorts after every YYYY-MM-DD
+ANALYTICS_DEFAULT_DAYS = 7
+ANALYTICS_MAX_DAYS = 30
+# Listing-card attributes — projected by PincodeStatusIndex and ShopGeoIndex, never the inventory
+SHOP_CARD_FIELDS: tuple = ("shopId", "pincode", "name", "category", "status", "lat", "lng", "address")
+# Shop `geohash` (ShopGeoIndex sort key) and the cell prefix in its `geoStatus` partition key.
+# Changing either needs scripts/backfill_shop_listing_keys.py.
+SHOP_GEOHASH_PRECISION = 9   # ≈ 4.8 m × 4.8 m
+SHOP_GEO_CELL_PRECISION = 5  # ≈ 4.9 km × 4.9 km
 
 # ── Inventory ────────────────────────────────────────────────────────────────
 DEFAULT_INVENTORY_UNIT = "piece"
@@ -0,0 +1,138 @@
+"""
+Post-response work: bookkeeping writes the caller does not need to wait for.
+
+Handlers call `defer("name", fn, *args)` for writes such as appending
+conversation turns, and decorate their entry point with `@post_response`.
+Deferred tasks then run after the handler has returned its response:
+
+  extension – on Lambda, an internal extension thread is registered at cold
+              start (Extensions API, INVOKE events). Lambda only freezes the
+              container once every extension has asked for the next event, so
+              the thread drains the queue after the response has been sent and
+              then calls /event/next. The client never waits for the writes.
+  inline    – everywhere else (serverless-offline, tests, or if registration
+              fails) the queue is drained as the handler returns.
+
+Durability: every deferred task runs before the container can be frozen or
+take its next event; a failed task is logged as `deferred_task_failed` with
+its name and error. Only tasks deferred with `idempotent=True` are retried
+(once) first: a task made of several writes may have applied some of them
+before failing, and running it again would apply those twice. Post-response
+time still counts toward the function timeout and billed duration.
+"""
+import functools
+import json
+import os
+import threading
+import urllib.request
+from typing import Any, Callable, List, Optional, Tuple
+
+from src.utils.config import config
+from src.utils.logger import logger
+
+_EXTENSION_API = "http://{api}/2020-01-01/extension"
+_EXTENSION_NAME = "gramsathi-post-response"
+_TASK_ATTEMPTS = 2
+
+_Task = Tuple[str, Callable[..., Any], tuple, dict, int]
+
+_lock = threading.Lock()
+_tasks: List[_Task] = []
+_handler_done = threading.Event()
+_extension: Optional[threading.Thread] = None
+
+
+def defer(name: str, fn: Callable[..., Any], *args: Any, idempotent: bool = False, **kwargs: Any) -> None:
+    """
+    Queue `fn(*args, **kwargs)` to run after the current response is returned.
+    Pass `idempotent=True` only if running it again after a partial failure is
+    harmless; such tasks are retried once.
+    """
+    with _lock:
+        _tasks.append((name, fn, args, kwargs, _TASK_ATTEMPTS if idempotent else 1))
+
+
+def run_deferred() -> int:
+    """Run and clear every queued task; returns how many failed."""
+    with _lock:
+        tasks = list(_tasks)
+        _tasks.clear()
+    failed = 0
+    for name, fn, args, kwargs, attempts in tasks:
+        for attempt in range(1, attempts + 1):
+            try:
+                fn(*args, **kwargs)
+                break
+            except Exception as exc:
+                if attempt == attempts:
+                    failed += 1
+                    logger.error("deferred_task_failed", task=name, attempts=attempt, error=str(exc))
+    if tasks:
+        logger.info("deferred_tasks_done", tasks=len(tasks), failed=failed)
+    return failed
+
+
+def post_response(handler: Callable[[dict, Any], dict]) -> Callable[[dict, Any], dict]:
+    """
+    Run tasks deferred during `handler` after it returns. Registers the Lambda
+    extension when this handler is the function's configured entry point.
+    """
+    entry_point = f"{handler.__module__}.{handler.__name__}"
+    if os.environ.get("_HANDLER", "").replace("/", ".") == entry_point:
+        _start_extension()
+
+    @functools.wraps(handler)
+    def wrapper(event: dict, context: Any) -> dict:
+        try:
+            return handler(event, context)
+        finally:
+            if _extension is not None and _extension.is_alive():
+                _handler_done.set()
+            else:
+                run_deferred()
+
+    return wrapper
+
+
+# ── Lambda internal extension ─────────────────────────────────────────────────
+
+def _start_extension() -> None:
+    global _extension
+    api = os.environ.get("AWS_LAMBDA_RUNTIME_API")
+    if _extension is not None or not api or not config.POST_RESPONSE_EXTENSION_ENABLED:
+        return
+    base = _EXTENSION_API.format(api=api)
+    try:
+        request = urllib.request.Request(
+            f"{base}/register",
+            data=json.dumps({"events": ["INVOKE"]}).encode(),
+            headers={"Lambda-Extension-Name": _EXTENSION_NAME},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=2) as resp:
+            extension_id = resp.headers["Lambda-Extension-Identifier"]
+    except Exception as exc:
+        logger.warning("post_response_extension_unavailable", error=str(exc))
+        return
+    _extension = threading.Thread(target=_extension_loop, args=(base, extension_id),
+                                  name=_EXTENSION_NAME, daemon=True)
+    _extension.start()
+    logger.info("post_response_extension_registered")
+
+
+def _extension_loop(base: str, extension_id: str) -> None:
+    next_event = urllib.request.Request(
+        f"{base}/event/next", headers={"Lambda-Extension-Identifier": extension_id}
+    )
+    while True:
+        try:
+            # Blocks until the next invoke; Lambda freezes the container only
+            # while every extension is waiting here.
+            with urllib.request.urlopen(next_event) as resp:
+                resp.read()
+        except Exception as exc:
+            logger.error("post_response_extension_failed", error=str(exc))
+            return
+        _handler_done.wait()
+        _handler_done.clear()
+        run_deferred()
@@ -0,0 +1,105 @@
+"""
+One-pass conversion between plain Python values and DynamoDB AttributeValues.
+
+The boto3 resource layer turns every number into a Decimal (TypeDeserializer)
+and refuses floats on the way in, so items used to be walked twice more in
+Python: `to_decimal` before each write and `from_decimal` after each read.
+DynamoDBService now talks to the low-level client and converts here instead:
+
+  write  str → S, bool → BOOL, int / float / Decimal → N, None → NULL,
+         bytes → B, dict → M, list / tuple → L, set → SS / NS / BS
+  read   N → int when integral ("12"), float otherwise ("12.5", "1E+3");
+         everything else to its plain Python type
+
+Floats are sent as their shortest round-trip repr, so 0.1 is stored as "0.1".
+NaN and infinity are rejected, as DynamoDB cannot store them.
+"""
+import math
+from decimal import Decimal
+from typing import Any, Dict
+
+
+def _number(value: Any) -> Dict[str, str]:
+    if isinstance(value, float) and not math.isfinite(value):
+        raise TypeError(f"DynamoDB cannot store {value!r}")
+    return {"N": repr(value) if isinstance(value, float) else str(value)}
+
+
+def _set(value: Any) -> Dict[str, list]:
+    if not value:
+        raise TypeError("DynamoDB cannot store an empty set")
+    sample = next(iter(value))
+    if isinstance(sample, str):
+        return {"SS": list(value)}
+    if isinstance(sample, (bytes, bytearray)):
+        return {"BS": list(value)}
+    return {"NS": [_number(v)["N"] for v in value]}
+
+
+_SERIALIZERS = {
+    str: lambda v: {"S": v},
+    bool: lambda v: {"BOOL": v},
+    int: _number,
+    float: _number,
+    Decimal: _number,
+    type(None): lambda v: {"NULL": True},
+    bytes: lambda v: {"B": v},
+    dict: lambda v: {"M": {k: serialize(x) for k, x in v.items()}},
+    list: lambda v: {"L": [serialize(x) for x in v]},
+    tuple: lambda v: {"L": [serialize(x) for x in v]},
+    set: _set,
+    frozenset: _set,
+}
+
+
+def serialize(value: Any) -> Dict[str, Any]:
+    """Plain Python value → AttributeValue."""
+    convert = _SERIALIZERS.get(type(value))
+    if convert is not None:
+        return convert(value)
+    # Subclasses (str enums, IntEnum, OrderedDict …) take the slower isinstance route
+    for base in (bool, str, int, float, Decimal, bytes, dict, list, tuple, set, frozenset):
+        if isinstance(value, base):
+            return _SERIALIZERS[base](value)
+    raise TypeError(f"Unsupported DynamoDB type: {type(value).__name__}")
+
+
+def serialize_item(item: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {k: serialize(v) for k, v in item.items()}
+
+
+def parse_number(text: str) -> Any:
+    """N text → int when integral, float otherwise (also used for page cursors)."""
+    if "." in text or "e" in text or "E" in text:
+        return float(text)
+    return int(text)
+
+
+def deserialize(value: Dict[str, Any]) -> Any:
+    """AttributeValue → plain Python value (numbers as int or float, never Decimal)."""
+    (tag, data), = value.items()
+    if tag == "S":
+        return data
+    if tag == "N":
+        return parse_number(data)
+    if tag == "M":
+        return {k: deserialize(v) for k, v in data.items()}
+    if tag == "L":
+        return [deserialize(v) for v in data]
+    if tag == "BOOL":
+        return data
+    if tag == "NULL":
+        return None
+    if tag == "B":
+        return data
+    if tag == "SS":
+        return set(data)
+    if tag == "NS":
+        return {parse_number(v) for v in data}
+    if tag == "BS":
+        return set(data)
+    raise TypeError(f"Unsupported DynamoDB type: {tag}")
+
+
+def deserialize_item(item: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {k: deserialize(v) for k, v in item.items()}
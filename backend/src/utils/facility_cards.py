@@ -0,0 +1,52 @@
+"""
+Compact wire encoding for facility / shop cards (opt-in, `facilityFormat: "compact"`).
+
+The default response repeats every key on every card. The compact form sends
+the column names once and each card as a positional row, drops columns that
+are empty on every card, and rounds coordinates to 5 decimals (~1 m):
+
+    {"fields": ["id", "name", "lat", "lon"],
+     "rows":   [["ChIJ…", "Sharma Clinic", 25.21401, 75.86502]]}
+
+`id` is the Places id for Google results (expanded via GET /health/place/{id})
+and the shopId for registered shops (GET /shop/{id}).
+"""
+from typing import Any, List, Optional
+
+CARD_FIELDS = ("id", "name", "address", "phone", "lat", "lon", "category", "rating", "source")
+COMPACT_FORMAT = "compact"
+
+
+def _card_value(item: dict, field: str) -> Any:
+    if field == "id":
+        return item.get("placeId") or item.get("shopId") or ""
+    if field == "lon":
+        value = item.get("lon", item.get("lng"))
+    else:
+        value = item.get(field)
+    if field in ("lat", "lon") and value is not None:
+        return round(float(value), 5)
+    if field == "rating" and value is not None:
+        return round(float(value), 1)
+    return value
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == ""
+
+
+def compact_cards(items: List[dict]) -> dict:
+    rows = [[_card_value(item, f) for f in CARD_FIELDS] for item in items]
+    keep = [i for i in range(len(CARD_FIELDS)) if any(not _is_empty(r[i]) for r in rows)]
+    return {
+        "fields": [CARD_FIELDS[i] for i in keep],
+        "rows": [[r[i] for i in keep] for r in rows],
+    }
+
+
+def expand_cards(compact: Optional[dict]) -> List[dict]:
+    """Inverse of compact_cards (reference decoder for clients and tests)."""
+    if not compact:
+        return []
+    fields = compact.get("fields", [])
+    return [dict(zip(fields, row)) for row in compact.get("rows", [])]
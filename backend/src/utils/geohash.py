@@ -0,0 +1,117 @@
+"""
+Geohash helpers for spatially keyed lookups (facility mirror, shop search).
+
+A geohash cell at precision 5 is roughly 4.9 km × 4.9 km; at precision 4 about
+39 km × 19.5 km. Nearby lookups fetch every cell overlapping the search
+circle's bounding box and then refine by exact distance.
+"""
+import math
+from typing import List, Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(_BASE32)}
+
+EARTH_RADIUS_KM = 6371.0088
+_KM_PER_DEGREE_LAT = 111.195
+
+
+def encode(lat: float, lon: float, precision: int = 5) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # geohash interleaves starting with longitude
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                bits = (bits << 1) | 1
+                lon_lo = mid
+            else:
+                bits <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Return (lat_degrees, lon_degrees) spanned by one cell at `precision`."""
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def bounds(cell: str) -> Tuple[float, float, float, float]:
+    """Return (lat_min, lat_max, lon_min, lon_max) of a geohash cell."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    even = True
+    for ch in cell:
+        value = _DECODE[ch]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lon_lo + lon_hi) / 2
+                if bit:
+                    lon_lo = mid
+                else:
+                    lon_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if bit:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            even = not even
+    return lat_lo, lat_hi, lon_lo, lon_hi
+
+
+def cells_covering(lat: float, lon: float, radius_km: float, precision: int = 5) -> List[str]:
+    """All cells at `precision` overlapping the bounding box of a radius_km circle."""
+    d_lat = radius_km / _KM_PER_DEGREE_LAT
+    d_lon = radius_km / (_KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+    step_lat, step_lon = cell_size(precision)
+
+    lat_min, lat_max = max(lat - d_lat, -90.0), min(lat + d_lat, 90.0)
+    lon_min, lon_max = lon - d_lon, lon + d_lon
+
+    cells: List[str] = []
+    seen = set()
+    # Walk cell centres on a grid aligned to the cell size; include the box edges
+    lat_start = math.floor((lat_min + 90.0) / step_lat) * step_lat - 90.0
+    lon_start = math.floor((lon_min + 180.0) / step_lon) * step_lon - 180.0
+    cur_lat = lat_start + step_lat / 2
+    while cur_lat - step_lat / 2 <= lat_max:
+        cur_lon = lon_start + step_lon / 2
+        while cur_lon - step_lon / 2 <= lon_max:
+            wrapped = ((cur_lon + 180.0) % 360.0) - 180.0
+            cell = encode(min(cur_lat, 89.999999), wrapped, precision)
+            if cell not in seen:
+                seen.add(cell)
+                cells.append(cell)
+            cur_lon += step_lon
+        cur_lat += step_lat
+    return cells
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    d_lat = p2 - p1
+    d_lon = math.radians(lon2 - lon1)
+    a = math.sin(d_lat / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(d_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
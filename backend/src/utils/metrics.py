@@ -0,0 +1,54 @@
+"""
+Counters exported as CloudWatch metrics through the Embedded Metric Format.
+
+A log line that carries an `_aws` block is turned into metrics by CloudWatch
+Logs — no PutMetricData calls, no extra dependency. `emf_fields()` builds that
+block so an existing structured log event doubles as the metric:
+
+    logger.warning("dynamodb_retry", **emf_fields({"DynamoDBRetries": 1}, table="users"))
+
+Counters also keep in-process totals per dimension (per table for DynamoDB
+retries) for tests and debugging; they reset when the container is recycled.
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Dict
+
+from src.utils.config import config
+
+
+def emf_fields(metrics: Dict[str, float], **dimensions: str) -> dict:
+    """Log fields that publish `metrics` (unit Count) under `dimensions`."""
+    return {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": config.METRICS_NAMESPACE,
+                "Dimensions": [sorted(dimensions)],
+                "Metrics": [{"Name": name, "Unit": "Count"} for name in metrics],
+            }],
+        },
+        **dimensions,
+        **metrics,
+    }
+
+
+class Counters:
+    """Thread-safe {dimension value: {metric name: count}}."""
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def add(self, key: str, metric: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[key][metric] += amount
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {key: dict(metrics) for key, metrics in self._counts.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
@@ -0,0 +1,53 @@
+"""
+Opaque page cursors for paginated queries.
+
+A cursor is the URL-safe base64 of the JSON-encoded position of the last item
+returned (DynamoDB's LastEvaluatedKey, or the Mongo sort position). Values
+are tagged as strings ("S") or numbers ("N"), so a numeric key such as turnSeq
+comes back as a number, parsed like dynamo_codec reads N (int when integral,
+float otherwise).
+"""
+import base64
+import binascii
+import json
+from typing import Optional
+
+from src.utils.dynamo_codec import parse_number
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(position: Optional[dict]) -> Optional[str]:
+    if not position:
+        return None
+    tagged = {
+        k: {"N": str(v)} if isinstance(v, (int, float)) and not isinstance(v, bool) else {"S": v}
+        for k, v in position.items()
+    }
+    raw = json.dumps(tagged, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[dict]:
+    """Inverse of encode_cursor. Raises ValueError on a malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        tagged = json.loads(raw)
+        return {
+            k: parse_number(v["N"]) if "N" in v else v["S"]
+            for k, v in tagged.items()
+        }
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+def clamp_page_size(value, default: int = DEFAULT_PAGE_SIZE) -> int:
+    """Parse a user-supplied page size into 1..MAX_PAGE_SIZE."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
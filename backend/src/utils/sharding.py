@@ -0,0 +1,46 @@
+"""
+Write sharding for hot GSI partition keys.
+
+A few district-town pincodes (and their busiest shops) take most of the
+writes, and a GSI partition key value lives on one partition, so indexes keyed
+by the bare pincode or shopId throttle at market hours. The sharded indexes
+are keyed "<key>#<n>" instead: n is a stable hash of the item's own id modulo
+the key's shard count, so a hot key spreads over that many partitions and
+readers query every suffix in parallel and merge.
+
+Counts are per key, from "key=count,key=count" specs in config
+(PINCODE_SHARDS, SHOP_ORDER_SHARDS), validated when config loads; any other
+key has one shard ("<key>#0").
+Raising a count is safe at any time — reads cover the larger range, which
+includes every item's old shard. After lowering one, run the backfill scripts:
+items above the new count are not read until they are rewritten.
+"""
+import zlib
+from functools import lru_cache
+
+
+@lru_cache(maxsize=16)
+def parse_shard_counts(spec: str) -> dict:
+    """'324001=4, 324008=8' → {"324001": 4, "324008": 8}. Raises ValueError on a malformed entry."""
+    counts = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        key, sep, count = entry.partition("=")
+        if not sep or not key.strip() or int(count) < 1:
+            raise ValueError(f"bad shard count {entry!r}: expected key=count with count >= 1")
+        counts[key.strip()] = int(count)
+    return counts
+
+
+def shard_keys(key: str, spec: str) -> list[str]:
+    """Every partition key value of `key`, e.g. ["324001#0", "324001#1"]."""
+    return [f"{key}#{n}" for n in range(parse_shard_counts(spec).get(key, 1))]
+
+
+def shard_index(key: str, item_id: str, spec: str) -> int:
+    """The shard (0 .. count - 1) of `key` that the item with `item_id` belongs to."""
+    return zlib.crc32(item_id.encode()) % parse_shard_counts(spec).get(key, 1)
+
+
+def shard_key(key: str, item_id: str, spec: str) -> str:
+    """The partition key value an item with `item_id` is written under."""
+    return f"{key}#{shard_index(key, item_id, spec)}"
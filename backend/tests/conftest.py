@@ -0,0 +1,28 @@
+import sys
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_in_process_caches():
+    """
+    Module-level service singletons keep warm-container state; isolate each test.
+    Only touches modules already imported, so AWS clients are still first created
+    inside each test module's own credential fixtures.
+    """
+    places_mod = sys.modules.get("src.services.google_places_service")
+    if places_mod:
+        places_mod.google_places.reset_resilience_state()
+    resolver_mod = sys.modules.get("src.services.location_resolver")
+    if resolver_mod:
+        resolver_mod.location_resolver.clear()
+    dynamo_mod = sys.modules.get("src.services.dynamodb_service")
+    if dynamo_mod:
+        dynamo_mod.retry_budget.reset()
+        dynamo_mod.retry_metrics.reset()
+    database_mod = sys.modules.get("src.services.database")
+    if database_mod and hasattr(database_mod.db, "clear_cache"):
+        database_mod.db.clear_cache()
+    if database_mod and hasattr(database_mod.db, "clear"):  # DB_BACKEND=memory
+        database_mod.db.clear()
+    yield
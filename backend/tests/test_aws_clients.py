@@ -0,0 +1,48 @@
+"""
+Tests for the shared AWS client factory: tuned botocore settings, one client
+per service, cached Table handles.
+"""
+import pytest
+
+from src.services import aws_clients
+from src.utils.config import config
+
+
+@pytest.fixture(autouse=True)
+def aws_credentials(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-south-1")
+
+
+def test_client_config_is_tuned():
+    cfg = aws_clients.client_config("polly")
+    assert cfg.max_pool_connections == config.AWS_MAX_POOL_CONNECTIONS
+    assert cfg.tcp_keepalive is True
+    assert (cfg.connect_timeout, cfg.read_timeout) == (2, 10)
+    assert cfg.retries == {"mode": "adaptive", "max_attempts": config.AWS_MAX_ATTEMPTS}
+
+
+def test_dynamodb_leaves_retries_to_the_service():
+    cfg = aws_clients.client_config("dynamodb")
+    assert (cfg.connect_timeout, cfg.read_timeout) == (1, 5)
+    assert cfg.retries["max_attempts"] == 1
+
+
+def test_s3_keeps_sigv4_and_regional_endpoint():
+    client = aws_clients.client("s3")
+    assert client.meta.config.signature_version == "s3v4"
+    assert client.meta.endpoint_url == f"https://s3.{config.AWS_REGION}.amazonaws.com"
+
+
+def test_clients_and_tables_are_reused():
+    assert aws_clients.client("sns") is aws_clients.client("sns")
+    assert aws_clients.table(config.USERS_TABLE) is aws_clients.table(config.USERS_TABLE)
+    assert aws_clients.table(config.USERS_TABLE) is not aws_clients.table(config.SHOPS_TABLE)
+
+
+def test_services_use_shared_clients():
+    from src.services.polly_service import polly
+    from src.services.s3_service import s3
+    assert polly._client is aws_clients.client("polly")
+    assert s3._client is aws_clients.client("s3")
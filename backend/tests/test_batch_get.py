@@ -0,0 +1,115 @@
+"""
+Tests for DynamoDBService.batch_get: 100-key chunking, input-order results,
+projections and UnprocessedKeys retry.
+"""
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.utils.config import config
+
+
+@pytest.fixture(autouse=True)
+def aws_credentials(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_SECURITY_TOKEN", "testing")
+    monkeypatch.setenv("AWS_SESSION_TOKEN", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-south-1")
+
+
+@pytest.fixture
+def dynamo_tables():
+    with mock_aws():
+        client = boto3.client("dynamodb", region_name="ap-south-1")
+        client.create_table(
+            TableName=config.SHOPS_TABLE,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[{"AttributeName": "shopId", "AttributeType": "S"}],
+            KeySchema=[{"AttributeName": "shopId", "KeyType": "HASH"}],
+        )
+        client.create_table(
+            TableName=config.INVENTORY_TABLE,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[
+                {"AttributeName": "shopId", "AttributeType": "S"},
+                {"AttributeName": "itemId", "AttributeType": "S"},
+            ],
+            KeySchema=[
+                {"AttributeName": "shopId", "KeyType": "HASH"},
+                {"AttributeName": "itemId", "KeyType": "RANGE"},
+            ],
+        )
+        yield
+
+
+def _seed_shops(db, n):
+    db.batch_write(config.SHOPS_TABLE, [
+        {"shopId": f"shop-{i:03d}", "name": f"Shop {i}", "pincode": "324001", "status": "approved"}
+        for i in range(n)
+    ])
+
+
+class TestBatchGet:
+
+    def test_results_follow_input_order_across_chunks(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+        _seed_shops(db, 250)
+
+        ids = [f"shop-{i:03d}" for i in reversed(range(250))]
+        items = db.batch_get(config.SHOPS_TABLE, [{"shopId": i} for i in ids])
+        assert [item["shopId"] for item in items] == ids
+
+    def test_missing_and_duplicate_keys(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+        _seed_shops(db, 3)
+
+        keys = [{"shopId": "shop-002"}, {"shopId": "nope"}, {"shopId": "shop-002"}]
+        items = db.batch_get(config.SHOPS_TABLE, keys)
+        assert items[0]["name"] == "Shop 2"
+        assert items[1] is None
+        assert items[2] == items[0]
+        assert db.batch_get(config.SHOPS_TABLE, []) == []
+
+    def test_projection_keeps_key_attributes(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+        _seed_shops(db, 2)
+
+        items = db.batch_get(config.SHOPS_TABLE, [{"shopId": "shop-001"}], projection=["name", "status"])
+        assert items == [{"shopId": "shop-001", "name": "Shop 1", "status": "approved"}]
+
+    def test_composite_keys(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+        db.save_inventory_items("s1", [{"itemId": "a", "name": "Atta"}, {"itemId": "b", "name": "Dal"}])
+
+        items = db.batch_get(config.INVENTORY_TABLE,
+                             [{"shopId": "s1", "itemId": "b"}, {"shopId": "s1", "itemId": "a"}])
+        assert [i["name"] for i in items] == ["Dal", "Atta"]
+
+    def test_unprocessed_keys_are_retried(self, monkeypatch):
+        from src.services import dynamodb_service
+        from src.services.dynamodb_service import DynamoDBService
+
+        requested = []
+
+        class FakeClient:
+            def batch_get_item(self, RequestItems):
+                keys = RequestItems["t"]["Keys"]
+                requested.append(len(keys))
+                served, unprocessed = (keys[:-1], keys[-1:]) if len(keys) > 1 else (keys, [])
+                return {
+                    "Responses": {"t": [dict(k, v={"N": "1"}) for k in served]},
+                    "UnprocessedKeys": {"t": {"Keys": unprocessed}} if unprocessed else {},
+                }
+
+        monkeypatch.setattr(dynamodb_service.time, "sleep", lambda s: None)
+        monkeypatch.setattr(DynamoDBService, "_client", FakeClient())
+        svc = DynamoDBService()
+
+        items = svc.batch_get("t", [{"k": str(i)} for i in range(150)])
+        assert [i["k"] for i in items] == [str(i) for i in range(150)]
+        assert sorted(requested) == [1, 1, 50, 100]
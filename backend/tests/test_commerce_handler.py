@@ -28,14 +28,46 @@ def dynamo_tables():
                 TableName=table_name,
                 BillingMode="PAY_PER_REQUEST",
                 AttributeDefinitions=[{"AttributeName": pk, "AttributeType": "S"},
-                                       {"AttributeName": "pincode" if pk == "shopId" else "userId", "AttributeType": "S"}],
+                                       {"AttributeName": "pincode" if pk == "shopId" else "userId", "AttributeType": "S"}]
+                                     + ([{"AttributeName": "pincodeStatus", "AttributeType": "S"},
+                                         {"AttributeName": "category", "AttributeType": "S"}] if pk == "shopId" else []),
                 KeySchema=[{"AttributeName": pk, "KeyType": "HASH"}],
                 GlobalSecondaryIndexes=[{
                     "IndexName": "PincodeIndex" if pk == "shopId" else "UserOrdersIndex",
                     "KeySchema": [{"AttributeName": "pincode" if pk == "shopId" else "userId", "KeyType": "HASH"}],
                     "Projection": {"ProjectionType": "ALL"},
-                }],
+                }] + ([{
+                    "IndexName": "PincodeStatusIndex",
+                    "KeySchema": [{"AttributeName": "pincodeStatus", "KeyType": "HASH"},
+                                  {"AttributeName": "category", "KeyType": "RANGE"}],
+                    "Projection": {"ProjectionType": "INCLUDE",
+                                   "NonKeyAttributes": ["pincode", "name", "status", "lat", "lng", "address"]},
+                }] if pk == "shopId" else []),
             )
+        client.create_table(
+            TableName=config.INVENTORY_TABLE,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[
+                {"AttributeName": "shopId", "AttributeType": "S"},
+                {"AttributeName": "itemId", "AttributeType": "S"},
+            ],
+            KeySchema=[
+                {"AttributeName": "shopId", "KeyType": "HASH"},
+                {"AttributeName": "itemId", "KeyType": "RANGE"},
+            ],
+        )
+        client.create_table(
+            TableName=config.SHOP_STATS_TABLE,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[
+                {"AttributeName": "shopId", "AttributeType": "S"},
+                {"AttributeName": "statDate", "AttributeType": "S"},
+            ],
+            KeySchema=[
+                {"AttributeName": "shopId", "KeyType": "HASH"},
+                {"AttributeName": "statDate", "KeyType": "RANGE"},
+            ],
+        )
         yield
 
 
@@ -64,6 +96,68 @@ def test_discover_shops_no_auth_needed(dynamo_tables):
     assert "shops" in body
 
 
+@mock_aws
+def test_discover_shops_card_view_omits_inventory(dynamo_tables):
+    from src.services.database import db
+    from src.handlers.commerce import handler
+    db.save_shop({
+        "shopId": "shop-001", "ownerId": "owner-1", "name": "Ramu Kirana",
+        "phone": "9000000000", "pincode": "110001", "status": "approved",
+        "inventory": [{"itemId": "i1", "name": "Atta", "price": 50}],
+    })
+
+    full = json.loads(handler(_post("/commerce/shops", {"pincode": "110001"}), None)["body"])
+    assert full["shops"][0]["inventory"][0]["name"] == "Atta"
+
+    cards = json.loads(handler(_post("/commerce/shops", {"pincode": "110001", "view": "card"}), None)["body"])
+    assert cards["shops"][0]["name"] == "Ramu Kirana"
+    assert cards["shops"][0]["shopId"] == "shop-001"
+    assert "inventory" not in cards["shops"][0]
+    assert "phone" not in cards["shops"][0]
+
+
+def _seed_listing_shops(db):
+    for shop_id, status, category in [
+        ("kirana", "approved", None),
+        ("pharmacy", "approved", "pharmacy"),
+        ("pending", "pending", None),
+        ("suspended", "suspended", "pharmacy"),
+    ]:
+        db.save_shop({"shopId": shop_id, "ownerId": "o", "name": shop_id, "phone": "9",
+                      "pincode": "110001", "status": status,
+                      **({"category": category} if category else {})})
+
+
+@mock_aws
+def test_discover_reads_only_approved_shops_of_category(dynamo_tables, monkeypatch):
+    from src.services.database import db
+    from src.handlers.commerce import handler
+    _seed_listing_shops(db)
+    monkeypatch.setattr(db, "get_shops_by_pincode", lambda *a: pytest.fail("unfiltered pincode read"))
+
+    def discover(**body):
+        resp = handler(_post("/commerce/shops", {"pincode": "110001", **body}), None)
+        return sorted(s["shopId"] for s in json.loads(resp["body"])["shops"])
+
+    assert discover() == ["kirana", "pharmacy"]
+    assert discover(category="pharmacy") == ["pharmacy"]
+    assert discover(category="general", view="card") == ["kirana"]
+
+
+@mock_aws
+def test_set_shop_status_moves_shop_between_listings(dynamo_tables):
+    from src.services.database import db
+    _seed_listing_shops(db)
+
+    db.set_shop_status("pending", "approved", "2026-01-01T00:00:00+00:00")
+    db.set_shop_status("pharmacy", "suspended", "2026-01-01T00:00:00+00:00")
+
+    assert sorted(s["shopId"] for s in db.get_shop_cards_by_pincode("110001")) == ["kirana", "pending"]
+    assert [s["shopId"] for s in db.get_shop_cards_by_pincode("110001", status="suspended", category="pharmacy")] \
+        == ["pharmacy", "suspended"]
+    assert db.set_shop_status("missing", "approved", "2026-01-01") is None
+
+
 @mock_aws
 def test_discover_shops_missing_pincode(dynamo_tables):
     from src.handlers.commerce import handler
@@ -0,0 +1,241 @@
+"""
+Tests for turn-per-item conversation storage: header + CONVERSATION_TURNS items,
+tail-only history loads, and migration of legacy whole-document conversations.
+"""
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.utils.config import config
+
+
+@pytest.fixture(autouse=True)
+def aws_credentials(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_SECURITY_TOKEN", "testing")
+    monkeypatch.setenv("AWS_SESSION_TOKEN", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-south-1")
+
+
+@pytest.fixture
+def dynamo_tables():
+    with mock_aws():
+        client = boto3.client("dynamodb", region_name="ap-south-1")
+        client.create_table(
+            TableName=config.CONVERSATIONS_TABLE,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[
+                {"AttributeName": "conversationId", "AttributeType": "S"},
+                {"AttributeName": "userId", "AttributeType": "S"},
+                {"AttributeName": "updatedAt", "AttributeType": "S"},
+            ],
+            KeySchema=[{"AttributeName": "conversationId", "KeyType": "HASH"}],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "UserConversationsIndex",
+                    "KeySchema": [{"AttributeName": "userId", "KeyType": "HASH"}],
+                    "Projection": {"ProjectionType": "ALL"},
+                },
+                {
+                    "IndexName": "UserRecentConversationsIndex",
+                    "KeySchema": [
+                        {"AttributeName": "userId", "KeyType": "HASH"},
+                        {"AttributeName": "updatedAt", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "KEYS_ONLY"},
+                },
+            ],
+        )
+        client.create_table(
+            TableName=config.CONVERSATION_TURNS_TABLE,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[
+                {"AttributeName": "conversationId", "AttributeType": "S"},
+                {"AttributeName": "turnSeq", "AttributeType": "N"},
+            ],
+            KeySchema=[
+                {"AttributeName": "conversationId", "KeyType": "HASH"},
+                {"AttributeName": "turnSeq", "KeyType": "RANGE"},
+            ],
+        )
+        yield
+
+
+def _header(conversation_id="conv-1"):
+    return {
+        "conversationId": conversation_id,
+        "userId": "user-1",
+        "intent": "health",
+        "language": "hi",
+        "symptoms": [],
+        "createdAt": "2026-01-01T00:00:00+00:00",
+        "updatedAt": "2026-01-01T00:00:00+00:00",
+    }
+
+
+def _turn(role, content):
+    return {"role": role, "content": content, "audioUrl": None,
+            "timestamp": "2026-01-01T00:00:00+00:00"}
+
+
+def _legacy_item(n_messages):
+    item = _header("legacy-1")
+    item["messages"] = [
+        _turn("user" if i % 2 == 0 else "assistant", f"m{i}") for i in range(n_messages)
+    ]
+    return item
+
+
+class TestAppendAndLoad:
+
+    def test_append_assigns_sequential_turns(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+
+        db.append_conversation_turns(_header(), [_turn("user", "a"), _turn("assistant", "b")])
+        db.append_conversation_turns(_header(), [_turn("user", "c"), _turn("assistant", "d")])
+
+        header = db.get_conversation("conv-1")
+        assert int(header["turnCount"]) == 4
+        assert "messages" not in header
+
+        turns = db.query_by_key(config.CONVERSATION_TURNS_TABLE, "conversationId", "conv-1")
+        assert [int(t["turnSeq"]) for t in turns] == [1, 2, 3, 4]
+        assert "audioUrl" not in turns[0]
+
+    def test_load_returns_only_latest_messages_oldest_first(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+        for i in range(5):
+            db.append_conversation_turns(_header(), [_turn("user", f"q{i}"), _turn("assistant", f"a{i}")])
+
+        loaded = db.load_conversation("conv-1", max_messages=4)
+        assert [m["content"] for m in loaded["messages"]] == ["q3", "a3", "q4", "a4"]
+        assert loaded["userId"] == "user-1"
+
+    def test_append_keeps_original_created_at(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+        db.append_conversation_turns(_header(), [_turn("user", "a")])
+
+        later = dict(_header(), createdAt="2030-01-01T00:00:00+00:00", updatedAt="2030-01-01T00:00:00+00:00")
+        db.append_conversation_turns(later, [_turn("user", "b")])
+
+        header = db.get_conversation("conv-1")
+        assert header["createdAt"] == "2026-01-01T00:00:00+00:00"
+        assert header["updatedAt"] == "2030-01-01T00:00:00+00:00"
+
+    def test_missing_conversation_loads_none(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        assert DynamoDBService().load_conversation("nope", 8) is None
+
+    def test_conversation_model_round_trip(self, dynamo_tables):
+        from src.models.conversation import Conversation
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+        db.append_conversation_turns(_header(), [_turn("user", "a"), _turn("assistant", "b")])
+
+        conversation = Conversation.from_dynamo(db.load_conversation("conv-1", 8))
+        assert conversation.turnCount == 2
+        assert [m.content for m in conversation.messages] == ["a", "b"]
+        assert "messages" not in conversation.to_header()
+
+
+class TestLatestConversation:
+
+    def test_returns_most_recently_updated(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+        for conv_id, updated in [("old", "2026-01-01"), ("newest", "2026-03-01"), ("mid", "2026-02-01")]:
+            header = dict(_header(conv_id), updatedAt=updated)
+            db.append_conversation_turns(header, [_turn("user", conv_id)])
+
+        latest = db.get_latest_conversation("user-1", max_messages=8)
+        assert latest["conversationId"] == "newest"
+        assert [m["content"] for m in latest["messages"]] == ["newest"]
+
+    def test_append_moves_conversation_to_latest(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+        db.append_conversation_turns(dict(_header("a"), updatedAt="2026-01-01"), [_turn("user", "a1")])
+        db.append_conversation_turns(dict(_header("b"), updatedAt="2026-01-02"), [_turn("user", "b1")])
+        db.append_conversation_turns(dict(_header("a"), updatedAt="2026-01-03"), [_turn("user", "a2")])
+
+        assert db.get_latest_conversation("user-1", 8)["conversationId"] == "a"
+
+    def test_unknown_user_has_no_latest(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        assert DynamoDBService().get_latest_conversation("nobody", 8) is None
+
+
+class TestLegacyMigration:
+
+    def test_legacy_item_is_migrated_on_load(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+        db.save_conversation(_legacy_item(6))
+
+        loaded = db.load_conversation("legacy-1", max_messages=2)
+        assert [m["content"] for m in loaded["messages"]] == ["m4", "m5"]
+
+        header = db.get_conversation("legacy-1")
+        assert "messages" not in header
+        assert int(header["turnCount"]) == 6
+
+        # Later appends continue the sequence after the migrated turns
+        db.append_conversation_turns(_header("legacy-1"), [_turn("user", "m6")])
+        reloaded = db.load_conversation("legacy-1", max_messages=3)
+        assert [m["content"] for m in reloaded["messages"]] == ["m4", "m5", "m6"]
+
+    def test_bulk_migration_is_idempotent(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+        db = DynamoDBService()
+        db.save_conversation(_legacy_item(3))
+        db.append_conversation_turns(_header("new-1"), [_turn("user", "x")])
+
+        legacy = list(db.iter_legacy_conversations())
+        assert [c["conversationId"] for c in legacy] == ["legacy-1"]
+
+        db.migrate_conversation(legacy[0])
+        db.migrate_conversation(legacy[0])  # second run is a no-op
+
+        assert list(db.iter_legacy_conversations()) == []
+        turns = db.query_by_key(config.CONVERSATION_TURNS_TABLE, "conversationId", "legacy-1")
+        assert len(turns) == 3
+
+
+class TestHandlersAppendTurns:
+
+    @mock_aws
+    def test_health_query_appends_instead_of_rewriting(self, dynamo_tables, monkeypatch):
+        import json
+        from src.handlers.health import handler
+        from src.services.database import db
+        from src.utils.auth import create_token
+
+        histories = []
+        monkeypatch.setattr("src.agents.graph.detect_red_flags_fast", lambda _: False)
+        monkeypatch.setattr("src.agents.graph._llm_classify_all", lambda text: ("health_advice", "", None))
+        monkeypatch.setattr(
+            "src.agents.graph.bedrock.chat",
+            lambda text, conversation_history=None, **kw: histories.append(list(conversation_history or [])) or "ok",
+        )
+        monkeypatch.setattr("src.handlers.health.polly.synthesize", lambda *a, **kw: None)
+        monkeypatch.setattr(db, "save_conversation",
+                            lambda *a: pytest.fail("whole-document rewrite"))
+
+        def ask(text, conversation_id=""):
+            event = {
+                "httpMethod": "POST",
+                "path": "/health/query",
+                "headers": {"Authorization": f"Bearer {create_token('user-1')}"},
+                "body": json.dumps({"text": text, "language": "en", "conversationId": conversation_id}),
+            }
+            return json.loads(handler(event, None)["body"])["conversationId"]
+
+        conv_id = ask("I have a fever")
+        ask("since two days", conv_id)
+
+        assert [m["content"] for m in histories[-1]] == ["I have a fever", "ok"]
+        assert int(db.get_conversation(conv_id)["turnCount"]) == 4
@@ -0,0 +1,144 @@
+"""
+Tests for post-response work: deferred tasks run after the handler returns,
+failures are logged (idempotent tasks are retried once first), and on Lambda
+the internal extension thread drains the queue instead of the handler.
+"""
+import io
+
+import pytest
+
+from src.utils import deferred
+
+
+@pytest.fixture(autouse=True)
+def clean_queue(monkeypatch):
+    monkeypatch.setattr(deferred, "_extension", None)
+    deferred._handler_done.clear()
+    deferred._tasks.clear()
+    yield
+    deferred._tasks.clear()
+
+
+class TestInline:
+
+    def test_tasks_run_after_handler_returns(self):
+        log = []
+
+        @deferred.post_response
+        def handler(event, context):
+            deferred.defer("write", log.append, "write")
+            log.append("response")
+            return {"statusCode": 200}
+
+        assert handler({}, None) == {"statusCode": 200}
+        assert log == ["response", "write"]
+        assert deferred._tasks == []
+
+    def test_tasks_run_even_when_handler_raises(self):
+        log = []
+
+        @deferred.post_response
+        def handler(event, context):
+            deferred.defer("write", log.append, "write")
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            handler({}, None)
+        assert log == ["write"]
+
+    def test_failed_task_is_retried_then_logged(self, monkeypatch):
+        errors = []
+        monkeypatch.setattr(deferred.logger, "error", lambda event, **kw: errors.append((event, kw)))
+        attempts = []
+        done = []
+
+        def flaky():
+            attempts.append(1)
+            raise ConnectionError("throttled")
+
+        deferred.defer("flaky", flaky, idempotent=True)
+        deferred.defer("next", done.append, True)
+        assert deferred.run_deferred() == 1
+        assert len(attempts) == 2
+        assert done == [True]
+        assert errors[0][0] == "deferred_task_failed"
+        assert errors[0][1]["task"] == "flaky"
+
+    def test_transient_failure_succeeds_on_retry(self):
+        attempts = []
+
+        def once_flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError("throttled")
+
+        deferred.defer("once_flaky", once_flaky, idempotent=True)
+        assert deferred.run_deferred() == 0
+        assert len(attempts) == 2
+
+    def test_non_idempotent_task_is_not_rerun_after_partial_failure(self):
+        writes = []
+
+        def two_writes():
+            writes.append("day")
+            if len(writes) == 1:
+                raise ConnectionError("second write failed")
+            writes.append("all")
+
+        deferred.defer("two_writes", two_writes)
+        assert deferred.run_deferred() == 1
+        assert writes == ["day"]
+
+
+class TestExtension:
+
+    def test_extension_thread_drains_after_response(self, monkeypatch):
+        requests = []
+
+        class FakeResponse(io.BytesIO):
+            headers = {"Lambda-Extension-Identifier": "ext-1"}
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+        def fake_urlopen(request, timeout=None):
+            requests.append(request.full_url.rsplit("/", 1)[-1])
+            if requests.count("next") > 1:
+                raise ConnectionError("container shutting down")
+            return FakeResponse(b"{}")
+
+        monkeypatch.setattr(deferred.urllib.request, "urlopen", fake_urlopen)
+        monkeypatch.setenv("AWS_LAMBDA_RUNTIME_API", "127.0.0.1:9001")
+        monkeypatch.setenv("_HANDLER", "tests/test_deferred.handler")
+
+        log = []
+
+        def handler(event, context):
+            deferred.defer("write", log.append, "write")
+            log.append("response")
+            return {"statusCode": 200}
+
+        handler.__module__ = "tests.test_deferred"
+        wrapped = deferred.post_response(handler)
+        assert deferred._extension is not None
+
+        wrapped({}, None)
+        deferred._extension.join(timeout=5)
+
+        assert not deferred._extension.is_alive()
+        assert log == ["response", "write"]
+        assert requests == ["register", "next", "next"]
+
+    def test_no_extension_outside_lambda(self, monkeypatch):
+        monkeypatch.delenv("AWS_LAMBDA_RUNTIME_API", raising=False)
+        monkeypatch.setenv("_HANDLER", "tests/test_deferred.handler")
+
+        def handler(event, context):
+            return {}
+
+        handler.__module__ = "tests.test_deferred"
+        deferred.post_response(handler)
+        assert deferred._extension is None
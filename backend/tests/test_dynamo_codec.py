@@ -0,0 +1,84 @@
+"""
+Tests for the one-pass DynamoDB item codec and the Decimal-free service path.
+"""
+from decimal import Decimal
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.utils.config import config
+from src.utils.dynamo_codec import deserialize_item, serialize, serialize_item
+
+
+@pytest.fixture(autouse=True)
+def aws_credentials(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-south-1")
+
+
+def test_serialize_covers_plain_python_types():
+    assert serialize_item({
+        "s": "a", "b": True, "i": 3, "f": 0.1, "d": Decimal("2.50"), "n": None,
+        "m": {"x": [1, "y"]}, "t": ("z",), "ss": {"p"},
+    }) == {
+        "s": {"S": "a"}, "b": {"BOOL": True}, "i": {"N": "3"}, "f": {"N": "0.1"},
+        "d": {"N": "2.50"}, "n": {"NULL": True},
+        "m": {"M": {"x": {"L": [{"N": "1"}, {"S": "y"}]}}}, "t": {"L": [{"S": "z"}]},
+        "ss": {"SS": ["p"]},
+    }
+
+
+def test_bool_is_not_a_number():
+    assert serialize(False) == {"BOOL": False}
+
+
+def test_str_subclass_is_a_string():
+    from src.models.shop import ShopStatus
+    assert serialize(ShopStatus.APPROVED) == {"S": "approved"}
+
+
+@pytest.mark.parametrize("bad", [float("nan"), float("inf"), set(), object()])
+def test_unstorable_values_are_rejected(bad):
+    with pytest.raises(TypeError):
+        serialize(bad)
+
+
+def test_numbers_come_back_as_int_or_float():
+    item = deserialize_item({
+        "qty": {"N": "12"}, "price": {"N": "12.5"}, "big": {"N": "1E+3"},
+        "ns": {"NS": ["1", "2.5"]},
+    })
+    assert item == {"qty": 12, "price": 12.5, "big": 1000.0, "ns": {1, 2.5}}
+    assert type(item["qty"]) is int and type(item["price"]) is float
+
+
+def test_round_trip():
+    item = {"shopId": "s1", "lat": 25.18, "inventory": [{"price": 45.0, "stockQty": 10}]}
+    assert deserialize_item(serialize_item(item)) == item
+
+
+@mock_aws
+def test_service_reads_and_writes_without_decimals():
+    from src.models.shop import Shop
+    from src.services.dynamodb_service import DynamoDBService
+
+    boto3.client("dynamodb", region_name=config.AWS_REGION).create_table(
+        TableName=config.SHOPS_TABLE,
+        BillingMode="PAY_PER_REQUEST",
+        AttributeDefinitions=[{"AttributeName": "shopId", "AttributeType": "S"}],
+        KeySchema=[{"AttributeName": "shopId", "KeyType": "HASH"}],
+    )
+    svc = DynamoDBService()
+    shop = Shop(shopId="s1", ownerId="o1", name="N", ownerName="O", phone="9",
+                pincode="324001", lat=25.18, lng=75.83)
+    svc.put_item(config.SHOPS_TABLE, shop.to_dynamo())
+
+    item = svc.get_item(config.SHOPS_TABLE, {"shopId": "s1"})
+    assert item["lat"] == 25.18 and type(item["lat"]) is float
+    assert Shop.from_dynamo(item).lng == 75.83
+
+    updated = svc.update_item(config.SHOPS_TABLE, {"shopId": "s1"},
+                              "SET visits = :v", {":v": 2})
+    assert updated["visits"] == 2 and type(updated["visits"]) is int
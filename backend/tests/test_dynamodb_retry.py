@@ -0,0 +1,118 @@
+"""
+Tests for DynamoDB retries: full-jitter backoff, transient network errors,
+the per-container retry budget and per-table retry / throttle counters.
+"""
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from src.services import dynamodb_service
+from src.services.dynamodb_service import _with_retry, retry_budget, retry_metrics
+
+
+def _client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "GetItem")
+
+
+def _failing(*errors, result="ok"):
+    errors = list(errors)
+
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return result
+    return call
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(dynamodb_service.time, "sleep", recorded.append)
+    return recorded
+
+
+class TestRetries:
+
+    def test_throttle_is_retried_with_jittered_sleep(self, sleeps):
+        call = _failing(_client_error("ProvisionedThroughputExceededException"),
+                        _client_error("ThrottlingException"))
+        assert _with_retry(call, "users") == "ok"
+        assert len(sleeps) == 2
+        assert 0 <= sleeps[0] <= 0.1 and 0 <= sleeps[1] <= 0.2
+        assert retry_metrics.snapshot() == {"users": {"DynamoDBThrottles": 2, "DynamoDBRetries": 2}}
+
+    def test_backoff_is_full_jitter_and_capped(self, monkeypatch):
+        monkeypatch.setattr(dynamodb_service.random, "uniform", lambda lo, hi: (lo, hi))
+        assert dynamodb_service._backoff(0) == (0, 0.1)
+        assert dynamodb_service._backoff(2) == (0, 0.4)
+        assert dynamodb_service._backoff(10) == (0, dynamodb_service._RETRY_MAX_SLEEP)
+
+    def test_transient_network_error_is_retried(self, sleeps):
+        call = _failing(EndpointConnectionError(endpoint_url="https://dynamodb"),
+                        _client_error("InternalServerError"))
+        assert _with_retry(call, "shops") == "ok"
+        assert retry_metrics.snapshot() == {"shops": {"DynamoDBRetries": 2}}
+
+    def test_non_retryable_error_is_raised_immediately(self, sleeps):
+        with pytest.raises(ClientError):
+            _with_retry(_failing(_client_error("ValidationException")), "shops")
+        assert sleeps == []
+
+    def test_gives_up_after_max_attempts(self, sleeps):
+        errors = [_client_error("ThrottlingException")] * dynamodb_service._MAX_RETRIES
+        with pytest.raises(ClientError):
+            _with_retry(_failing(*errors), "orders")
+        assert len(sleeps) == dynamodb_service._MAX_RETRIES - 1
+        assert retry_metrics.snapshot()["orders"]["DynamoDBThrottles"] == dynamodb_service._MAX_RETRIES
+
+    def test_throttle_on_the_last_attempt_is_published(self, sleeps, capsys):
+        import json
+        errors = [_client_error("ThrottlingException")] * dynamodb_service._MAX_RETRIES
+        with pytest.raises(ClientError):
+            _with_retry(_failing(*errors), "orders")
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines() if "_aws" in line]
+        assert sum(r.get("DynamoDBThrottles", 0) for r in records) == dynamodb_service._MAX_RETRIES
+        assert records[-1]["event"] == "dynamodb_throttled"
+
+
+class TestRetryBudget:
+
+    def test_exhausted_budget_stops_retrying(self, sleeps):
+        while retry_budget.acquire(1):
+            pass
+        with pytest.raises(ClientError):
+            _with_retry(_failing(_client_error("ThrottlingException")), "users")
+        assert sleeps == []
+        assert retry_metrics.snapshot()["users"]["DynamoDBRetryBudgetExhausted"] == 1
+
+    def test_success_refunds_only_the_last_retry(self, sleeps):
+        call = _failing(_client_error("InternalServerError"), _client_error("ThrottlingException"))
+        assert _with_retry(call, "users") == "ok"
+        left = 0
+        while retry_budget.acquire(1):
+            left += 1
+        # spent transient + throttle, got the throttle retry's cost back
+        assert left == dynamodb_service._RETRY_BUDGET_CAPACITY - dynamodb_service._TRANSIENT_RETRY_COST
+
+    def test_successful_calls_refill_the_budget(self, sleeps):
+        cost = dynamodb_service._THROTTLE_RETRY_COST
+        while retry_budget.acquire(1):
+            pass
+        retry_budget.refund(cost - 1)
+        _with_retry(lambda: "ok", "users")  # refunds one token
+        assert _with_retry(_failing(_client_error("ThrottlingException")), "users") == "ok"
+        assert len(sleeps) == 1
+
+
+class TestMetricsExport:
+
+    def test_retry_log_line_is_an_embedded_metric(self, sleeps, capsys):
+        import json
+        _with_retry(_failing(_client_error("ThrottlingException")), "users")
+        record = next(json.loads(line) for line in capsys.readouterr().out.splitlines()
+                      if '"dynamodb_retry"' in line)
+        assert record["table"] == "users"
+        assert record["DynamoDBRetries"] == record["DynamoDBThrottles"] == 1
+        metric = record["_aws"]["CloudWatchMetrics"][0]
+        assert metric["Dimensions"] == [["table"]]
+        assert metric["Metrics"] == [{"Name": "DynamoDBThrottles", "Unit": "Count"},
+                                     {"Name": "DynamoDBRetries", "Unit": "Count"}]
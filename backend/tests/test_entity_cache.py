@@ -0,0 +1,246 @@
+"""
+Tests for the read-through entity cache: hits skip the database, writes
+invalidate users / shops / pincode listings, entries expire and stay bounded,
+and the shared tier round-trips items through a Redis-compatible client.
+"""
+import pytest
+
+from src.services.entity_cache import CachedDatabase, _LocalStore
+from src.utils.config import config
+
+
+class FakeDB:
+    """Minimal backend recording every call that reaches the database."""
+
+    def __init__(self):
+        self.calls = []
+        self.users = {}
+        self.shops = {}
+
+    def get_user(self, user_id):
+        self.calls.append(("get_user", user_id))
+        return self.users.get(user_id)
+
+    def save_user(self, user):
+        self.users[user["userId"]] = dict(user)
+
+    def get_shop(self, shop_id):
+        self.calls.append(("get_shop", shop_id))
+        return self.shops.get(shop_id)
+
+    def save_shop(self, shop):
+        self.shops[shop["shopId"]] = dict(shop)
+
+    def set_shop_status(self, shop_id, status, updated_at):
+        if shop_id not in self.shops:
+            return None
+        self.shops[shop_id].update(status=status, updatedAt=updated_at)
+        return dict(self.shops[shop_id])
+
+    def get_shop_cards_by_pincode(self, pincode, category=None, status="approved"):
+        self.calls.append(("cards", pincode, category, status))
+        return [
+            {"shopId": s["shopId"], "name": s["name"]}
+            for s in self.shops.values()
+            if s["pincode"] == pincode and s["status"] == status
+            and (category is None or s.get("category") == category)
+        ]
+
+    def batch_get(self, table_name, keys, projection=None):
+        self.calls.append(("batch_get", tuple(k["shopId"] for k in keys)))
+        return [self.shops.get(k["shopId"]) for k in keys]
+
+    def get_order(self, order_id):
+        return {"orderId": order_id}
+
+
+class FakeRedis:
+    """Redis-compatible stand-in: get / set(ex=) / delete on a dict of strings."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+def _shop(shop_id, pincode="325001", status="approved", **extra):
+    return dict({"shopId": shop_id, "name": shop_id.title(), "pincode": pincode,
+                 "status": status, "category": "kirana"}, **extra)
+
+
+@pytest.fixture
+def inner():
+    return FakeDB()
+
+
+@pytest.fixture
+def db(inner):
+    return CachedDatabase(inner)
+
+
+class TestReadThrough:
+
+    def test_user_is_read_once(self, db, inner):
+        inner.users["u1"] = {"userId": "u1", "name": "Asha"}
+        assert db.get_user("u1")["name"] == "Asha"
+        assert db.get_user("u1")["name"] == "Asha"
+        assert inner.calls == [("get_user", "u1")]
+
+    def test_missing_entities_are_not_cached(self, db, inner):
+        assert db.get_user("new") is None
+        db.save_user({"userId": "new", "name": "Ravi"})
+        assert db.get_user("new")["name"] == "Ravi"
+
+    def test_callers_cannot_mutate_cached_entries(self, db, inner):
+        inner.shops["s1"] = _shop("s1")
+        db.get_shop("s1")["name"] = "changed"
+        assert db.get_shop("s1")["name"] == "S1"
+
+    def test_uncached_methods_pass_through(self, db):
+        assert db.get_order("o1") == {"orderId": "o1"}
+
+
+class TestInvalidation:
+
+    def test_save_user_invalidates(self, db, inner):
+        inner.users["u1"] = {"userId": "u1", "name": "Asha"}
+        db.get_user("u1")
+        db.save_user({"userId": "u1", "name": "Asha Devi"})
+        assert db.get_user("u1")["name"] == "Asha Devi"
+
+    def test_save_shop_invalidates_shop_and_listing(self, db, inner):
+        db.save_shop(_shop("s1"))
+        assert [c["shopId"] for c in db.get_shop_cards_by_pincode("325001")] == ["s1"]
+        db.get_shop("s1")
+
+        db.save_shop(_shop("s2"))
+        db.save_shop(_shop("s1", name="Renamed"))
+        assert [c["shopId"] for c in db.get_shop_cards_by_pincode("325001")] == ["s1", "s2"]
+        assert db.get_shop("s1")["name"] == "Renamed"
+
+    def test_pincode_change_invalidates_old_listing(self, db, inner):
+        db.save_shop(_shop("s1", pincode="325001"))
+        db.get_shop_cards_by_pincode("325001")
+        db.save_shop(_shop("s1", pincode="326001"))
+        assert db.get_shop_cards_by_pincode("325001") == []
+        assert len(db.get_shop_cards_by_pincode("326001")) == 1
+
+    def test_status_change_invalidates_every_listing_variant(self, db, inner):
+        db.save_shop(_shop("s1", status="pending"))
+        assert db.get_shop_cards_by_pincode("325001") == []
+        assert db.get_shop_cards_by_pincode("325001", "kirana") == []
+
+        db.set_shop_status("s1", "approved", "2026-01-01")
+        assert len(db.get_shop_cards_by_pincode("325001")) == 1
+        assert len(db.get_shop_cards_by_pincode("325001", "kirana")) == 1
+
+    def test_inventory_write_of_migrated_shop_keeps_cache(self, db, inner):
+        inner.migrated = []
+        inner.migrate_shop_inventory = lambda shop: inner.migrated.append(shop["shopId"])
+        db.save_shop(_shop("s1"))
+        db.get_shop("s1")
+        db.get_shop_cards_by_pincode("325001")
+        inner.calls.clear()
+
+        db.migrate_shop_inventory(db.get_shop("s1"))
+        assert inner.migrated == []
+        db.get_shop("s1")
+        db.get_shop_cards_by_pincode("325001")
+        assert inner.calls == []
+
+        db.migrate_shop_inventory(dict(db.get_shop("s1"), inventory=[]))
+        assert inner.migrated == ["s1"]
+        db.get_shop("s1")
+        db.get_shop_cards_by_pincode("325001")
+        assert inner.calls == [("get_shop", "s1")]
+
+    def test_listing_variants_are_cached_separately(self, db, inner):
+        db.save_shop(_shop("s1"))
+        db.get_shop_cards_by_pincode("325001")
+        db.get_shop_cards_by_pincode("325001", "kirana")
+        db.get_shop_cards_by_pincode("325001")
+        db.get_shop_cards_by_pincode("325001", "kirana")
+        assert [c for c in inner.calls if c[0] == "cards"] == [
+            ("cards", "325001", None, "approved"), ("cards", "325001", "kirana", "approved"),
+        ]
+
+
+class TestApprovedShops:
+
+    def test_only_uncached_shops_are_batch_read(self, db, inner):
+        for shop_id in ("s1", "s2", "s3"):
+            inner.save_shop(_shop(shop_id))
+        db.get_shop("s2")
+
+        shops = db.get_approved_shops_by_pincode("325001")
+        assert [s["shopId"] for s in shops] == ["s1", "s2", "s3"]
+        assert ("batch_get", ("s1", "s3")) in inner.calls
+
+        inner.calls.clear()
+        assert len(db.get_approved_shops_by_pincode("325001")) == 3
+        assert inner.calls == []
+
+
+class TestLocalStore:
+
+    def test_entries_expire(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("src.services.entity_cache.time.monotonic", lambda: now[0])
+        store = _LocalStore(ttl_seconds=60, max_entries=10)
+        store.set("k", {"v": 1})
+        now[0] += 59
+        assert store.get("k") == {"v": 1}
+        now[0] += 2
+        assert store.get("k") is None
+
+    def test_size_is_bounded_least_recently_used_first(self):
+        store = _LocalStore(ttl_seconds=60, max_entries=2)
+        store.set("a", 1)
+        store.set("b", 2)
+        store.get("a")
+        store.set("c", 3)
+        assert store.get("b") is None
+        assert (store.get("a"), store.get("c")) == (1, 3)
+
+
+class TestSharedTier:
+
+    def test_items_round_trip(self, inner):
+        inner.shops["s1"] = _shop("s1", lat=25.2138, inventory=[{"price": 40, "stockQty": 2.5}])
+        db = CachedDatabase(inner, FakeRedis())
+        db.get_shop("s1")
+        shop = db.get_shop("s1")
+        assert shop["lat"] == 25.2138
+        assert shop["inventory"] == [{"price": 40, "stockQty": 2.5}]
+        assert inner.calls == [("get_shop", "s1")]
+
+    def test_invalidation_reaches_other_containers(self, inner):
+        shared = FakeRedis()
+        container_a, container_b = CachedDatabase(inner, shared), CachedDatabase(inner, shared)
+        container_a.save_shop(_shop("s1"))
+        assert container_b.get_shop("s1")["name"] == "S1"
+
+        container_a.save_shop(_shop("s1", name="Renamed"))
+        assert container_b.get_shop("s1")["name"] == "Renamed"
+
+    def test_keys_are_namespaced_by_stage(self, inner):
+        shared = FakeRedis()
+        inner.users["u1"] = {"userId": "u1"}
+        CachedDatabase(inner, shared).get_user("u1")
+        assert list(shared.data) == [f"{config.TABLE_PREFIX}:entity:user:u1"]
+
+    def test_shared_errors_fall_back_to_database(self, inner):
+        class DownRedis(FakeRedis):
+            def get(self, key):
+                raise ConnectionError("refused")
+
+        inner.users["u1"] = {"userId": "u1"}
+        assert CachedDatabase(inner, DownRedis()).get_user("u1") == {"userId": "u1"}
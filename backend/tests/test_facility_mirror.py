@@ -0,0 +1,240 @@
+"""
+Tests for the geohash helpers and the local facility mirror (harvest + lookup)
+that serves nearby health facilities before falling back to live Places.
+"""
+import random
+import time
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.utils import geohash
+from src.utils.config import config
+
+
+@pytest.fixture(autouse=True)
+def aws_credentials(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_SECURITY_TOKEN", "testing")
+    monkeypatch.setenv("AWS_SESSION_TOKEN", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-south-1")
+
+
+@pytest.fixture
+def dynamo_tables():
+    with mock_aws():
+        client = boto3.client("dynamodb", region_name="ap-south-1")
+        client.create_table(
+            TableName=config.FACILITIES_TABLE,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[
+                {"AttributeName": "geohash", "AttributeType": "S"},
+                {"AttributeName": "facilityKey", "AttributeType": "S"},
+            ],
+            KeySchema=[
+                {"AttributeName": "geohash", "KeyType": "HASH"},
+                {"AttributeName": "facilityKey", "KeyType": "RANGE"},
+            ],
+        )
+        yield
+
+
+KOTA = (25.2138, 75.8648)
+
+FAKE_PLACES = {
+    "clinic": [
+        {"placeId": "c1", "name": "Sharma Clinic", "lat": 25.2140, "lon": 75.8650, "rating": 4.5},
+        {"placeId": "c2", "name": "Far Clinic", "lat": 25.2900, "lon": 75.8650},  # ≈ 8.5 km north
+        {"placeId": "c3", "name": "Bundi Clinic", "lat": 25.4400, "lon": 75.6400},  # ≈ 33 km away
+    ],
+    "pharmacy": [
+        {"placeId": "p1", "name": "Jan Aushadhi", "lat": 25.2200, "lon": 75.8700},
+    ],
+    "hospital": [],
+}
+
+
+@pytest.fixture
+def fake_places(monkeypatch):
+    calls = []
+
+    def fake_harvest_page(lat, lon, kind, radius_m):
+        calls.append((lat, lon, kind, radius_m))
+        if FAKE_PLACES.get(kind) is None:
+            return None  # Places failed
+        return [dict(p, address="", phone="", category=kind, source="google") for p in FAKE_PLACES[kind]]
+
+    monkeypatch.setattr(config, "GOOGLE_PLACES_API_KEY", "test-key")
+    monkeypatch.setattr("src.services.facility_mirror.google_places.harvest_page", fake_harvest_page)
+    return calls
+
+
+class TestGeohash:
+
+    def test_encode_known_value(self):
+        assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+    def test_bounds_contain_encoded_point(self):
+        rng = random.Random(7)
+        for _ in range(100):
+            lat, lon = rng.uniform(8, 36), rng.uniform(69, 96)
+            lat_min, lat_max, lon_min, lon_max = geohash.bounds(geohash.encode(lat, lon, 5))
+            assert lat_min <= lat <= lat_max
+            assert lon_min <= lon <= lon_max
+
+    def test_cells_covering_include_every_point_in_radius(self):
+        rng = random.Random(11)
+        cells = set(geohash.cells_covering(*KOTA, radius_km=10, precision=5))
+        for _ in range(300):
+            lat = KOTA[0] + rng.uniform(-0.09, 0.09)
+            lon = KOTA[1] + rng.uniform(-0.1, 0.1)
+            if geohash.haversine_km(*KOTA, lat, lon) <= 10:
+                assert geohash.encode(lat, lon, 5) in cells
+
+
+class TestFacilityMirror:
+
+    def test_unharvested_area_misses(self, dynamo_tables):
+        from src.services.facility_mirror import FacilityMirror
+        assert FacilityMirror().nearby(*KOTA, "clinic", 5) is None
+
+    def test_harvest_then_nearby_returns_sorted_in_radius(self, dynamo_tables, fake_places):
+        from src.services.facility_mirror import FacilityMirror
+        mirror = FacilityMirror()
+        result = mirror.harvest_area(*KOTA, radius_km=10)
+
+        assert result["cells"] == len(geohash.cells_covering(*KOTA, 10, 5)) and result["failedCells"] == 0
+        places = mirror.nearby(*KOTA, "clinic", 5)
+        assert [p["name"] for p in places] == ["Sharma Clinic", "Far Clinic"]
+        assert places[0]["rating"] == 4.5
+        assert places[0]["source"] == "google"
+
+    def test_facilities_kind_merges_health_kinds(self, dynamo_tables, fake_places):
+        from src.services.facility_mirror import FacilityMirror
+        mirror = FacilityMirror()
+        mirror.harvest_area(*KOTA, radius_km=10)
+
+        names = [p["name"] for p in mirror.nearby(*KOTA, "facilities", 5)]
+        assert names == ["Sharma Clinic", "Jan Aushadhi", "Far Clinic"]
+
+    def test_shops_are_never_served_from_mirror(self, dynamo_tables, fake_places):
+        from src.services.facility_mirror import FacilityMirror
+        mirror = FacilityMirror()
+        mirror.harvest_area(*KOTA, radius_km=10)
+        assert mirror.nearby(*KOTA, "shops", 5) is None
+
+    def test_partially_harvested_area_misses(self, dynamo_tables, fake_places):
+        from src.services.facility_mirror import FacilityMirror
+        mirror = FacilityMirror()
+        mirror.harvest_area(*KOTA, radius_km=2)  # only the centre cells
+        assert mirror.nearby(*KOTA, "clinic", 5) is None
+
+    def test_expired_rows_are_ignored(self, dynamo_tables, fake_places, monkeypatch):
+        from src.services.facility_mirror import FacilityMirror
+        mirror = FacilityMirror()
+        mirror.harvest_area(*KOTA, radius_km=10)
+
+        monkeypatch.setattr(
+            "src.services.facility_mirror.time.time",
+            lambda: time.time_ns() / 1e9 + (config.FACILITY_MIRROR_TTL_DAYS + 1) * 86400,
+        )
+        assert mirror.nearby(*KOTA, "clinic", 5) is None
+
+    def test_harvest_without_api_key_is_noop(self, dynamo_tables, monkeypatch):
+        from src.services.facility_mirror import FacilityMirror
+        monkeypatch.setattr(config, "GOOGLE_PLACES_API_KEY", "")
+        assert FacilityMirror().harvest_area(*KOTA, radius_km=10) == {
+            "cells": 0, "facilities": 0, "failedCells": 0, "saturatedCells": 0,
+        }
+
+    def test_failed_searches_leave_cells_unmarked(self, dynamo_tables, fake_places, monkeypatch):
+        from src.services.facility_mirror import FacilityMirror
+        monkeypatch.setitem(FAKE_PLACES, "hospital", None)
+        mirror = FacilityMirror()
+        result = mirror.harvest_area(*KOTA, radius_km=10)
+        assert result["cells"] == 0 and result["failedCells"] == len(geohash.cells_covering(*KOTA, 10, 5))
+        # an outage must not pass for an empty area: live Places answers instead
+        assert mirror.nearby(*KOTA, "hospital", 5) is None
+        assert mirror.nearby(*KOTA, "facilities", 5) is None
+        # kinds whose searches succeeded are still served
+        assert [p["name"] for p in mirror.nearby(*KOTA, "clinic", 5)] == ["Sharma Clinic", "Far Clinic"]
+
+    def test_saturated_searches_leave_cells_unmarked(self, dynamo_tables, fake_places, monkeypatch):
+        from src.services.facility_mirror import FacilityMirror
+        crowded = [
+            {"placeId": f"x{i}", "name": f"Pharmacy {i}", "lat": 25.2141 + i * 1e-4, "lon": 75.8649}
+            for i in range(20)
+        ]
+        monkeypatch.setitem(FAKE_PLACES, "pharmacy", crowded)
+        mirror = FacilityMirror()
+        result = mirror.harvest_area(*KOTA, radius_km=10)
+        assert result["cells"] == 0 and result["saturatedCells"] == len(geohash.cells_covering(*KOTA, 10, 5))
+        assert mirror.nearby(*KOTA, "pharmacy", 5) is None
+        assert mirror.nearby(*KOTA, "clinic", 5)
+
+    def test_harvest_ranks_by_distance(self, monkeypatch):
+        from src.services.google_places_service import google_places
+        sent = []
+        monkeypatch.setattr(google_places, "_request", lambda url, payload, mask: sent.append(payload) or {})
+        assert google_places.harvest_page(*KOTA, "clinic", 3500) == []
+        assert sent[0]["rankPreference"] == "DISTANCE" and sent[0]["maxResultCount"] == 20
+
+    def test_harvest_ignores_breaker_and_negative_cache(self, monkeypatch):
+        from src.services.google_places_service import google_places
+        monkeypatch.setattr(google_places, "_call", lambda *a, **kw: pytest.fail("resilience path used"))
+        monkeypatch.setattr(google_places, "_request", lambda *a: None)
+        assert google_places.harvest_page(*KOTA, "clinic", 3500) is None
+
+    def test_lookup_reads_only_the_kind_range_of_covering_cells(self, dynamo_tables, fake_places, monkeypatch):
+        from src.services import facility_mirror as module
+        mirror = module.FacilityMirror()
+        mirror.harvest_area(*KOTA, radius_km=15)
+        reads = []
+        real_read = module.db.get_facilities_in_cell
+        monkeypatch.setattr(module.db, "get_facilities_in_cell",
+                            lambda cell, kind: reads.append((cell, kind)) or real_read(cell, kind))
+
+        assert mirror.nearby(*KOTA, "clinic", 5)
+        cells = geohash.cells_covering(*KOTA, 10, 5)
+        assert sorted(reads) == sorted((cell, "clinic") for cell in cells)
+
+    def test_kind_range_excludes_other_kinds(self, dynamo_tables, fake_places):
+        from src.services.database import db
+        from src.services.facility_mirror import FacilityMirror
+        FacilityMirror().harvest_area(*KOTA, radius_km=2)
+        cell = geohash.encode(*KOTA, 5)
+
+        clinic_rows = db.get_facilities_in_cell(cell, "clinic")
+        assert {r["facilityKey"] for r in clinic_rows} == {"clinic#c1", "clinic##coverage"}
+        assert len(db.get_facilities_in_cell(cell)) > len(clinic_rows)
+
+
+class TestGraphUsesMirror:
+
+    def test_gps_query_served_from_mirror_without_places_call(self, monkeypatch):
+        from src.agents.graph import _fetch_facilities
+
+        mirrored = [{"name": "Sharma Clinic", "lat": 25.214, "lon": 75.865, "source": "google"}]
+        monkeypatch.setattr("src.agents.graph.facility_mirror.nearby", lambda *a: mirrored)
+        monkeypatch.setattr(
+            "src.agents.graph.google_places.search_facilities",
+            lambda **kw: pytest.fail("live Places should not be called"),
+        )
+        assert _fetch_facilities("clinic", None, *KOTA, None) == mirrored
+
+    def test_mirror_miss_falls_back_to_places(self, monkeypatch):
+        from src.agents.graph import _fetch_facilities
+
+        live = [{"name": "Live Clinic", "source": "google"}]
+        monkeypatch.setattr("src.agents.graph.facility_mirror.nearby", lambda *a: None)
+        monkeypatch.setattr("src.agents.graph.google_places.search_facilities", lambda **kw: live)
+        assert _fetch_facilities("clinic", None, *KOTA, None) == live
+
+
+class TestHarvestHandler:
+
+    def test_parse_areas_skips_malformed_entries(self):
+        from src.handlers.harvest import parse_areas
+        assert parse_areas("25.2,75.8,15; bad ;26.9,75.7,x") == [(25.2, 75.8, 15.0)]
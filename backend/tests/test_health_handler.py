@@ -35,18 +35,38 @@ def dynamo_tables():
                 "Projection": {"ProjectionType": "ALL"},
             }],
         )
+        client.create_table(
+            TableName=config.CONVERSATION_TURNS_TABLE,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[
+                {"AttributeName": "conversationId", "AttributeType": "S"},
+                {"AttributeName": "turnSeq", "AttributeType": "N"},
+            ],
+            KeySchema=[
+                {"AttributeName": "conversationId", "KeyType": "HASH"},
+                {"AttributeName": "turnSeq", "KeyType": "RANGE"},
+            ],
+        )
         client.create_table(
             TableName=config.SHOPS_TABLE,
             BillingMode="PAY_PER_REQUEST",
             AttributeDefinitions=[
                 {"AttributeName": "shopId", "AttributeType": "S"},
                 {"AttributeName": "pincode", "AttributeType": "S"},
+                {"AttributeName": "pincodeStatus", "AttributeType": "S"},
+                {"AttributeName": "category", "AttributeType": "S"},
             ],
             KeySchema=[{"AttributeName": "shopId", "KeyType": "HASH"}],
             GlobalSecondaryIndexes=[{
                 "IndexName": "PincodeIndex",
                 "KeySchema": [{"AttributeName": "pincode", "KeyType": "HASH"}],
                 "Projection": {"ProjectionType": "ALL"},
+            }, {
+                "IndexName": "PincodeStatusIndex",
+                "KeySchema": [{"AttributeName": "pincodeStatus", "KeyType": "HASH"},
+                              {"AttributeName": "category", "KeyType": "RANGE"}],
+                "Projection": {"ProjectionType": "INCLUDE",
+                               "NonKeyAttributes": ["pincode", "name", "status", "lat", "lng", "address"]},
             }],
         )
         client.create_table(
@@ -172,3 +192,93 @@ def test_nearby_returns_facilities(dynamo_tables):
     body = json.loads(resp["body"])
     assert len(body["facilities"]) == 1
     assert body["facilities"][0]["name"] == "Sharma Clinic"
+    assert "inventory" not in body["facilities"][0]
+    assert "ownerId" not in body["facilities"][0]
+
+
+@mock_aws
+def test_nearby_skips_unapproved_facilities(dynamo_tables):
+    from src.handlers.health import handler
+    from src.services.database import db
+    for shop_id, status in [("open", "approved"), ("new", "pending")]:
+        db.save_shop({"shopId": shop_id, "ownerId": "o", "name": shop_id, "phone": "9",
+                      "pincode": "110001", "category": "pharmacy", "status": status})
+
+    body = json.loads(handler(_public_event("/health/nearby", {"pincode": "110001"}), None)["body"])
+    assert [f["shopId"] for f in body["facilities"]] == ["open"]
+
+
+@mock_aws
+def test_nearby_reads_the_pincode_cards_once(dynamo_tables, monkeypatch):
+    from src.handlers.health import handler
+    from src.services.database import db
+    for shop_id, category in [("c", "clinic"), ("g", "grocery"), ("p", "pharmacy")]:
+        db.save_shop({"shopId": shop_id, "ownerId": "o", "name": shop_id, "phone": "9",
+                      "pincode": "110001", "category": category, "status": "approved"})
+    calls = []
+    real = db.get_shop_cards_by_pincode
+    monkeypatch.setattr(db, "get_shop_cards_by_pincode", lambda *a, **kw: calls.append((a, kw)) or real(*a, **kw))
+
+    body = json.loads(handler(_public_event("/health/nearby", {"pincode": "110001"}), None)["body"])
+    assert [f["shopId"] for f in body["facilities"]] == ["c", "p"]
+    assert calls == [(("110001",), {})]
+
+
+# ── compact facilities / place details ─────────────────────────────────────────
+
+@mock_aws
+def test_health_query_compact_facilities(dynamo_tables, monkeypatch):
+    from src.handlers.health import handler
+    monkeypatch.setattr("src.handlers.health.polly.synthesize", lambda *a, **kw: None)
+    monkeypatch.setattr("src.agents.graph._llm_classify_all",
+                        lambda text: ("nearby_facilities", "clinic", None))
+    monkeypatch.setattr("src.agents.graph.facility_mirror.nearby", lambda *a: None)
+    tiers = []
+    monkeypatch.setattr(
+        "src.agents.graph.google_places.search_facilities",
+        lambda **kw: tiers.append(kw["field_tier"]) or [
+            {"placeId": "p1", "name": "Sharma Clinic", "lat": 25.2, "lon": 75.8, "source": "google"}
+        ],
+    )
+
+    event = _auth_event("/health/query", {
+        "text": "nearby clinic", "language": "en", "latitude": 25.2, "longitude": 75.8,
+        "lowBandwidth": True, "facilityFormat": "compact",
+    })
+    body = json.loads(handler(event, None)["body"])
+
+    assert tiers == ["minimal"]
+    assert body["facilityFormat"] == "compact"
+    assert body["facilities"]["fields"] == ["id", "name", "lat", "lon", "source"]
+    assert body["facilities"]["rows"] == [["p1", "Sharma Clinic", 25.2, 75.8, "google"]]
+
+
+@mock_aws
+def test_place_details_route(dynamo_tables, monkeypatch):
+    from src.handlers.health import handler
+    monkeypatch.setattr("src.handlers.health.google_places.get_place_details",
+                        lambda place_id: {"placeId": place_id, "name": "Sharma Clinic"})
+
+    event = _auth_event("/health/place/ChIJabc", None)
+    event.update(httpMethod="GET", pathParameters={"placeId": "ChIJabc"})
+    resp = handler(event, None)
+    assert resp["statusCode"] == 200
+    assert json.loads(resp["body"])["place"]["placeId"] == "ChIJabc"
+
+
+@mock_aws
+def test_place_details_not_found(dynamo_tables, monkeypatch):
+    from src.handlers.health import handler
+    monkeypatch.setattr("src.handlers.health.google_places.get_place_details", lambda place_id: None)
+
+    event = _auth_event("/health/place/missing", None)
+    event.update(httpMethod="GET", pathParameters={"placeId": "missing"})
+    assert handler(event, None)["statusCode"] == 404
+
+
+@mock_aws
+def test_place_details_rejects_bad_id(dynamo_tables):
+    from src.handlers.health import handler
+    event = _auth_event("/health/place/x", None)
+    event.update(httpMethod="GET", pathParameters={"placeId": "../etc"})
+    assert handler(event, None)["statusCode"] == 400
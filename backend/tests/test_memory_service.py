@@ -0,0 +1,155 @@
+"""
+Tests for the in-process InMemoryDBService: GSI hash indexes, projections,
+pagination, TTL and injected latency.
+"""
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.services.memory_service import InMemoryDBService
+from src.utils.config import config
+from src.utils.constants import SHOP_CARD_FIELDS
+
+
+@pytest.fixture
+def mem():
+    return InMemoryDBService(latency_ms=0)
+
+
+def _shop(shop_id, pincode="324001", status="approved", category="grocery", **extra):
+    return {"shopId": shop_id, "ownerId": "o", "name": shop_id, "pincode": pincode,
+            "status": status, "category": category, **extra}
+
+
+def test_items_are_copied_in_and_out(mem):
+    user = {"userId": "u1", "tags": ["a"]}
+    mem.save_user(user)
+    user["tags"].append("b")
+    fetched = mem.get_user("u1")
+    fetched["tags"].append("c")
+    assert mem.get_user("u1")["tags"] == ["a"]
+
+
+def test_listing_index_follows_status_changes(mem):
+    mem.save_shop(_shop("s1", status="pending"))
+    mem.save_shop(_shop("s2", category="pharmacy"))
+    mem.save_shop(_shop("s3", pincode="324002"))
+
+    assert [c["shopId"] for c in mem.get_shop_cards_by_pincode("324001")] == ["s2"]
+    mem.set_shop_status("s1", "approved", "2026-01-01T00:00:00")
+    assert [c["shopId"] for c in mem.get_shop_cards_by_pincode("324001")] == ["s1", "s2"]
+    assert [c["shopId"] for c in mem.get_shop_cards_by_pincode("324001", "pharmacy")] == ["s2"]
+    assert {s["shopId"] for s in mem.get_shops_by_pincode("324001")} == {"s1", "s2"}
+
+
+def test_index_projection_is_applied(mem):
+    mem.save_shop(_shop("s1", phone="9000000000", lat=25.1))
+    card, = mem.get_shop_cards_by_pincode("324001")
+    assert set(card) <= set(SHOP_CARD_FIELDS)
+    assert "phone" not in card and card["lat"] == 25.1
+    assert mem.get_approved_shops_by_pincode("324001")[0]["phone"] == "9000000000"
+
+
+def test_shops_near_are_approved_cards_nearest_first(mem):
+    mem.save_shop(_shop("far", lat=25.25, lng=75.83))
+    mem.save_shop(_shop("near", lat=25.19, lng=75.83, phone="9"))
+    mem.save_shop(_shop("pending", status="pending", lat=25.18, lng=75.83))
+    mem.save_shop(_shop("out", lat=26.0, lng=75.83))
+    shops = mem.get_shops_near(25.18, 75.83, radius_km=10)
+    assert [(s["shopId"], s["distanceKm"]) for s in shops] == [("near", 1.11), ("far", 7.78)]
+    assert "phone" not in shops[0]
+
+
+def test_sparse_index_skips_items_without_the_range_key(mem):
+    mem.save_order({"orderId": "o1", "shopId": "s1", "userId": "u1"})
+    assert mem.get_orders_page("s1") == ([], None)
+    assert mem.get_orders_by_shop("s1") == []
+    assert [o["orderId"] for o in mem.get_orders_by_user("u1")] == ["o1"]
+
+
+def test_orders_page_is_newest_first_with_cursor(mem):
+    for n in range(5):
+        mem.save_order({"orderId": f"o{n}", "shopId": "s1", "userId": "u1",
+                        "createdAt": f"2026-01-0{n + 1}", "status": "pending" if n % 2 else "delivered"})
+    page, cursor = mem.get_orders_page("s1", limit=2)
+    assert [o["orderId"] for o in page] == ["o4", "o3"]
+    page, cursor = mem.get_orders_page("s1", limit=2, cursor=cursor)
+    assert [o["orderId"] for o in page] == ["o2", "o1"]
+    page, cursor = mem.get_orders_page("s1", limit=2, cursor=cursor)
+    assert [o["orderId"] for o in page] == ["o0"] and cursor is None
+    assert [o["orderId"] for o in mem.get_orders_page("s1", status="pending")[0]] == ["o3", "o1"]
+
+
+def test_invalid_cursor_raises_value_error(mem):
+    with pytest.raises(ValueError):
+        mem.get_inventory_page("s1", cursor="not-a-cursor")
+    mem.save_inventory_items("s1", [{"itemId": f"i{n}", "name": "x", "price": 1} for n in range(3)])
+    _, cursor = mem.get_inventory_page("s1", limit=1)
+    with pytest.raises(ValueError):
+        mem.get_inventory_page("s2", cursor=cursor)  # another shop's cursor
+
+
+def test_conversation_turns_and_latest(mem):
+    mem.append_conversation_turns({"conversationId": "c1", "userId": "u1", "updatedAt": "1"},
+                                  [{"role": "user", "content": "a"}, {"role": "assistant", "content": "b"}])
+    mem.append_conversation_turns({"conversationId": "c2", "userId": "u1", "updatedAt": "2"},
+                                  [{"role": "user", "content": "x"}])
+    mem.append_conversation_turns({"conversationId": "c1", "userId": "u1", "updatedAt": "3"},
+                                  [{"role": "user", "content": "c"}])
+    latest = mem.get_latest_conversation("u1", max_messages=2)
+    assert latest["conversationId"] == "c1" and latest["turnCount"] == 3
+    assert [m["content"] for m in latest["messages"]] == ["b", "c"]
+
+
+def test_conditional_updates(mem):
+    mem.save_order({"orderId": "o1", "shopId": "s1", "userId": "u1", "status": "pending"})
+    assert mem.update_order_status("o1", "accepted", "delivered", "t") is None
+    assert mem.update_order_status("o1", "pending", "accepted", "t")["status"] == "accepted"
+    assert mem.update_inventory_item("s1", "missing", {"price": 1}) is None
+
+
+def test_stats_rollups_add_atomically(mem):
+    mem.record_order_placed("s1", "2026-01-02", 10.5, "o1")
+    mem.record_order_placed("s1", "2026-01-02", 4.5, "o2")
+    mem.record_order_status_change("s1", "pending", "accepted")
+    rows = {r["statDate"]: r for r in mem.get_shop_stats("s1", "2026-01-01")}
+    assert rows["2026-01-02"]["revenue"] == 15.0 and rows["2026-01-02"]["orderCount"] == 2
+    assert rows["ALL"]["pendingOrders"] == 1
+
+
+def test_ttl_hides_and_drops_expired_items(mem):
+    mem.set_response_cache("k", "cached answer", "hi")
+    assert mem.get_response_cache("k") == "cached answer"
+    past = int(time.time()) - 1
+    mem.put_item(config.RESPONSE_CACHE_TABLE, {"cacheKey": "k", "response": "old", "ttl": past})
+    assert mem.get_response_cache("k") is None
+    mem.mark_cell_harvested("tsq4e", ["clinic"], "2026-01-01", past)
+    assert mem.get_facilities_in_cell("tsq4e", "clinic") == []
+    assert mem._tables[config.FACILITIES_TABLE].items == {}
+
+
+def test_injected_latency_per_round_trip():
+    slow = InMemoryDBService(latency_ms=20)
+    slow.save_shop(_shop("s1"))
+    start = time.perf_counter()
+    slow.get_user("u1")
+    slow.get_approved_shops_by_pincode("324001")  # index query + batch_get
+    assert time.perf_counter() - start >= 0.06
+
+
+def test_unknown_table_is_rejected(mem):
+    with pytest.raises(ValueError):
+        mem.get_item("no-such-table", {"id": "x"})
+
+
+def test_db_backend_env_flag_selects_memory():
+    env = dict(os.environ, DB_BACKEND="memory")
+    out = subprocess.run(
+        [sys.executable, "-c", "from src.services.database import db; print(type(db._inner).__name__)"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env, capture_output=True, text=True, check=True,
+    )
+    assert out.stdout.strip() == "InMemoryDBService"
@@ -0,0 +1,277 @@
+"""
+Tests for MongoDB index bootstrapping, TTL / geo fields, the Decimal codec
+and client settings (no server needed: the sync and async services run
+against small fakes).
+"""
+import asyncio
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import bson
+import pytest
+from bson.codec_options import CodecOptions
+from bson.decimal128 import Decimal128
+
+from src.services import mongodb_service
+from src.services.mongodb_async_service import AsyncMongoDBService
+from src.services.mongodb_service import (
+    BACKFILLS,
+    INDEXES,
+    INDEX_MARKER_ID,
+    INDEX_VERSION,
+    RETIRED_INDEXES,
+    SCHEMA_COLLECTION,
+    TYPE_REGISTRY,
+    MongoDBService,
+    _collection_name,
+    _find_args,
+    _near_query,
+    _with_expiry,
+    _with_location,
+    client_options,
+)
+from src.utils.config import config
+
+
+class FakeCollection:
+    def __init__(self, calls):
+        self.calls = calls
+        self.indexes = [{"name": "_id_"}]
+        self.docs = {}
+
+    def find_one(self, query):
+        self.calls.append("find_one")
+        return self.docs.get(query["_id"])
+
+    def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = doc
+
+    def update_many(self, query, pipeline):
+        self.calls.append("update_many")
+
+    def list_indexes(self):
+        self.calls.append("list_indexes")
+        return list(self.indexes)
+
+    def create_indexes(self, models):
+        self.calls.append("create_indexes")
+        self.indexes += [m.document for m in models]
+
+    def drop_index(self, name):
+        self.calls.append("drop_index")
+        self.indexes = [i for i in self.indexes if i["name"] != name]
+
+
+class FakeDatabase(dict):
+    def __init__(self, name="gramsathi_test"):
+        super().__init__()
+        self.name = name
+        self.calls = []
+
+    def __missing__(self, key):
+        self[key] = FakeCollection(self.calls)
+        return self[key]
+
+
+class AsyncCursor:
+    def __init__(self, items):
+        self.items = items
+
+    async def to_list(self, length):
+        return list(self.items)
+
+
+class AsyncFakeCollection(FakeCollection):
+    async def find_one(self, query):
+        return FakeCollection.find_one(self, query)
+
+    async def replace_one(self, query, doc, upsert=False):
+        FakeCollection.replace_one(self, query, doc, upsert)
+
+    async def update_many(self, query, pipeline):
+        FakeCollection.update_many(self, query, pipeline)
+
+    async def list_indexes(self):
+        return AsyncCursor(FakeCollection.list_indexes(self))
+
+    async def create_indexes(self, models):
+        await asyncio.sleep(0)  # let concurrent callers interleave
+        FakeCollection.create_indexes(self, models)
+
+    async def drop_index(self, name):
+        FakeCollection.drop_index(self, name)
+
+
+class AsyncFakeDatabase(FakeDatabase):
+    def __missing__(self, key):
+        self[key] = AsyncFakeCollection(self.calls)
+        return self[key]
+
+
+@pytest.fixture(autouse=True)
+def fresh_process(monkeypatch):
+    monkeypatch.setattr(mongodb_service, "_indexes_ready", set())
+
+
+def _sync_service(database):
+    svc = MongoDBService.__new__(MongoDBService)
+    svc._db = database
+    return svc
+
+
+def test_pool_and_timeouts_come_from_config():
+    options = client_options()
+    assert options["maxPoolSize"] == config.MONGODB_MAX_POOL_SIZE
+    assert options["serverSelectionTimeoutMS"] == config.MONGODB_SERVER_SELECTION_TIMEOUT_MS
+    assert options["type_registry"] is TYPE_REGISTRY
+
+
+def test_driver_codec_converts_decimals_at_any_depth():
+    options = CodecOptions(type_registry=TYPE_REGISTRY)
+    written = bson.decode(bson.encode({"total": Decimal("12.50"), "items": [{"price": Decimal("2.25")}]},
+                                      codec_options=options))
+    assert written == {"total": 12.5, "items": [{"price": 2.25}]}
+    read = bson.decode(bson.encode({"price": Decimal128("9.99"), "qty": 3}), codec_options=options)
+    assert read == {"price": 9.99, "qty": 3} and isinstance(read["price"], float)
+
+
+def test_index_queries_project_id_away_except_for_page_cursors():
+    fields, _ = _find_args("InventoryItemsIndex", True, None)
+    assert fields == {"_id": 0}
+    fields, _ = _find_args("InventoryItemsIndex", True, ["name"])
+    assert fields == {"name": 1, "_id": 0}
+    fields, _ = _find_args("InventoryItemsIndex", True, ["name"], keep_sort_fields=True)
+    assert fields == {"name": 1, "itemId": 1}
+
+
+def test_indexes_created_once_and_only_when_missing():
+    database = FakeDatabase()
+    orders = database[_collection_name(config.ORDERS_TABLE)]
+    orders.indexes.append(INDEXES[config.ORDERS_TABLE][0].document)
+
+    _sync_service(database)._ensure_indexes()
+    assert orders.indexes[1:] == [m.document for m in INDEXES[config.ORDERS_TABLE]]
+    assert database[SCHEMA_COLLECTION].docs[INDEX_MARKER_ID]["version"] == INDEX_VERSION
+    created = database.calls.count("create_indexes")
+    assert created == len(INDEXES)
+
+    # Same process: no round trips at all
+    database.calls.clear()
+    _sync_service(database)._ensure_indexes()
+    assert database.calls == []
+
+
+def test_cold_start_with_current_marker_is_one_read():
+    database = FakeDatabase()
+    database[SCHEMA_COLLECTION].docs[INDEX_MARKER_ID] = {"version": INDEX_VERSION}
+    _sync_service(database)._ensure_indexes()
+    assert database.calls == ["find_one"]
+
+
+def test_changed_spec_rechecks_indexes_and_backfills():
+    database = FakeDatabase()
+    database[SCHEMA_COLLECTION].docs[INDEX_MARKER_ID] = {"version": "stale"}
+    _sync_service(database)._ensure_indexes()
+    assert database.calls.count("list_indexes") == len(INDEXES)
+    assert database.calls.count("update_many") == len(BACKFILLS)
+
+
+def test_changed_spec_drops_superseded_single_field_indexes():
+    database = FakeDatabase()
+    orders = database[_collection_name(config.ORDERS_TABLE)]
+    orders.indexes += [{"name": "UserOrdersIndex"}, {"name": "ShopOrdersIndex"}]
+    _sync_service(database)._ensure_indexes()
+    names = {i["name"] for i in orders.indexes}
+    assert not names & set(RETIRED_INDEXES[config.ORDERS_TABLE])
+    assert database.calls.count("drop_index") == 2
+
+
+def test_newest_first_reads_have_a_matching_compound_index():
+    # equality key then createdAt descending: the sort is an index walk, not in memory
+    for table, key in ((config.CONVERSATIONS_TABLE, "userId"),
+                       (config.ORDERS_TABLE, "userId"), (config.ORDERS_TABLE, "shopId")):
+        prefixes = [list(m.document["key"].items())[:2] for m in INDEXES[table]]
+        assert [(key, 1), ("createdAt", -1)] in prefixes
+
+
+def test_order_and_conversation_reads_project_server_side():
+    queries = []
+
+    class Cursor(list):
+        def sort(self, sort):
+            queries.append(sort)
+            return self
+
+    class Collection:
+        def find(self, query, fields):
+            queries.append(fields)
+            return Cursor([])
+
+    svc = _sync_service({})
+    svc._collection = lambda table: Collection()
+    svc.get_orders_by_shop("s1", projection=["createdAt", "totalAmount"])
+    svc.get_orders_by_user("u1")
+    svc.get_conversations_by_user("u1")
+    assert queries == [
+        {"createdAt": 1, "totalAmount": 1, "_id": 0}, [("createdAt", -1)],
+        {"_id": 0}, [("createdAt", -1)],
+        {"_id": 0, "messages": 0}, [("createdAt", -1)],
+    ]
+
+
+def _index(table, name):
+    return next(m.document for m in INDEXES[table] if m.document["name"] == name)
+
+
+def test_ttl_and_geo_indexes():
+    assert _index(config.RESPONSE_CACHE_TABLE, "ResponseCacheExpiryIndex")["expireAfterSeconds"] == 0
+    assert _index(config.FACILITIES_TABLE, "FacilityExpiryIndex")["expireAfterSeconds"] == 0
+    assert dict(_index(config.SHOPS_TABLE, "ShopLocationIndex")["key"]) == {"location": "2dsphere"}
+
+
+def test_ttl_epoch_becomes_expiry_date():
+    doc = _with_expiry({"cacheKey": "k", "ttl": 1_700_000_000})
+    assert doc["expiresAt"] == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+    assert "expiresAt" not in _with_expiry({"geohash": "tsq4"})
+
+
+def test_shop_location_is_a_geojson_point():
+    shop = _with_location({"shopId": "s1", "lat": 25.18, "lng": 75.83})
+    assert shop["location"] == {"type": "Point", "coordinates": [75.83, 25.18]}
+    assert "location" not in _with_location({"shopId": "s1", "lat": None, "lng": 75.83})
+    assert "location" not in _with_location({"shopId": "s1", "lat": 125.0, "lng": 75.83})
+
+
+def test_get_shops_near_queries_near_sphere_and_adds_distance():
+    queries = []
+
+    class Cursor(list):
+        def limit(self, n):
+            return Cursor(self[:n])
+
+    class Shops:
+        def find(self, query, fields):
+            queries.append((query, fields))
+            return Cursor([{"shopId": "s1", "lat": 25.19, "lng": 75.83}])
+
+    svc = _sync_service({})
+    svc._collection = lambda table: Shops()
+    shops = svc.get_shops_near(25.18, 75.83, radius_km=3, category="grocery")
+
+    query, fields = queries[0]
+    assert query == _near_query(25.18, 75.83, 3, "grocery")
+    assert query["location"]["$nearSphere"]["$maxDistance"] == 3000
+    assert fields["_id"] == 0 and "location" not in fields
+    assert shops == [{"shopId": "s1", "lat": 25.19, "lng": 75.83, "distanceKm": 1.11}]
+
+
+async def test_async_concurrent_first_calls_create_indexes_once():
+    database = AsyncFakeDatabase()
+    svc = AsyncMongoDBService.__new__(AsyncMongoDBService)
+    svc._db = database
+    svc._index_lock = asyncio.Lock()
+
+    await asyncio.gather(*(svc.ensure_indexes() for _ in range(50)))
+    assert database.calls.count("find_one") == 1
+    assert database.calls.count("create_indexes") == len(INDEXES)
+    assert database.name in mongodb_service._indexes_ready
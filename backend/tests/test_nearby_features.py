@@ -30,6 +30,19 @@ def aws_credentials(monkeypatch):
     monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-south-1")
 
 
+@pytest.fixture(autouse=True)
+def stub_geo_cache(monkeypatch):
+    """Named-location searches read/write GEO_CACHE — keep those off the network."""
+    monkeypatch.setattr("src.services.location_resolver.db.get_geo_cache", lambda key: None)
+    monkeypatch.setattr("src.services.location_resolver.db.set_geo_cache", lambda key, lat, lon: None)
+
+
+@pytest.fixture(autouse=True)
+def stub_facility_mirror(monkeypatch):
+    """These tests exercise live-Places paths — the local mirror always misses."""
+    monkeypatch.setattr("src.agents.graph.facility_mirror.nearby", lambda *a, **kw: None)
+
+
 @pytest.fixture
 def dynamo_tables():
     with mock_aws():
@@ -56,7 +69,39 @@ def dynamo_tables():
                     "KeySchema": [{"AttributeName": gsi_key, "KeyType": "HASH"}],
                     "Projection": {"ProjectionType": "ALL"},
                 }]
+            if gsi_name == "PincodeIndex":
+                attrs += [{"AttributeName": "pincodeStatus", "AttributeType": "S"},
+                          {"AttributeName": "category", "AttributeType": "S"},
+                          {"AttributeName": "geoStatus", "AttributeType": "S"},
+                          {"AttributeName": "geohash", "AttributeType": "S"}]
+                kwargs["GlobalSecondaryIndexes"].append({
+                    "IndexName": "PincodeStatusIndex",
+                    "KeySchema": [{"AttributeName": "pincodeStatus", "KeyType": "HASH"},
+                                  {"AttributeName": "category", "KeyType": "RANGE"}],
+                    "Projection": {"ProjectionType": "INCLUDE",
+                                   "NonKeyAttributes": ["pincode", "name", "status", "lat", "lng", "address"]},
+                })
+                kwargs["GlobalSecondaryIndexes"].append({
+                    "IndexName": "ShopGeoIndex",
+                    "KeySchema": [{"AttributeName": "geoStatus", "KeyType": "HASH"},
+                                  {"AttributeName": "geohash", "KeyType": "RANGE"}],
+                    "Projection": {"ProjectionType": "INCLUDE",
+                                   "NonKeyAttributes": ["pincode", "name", "category", "status",
+                                                        "lat", "lng", "address"]},
+                })
             client.create_table(**kwargs)
+        client.create_table(
+            TableName=config.CONVERSATION_TURNS_TABLE,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[
+                {"AttributeName": "conversationId", "AttributeType": "S"},
+                {"AttributeName": "turnSeq", "AttributeType": "N"},
+            ],
+            KeySchema=[
+                {"AttributeName": "conversationId", "KeyType": "HASH"},
+                {"AttributeName": "turnSeq", "KeyType": "RANGE"},
+            ],
+        )
         yield
 
 
@@ -93,7 +138,7 @@ class TestGooglePlacesRouting:
 
         nearby_called = {}
         monkeypatch.setattr(svc, "_nearby_search",
-                            lambda lat, lon, kind, max_results: (
+                            lambda lat, lon, kind, max_results, field_tier="full": (
                                 nearby_called.update({"lat": lat, "lon": lon}) or [_google_place()]
                             ))
         monkeypatch.setattr(svc, "_text_search", lambda *a, **kw: [])
@@ -110,7 +155,7 @@ class TestGooglePlacesRouting:
 
         text_called = {}
         monkeypatch.setattr(svc, "_text_search",
-                            lambda query, kind, max_results, pincode=None: (
+                            lambda query, kind, max_results, pincode=None, field_tier="full": (
                                 text_called.update({"query": query}) or [_google_place()]
                             ))
         monkeypatch.setattr(svc, "_nearby_search", lambda *a, **kw: [])
@@ -126,7 +171,7 @@ class TestGooglePlacesRouting:
 
         text_called = {}
         monkeypatch.setattr(svc, "_text_search",
-                            lambda query, kind, max_results, pincode=None: (
+                            lambda query, kind, max_results, pincode=None, field_tier="full": (
                                 text_called.update({"called": True}) or [_google_place()]
                             ))
         monkeypatch.setattr(svc, "_nearby_search",
@@ -144,7 +189,7 @@ class TestGooglePlacesRouting:
 
         received_pincode = {}
         monkeypatch.setattr(svc, "_text_search",
-                            lambda query, kind, max_results, pincode=None: (
+                            lambda query, kind, max_results, pincode=None, field_tier="full": (
                                 received_pincode.update({"pincode": pincode}) or []
                             ))
         monkeypatch.setattr(svc, "_nearby_search", lambda *a, **kw: [])
@@ -160,7 +205,7 @@ class TestGooglePlacesRouting:
 
         sent_queries = []
 
-        def fake_call(url, payload):
+        def fake_call(url, payload, field_mask=None):
             sent_queries.append(payload.get("textQuery", ""))
             return []
 
@@ -178,7 +223,7 @@ class TestGooglePlacesRouting:
 
         sent_queries = []
 
-        def fake_call(url, payload):
+        def fake_call(url, payload, field_mask=None):
             sent_queries.append(payload.get("textQuery", ""))
             return []
 
@@ -212,7 +257,7 @@ class TestRadiusExpansion:
 
         call_count = {"n": 0}
 
-        def fake_call(url, payload):
+        def fake_call(url, payload, field_mask=None):
             call_count["n"] += 1
             return [_google_place()]   # non-empty first time
 
@@ -229,7 +274,7 @@ class TestRadiusExpansion:
 
         radii_tried = []
 
-        def fake_call(url, payload):
+        def fake_call(url, payload, field_mask=None):
             radius = payload["locationRestriction"]["circle"]["radius"]
             radii_tried.append(int(radius))
             # Return results only at 20 km
@@ -249,7 +294,7 @@ class TestRadiusExpansion:
 
         radii_tried = []
 
-        def fake_call(url, payload):
+        def fake_call(url, payload, field_mask=None):
             radius = payload["locationRestriction"]["circle"]["radius"]
             radii_tried.append(int(radius))
             return [_google_place()] if radius >= 50_000 else []
@@ -271,6 +316,241 @@ class TestRadiusExpansion:
         assert results == []
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# GooglePlacesService — negative cache + circuit breaker
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestPlacesResilience:
+
+    _PAYLOAD = {"textQuery": "clinics in Kota, India"}
+
+    def test_empty_result_is_negatively_cached(self):
+        """Same request that came back empty is not re-sent within the TTL."""
+        from src.services.google_places_service import GooglePlacesService, _TEXT_SEARCH_URL
+        svc = GooglePlacesService()
+
+        with patch.object(svc, "_fetch", return_value=[]) as fetch:
+            assert svc._call(_TEXT_SEARCH_URL, self._PAYLOAD) == []
+            assert svc._call(_TEXT_SEARCH_URL, self._PAYLOAD) == []
+        assert fetch.call_count == 1
+
+    def test_failed_result_is_negatively_cached(self):
+        from src.services.google_places_service import GooglePlacesService, _TEXT_SEARCH_URL
+        svc = GooglePlacesService()
+
+        with patch.object(svc, "_fetch", return_value=None) as fetch:
+            svc._call(_TEXT_SEARCH_URL, self._PAYLOAD)
+            svc._call(_TEXT_SEARCH_URL, self._PAYLOAD)
+        assert fetch.call_count == 1
+
+    def test_successful_result_is_not_cached(self):
+        from src.services.google_places_service import GooglePlacesService, _TEXT_SEARCH_URL
+        svc = GooglePlacesService()
+
+        with patch.object(svc, "_fetch", return_value=[_google_place()]) as fetch:
+            svc._call(_TEXT_SEARCH_URL, self._PAYLOAD)
+            svc._call(_TEXT_SEARCH_URL, self._PAYLOAD)
+        assert fetch.call_count == 2
+
+    def test_breaker_opens_after_threshold_and_fails_fast(self, monkeypatch):
+        """After N consecutive failures no further HTTP calls are made."""
+        import src.services.google_places_service as gps_mod
+        monkeypatch.setattr(gps_mod.config, "PLACES_BREAKER_FAILURE_THRESHOLD", 3)
+        svc = gps_mod.GooglePlacesService()
+
+        with patch.object(svc, "_fetch", return_value=None) as fetch:
+            for i in range(6):
+                svc._call(gps_mod._TEXT_SEARCH_URL, {"textQuery": f"q{i}"})
+        assert fetch.call_count == 3
+        assert svc._breaker.state == "open"
+
+    def test_half_open_probe_closes_breaker_on_recovery(self, monkeypatch):
+        import src.services.google_places_service as gps_mod
+        monkeypatch.setattr(gps_mod.config, "PLACES_BREAKER_FAILURE_THRESHOLD", 1)
+        monkeypatch.setattr(gps_mod.config, "PLACES_BREAKER_RESET_SECONDS", 0)
+        svc = gps_mod.GooglePlacesService()
+
+        with patch.object(svc, "_fetch", return_value=None):
+            svc._call(gps_mod._TEXT_SEARCH_URL, {"textQuery": "down"})
+        assert svc._breaker.state == "open"
+
+        # Reset window elapsed → one probe goes through and succeeds
+        with patch.object(svc, "_fetch", return_value=[_google_place()]) as fetch:
+            results = svc._call(gps_mod._TEXT_SEARCH_URL, {"textQuery": "up"})
+        assert fetch.call_count == 1
+        assert len(results) == 1
+        assert svc._breaker.state == "closed"
+
+    def test_half_open_probe_failure_reopens(self, monkeypatch):
+        import src.services.google_places_service as gps_mod
+        monkeypatch.setattr(gps_mod.config, "PLACES_BREAKER_FAILURE_THRESHOLD", 1)
+        monkeypatch.setattr(gps_mod.config, "PLACES_BREAKER_RESET_SECONDS", 0)
+        svc = gps_mod.GooglePlacesService()
+
+        with patch.object(svc, "_fetch", return_value=None):
+            svc._call(gps_mod._TEXT_SEARCH_URL, {"textQuery": "a"})
+            svc._call(gps_mod._TEXT_SEARCH_URL, {"textQuery": "b"})
+        assert svc._breaker.state == "open"
+
+
+    def test_stale_success_does_not_close_open_breaker(self):
+        from src.services.google_places_service import _CircuitBreaker
+        breaker = _CircuitBreaker(failure_threshold=1, reset_seconds=60)
+        slow = breaker.allow()
+        breaker.record_failure(breaker.allow())
+        assert breaker.state == "open"
+
+        breaker.record_success(slow)  # admitted before the breaker opened
+        assert breaker.state == "open"
+        assert breaker.allow() is None
+
+    def test_stale_result_does_not_release_half_open_probe(self):
+        from src.services.google_places_service import _CircuitBreaker
+        breaker = _CircuitBreaker(failure_threshold=1, reset_seconds=0)
+        slow = breaker.allow()
+        breaker.record_failure(breaker.allow())
+        probe = breaker.allow()
+        assert probe is not None and breaker.state == "half_open"
+
+        breaker.record_failure(slow)
+        breaker.record_success(slow)
+        assert breaker.state == "half_open"
+        assert breaker.allow() is None  # the probe is still out
+
+        breaker.record_success(probe)
+        assert breaker.state == "closed"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Field-mask tiers, place details, compact cards
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestFieldTiers:
+
+    @pytest.fixture(autouse=True)
+    def fake_api_key(self, monkeypatch):
+        import src.services.google_places_service as gps_mod
+        monkeypatch.setattr(gps_mod.config, "GOOGLE_PLACES_API_KEY", "fake-key-for-tests")
+
+    def test_minimal_tier_requests_only_name_and_location(self):
+        import src.services.google_places_service as gps_mod
+        svc = gps_mod.GooglePlacesService()
+
+        with patch.object(svc, "_fetch", return_value=[_google_place()]) as fetch:
+            svc.search_facilities("clinics", kind="clinic", lat=28.6, lon=77.2,
+                                  max_results=5, field_tier=gps_mod.FIELD_TIER_MINIMAL)
+
+        mask = fetch.call_args[0][2]
+        assert mask == "places.id,places.displayName,places.location"
+
+    def test_default_tier_is_full(self):
+        import src.services.google_places_service as gps_mod
+        svc = gps_mod.GooglePlacesService()
+
+        with patch.object(svc, "_fetch", return_value=[_google_place()]) as fetch:
+            svc.search_facilities("clinics in Kota", kind="clinic", max_results=5,
+                                  force_text_search=True)
+
+        mask = fetch.call_args[0][2]
+        assert "places.nationalPhoneNumber" in mask and "places.rating" in mask
+
+    def test_place_details_adds_hours_and_maps_link(self):
+        import src.services.google_places_service as gps_mod
+        svc = gps_mod.GooglePlacesService()
+        body = {
+            "id": "ChIJabc",
+            "displayName": {"text": "Sharma Clinic"},
+            "location": {"latitude": 25.21, "longitude": 75.86},
+            "currentOpeningHours": {"openNow": True, "weekdayDescriptions": ["Monday: 9 AM – 1 PM"]},
+            "googleMapsUri": "https://maps.google.com/?cid=1",
+        }
+        with patch.object(svc, "_request", return_value=body) as request:
+            details = svc.get_place_details("ChIJabc")
+
+        assert request.call_args[0][0].endswith("/places/ChIJabc")
+        assert request.call_args[0][1] is None  # GET
+        assert details["placeId"] == "ChIJabc"
+        assert details["openNow"] is True
+        assert details["mapsUrl"] == "https://maps.google.com/?cid=1"
+
+    def test_place_details_failure_returns_none(self):
+        import src.services.google_places_service as gps_mod
+        svc = gps_mod.GooglePlacesService()
+        with patch.object(svc, "_request", return_value=None):
+            assert svc.get_place_details("ChIJabc") is None
+
+    def test_unknown_place_ids_do_not_open_the_breaker(self, monkeypatch):
+        import io
+        import urllib.error
+        import src.services.google_places_service as gps_mod
+        monkeypatch.setattr(gps_mod.config, "PLACES_BREAKER_FAILURE_THRESHOLD", 2)
+        svc = gps_mod.GooglePlacesService()
+
+        def not_found(req, timeout):
+            raise urllib.error.HTTPError(req.full_url, 404, "Not Found", {}, io.BytesIO(b"{}"))
+
+        with patch.object(gps_mod.urllib.request, "urlopen", side_effect=not_found) as urlopen:
+            for i in range(5):
+                assert svc.get_place_details(f"bogus-{i}") is None
+        assert urlopen.call_count == 5
+        assert svc._breaker.state == "closed"
+
+    def test_server_errors_open_the_breaker(self, monkeypatch):
+        import io
+        import urllib.error
+        import src.services.google_places_service as gps_mod
+        monkeypatch.setattr(gps_mod.config, "PLACES_BREAKER_FAILURE_THRESHOLD", 2)
+        svc = gps_mod.GooglePlacesService()
+
+        def unavailable(req, timeout):
+            raise urllib.error.HTTPError(req.full_url, 503, "Unavailable", {}, io.BytesIO(b"{}"))
+
+        with patch.object(gps_mod.urllib.request, "urlopen", side_effect=unavailable):
+            for i in range(2):
+                svc.get_place_details(f"place-{i}")
+        assert svc._breaker.state == "open"
+
+    def test_low_bandwidth_state_uses_minimal_tier(self, monkeypatch):
+        from src.agents.graph import nearby_facilities_node
+
+        calls = []
+        monkeypatch.setattr("src.agents.graph.google_places.search_facilities",
+                            lambda **kw: calls.append(kw) or [_google_place()])
+        nearby_facilities_node(dict(
+            text="nearby clinics", language="en", user_id="u1", pincode=None,
+            lat=28.6, lon=77.2, conversation_history=[], system_extra="",
+            use_cache=False, low_bandwidth=True, field_tier="minimal",
+            intent="nearby_facilities", nearby_kind="clinic",
+            extracted_location=None, reply="", facilities=[],
+        ))
+        assert calls[0]["field_tier"] == "minimal"
+
+
+class TestCompactCards:
+
+    def test_round_trip_drops_empty_columns(self):
+        from src.utils.facility_cards import compact_cards, expand_cards
+
+        places = [
+            {"placeId": "p1", "name": "A", "address": "", "phone": "", "lat": 25.2138123,
+             "lon": 75.8648456, "category": "", "rating": None, "source": "google"},
+            {"placeId": "p2", "name": "B", "address": "", "phone": "", "lat": 25.1,
+             "lon": 75.9, "category": "", "rating": None, "source": "google"},
+        ]
+        compact = compact_cards(places)
+
+        assert compact["fields"] == ["id", "name", "lat", "lon", "source"]
+        assert compact["rows"][0] == ["p1", "A", 25.21381, 75.86485, "google"]
+        assert expand_cards(compact)[1] == {"id": "p2", "name": "B", "lat": 25.1, "lon": 75.9, "source": "google"}
+
+    def test_registered_shops_use_shop_id_and_lng(self):
+        from src.utils.facility_cards import compact_cards
+
+        compact = compact_cards([{"shopId": "s1", "name": "Ramu Kirana", "lat": 25.2, "lng": 75.8}])
+        assert compact["fields"] == ["id", "name", "lat", "lon"]
+        assert compact["rows"] == [["s1", "Ramu Kirana", 25.2, 75.8]]
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # LangGraph — nearby_facilities_node
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -294,7 +574,7 @@ class TestNearbyFacilitiesNode:
         calls = []
         monkeypatch.setattr(
             "src.agents.graph.google_places.search_facilities",
-            lambda query, kind, lat, lon, max_results, force_text_search=False, pincode=None: (
+            lambda query, kind, lat, lon, max_results, force_text_search=False, pincode=None, field_tier="full": (
                 calls.append({"query": query, "lat": lat, "force_text": force_text_search})
                 or [_google_place("Aklera Clinic")]
             )
@@ -315,7 +595,7 @@ class TestNearbyFacilitiesNode:
         calls = []
         monkeypatch.setattr(
             "src.agents.graph.google_places.search_facilities",
-            lambda query, kind, lat, lon, max_results, force_text_search=False, pincode=None: (
+            lambda query, kind, lat, lon, max_results, force_text_search=False, pincode=None, field_tier="full": (
                 calls.append({"lat": lat, "lon": lon, "force_text": force_text_search})
                 or [_google_place()]
             )
@@ -334,7 +614,7 @@ class TestNearbyFacilitiesNode:
         calls = []
         monkeypatch.setattr(
             "src.agents.graph.google_places.search_facilities",
-            lambda query, kind, lat, lon, max_results, force_text_search=False, pincode=None: (
+            lambda query, kind, lat, lon, max_results, force_text_search=False, pincode=None, field_tier="full": (
                 calls.append({"pincode": pincode}) or []
             )
         )
@@ -355,6 +635,131 @@ class TestNearbyFacilitiesNode:
         assert len(result["reply"]) > 10    # some non-empty guidance message
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# Named-location resolution via GEO_CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestNamedLocationGeoCache:
+
+    def _state(self, **kwargs):
+        base = dict(text="clinics in Kota", language="en",
+                    user_id="u1", pincode=None, lat=None, lon=None,
+                    conversation_history=[], system_extra="", use_cache=False,
+                    low_bandwidth=False, intent="nearby_facilities",
+                    nearby_kind="clinic", extracted_location="Kota",
+                    reply="", facilities=[])
+        base.update(kwargs)
+        return base
+
+    def test_first_query_text_searches_and_caches_coordinates(self, monkeypatch):
+        from src.agents.graph import nearby_facilities_node
+
+        stored = {}
+        monkeypatch.setattr("src.services.location_resolver.db.set_geo_cache",
+                            lambda key, lat, lon: stored.update({key: (lat, lon)}))
+        calls = []
+        monkeypatch.setattr(
+            "src.agents.graph.google_places.search_facilities",
+            lambda **kw: calls.append(kw) or [_google_place("Kota Clinic")],
+        )
+
+        nearby_facilities_node(self._state())
+
+        assert calls[0]["force_text_search"] is True
+        assert stored == {"place:kota": (28.6, 77.2)}
+
+    def test_second_query_uses_nearby_search_with_cached_coordinates(self, monkeypatch):
+        from src.agents.graph import nearby_facilities_node
+
+        calls = []
+        monkeypatch.setattr(
+            "src.agents.graph.google_places.search_facilities",
+            lambda **kw: calls.append(kw) or [_google_place("Kota Clinic")],
+        )
+
+        nearby_facilities_node(self._state())
+        nearby_facilities_node(self._state(extracted_location="  KOTA "))
+
+        assert calls[1]["force_text_search"] is False
+        assert (calls[1]["lat"], calls[1]["lon"]) == (28.6, 77.2)
+
+    def test_persisted_geo_cache_is_used_on_cold_start(self, monkeypatch):
+        from src.agents.graph import nearby_facilities_node
+
+        monkeypatch.setattr("src.services.location_resolver.db.get_geo_cache",
+                            lambda key: {"locationKey": key, "lat": "25.18", "lon": "75.83"})
+        calls = []
+        monkeypatch.setattr(
+            "src.agents.graph.google_places.search_facilities",
+            lambda **kw: calls.append(kw) or [],
+        )
+
+        nearby_facilities_node(self._state())
+
+        assert calls[0]["force_text_search"] is False
+        assert (calls[0]["lat"], calls[0]["lon"]) == (25.18, 75.83)
+
+    def test_geo_cache_failure_falls_back_to_text_search(self, monkeypatch):
+        from src.agents.graph import nearby_facilities_node
+
+        def boom(key):
+            raise RuntimeError("table missing")
+
+        monkeypatch.setattr("src.services.location_resolver.db.get_geo_cache", boom)
+        calls = []
+        monkeypatch.setattr(
+            "src.agents.graph.google_places.search_facilities",
+            lambda **kw: calls.append(kw) or [],
+        )
+
+        nearby_facilities_node(self._state())
+        assert calls[0]["force_text_search"] is True
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# DynamoDB — get_shops_near (ShopGeoIndex)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _registered_shop(shop_id, name, status="approved", **extra):
+    return {"shopId": shop_id, "ownerId": "o1", "name": name, "ownerName": "Ramu",
+            "phone": "9000000001", "pincode": "324001", "status": status,
+            "createdAt": "2024-01-01", "updatedAt": "2024-01-01", **extra}
+
+
+class TestShopsNear:
+
+    def test_geo_keys_follow_coordinates_and_status(self):
+        from src.models.shop import Shop, status_keys, with_listing_keys
+
+        keyed = with_listing_keys(_registered_shop("s1", "A", lat=25.18, lng=75.83))
+        assert keyed["geoStatus"] == keyed["geohash"][:5] + "#approved" and len(keyed["geohash"]) == 9
+        assert status_keys(keyed, "suspended")["geoStatus"].endswith("#suspended")
+        moved = with_listing_keys(dict(keyed, lat=None))
+        assert "geohash" not in moved and "geoStatus" not in moved   # sparse: no coordinates, no index entry
+        assert "geohash" not in Shop(shopId="s", ownerId="o", name="n", ownerName="o",
+                                     phone="9", pincode="324001").to_dynamo()
+
+    @mock_aws
+    def test_reads_every_covering_cell_and_refines_by_distance(self, dynamo_tables):
+        from src.services.dynamodb_service import DynamoDBService
+
+        svc = DynamoDBService()
+        # the search point's cell is tsmzj; both matches sit in tsmzm, the cell to its north
+        svc.save_shop(_registered_shop("kirana", "Kirana", lat=25.19, lng=75.83))
+        svc.save_shop(_registered_shop("chemist", "Chemist", lat=25.22, lng=75.83, category="pharmacy"))
+        svc.save_shop(_registered_shop("far", "Far", lat=25.40, lng=75.83))
+        svc.save_shop(_registered_shop("pending", "Pending", status="pending", lat=25.18, lng=75.83))
+        svc.save_shop(_registered_shop("no-gps", "No GPS"))
+
+        shops = svc.get_shops_near(25.18, 75.83, radius_km=5)
+        assert [(s["shopId"], s["distanceKm"]) for s in shops] == [("kirana", 1.11), ("chemist", 4.45)]
+        assert "phone" not in shops[0]
+        assert [s["shopId"] for s in svc.get_shops_near(25.18, 75.83, 5, category="pharmacy")] == ["chemist"]
+
+        svc.set_shop_status("kirana", "suspended", "2024-01-02")
+        assert [s["shopId"] for s in svc.get_shops_near(25.18, 75.83, 5)] == ["chemist"]
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # LangGraph — shops_node
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -378,12 +783,12 @@ class TestShopsNode:
         google_calls = []
 
         monkeypatch.setattr(
-            "src.agents.graph.db.get_shops_by_pincode",
+            "src.agents.graph.db.get_shop_cards_by_pincode",
             lambda p: (db_called.update({"flag": True}) or [])
         )
         monkeypatch.setattr(
             "src.agents.graph.google_places.search_facilities",
-            lambda query, kind, lat, lon, max_results, force_text_search=False, pincode=None: (
+            lambda query, kind, lat, lon, max_results, force_text_search=False, pincode=None, field_tier="full": (
                 google_calls.append({"query": query, "force_text": force_text_search})
                 or [_google_place("Aklera Shop")]
             )
@@ -442,6 +847,40 @@ class TestShopsNode:
         assert google_called["flag"] is True
         assert result["facilities"][0]["name"] == "Google Shop"
 
+    @mock_aws
+    def test_gps_finds_registered_shops_without_pincode(self, dynamo_tables, monkeypatch):
+        """GPS only → nearest registered shops from ShopGeoIndex; no Google."""
+        from src.agents.graph import shops_node
+        from src.services.database import db
+
+        db.save_shop(_registered_shop("s1", "Ramu Kirana", lat=25.19, lng=75.83))
+        monkeypatch.setattr("src.agents.graph.pincode_gazetteer.nearest_pincode", lambda *a: None)
+        monkeypatch.setattr("src.agents.graph.google_places.search_facilities",
+                            lambda *a, **kw: pytest.fail("Google called"))
+
+        result = shops_node(self._state(lat=25.18, lon=75.83))
+
+        assert result["facilities"][0]["name"] == "Ramu Kirana"
+        assert result["facilities"][0]["distanceKm"] == 1.11
+
+    @mock_aws
+    def test_gps_and_pincode_shops_are_merged(self, dynamo_tables, monkeypatch):
+        """Pincode matches first (nearest first, then those without lat/lng), then other shops in range."""
+        from src.agents.graph import shops_node
+        from src.services.database import db
+
+        db.save_shop(_registered_shop("far", "Far Kirana", lat=25.20, lng=75.83))
+        db.save_shop(_registered_shop("near", "Near Kirana", lat=25.185, lng=75.83))
+        db.save_shop(_registered_shop("no-gps", "Shyam Store"))
+        db.save_shop(_registered_shop("other", "Next Door", pincode="324002", lat=25.181, lng=75.83))
+        monkeypatch.setattr("src.agents.graph.google_places.search_facilities",
+                            lambda *a, **kw: pytest.fail("Google called"))
+
+        result = shops_node(self._state(pincode="324001", lat=25.18, lon=75.83))
+
+        assert [s["shopId"] for s in result["facilities"]] == ["near", "far", "no-gps", "other"]
+        assert result["facilities"][0]["distanceKm"] == 0.56
+
     def test_returns_no_location_reply_when_nothing_available(self):
         """No GPS, no pincode, no extracted location → guidance message."""
         from src.agents.graph import shops_node
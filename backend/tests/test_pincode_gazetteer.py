@@ -0,0 +1,125 @@
+"""
+Tests for the offline pincode gazetteer (pincode ↔ lat/lon) and its use in
+the agent graph for pincode-only and GPS-only users.
+"""
+import math
+import random
+
+import pytest
+
+from src.services.pincode_gazetteer import PincodeGazetteer, build_gazetteer
+
+
+KOTA_POINTS = [
+    ("324001", 25.1800, 75.8330),
+    ("324002", 25.1500, 75.8500),
+    ("324005", 25.1400, 75.8100),
+    ("324007", 25.1700, 75.8600),
+    ("324008", 25.2138, 75.8648),
+    ("324009", 25.1200, 75.8800),
+    ("110001", 28.6328, 77.2197),
+]
+
+
+@pytest.fixture(autouse=True)
+def stub_facility_mirror(monkeypatch):
+    monkeypatch.setattr("src.agents.graph.facility_mirror.nearby", lambda *a, **kw: None)
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    path = tmp_path / "pincodes.bin"
+    build_gazetteer(KOTA_POINTS, str(path))
+    return PincodeGazetteer(str(path))
+
+
+def _brute_force_nearest(points, lat, lon):
+    scale = math.cos(math.radians(lat))
+    return min(
+        points,
+        key=lambda p: (lat - p[1]) ** 2 + ((lon - p[2]) * scale) ** 2,
+    )[0]
+
+
+class TestCentroid:
+
+    def test_known_pincode_returns_centroid(self, gazetteer):
+        lat, lon = gazetteer.centroid("324008")
+        assert lat == pytest.approx(25.2138, abs=1e-4)
+        assert lon == pytest.approx(75.8648, abs=1e-4)
+
+    def test_unknown_pincode_returns_none(self, gazetteer):
+        assert gazetteer.centroid("999999") is None
+
+    def test_non_numeric_pincode_returns_none(self, gazetteer):
+        assert gazetteer.centroid("abc") is None
+
+    def test_missing_file_is_unavailable(self, tmp_path):
+        gz = PincodeGazetteer(str(tmp_path / "missing.bin"))
+        assert gz.available is False
+        assert gz.centroid("324008") is None
+        assert gz.nearest_pincode(25.2, 75.8) is None
+
+
+class TestNearestPincode:
+
+    def test_exact_centroid_maps_to_itself(self, gazetteer):
+        assert gazetteer.nearest_pincode(25.2138, 75.8648) == "324008"
+
+    def test_far_away_point_returns_none(self, gazetteer):
+        # Mumbai is hundreds of km from every centroid in the fixture
+        assert gazetteer.nearest_pincode(19.07, 72.87) is None
+
+    def test_matches_brute_force_on_random_points(self, tmp_path):
+        rng = random.Random(42)
+        points = [
+            (f"{100000 + i:06d}", rng.uniform(8.0, 36.0), rng.uniform(69.0, 96.0))
+            for i in range(2000)
+        ]
+        path = tmp_path / "random.bin"
+        build_gazetteer(points, str(path))
+        gz = PincodeGazetteer(str(path))
+
+        for _ in range(200):
+            lat, lon = rng.uniform(8.0, 36.0), rng.uniform(69.0, 96.0)
+            assert gz.nearest_pincode(lat, lon, max_km=10_000) == _brute_force_nearest(points, lat, lon)
+
+
+class TestGraphIntegration:
+
+    def test_pincode_only_uses_centroid_for_nearby_search(self, gazetteer, monkeypatch):
+        from src.agents.graph import _fetch_facilities
+
+        calls = []
+        monkeypatch.setattr("src.agents.graph.pincode_gazetteer", gazetteer)
+        monkeypatch.setattr(
+            "src.agents.graph.google_places.search_facilities",
+            lambda **kw: calls.append(kw) or [],
+        )
+
+        _fetch_facilities("clinic", None, None, None, "324008")
+
+        assert calls[0]["lat"] == pytest.approx(25.2138, abs=1e-4)
+        assert calls[0]["lon"] == pytest.approx(75.8648, abs=1e-4)
+        assert calls[0]["pincode"] == "324008"
+
+    def test_gps_only_shops_use_nearest_pincode(self, gazetteer, monkeypatch):
+        from src.agents.graph import shops_node
+
+        looked_up = []
+        monkeypatch.setattr("src.agents.graph.pincode_gazetteer", gazetteer)
+        monkeypatch.setattr("src.agents.graph.db.get_shops_near", lambda *a, **kw: [])  # none registered in range
+        monkeypatch.setattr(
+            "src.agents.graph.db.get_shop_cards_by_pincode",
+            lambda p: looked_up.append(p) or [{"name": "Ramu Kirana", "status": "approved"}],
+        )
+
+        state = dict(text="nearby shops", language="en", user_id="u1",
+                     pincode=None, lat=25.2130, lon=75.8640,
+                     conversation_history=[], system_extra="", use_cache=False,
+                     low_bandwidth=False, intent="shops", nearby_kind="",
+                     extracted_location=None, reply="", facilities=[])
+        result = shops_node(state)
+
+        assert looked_up == ["324008"]
+        assert result["facilities"][0]["name"] == "Ramu Kirana"
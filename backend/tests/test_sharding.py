@@ -0,0 +1,176 @@
+"""
+Tests for write-sharded hot partition keys: shard key derivation, config
+validation, and the scatter-gather reads behind get_shops_by_pincode, the
+approved-shop listing, get_orders_by_shop and the paginated order history on
+DynamoDB (moto) and the in-memory backend.
+"""
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.models.order import with_order_keys
+from src.models.shop import listing_keys, with_listing_keys
+from src.services.memory_service import InMemoryDBService
+from src.utils.config import config
+from src.utils.sharding import parse_shard_counts, shard_key, shard_keys
+
+
+@pytest.fixture(autouse=True)
+def aws_credentials(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_SECURITY_TOKEN", "testing")
+    monkeypatch.setenv("AWS_SESSION_TOKEN", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "ap-south-1")
+
+
+@pytest.fixture
+def hot_keys(monkeypatch):
+    monkeypatch.setattr(config, "PINCODE_SHARDS", "324001=4, 324008=2")
+    monkeypatch.setattr(config, "SHOP_ORDER_SHARDS", "busy-shop=3")
+
+
+def _gsi(name, hash_key, range_key=None):
+    keys = [{"AttributeName": hash_key, "KeyType": "HASH"}]
+    if range_key:
+        keys.append({"AttributeName": range_key, "KeyType": "RANGE"})
+    return {"IndexName": name, "KeySchema": keys, "Projection": {"ProjectionType": "ALL"}}
+
+
+@pytest.fixture
+def dynamo_tables():
+    with mock_aws():
+        client = boto3.client("dynamodb", region_name="ap-south-1")
+        for table, pk, indexes in (
+            (config.SHOPS_TABLE, "shopId", [_gsi("PincodeShardIndex", "pincodeShard"),
+                                            _gsi("PincodeStatusIndex", "pincodeStatus", "category")]),
+            (config.ORDERS_TABLE, "orderId", [_gsi("ShopOrdersShardIndex", "shopShard", "createdAt")]),
+        ):
+            attributes = {pk} | {k["AttributeName"] for index in indexes for k in index["KeySchema"]}
+            client.create_table(
+                TableName=table,
+                BillingMode="PAY_PER_REQUEST",
+                AttributeDefinitions=[{"AttributeName": a, "AttributeType": "S"} for a in sorted(attributes)],
+                KeySchema=[{"AttributeName": pk, "KeyType": "HASH"}],
+                GlobalSecondaryIndexes=indexes,
+            )
+        yield
+
+
+def _shop(shop_id, pincode="324001", category="general"):
+    return {"shopId": shop_id, "ownerId": "o", "name": shop_id, "pincode": pincode, "status": "approved",
+            "category": category}
+
+
+def _order(order_id, shop_id="busy-shop"):
+    return {"orderId": order_id, "shopId": shop_id, "userId": "u1", "status": "pending",
+            "createdAt": f"2026-01-01T00:00:{order_id[-2:]}"}
+
+
+def test_shard_counts_are_per_key_and_default_to_one():
+    spec = "324001=4, 324008=2"
+    assert parse_shard_counts(spec) == {"324001": 4, "324008": 2}
+    assert shard_keys("324001", spec) == ["324001#0", "324001#1", "324001#2", "324001#3"]
+    assert shard_keys("110001", spec) == ["110001#0"]
+    assert shard_key("110001", "any-shop", spec) == "110001#0"
+    # stable per item, so re-saving an item never moves it
+    assert shard_key("324001", "s1", spec) == shard_key("324001", "s1", spec) in shard_keys("324001", spec)
+
+
+@pytest.mark.parametrize("spec", ["324001", "324001=0", "=4", "324001=four"])
+def test_malformed_shard_counts_are_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_shard_counts(spec)
+
+
+def test_malformed_shard_env_fails_when_config_loads(monkeypatch):
+    from src.utils.config import _shard_spec
+    monkeypatch.setenv("PINCODE_SHARDS", "324001=4,324008")
+    with pytest.raises(ValueError, match="PINCODE_SHARDS"):
+        _shard_spec("PINCODE_SHARDS")
+    monkeypatch.setenv("PINCODE_SHARDS", "324001=4")
+    assert _shard_spec("PINCODE_SHARDS") == "324001=4"
+
+
+def test_listing_keys_keep_shard_zero_bare(hot_keys):
+    assert listing_keys("324001", "approved") == [
+        "324001#approved", "324001#approved#1", "324001#approved#2", "324001#approved#3",
+    ]
+    assert listing_keys("110001", "approved") == ["110001#approved"]
+    statuses = {with_listing_keys(_shop(f"s{n:02d}"))["pincodeStatus"] for n in range(40)}
+    assert statuses == set(listing_keys("324001", "approved"))
+    assert with_listing_keys(_shop("s1", pincode="110001"))["pincodeStatus"] == "110001#approved"
+
+
+def test_hot_key_writes_spread_over_its_shards(hot_keys):
+    shop_shards = {with_listing_keys(_shop(f"s{n:02d}"))["pincodeShard"] for n in range(40)}
+    assert shop_shards == set(shard_keys("324001", config.PINCODE_SHARDS))
+    order_shards = {with_order_keys(_order(f"o{n:02d}"))["shopShard"] for n in range(40)}
+    assert order_shards == {"busy-shop#0", "busy-shop#1", "busy-shop#2"}
+    assert with_order_keys(_order("o1", shop_id="quiet-shop"))["shopShard"] == "quiet-shop#0"
+
+
+def test_dynamodb_reads_gather_every_shard(hot_keys, dynamo_tables):
+    from src.services.dynamodb_service import DynamoDBService
+
+    svc = DynamoDBService()
+    for n in range(12):
+        svc.save_shop(_shop(f"s{n:02d}"))
+        svc.save_order(_order(f"o{n:02d}"))
+    svc.save_shop(_shop("elsewhere", pincode="110001"))
+    svc.save_order(_order("o99", shop_id="quiet-shop"))
+
+    shops = svc.get_shops_by_pincode("324001")
+    assert sorted(s["shopId"] for s in shops) == [f"s{n:02d}" for n in range(12)]
+    assert len({s["pincodeShard"] for s in shops}) > 1
+    assert [s["shopId"] for s in svc.get_shops_by_pincode("110001")] == ["elsewhere"]
+
+    orders = svc.get_orders_by_shop("busy-shop", projection=["orderId", "createdAt"])
+    assert sorted(o["orderId"] for o in orders) == [f"o{n:02d}" for n in range(12)]
+    assert set(orders[0]) == {"orderId", "createdAt"}
+    assert [o["orderId"] for o in svc.get_orders_by_shop("quiet-shop")] == ["o99"]
+
+
+def test_dynamodb_listing_and_order_pages_merge_shards(hot_keys, dynamo_tables):
+    from src.services.dynamodb_service import DynamoDBService
+    _assert_listing_and_order_pages_merge_shards(DynamoDBService())
+
+
+def test_memory_listing_and_order_pages_merge_shards(hot_keys):
+    _assert_listing_and_order_pages_merge_shards(InMemoryDBService(latency_ms=0))
+
+
+def _assert_listing_and_order_pages_merge_shards(svc):
+    for n in range(12):
+        svc.save_shop(_shop(f"s{n:02d}", category="pharmacy" if n % 3 else "grocery"))
+        svc.save_order(dict(_order(f"o{n:02d}"), status="pending" if n % 2 else "delivered"))
+    assert len({o["shopShard"] for o in svc.get_orders_by_shop("busy-shop")}) > 1
+
+    cards = svc.get_shop_cards_by_pincode("324001")
+    assert sorted(c["shopId"] for c in cards) == [f"s{n:02d}" for n in range(12)]
+    assert [c["category"] for c in cards] == ["grocery"] * 4 + ["pharmacy"] * 8
+    grocery = svc.get_shop_cards_by_pincode("324001", category="grocery")
+    assert sorted(c["shopId"] for c in grocery) == ["s00", "s03", "s06", "s09"]
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = svc.get_orders_page("busy-shop", limit=5, cursor=cursor)
+        seen += [o["orderId"] for o in page]
+        if cursor is None:
+            break
+    assert seen == [f"o{n:02d}" for n in reversed(range(12))]
+    pending, cursor = svc.get_orders_page("busy-shop", limit=4, status="pending")
+    assert [o["orderId"] for o in pending] == ["o11", "o09", "o07", "o05"]
+    pending, _ = svc.get_orders_page("busy-shop", limit=4, cursor=cursor, status="pending")
+    assert [o["orderId"] for o in pending] == ["o03", "o01"]
+    with pytest.raises(ValueError):
+        svc.get_orders_page("quiet-shop", cursor=cursor)
+
+
+def test_raising_a_shard_count_keeps_existing_items_readable(monkeypatch):
+    mem = InMemoryDBService(latency_ms=0)
+    for n in range(10):
+        mem.save_order(_order(f"o{n:02d}"))
+    monkeypatch.setattr(config, "SHOP_ORDER_SHARDS", "busy-shop=5")
+    mem.save_order(_order("o10"))
+    assert sorted(o["orderId"] for o in mem.get_orders_by_shop("busy-shop")) == [f"o{n:02d}" for n in range(11)]
@@ -39,14 +39,44 @@ def dynamo_tables():
             BillingMode="PAY_PER_REQUEST",
             AttributeDefinitions=[
                 {"AttributeName": "orderId", "AttributeType": "S"},
-                {"AttributeName": "shopId", "AttributeType": "S"},
+                {"AttributeName": "shopShard", "AttributeType": "S"},
+                {"AttributeName": "createdAt", "AttributeType": "S"},
             ],
             KeySchema=[{"AttributeName": "orderId", "KeyType": "HASH"}],
-            GlobalSecondaryIndexes=[{
-                "IndexName": "ShopOrdersIndex",
-                "KeySchema": [{"AttributeName": "shopId", "KeyType": "HASH"}],
-                "Projection": {"ProjectionType": "ALL"},
-            }],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "ShopOrdersShardIndex",
+                    "KeySchema": [
+                        {"AttributeName": "shopShard", "KeyType": "HASH"},
+                        {"AttributeName": "createdAt", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                },
+            ],
+        )
+        client.create_table(
+            TableName=config.INVENTORY_TABLE,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[
+                {"AttributeName": "shopId", "AttributeType": "S"},
+                {"AttributeName": "itemId", "AttributeType": "S"},
+            ],
+            KeySchema=[
+                {"AttributeName": "shopId", "KeyType": "HASH"},
+                {"AttributeName": "itemId", "KeyType": "RANGE"},
+            ],
+        )
+        client.create_table(
+            TableName=config.SHOP_STATS_TABLE,
+            BillingMode="PAY_PER_REQUEST",
+            AttributeDefinitions=[
+                {"AttributeName": "shopId", "AttributeType": "S"},
+                {"AttributeName": "statDate", "AttributeType": "S"},
+            ],
+            KeySchema=[
+                {"AttributeName": "shopId", "KeyType": "HASH"},
+                {"AttributeName": "statDate", "KeyType": "RANGE"},
+            ],
         )
         yield
 
@@ -155,6 +185,171 @@ def test_update_inventory_success(dynamo_tables):
     assert json.loads(resp["body"])["itemCount"] == 2
 
 
+def _shop_with_inventory(handler, owner_id, n_items):
+    reg = _event("POST", "/shop",
+                 {"name": "Big Kirana", "ownerName": "K", "phone": "9000000010", "pincode": "110010"},
+                 user_id=owner_id)
+    shop_id = json.loads(handler(reg, None)["body"])["shopId"]
+    items = [{"itemId": f"item-{i:03d}", "name": f"Item {i}", "price": 10 + i, "stockQty": 5}
+             for i in range(n_items)]
+    handler(_event("POST", f"/shop/{shop_id}/inventory", {"items": items},
+                   user_id=owner_id, path_params={"shopId": shop_id}), None)
+    return shop_id
+
+
+@mock_aws
+def test_inventory_stored_per_item_and_shop_header_untouched(dynamo_tables):
+    from src.handlers.shop_owner import handler
+    from src.services.database import db
+    shop_id = _shop_with_inventory(handler, "owner-6", 60)  # > one 25-item batch
+
+    assert "inventory" not in db.get_shop(shop_id)
+    assert len(db.get_inventory(shop_id)) == 60
+
+    body = json.loads(handler(_event("GET", f"/shop/{shop_id}", path_params={"shopId": shop_id}), None)["body"])
+    assert len(body["inventory"]) == 60
+    assert "shopId" not in body["inventory"][0]
+
+
+@mock_aws
+def test_inventory_merge_and_replace(dynamo_tables):
+    from src.handlers.shop_owner import handler
+    from src.services.database import db
+    shop_id = _shop_with_inventory(handler, "owner-7", 3)
+
+    def upload(items, replace=False):
+        event = _event("POST", f"/shop/{shop_id}/inventory", {"items": items, "replace": replace},
+                       user_id="owner-7", path_params={"shopId": shop_id})
+        return json.loads(handler(event, None)["body"])["itemCount"]
+
+    assert upload([{"itemId": "item-000", "name": "Renamed", "price": 1}, {"name": "New", "price": 2}]) == 4
+    assert upload([{"itemId": "only", "name": "Only", "price": 3}], replace=True) == 1
+    assert [i["itemId"] for i in db.get_inventory(shop_id)] == ["only"]
+
+
+@mock_aws
+def test_inventory_pages_follow_cursor(dynamo_tables):
+    from src.handlers.shop_owner import handler
+    shop_id = _shop_with_inventory(handler, "owner-8", 7)
+
+    seen, cursor = [], None
+    while True:
+        query = {"limit": "3"}
+        if cursor:
+            query["cursor"] = cursor
+        event = _event("GET", f"/shop/{shop_id}/inventory", path_params={"shopId": shop_id})
+        event["queryStringParameters"] = query
+        body = json.loads(handler(event, None)["body"])
+        seen += [i["itemId"] for i in body["items"]]
+        cursor = body["nextCursor"]
+        if not cursor:
+            break
+    assert seen == [f"item-{i:03d}" for i in range(7)]
+
+
+@mock_aws
+def test_patch_item_updates_only_price_and_stock(dynamo_tables):
+    from src.handlers.shop_owner import handler
+    from src.services.database import db
+    shop_id = _shop_with_inventory(handler, "owner-9", 2)
+    header_before = db.get_shop(shop_id)
+
+    def patch(item_id, body, user_id="owner-9"):
+        return handler(_event("PATCH", f"/shop/{shop_id}/inventory/{item_id}", body, user_id=user_id,
+                              path_params={"shopId": shop_id, "itemId": item_id}), None)
+
+    resp = patch("item-001", {"stockQty": 0})
+    assert resp["statusCode"] == 200
+    item = json.loads(resp["body"])
+    assert int(item["stockQty"]) == 0
+    assert item["name"] == "Item 1"
+    assert db.get_shop(shop_id) == header_before
+
+    assert patch("item-001", {})["statusCode"] == 400
+    assert patch("item-001", {"price": -1})["statusCode"] == 400
+    assert patch("missing", {"price": 5})["statusCode"] == 404
+    assert patch("item-001", {"price": 5}, user_id="attacker")["statusCode"] == 403
+    assert "missing" not in [i["itemId"] for i in db.get_inventory(shop_id)]
+
+
+@mock_aws
+def test_legacy_embedded_inventory_is_migrated_on_write(dynamo_tables):
+    from src.handlers.shop_owner import handler
+    from src.services.database import db
+    db.save_shop({"shopId": "legacy", "ownerId": "owner-10", "name": "Old", "ownerName": "O",
+                  "phone": "9", "pincode": "110011",
+                  "inventory": [{"itemId": "a", "name": "Atta", "price": 40}]})
+
+    body = json.loads(handler(_event("GET", "/shop/legacy", path_params={"shopId": "legacy"}), None)["body"])
+    assert body["inventory"][0]["name"] == "Atta"
+    # public reads serve the embedded list and never write
+    event = _event("GET", "/shop/legacy/inventory", path_params={"shopId": "legacy"})
+    body = json.loads(handler(event, None)["body"])
+    assert [i["itemId"] for i in body["items"]] == ["a"] and body["nextCursor"] is None
+    assert "inventory" in db.get_shop("legacy")
+
+    event = _event("POST", "/shop/legacy/inventory", {"items": [{"itemId": "b", "name": "Dal", "price": 90}]},
+                   user_id="owner-10", path_params={"shopId": "legacy"})
+    assert json.loads(handler(event, None)["body"])["itemCount"] == 2
+    assert "inventory" not in db.get_shop("legacy")
+    assert sorted(i["itemId"] for i in db.get_inventory("legacy")) == ["a", "b"]
+
+
+@mock_aws
+def test_legacy_inventory_pages_follow_cursor(dynamo_tables):
+    from src.handlers.shop_owner import handler
+    from src.services.database import db
+    db.save_shop({"shopId": "legacy", "ownerId": "owner-10", "name": "Old", "ownerName": "O",
+                  "phone": "9", "pincode": "110011",
+                  "inventory": [{"itemId": f"i{n}", "name": "x", "price": n} for n in (3, 1, 2)]})
+
+    def page(**query):
+        event = _event("GET", "/shop/legacy/inventory", path_params={"shopId": "legacy"})
+        event["queryStringParameters"] = query
+        return handler(event, None)
+
+    first = json.loads(page(limit="2")["body"])
+    assert [i["itemId"] for i in first["items"]] == ["i1", "i2"]
+    rest = json.loads(page(limit="2", cursor=first["nextCursor"])["body"])
+    assert [i["itemId"] for i in rest["items"]] == ["i3"] and rest["nextCursor"] is None
+    assert page(cursor="not-a-cursor!")["statusCode"] == 400
+
+
+@mock_aws
+def test_discover_shops_reads_inventories_in_parallel(dynamo_tables, monkeypatch):
+    from src.services.database import db
+    from src.services.dynamodb_service import DynamoDBService
+    for n in range(3):
+        db.save_inventory_items(f"s{n}", [{"itemId": "a", "name": "Atta", "price": 40 + n}])
+    shops = [{"shopId": "s0"}, {"shopId": "legacy", "inventory": []}, {"shopId": "s1"}, {"shopId": "s2"}]
+    attached = DynamoDBService().attach_inventories(shops)
+    assert [s["shopId"] for s in attached] == ["s0", "legacy", "s1", "s2"]
+    assert [s["inventory"][0]["price"] for s in attached if s["inventory"]] == [40, 41, 42]
+
+
+def test_batch_write_retries_unprocessed_items(monkeypatch):
+    from src.services import dynamodb_service
+    from src.services.dynamodb_service import DynamoDBService
+
+    calls = []
+
+    class FakeClient:
+        def batch_write_item(self, RequestItems):
+            batch = RequestItems["t"]
+            calls.append(len(batch))
+            # Reject the last request of each first attempt
+            if len(calls) % 2 == 1 and len(batch) > 1:
+                return {"UnprocessedItems": {"t": batch[-1:]}}
+            return {"UnprocessedItems": {}}
+
+    monkeypatch.setattr(dynamodb_service.time, "sleep", lambda s: None)
+    monkeypatch.setattr(DynamoDBService, "_client", FakeClient())
+    svc = DynamoDBService()
+    svc.batch_write("t", [{"k": str(i)} for i in range(30)])
+
+    assert calls == [25, 1, 5, 1]
+
+
 # ── Analytics ──────────────────────────────────────────────────────────────────
 
 @mock_aws
@@ -181,3 +376,222 @@ def test_analytics_returns_zeros_for_new_shop(dynamo_tables):
     body = json.loads(resp["body"])
     assert body["today"]["orderCount"] == 0
     assert body["allTime"]["orderCount"] == 0
+
+
+# ── Analytics rollups ──────────────────────────────────────────────────────────
+
+def _place_orders(shop_id, amounts, buyer="buyer-1"):
+    from src.handlers.commerce import handler as commerce_handler
+    order_ids = []
+    for amount in amounts:
+        event = {
+            "httpMethod": "POST",
+            "path": "/commerce/order",
+            "headers": {"Authorization": f"Bearer {create_token(buyer)}"},
+            "body": json.dumps({"shopId": shop_id,
+                                "items": [{"itemId": "i1", "name": "Atta", "qty": 1, "price": amount}]}),
+        }
+        order_ids.append(json.loads(commerce_handler(event, None)["body"])["orderId"])
+    return order_ids
+
+
+def _analytics(handler, shop_id, owner_id, **query):
+    event = _event("GET", f"/shop/{shop_id}/analytics", user_id=owner_id, path_params={"shopId": shop_id})
+    event["queryStringParameters"] = query or None
+    return handler(event, None)
+
+
+@mock_aws
+def test_analytics_reads_rollups_not_orders(dynamo_tables, monkeypatch):
+    from src.handlers.shop_owner import handler
+    from src.services.database import db
+    monkeypatch.setattr("src.handlers.commerce.sns.notify_shop_new_order", lambda *a, **kw: None)
+    shop_id = _register_with_orders(handler, "owner-11", 0)
+    _place_orders(shop_id, [120, 30.5])
+
+    monkeypatch.setattr(db, "get_orders_by_shop", lambda *a, **kw: pytest.fail("full order scan"))
+    body = json.loads(_analytics(handler, shop_id, "owner-11")["body"])
+
+    assert body["today"] == {"orderCount": 2, "revenue": 150.5}
+    assert body["allTime"] == {"orderCount": 2, "pendingOrders": 2}
+    assert body["range"]["days"] == 7
+    assert len(body["range"]["daily"]) == 7
+    assert body["range"]["daily"][-1]["orderCount"] == 2
+    assert body["range"]["revenue"] == 150.5
+
+
+@mock_aws
+def test_analytics_range_covers_older_days(dynamo_tables):
+    from datetime import datetime, timedelta, timezone
+    from src.handlers.shop_owner import handler
+    from src.services.database import db
+    shop_id = _register_with_orders(handler, "owner-12", 0)
+    today = datetime.now(timezone.utc).date()
+    for age in (0, 6, 20, 40):
+        db.record_order_placed(shop_id, (today - timedelta(days=age)).isoformat(), 10, f"order-{age}")
+
+    week = json.loads(_analytics(handler, shop_id, "owner-12")["body"])
+    month = json.loads(_analytics(handler, shop_id, "owner-12", days="30")["body"])
+
+    assert week["range"]["orderCount"] == 2
+    assert month["range"]["orderCount"] == 3
+    assert month["range"]["daily"][0]["date"] == (today - timedelta(days=29)).isoformat()
+    assert month["allTime"]["orderCount"] == 4
+    assert _analytics(handler, shop_id, "owner-12", days="31")["statusCode"] == 400
+    assert _analytics(handler, shop_id, "owner-12", days="week")["statusCode"] == 400
+
+
+@mock_aws
+def test_order_rollup_is_one_idempotent_transaction(dynamo_tables):
+    from src.services.dynamodb_service import DynamoDBService
+    db = DynamoDBService()
+    calls = []
+    db._client.meta.events.register(
+        "before-parameter-build.dynamodb.*", lambda model, params, **kw: calls.append((model.name, params))
+    )
+    db.record_order_placed("shop-1", "2026-01-02", 25, "order-1")
+
+    assert [name for name, _ in calls] == ["TransactWriteItems"]
+    assert calls[0][1]["ClientRequestToken"] == "order-1"
+    rows = {r["statDate"]: r for r in db.get_shop_stats("shop-1", "2026-01-01")}
+    assert rows["2026-01-02"]["orderCount"] == 1 and rows["2026-01-02"]["revenue"] == 25
+    assert rows["ALL"]["pendingOrders"] == 1
+
+
+@mock_aws
+def test_order_status_change_updates_pending_count(dynamo_tables, monkeypatch):
+    from src.handlers.shop_owner import handler
+    monkeypatch.setattr("src.handlers.commerce.sns.notify_shop_new_order", lambda *a, **kw: None)
+    shop_id = _register_with_orders(handler, "owner-13", 0)
+    order_id = _place_orders(shop_id, [50])[0]
+
+    def set_status(status, user_id="owner-13", target=order_id):
+        event = _event("PATCH", f"/shop/{shop_id}/orders/{target}", {"status": status}, user_id=user_id,
+                       path_params={"shopId": shop_id, "orderId": target})
+        return handler(event, None)
+
+    resp = set_status("confirmed")
+    assert resp["statusCode"] == 200
+    assert json.loads(resp["body"])["status"] == "confirmed"
+    assert set_status("confirmed")["statusCode"] == 200  # no-op
+    assert json.loads(_analytics(handler, shop_id, "owner-13")["body"])["allTime"]["pendingOrders"] == 0
+
+    assert set_status("lost")["statusCode"] == 400
+    assert set_status("ready", user_id="someone-else")["statusCode"] == 403
+    assert set_status("ready", target="missing")["statusCode"] == 404
+
+    # no skipping steps, no going back, nothing after a final status
+    assert set_status("delivered")["statusCode"] == 409
+    assert set_status("pending")["statusCode"] == 409
+    assert set_status("ready")["statusCode"] == 200
+    assert set_status("cancelled")["statusCode"] == 200
+    assert set_status("ready")["statusCode"] == 409
+    assert set_status("pending")["statusCode"] == 409
+    assert json.loads(_analytics(handler, shop_id, "owner-13")["body"])["allTime"]["pendingOrders"] == 0
+
+
+@mock_aws
+def test_order_status_conflict(dynamo_tables):
+    from src.services.database import db
+    db.save_order({"orderId": "o1", "shopId": "s1", "status": "confirmed"})
+    assert db.update_order_status("o1", "pending", "ready", "2026-01-01") is None
+    assert db.get_order("o1")["status"] == "confirmed"
+
+
+def test_backfill_rollup_rows():
+    from scripts.backfill_shop_stats import rollup_rows
+    rows = rollup_rows([
+        {"createdAt": "2026-01-01T10:00:00+00:00", "totalAmount": 10, "status": "pending"},
+        {"createdAt": "2026-01-01T12:00:00+00:00", "totalAmount": 5.5, "status": "delivered"},
+        {"createdAt": "2026-01-03T09:00:00+00:00", "totalAmount": 20, "status": "pending"},
+    ])
+    assert rows == [
+        {"statDate": "2026-01-01", "orderCount": 2, "revenue": 15.5},
+        {"statDate": "2026-01-03", "orderCount": 1, "revenue": 20},
+        {"statDate": "ALL", "orderCount": 3, "revenue": 35.5, "pendingOrders": 2},
+    ]
+
+
+# ── Orders (paginated) ─────────────────────────────────────────────────────────
+
+def _register_with_orders(handler, owner_id, n_orders):
+    from src.services.database import db
+    reg = _event("POST", "/shop",
+                 {"name": "Shop D", "ownerName": "D", "phone": "9000000006", "pincode": "110006"},
+                 user_id=owner_id)
+    shop_id = json.loads(handler(reg, None)["body"])["shopId"]
+    for i in range(n_orders):
+        db.save_order({
+            "orderId": f"order-{i:02d}",
+            "shopId": shop_id,
+            "userId": "buyer-1",
+            "status": "pending" if i % 2 == 0 else "confirmed",
+            "totalAmount": 10,
+            "createdAt": f"2026-01-{i + 1:02d}T10:00:00+00:00",
+        })
+    return shop_id
+
+
+def _orders_event(shop_id, owner_id, **query):
+    event = _event("GET", f"/shop/{shop_id}/orders", user_id=owner_id, path_params={"shopId": shop_id})
+    event["queryStringParameters"] = query or None
+    return event
+
+
+@mock_aws
+def test_orders_paginate_newest_first(dynamo_tables):
+    from src.handlers.shop_owner import handler
+    shop_id = _register_with_orders(handler, "owner-6", 5)
+
+    seen = []
+    cursor = None
+    for _ in range(5):
+        query = {"limit": "2", **({"cursor": cursor} if cursor else {})}
+        body = json.loads(handler(_orders_event(shop_id, "owner-6", **query), None)["body"])
+        seen.extend(o["orderId"] for o in body["orders"])
+        cursor = body["nextCursor"]
+        if not cursor:
+            break
+
+    assert seen == ["order-04", "order-03", "order-02", "order-01", "order-00"]
+
+
+@mock_aws
+def test_orders_status_filter(dynamo_tables):
+    from src.handlers.shop_owner import handler
+    shop_id = _register_with_orders(handler, "owner-7", 6)
+
+    body = json.loads(handler(_orders_event(shop_id, "owner-7", status="confirmed", limit="10"), None)["body"])
+    assert [o["orderId"] for o in body["orders"]] == ["order-05", "order-03", "order-01"]
+    assert body["nextCursor"] is None
+
+
+@mock_aws
+def test_orders_invalid_cursor_is_400(dynamo_tables):
+    from src.handlers.shop_owner import handler
+    shop_id = _register_with_orders(handler, "owner-8", 1)
+
+    resp = handler(_orders_event(shop_id, "owner-8", cursor="not-a-cursor!"), None)
+    assert resp["statusCode"] == 400
+
+
+@mock_aws
+def test_orders_cursor_from_another_shop_or_edited_is_400(dynamo_tables):
+    from src.handlers.shop_owner import handler
+    from src.utils.pagination import encode_cursor
+    shop_id = _register_with_orders(handler, "owner-8", 3)
+
+    foreign = encode_cursor({"orderId": "order-01", "shopId": "other-shop", "createdAt": "2026-01-01"})
+    assert handler(_orders_event(shop_id, "owner-8", cursor=foreign), None)["statusCode"] == 400
+    edited = encode_cursor({"shopId": shop_id, "createdAt": "2026-01-01"})  # not a key of the index
+    assert handler(_orders_event(shop_id, "owner-8", cursor=edited), None)["statusCode"] == 400
+
+
+def test_cursor_round_trips_numeric_keys():
+    from src.utils.pagination import decode_cursor, encode_cursor
+
+    key = {"shopId": "s1", "createdAt": "2026-01-01", "turnSeq": 12, "distance": 2.5}
+    decoded = decode_cursor(encode_cursor(key))
+    assert decoded == key
+    assert type(decoded["turnSeq"]) is int and type(decoded["distance"]) is float
+    assert encode_cursor(None) is None